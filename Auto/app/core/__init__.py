@@ -3,6 +3,8 @@
 
 from app.core.fingerprint_generator import FingerprintGenerator
 from app.core.profile_manager import ProfileManager
+from app.core.template_cloner import TemplateCloner
+from app.core.profile_catalog import ProfileCatalog
 from app.core.browser_manager import BrowserManager
 from app.core.proxy_manager import ProxyManager, ProxyInfo
 from app.core.session_manager import SessionManager, SessionStatus, SessionResult
@@ -10,6 +12,8 @@ from app.core.session_manager import SessionManager, SessionStatus, SessionResul
 __all__ = [
     'FingerprintGenerator',
     'ProfileManager',
+    'TemplateCloner',
+    'ProfileCatalog',
     'BrowserManager',
     'ProxyManager',
     'ProxyInfo',
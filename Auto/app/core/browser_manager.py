@@ -3,13 +3,25 @@
 
 import os
 import subprocess
-from typing import Dict, Optional, Tuple, List, Any
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple, List, Any
 from datetime import datetime
 
 from app.data.profile_models import Profile
+from app.data.preferences_document import PreferencesDocument
 from app.core.profile_manager import ProfileManager
 from app.core.geolocation_manager import GeolocationManager, GeoLocation
 from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.process_reaper import SessionExitEvent
+from app.core.browser_pool import BrowserPool
+from app.core.launch_engine import BrowserInstance, LaunchEngine, get_launch_engine
+from app.core.devtools_port import read_devtools_active_port
+from app.core.launch_metrics import (
+    LaunchMetrics, STAGE_LOOKUP, STAGE_USER_AGENT, STAGE_GEOIP, STAGE_PREFERENCES,
+    STAGE_PORT, STAGE_SPAWN, STAGE_STATUS, STAGE_TOTAL, STAGE_READY
+)
 
 # Optional Selenium imports (for automation mode)
 try:
@@ -21,6 +33,19 @@ except ImportError:
     SELENIUM_AVAILABLE = False
 
 
+@dataclass
+class PreparedLaunch:
+    """Profile whose pre-launch stages are done (see BrowserManager.prepare_launch)."""
+    profile: Profile
+    location: Optional[GeoLocation] = None
+    cdp_port: Optional[int] = None
+    
+    @property
+    def profile_id(self) -> str:
+        """Profile ID."""
+        return self.profile.profile_id
+
+
 class BrowserManager:
     """
     Manager for browser sessions.
@@ -44,17 +69,20 @@ class BrowserManager:
     # Grid layout for batch mode: 5 columns x 2 rows = 10 profiles max
     GRID_COLS = 5
     GRID_ROWS = 2
-    MAX_CONCURRENT_PROFILES = 10
+    # The launch engine's default ceiling; use max_browsers for the live one
+    MAX_CONCURRENT_PROFILES = LaunchEngine.MAX_BROWSERS
     
-    # CDP port range for remote debugging
-    CDP_PORT_START = 9222
-    CDP_PORT_END = 9322
+    # Owner tag of this manager's browsers in the launch engine registry
+    OWNER = "browser_manager"
     
     def __init__(
         self,
         profile_manager: ProfileManager = None,
         orbita_path: str = None,
-        extensions_dir: str = "extensions"
+        extensions_dir: str = "extensions",
+        launch_trace_path: str = None,
+        engine: LaunchEngine = None,
+        auto_cdp_port: bool = False
     ):
         """
         Initialize BrowserManager.
@@ -63,6 +91,11 @@ class BrowserManager:
             profile_manager: ProfileManager instance
             orbita_path: Path to Orbita browser executable
             extensions_dir: Path to extensions directory
+            launch_trace_path: Optional JSON-lines file receiving launch stage timings
+            engine: Launch engine starting and tracking the browsers
+                    (default: the one shared with the other launchers)
+            auto_cdp_port: Launch with --remote-debugging-port=0 and let the
+                           browser pick its port (read from DevToolsActivePort)
         """
         self.profile_manager = profile_manager or ProfileManager()
         self.orbita_path = orbita_path or self.ORBITA_PATH
@@ -76,8 +109,23 @@ class BrowserManager:
         self.active_processes: Dict[str, subprocess.Popen] = {}
         # Store CDP ports for each profile (for Playwright connection)
         self.cdp_ports: Dict[str, int] = {}
-        # Track used ports
-        self._used_ports: set = set()
+        # Browsers are started, counted and health-tracked by the engine shared
+        # with the other launchers; CDP ports are leased from its allocator
+        self.engine = engine or get_launch_engine()
+        self.port_allocator = self.engine.port_allocator
+        self.auto_cdp_port = auto_cdp_port
+        # Guards cdp_ports (prepare_launch runs on worker threads)
+        self._port_lock = threading.RLock()
+        # Per-stage launch timings (see get_launch_stats)
+        self.launch_metrics = LaunchMetrics(trace_path=launch_trace_path)
+        # Browser exits (window closed, chromedriver gone, DevTools unresponsive)
+        # are reported by the engine as they happen
+        self.engine.add_exit_listener(self._on_engine_exit)
+        self._session_listeners: List[Callable[[SessionExitEvent], None]] = []
+        # Guards active_processes / active_sessions against the reaper thread
+        self._sessions_lock = threading.RLock()
+        # Warm browser pool for automation jobs (see enable_pool)
+        self.pool: Optional[BrowserPool] = None
     
     def build_chrome_options(
         self,
@@ -230,74 +278,141 @@ class BrowserManager:
         Returns:
             Process or WebDriver instance, or None if failed
         """
+        with self.launch_metrics.span(STAGE_TOTAL, profile_id):
+            return self._launch_profile(profile_id, window_position, extensions, use_selenium, sync_geolocation)
+    
+    def _launch_profile(
+        self,
+        profile_id: str,
+        window_position: Tuple[int, int],
+        extensions: List[str],
+        use_selenium: bool,
+        sync_geolocation: bool
+    ) -> Optional[Any]:
+        """Launch pipeline of launch_profile: prepare, then spawn."""
+        # Check if already running
+        if self.is_session_active(profile_id):
+            print(f"Profile {profile_id} is already running")
+            return self.active_processes.get(profile_id) or self.active_sessions.get(profile_id)
+        
+        selenium = use_selenium and SELENIUM_AVAILABLE
+        prepared = self.prepare_launch(profile_id, sync_geolocation, enable_cdp=not selenium)
+        if prepared is None:
+            return None
+        return self.spawn_prepared(prepared, window_position, extensions, use_selenium, sync_geolocation)
+    
+    def prepare_launch(
+        self,
+        profile_id: str,
+        sync_geolocation: bool = True,
+        enable_cdp: bool = True
+    ) -> Optional[PreparedLaunch]:
+        """
+        Run the pre-launch stages of a profile: DB lookup, User-Agent fix,
+        GeoIP lookup, Preferences write and CDP port allocation.
+        Safe to call from worker threads for different profiles.
+        
+        Args:
+            profile_id: Profile ID to prepare
+            sync_geolocation: If True, sync GPS location with proxy IP
+            enable_cdp: If True, reserve a CDP port
+            
+        Returns:
+            PreparedLaunch for spawn_prepared, or None if the profile is
+            missing or already running
+        """
+        metrics = self.launch_metrics
+        
         # Get profile
-        profile = self.profile_manager.get_profile(profile_id)
+        with metrics.span(STAGE_LOOKUP, profile_id):
+            profile = self.profile_manager.get_profile(profile_id)
         if not profile or not profile.exists:
             print(f"Profile {profile_id} not found or missing")
             return None
         
-        # Fix User Agent to match Orbita version
-        self._fix_user_agent(profile)
-        
-        # Check if already running
-        if profile_id in self.active_processes or profile_id in self.active_sessions:
+        if self.is_session_active(profile_id):
             print(f"Profile {profile_id} is already running")
-            return self.active_processes.get(profile_id) or self.active_sessions.get(profile_id)
+            return None
+        
+        # Preferences is parsed once; pre-launch steps patch it in memory
+        prefs = PreferencesDocument(profile.path)
+        
+        # Fix User Agent to match Orbita version
+        with metrics.span(STAGE_USER_AGENT, profile_id):
+            self._fix_user_agent(profile, prefs)
         
         # Sync geolocation with proxy IP before launching
         location = None
         if sync_geolocation:
-            location = self._sync_geolocation_with_proxy(profile)
+            location = self._sync_geolocation_with_proxy(profile, prefs)
         
-        if use_selenium and SELENIUM_AVAILABLE:
-            return self._launch_with_selenium(profile, profile_id, window_position, extensions, sync_geolocation, location)
-        else:
-            return self._launch_with_subprocess(profile, profile_id, window_position, extensions, location)
+        # Single atomic write of all patches
+        with metrics.span(STAGE_PREFERENCES, profile_id):
+            prefs.save()
+        
+        cdp_port = None
+        if enable_cdp:
+            with metrics.span(STAGE_PORT, profile_id):
+                cdp_port = 0 if self.auto_cdp_port else self._get_free_cdp_port(profile_id)
+        
+        return PreparedLaunch(profile=profile, location=location, cdp_port=cdp_port)
     
-    def _get_free_cdp_port(self) -> int:
+    def spawn_prepared(
+        self,
+        prepared: PreparedLaunch,
+        window_position: Tuple[int, int] = None,
+        extensions: List[str] = None,
+        use_selenium: bool = False,
+        sync_geolocation: bool = True
+    ) -> Optional[Any]:
         """
-        Get a free CDP port for remote debugging.
+        Start the browser for a profile prepared by prepare_launch.
         
+        Args:
+            prepared: Result of prepare_launch
+            window_position: Optional window position
+            extensions: Optional list of extensions
+            use_selenium: If True, use Selenium (requires matching ChromeDriver)
+            sync_geolocation: If True, apply geolocation to the Selenium driver
+            
         Returns:
-            Available port number
+            Process or WebDriver instance, or None if failed
         """
-        import socket
-        import random
+        profile, profile_id = prepared.profile, prepared.profile_id
+        if use_selenium and SELENIUM_AVAILABLE:
+            self.release_prepared(prepared)
+            return self._launch_with_selenium(
+                profile, profile_id, window_position, extensions, sync_geolocation, prepared.location
+            )
+        return self._launch_with_subprocess(
+            profile, profile_id, window_position, extensions, prepared.location,
+            cdp_port=prepared.cdp_port
+        )
+    
+    def release_prepared(self, prepared: PreparedLaunch):
+        """Give back the CDP port of a prepared launch that will not be spawned."""
+        self.port_allocator.release(prepared.cdp_port)
+        prepared.cdp_port = None
+    
+    def _get_free_cdp_port(self, profile_id: str = None) -> int:
+        """
+        Lease a free CDP port for remote debugging.
         
-        # Try random ports in range
-        for _ in range(100):
-            port = random.randint(self.CDP_PORT_START, self.CDP_PORT_END)
-            if port in self._used_ports:
-                continue
+        Args:
+            profile_id: Profile the port is leased to
             
-            # Check if port is actually free
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('127.0.0.1', port))
-                    self._used_ports.add(port)
-                    return port
-            except OSError:
-                continue
-        
-        # Fallback to sequential search
-        for port in range(self.CDP_PORT_START, self.CDP_PORT_END):
-            if port not in self._used_ports:
-                try:
-                    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                        s.bind(('127.0.0.1', port))
-                        self._used_ports.add(port)
-                        return port
-                except OSError:
-                    continue
-        
-        raise RuntimeError("No free CDP ports available")
+        Returns:
+            Available port number
+        """
+        return self.port_allocator.lease(profile_id)
     
     def _release_cdp_port(self, profile_id: str):
         """Release CDP port when browser closes."""
-        if profile_id in self.cdp_ports:
-            port = self.cdp_ports[profile_id]
-            self._used_ports.discard(port)
-            del self.cdp_ports[profile_id]
+        with self._port_lock:
+            port = self.cdp_ports.pop(profile_id, None)
+        # Ports picked by the browser itself (auto_cdp_port) were never leased
+        if port is not None and self.port_allocator.owner_of(port) == profile_id:
+            self.port_allocator.release(port)
     
     def get_cdp_url(self, profile_id: str) -> Optional[str]:
         """
@@ -309,11 +424,54 @@ class BrowserManager:
         Returns:
             CDP URL like "http://127.0.0.1:9222" or None
         """
-        port = self.cdp_ports.get(profile_id)
+        with self._port_lock:
+            port = self.cdp_ports.get(profile_id)
+        if not port and profile_id in self.active_processes:
+            port = self._read_cdp_port(profile_id)
         if port:
             return f"http://127.0.0.1:{port}"
         return None
     
+    def _read_cdp_port(self, profile_id: str) -> Optional[int]:
+        """Take the port of a running browser from its DevToolsActivePort, if written yet."""
+        profile = self.profile_manager.get_profile(profile_id)
+        active = read_devtools_active_port(os.path.abspath(profile.path)) if profile else None
+        if not active:
+            return None
+        with self._port_lock:
+            self.cdp_ports[profile_id] = active[0]
+        return active[0]
+    
+    def wait_until_ready(self, profile_id: str, timeout: float = 15.0) -> Optional[str]:
+        """
+        Block until a launched browser accepts DevTools connections.
+        
+        Readiness is signalled by the browser writing DevToolsActivePort
+        into the profile dir (watched with inotify where available), so
+        there is no fixed sleep and no HTTP polling. The spawn-to-ready
+        latency is recorded as the "devtools_ready" launch stage.
+        
+        Args:
+            profile_id: Profile launched with launch_profile (subprocess mode)
+            timeout: Seconds to wait
+            
+        Returns:
+            CDP URL like "http://127.0.0.1:9222", or None on timeout, exit
+            or if the profile is not running
+        """
+        if profile_id not in self.active_processes:
+            return None
+        
+        instance = self.engine.wait_ready(profile_id, timeout)
+        if instance is None:
+            print(f"DevTools of profile {profile_id} not ready after {timeout:.0f}s")
+            return None
+        
+        self.launch_metrics.record(STAGE_READY, time.perf_counter() - instance.started_at, profile_id)
+        with self._port_lock:
+            self.cdp_ports[profile_id] = instance.debug_port
+        return instance.cdp_url
+    
     def _launch_with_subprocess(
         self,
         profile: Profile,
@@ -321,7 +479,8 @@ class BrowserManager:
         window_position: Tuple[int, int] = None,
         extensions: List[str] = None,
         location: GeoLocation = None,
-        enable_cdp: bool = True
+        enable_cdp: bool = True,
+        cdp_port: int = None
     ) -> Optional[subprocess.Popen]:
         """
         Launch browser using subprocess with CDP support.
@@ -335,33 +494,19 @@ class BrowserManager:
             extensions: List of extensions to load
             location: GeoLocation for timezone
             enable_cdp: Enable CDP remote debugging (default True)
+            cdp_port: Port already reserved by prepare_launch
         """
         try:
-            # Build command line arguments
-            chrome_path = os.path.abspath(self.orbita_path)
-            profile_path = os.path.abspath(profile.path)
-            
-            args = [
-                chrome_path,
-                f"--user-data-dir={profile_path}",
-            ]
-            
             # Enable CDP remote debugging
             if enable_cdp:
-                cdp_port = self._get_free_cdp_port()
-                args.append(f"--remote-debugging-port={cdp_port}")
-                self.cdp_ports[profile_id] = cdp_port
-                print(f"CDP enabled on port {cdp_port}")
-            
-            # Window position
-            if window_position:
-                x, y = window_position
-                args.append(f"--window-position={x},{y}")
-            else:
-                args.append("--window-position=0,0")
-            
-            # Force dark mode
-            args.append("--force-dark-mode")
+                if cdp_port is None:
+                    with self.launch_metrics.span(STAGE_PORT, profile_id):
+                        cdp_port = 0 if self.auto_cdp_port else self._get_free_cdp_port(profile_id)
+                # Port 0: known once the browser writes DevToolsActivePort
+                if cdp_port:
+                    with self._port_lock:
+                        self.cdp_ports[profile_id] = cdp_port
+                    print(f"CDP enabled on port {cdp_port}")
             
             # Load extensions - always include stealth extension
             extension_paths = self._get_extension_paths(extensions)
@@ -369,36 +514,44 @@ class BrowserManager:
             stealth_path = os.path.abspath(os.path.join(self.extensions_dir, "stealth"))
             if os.path.isdir(stealth_path) and stealth_path not in extension_paths:
                 extension_paths.insert(0, stealth_path)
-            if extension_paths:
-                args.append(f"--load-extension={','.join(extension_paths)}")
-            
-            # Anti-detection arguments
-            args.extend([
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-blink-features=AutomationControlled",
-                "--disable-infobars",
-                "--disable-dev-shm-usage",
-                "--disable-browser-side-navigation",
-            ])
+            
+            # Anti-detection arguments beyond the engine's common set
+            extra_args = ["--disable-dev-shm-usage", "--disable-browser-side-navigation"]
             
             # Timezone override to match geo IP
             if location and location.timezone:
-                args.append(f"--timezone-for-testing={location.timezone}")
-            
-            # Launch browser
-            process = subprocess.Popen(args)
+                extra_args.append(f"--timezone-for-testing={location.timezone}")
             
-            # Store process
-            self.active_processes[profile_id] = process
+            # Launch browser; the engine ends the session when it exits
+            with self.launch_metrics.span(STAGE_SPAWN, profile_id):
+                with self._sessions_lock:
+                    instance = self.engine.spawn(
+                        profile_id,
+                        profile.path,
+                        owner=self.OWNER,
+                        orbita_path=self.orbita_path,
+                        debug_port=cdp_port,
+                        enable_cdp=enable_cdp,
+                        window_position=window_position or (0, 0),
+                        extension_paths=extension_paths,
+                        extra_args=extra_args
+                    )
+                    process = instance.process
+                    self.active_processes[profile_id] = process
             
             # Update status
-            self.profile_manager.update_profile_status(profile_id, "running")
-            self.profile_manager.update_last_run(profile_id)
+            with self.launch_metrics.span(STAGE_STATUS, profile_id):
+                self.profile_manager.update_profile_status(profile_id, "running")
+                self.profile_manager.update_last_run(profile_id)
             
             print(f"Launched profile {profile_id} (subprocess + CDP mode)")
             return process
             
+        except RuntimeError as e:
+            # Refused by the engine: browser limit reached, running elsewhere or no port
+            print(f"Cannot launch profile {profile_id}: {e}")
+            self._release_cdp_port(profile_id)
+            return None
         except Exception as e:
             print(f"Error launching profile {profile_id}: {e}")
             self.profile_manager.update_profile_status(profile_id, "error")
@@ -423,6 +576,10 @@ class BrowserManager:
             print("Selenium not available, falling back to subprocess")
             return self._launch_with_subprocess(profile, profile_id, window_position, extensions)
         
+        if self.engine.is_full():
+            print(f"Cannot launch profile {profile_id}: browser limit reached")
+            return None
+        
         try:
             # Build options
             options = self.build_chrome_options(profile, window_position, extensions)
@@ -438,12 +595,13 @@ class BrowserManager:
                 chromedriver_path = os.path.abspath("app/chromedriver")
             
             # Create WebDriver with Service
-            if os.path.exists(chromedriver_path):
-                service = Service(executable_path=chromedriver_path)
-                driver = webdriver.Chrome(service=service, options=options)
-            else:
-                # Let Selenium find chromedriver in PATH
-                driver = webdriver.Chrome(options=options)
+            with self.launch_metrics.span(STAGE_SPAWN, profile_id):
+                if os.path.exists(chromedriver_path):
+                    service = Service(executable_path=chromedriver_path)
+                    driver = webdriver.Chrome(service=service, options=options)
+                else:
+                    # Let Selenium find chromedriver in PATH
+                    driver = webdriver.Chrome(options=options)
             
             # Hide webdriver detection - CRITICAL for anti-detection
             self._apply_stealth_scripts(driver)
@@ -452,12 +610,20 @@ class BrowserManager:
             if sync_geolocation:
                 self._apply_geolocation_to_driver(driver, profile)
             
-            # Store session
-            self.active_sessions[profile_id] = driver
+            # Store session; the engine counts it and watches its health
+            with self._sessions_lock:
+                try:
+                    self._register_driver(profile, driver)
+                except RuntimeError as e:
+                    print(f"Cannot run profile {profile_id}: {e}")
+                    driver.quit()
+                    return None
+                self.active_sessions[profile_id] = driver
             
             # Update status
-            self.profile_manager.update_profile_status(profile_id, "running")
-            self.profile_manager.update_last_run(profile_id)
+            with self.launch_metrics.span(STAGE_STATUS, profile_id):
+                self.profile_manager.update_profile_status(profile_id, "running")
+                self.profile_manager.update_last_run(profile_id)
             
             print(f"Launched profile {profile_id} (Selenium mode)")
             return driver
@@ -480,9 +646,12 @@ class BrowserManager:
         closed = False
         
         # Close subprocess if exists
-        if profile_id in self.active_processes:
+        self.engine.forget(profile_id, self.OWNER)
+        with self._sessions_lock:
+            process = self.active_processes.pop(profile_id, None)
+            driver = self.active_sessions.pop(profile_id, None)
+        if process is not None:
             try:
-                process = self.active_processes[profile_id]
                 process.terminate()
                 process.wait(timeout=5)
             except Exception as e:
@@ -492,18 +661,17 @@ class BrowserManager:
                 except:
                     pass
             finally:
-                del self.active_processes[profile_id]
                 closed = True
         
+        exit_code = process.returncode if process is not None else None
+        
         # Close Selenium session if exists
-        if profile_id in self.active_sessions:
+        if driver is not None:
             try:
-                driver = self.active_sessions[profile_id]
                 driver.quit()
             except Exception as e:
                 print(f"Error closing session {profile_id}: {e}")
             finally:
-                del self.active_sessions[profile_id]
                 closed = True
         
         # Release CDP port
@@ -511,6 +679,7 @@ class BrowserManager:
         
         if closed:
             self.profile_manager.update_profile_status(profile_id, "inactive")
+            self._notify_session_ended(SessionExitEvent(profile_id, "closed", exit_code))
         
         return closed
     
@@ -536,20 +705,21 @@ class BrowserManager:
         Remove entries for sessions that have been closed manually (browser window closed)
         and update profile status accordingly.
         
+        Exits are normally reported as they happen by the reaper and the
+        DevTools health probe; this is a blocking full sweep (one WebDriver
+        round-trip per Selenium session) and should not run on the UI thread.
+        
         Returns:
             List of profile_ids that were cleaned up.
         """
         closed_profiles = []
         
-        # Check subprocess-based browsers
+        # Check subprocess-based browsers (normally already ended by the reaper)
         for profile_id, process in list(self.active_processes.items()):
             if process.poll() is not None:  # Process terminated
-                try:
-                    del self.active_processes[profile_id]
-                except KeyError:
-                    pass
-                closed_profiles.append(profile_id)
-                self.profile_manager.update_profile_status(profile_id, "inactive")
+                self.engine.forget(profile_id, self.OWNER)
+                if self._end_process_session(profile_id, process, "exited"):
+                    closed_profiles.append(profile_id)
         
         # Check Selenium sessions
         for profile_id, driver in list(self.active_sessions.items()):
@@ -567,20 +737,118 @@ class BrowserManager:
                 if service_process and service_process.poll() is not None:
                     dead = True
             
-            if dead:
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
-                try:
-                    del self.active_sessions[profile_id]
-                except KeyError:
-                    pass
+            if dead and self._end_driver_session(profile_id, driver, "exited"):
                 closed_profiles.append(profile_id)
-                self.profile_manager.update_profile_status(profile_id, "inactive")
         
         return closed_profiles
     
+    def _register_driver(self, profile: Profile, driver: Any):
+        """
+        Register a chromedriver-started browser with the engine, which
+        probes its DevTools endpoint and reaps its chromedriver process.
+        Only Selenium sessions registered here are health-probed.
+        
+        Raises:
+            RuntimeError: If the engine refuses it (limit reached, running elsewhere)
+        """
+        try:
+            address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        except Exception:
+            address = None
+        service = getattr(driver, "service", None)
+        self.engine.register_external(
+            profile.profile_id,
+            profile.path,
+            owner=self.OWNER,
+            control=driver,
+            debug_address=address,
+            process=getattr(service, "process", None) if service else None
+        )
+    
+    def _on_engine_exit(self, instance: BrowserInstance, event: SessionExitEvent):
+        """
+        Engine listener: end the session of a browser of ours that exited.
+        An unresponsive browser is only reported to the session listeners;
+        it may just be busy, so its driver is not quit.
+        """
+        if instance.owner != self.OWNER or event.reason == "closed":
+            return
+        profile_id = instance.profile_id
+        if event.reason == "unresponsive":
+            if self.is_session_active(profile_id):
+                print(f"Browser of profile {profile_id} stopped responding")
+                self._notify_session_ended(event)
+            return
+        if instance.control is not None:
+            if self._end_driver_session(profile_id, instance.control, event.reason, event.exit_code):
+                print(f"WebDriver of profile {profile_id} exited")
+        elif self._end_process_session(profile_id, instance.process, event.reason):
+            print(f"Browser of profile {profile_id} exited ({event.exit_code})")
+    
+    def _end_process_session(self, profile_id: str, process: subprocess.Popen, reason: str) -> bool:
+        """
+        Remove an exited subprocess session, free its port and mark the profile inactive.
+        
+        Returns:
+            True if the session was still registered
+        """
+        with self._sessions_lock:
+            if self.active_processes.get(profile_id) is not process:
+                return False
+            del self.active_processes[profile_id]
+        self._release_cdp_port(profile_id)
+        self.profile_manager.update_profile_status(profile_id, "inactive")
+        self._notify_session_ended(SessionExitEvent(profile_id, reason, process.returncode))
+        return True
+    
+    def _end_driver_session(
+        self,
+        profile_id: str,
+        driver: Any,
+        reason: str,
+        exit_code: Optional[int] = None
+    ) -> bool:
+        """
+        Remove a dead Selenium session and mark the profile inactive.
+        
+        Returns:
+            True if the session was still registered
+        """
+        with self._sessions_lock:
+            if self.active_sessions.get(profile_id) is not driver:
+                return False
+            del self.active_sessions[profile_id]
+        self.engine.forget(profile_id, self.OWNER)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self.profile_manager.update_profile_status(profile_id, "inactive")
+        self._notify_session_ended(SessionExitEvent(profile_id, reason, exit_code))
+        return True
+    
+    def add_session_listener(self, callback: Callable[[SessionExitEvent], None]):
+        """
+        Register a callback run with a SessionExitEvent whenever a session
+        ends (window closed, close_session, cleanup) or a health-probed
+        Selenium browser stops responding (reason "unresponsive"; the
+        session stays open). May run on a reaper or health probe thread.
+        """
+        self._session_listeners.append(callback)
+    
+    def remove_session_listener(self, callback: Callable[[SessionExitEvent], None]):
+        """Unregister a session listener."""
+        if callback in self._session_listeners:
+            self._session_listeners.remove(callback)
+    
+    def _notify_session_ended(self, event: SessionExitEvent):
+        """Call session listeners."""
+        for callback in list(self._session_listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Error in session listener: {e}")
+    
     def get_active_sessions(self) -> Dict[str, webdriver.Chrome]:
         """
         Get all active browser sessions.
@@ -590,14 +858,44 @@ class BrowserManager:
         """
         return self.active_sessions.copy()
     
+    def get_launch_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get launch stage timings.
+        
+        Returns:
+            Dict of stage -> {"count", "p50", "p95", "max"} in milliseconds
+        """
+        return self.launch_metrics.summary()
+    
     def get_session_count(self) -> int:
         """Get number of active sessions (both subprocess and Selenium)."""
         return len(self.active_sessions) + len(self.active_processes)
     
+    @property
+    def max_browsers(self) -> int:
+        """Browsers that may run at once (enforced by the launch engine registry)."""
+        return self.engine.registry.max_browsers
+    
     def is_session_active(self, profile_id: str) -> bool:
         """Check if a session is active."""
         return profile_id in self.active_sessions or profile_id in self.active_processes
     
+    def enable_pool(self, max_size: int = None) -> BrowserPool:
+        """
+        Switch on pool mode: automation jobs run through the returned
+        BrowserPool, which keeps browsers alive between jobs and evicts the
+        least recently used idle one at the concurrency ceiling.
+        
+        Args:
+            max_size: Concurrency ceiling (default: the engine's, see max_browsers)
+            
+        Returns:
+            The BrowserPool (also available as self.pool)
+        """
+        if self.pool is None:
+            self.pool = BrowserPool(self, max_size)
+        return self.pool
+    
     def get_driver(self, profile_id: str) -> Optional[webdriver.Chrome]:
         """
         Get WebDriver for a profile.
@@ -610,13 +908,19 @@ class BrowserManager:
         """
         return self.active_sessions.get(profile_id)
     
-    def _sync_geolocation_with_proxy(self, profile: Profile) -> Optional[GeoLocation]:
+    def _sync_geolocation_with_proxy(
+        self,
+        profile: Profile,
+        prefs: PreferencesDocument = None
+    ) -> Optional[GeoLocation]:
         """
         Sync geolocation in Preferences file with proxy IP.
         This works for both subprocess and Selenium modes.
         
         Args:
             profile: Profile to sync
+            prefs: Optional PreferencesDocument to patch instead of
+                   rewriting the file immediately
             
         Returns:
             GeoLocation if successful, None otherwise
@@ -629,21 +933,26 @@ class BrowserManager:
                 print(f"No proxy configured for profile, using current IP for geolocation")
             
             # Get geolocation from IP
-            location = self.geolocation_manager.get_location_from_ip(proxy=proxy)
-            if not location and proxy:
-                # Fallback to current IP if proxy lookup failed
-                location = self.geolocation_manager.get_location_from_ip()
-            if not location:
-                # Final fallback
-                location = self.geolocation_manager.get_location_from_ip()
+            with self.launch_metrics.span(STAGE_GEOIP, profile.profile_id):
+                location = self.geolocation_manager.get_location_from_ip(proxy=proxy)
+                if not location and proxy:
+                    # Fallback to current IP if proxy lookup failed
+                    location = self.geolocation_manager.get_location_from_ip()
+                if not location:
+                    # Final fallback
+                    location = self.geolocation_manager.get_location_from_ip()
             
             if location:
                 # Update Preferences file
-                preferences_path = os.path.join(profile.path, "Default", "Preferences")
-                if os.path.exists(preferences_path):
-                    self.geolocation_manager.apply_geolocation_to_preferences(
-                        preferences_path, location
+                if prefs is not None:
+                    synced = prefs.patch(
+                        lambda p: self.geolocation_manager.apply_geolocation_to_prefs(p, location)
                     )
+                else:
+                    preferences_path = os.path.join(profile.path, "Default", "Preferences")
+                    synced = os.path.exists(preferences_path) and \
+                        self.geolocation_manager.apply_geolocation_to_preferences(preferences_path, location)
+                if synced:
                     print(f"Synced geolocation: {location.city}, {location.country} ({location.latitude}, {location.longitude})")
                 return location
             else:
@@ -741,21 +1050,31 @@ class BrowserManager:
             print(f"Error applying stealth scripts: {e}")
             return False
 
-    def _fix_user_agent(self, profile: Profile) -> bool:
+    def _fix_user_agent(self, profile: Profile, prefs: PreferencesDocument = None) -> bool:
         """
         Fix User Agent in profile to match Orbita browser version.
         
         Args:
             profile: Profile to fix
+            prefs: Optional PreferencesDocument to patch instead of
+                   rewriting the file immediately
             
         Returns:
             True if successful
         """
         try:
-            result = self.fingerprint_generator.update_user_agent(
-                profile.path, 
-                self.orbita_version
-            )
+            if prefs is not None:
+                # Already repaired (e.g. by a bulk maintenance pass): nothing to write
+                if prefs.exists and self.fingerprint_generator.has_user_agent(prefs.load(), self.orbita_version):
+                    return True
+                result = prefs.patch(
+                    lambda p: self.fingerprint_generator.apply_user_agent(p, self.orbita_version)
+                )
+            else:
+                result = self.fingerprint_generator.update_user_agent(
+                    profile.path, 
+                    self.orbita_version
+                )
             if result:
                 print(f"Fixed User Agent to Chrome/{self.orbita_version}")
             return result
@@ -0,0 +1,254 @@
+# Multi-Profile Fingerprint Automation
+# Warm browser pool: keep launched profiles alive between automation jobs
+
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+
+@dataclass
+class PooledBrowser:
+    """A live pooled browser handed to a job."""
+    profile_id: str
+    # subprocess.Popen, or the WebDriver in Selenium mode
+    session: Any
+    use_selenium: bool = False
+    # CDP endpoint ("http://127.0.0.1:<port>") in subprocess mode
+    cdp_url: Optional[str] = None
+
+
+class BrowserPool:
+    """
+    Keeps launched browsers alive and idle so the next job for the same
+    profile starts on a live browser instead of a cold Orbita start.
+
+    A job acquires its profile's browser (launching it on a miss, waiting
+    for DevTools in subprocess mode) and releases it when done; released
+    browsers stay open as idle. When the browsers running in the launch
+    engine (all launchers) reach max_size
+    (the engine registry's ceiling by default), the least
+    recently used idle browser is closed to make room. Browsers in use are
+    never evicted.
+
+    Created through BrowserManager.enable_pool().
+    """
+
+    # Seconds to wait for a launched browser's DevTools endpoint
+    READY_TIMEOUT = 15.0
+
+    def __init__(self, browser_manager: Any, max_size: int = None):
+        """
+        Initialize BrowserPool.
+
+        Args:
+            browser_manager: BrowserManager owning the sessions
+            max_size: Concurrency ceiling (default: browser_manager.max_browsers)
+        """
+        self.browser_manager = browser_manager
+        self.max_size = max_size or browser_manager.max_browsers
+        # profile_id -> PooledBrowser, least recently used first
+        self._idle: "OrderedDict[str, PooledBrowser]" = OrderedDict()
+        self._busy: Dict[str, PooledBrowser] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Browsers picked for closing whose close_session hasn't returned yet
+        self._closing = 0
+        browser_manager.add_session_listener(self._on_session_ended)
+
+    # ==================== JOBS ====================
+
+    def acquire(self, profile_id: str, use_selenium: bool = False) -> Optional[PooledBrowser]:
+        """
+        Get a live browser for a job, launching it if it is not warm.
+
+        Args:
+            profile_id: Profile to run
+            use_selenium: Job needs a WebDriver instead of a CDP endpoint
+
+        Returns:
+            PooledBrowser, or None if the profile is already in use by
+            another job, no slot could be freed or the launch failed
+        """
+        with self._lock:
+            if profile_id in self._busy:
+                print(f"Profile {profile_id} is busy in another job")
+                return None
+            pooled = self._idle.pop(profile_id, None)
+            if pooled is not None:
+                if pooled.use_selenium == use_selenium and self.browser_manager.is_session_active(profile_id):
+                    self.hits += 1
+                    self._busy[profile_id] = pooled
+                    return pooled
+            self.misses += 1
+            # Warm in the other mode: closed and relaunched below
+            victims = []
+            if pooled is not None and self.browser_manager.is_session_active(profile_id):
+                victims.append(profile_id)
+                self._closing += 1
+            evicted = self._make_room()
+            if evicted is not None:
+                victims.extend(evicted)
+                # Reserve the profile while it launches outside the lock
+                self._busy[profile_id] = None
+
+        # close_session can block for seconds per browser; never under _lock
+        self._close_sessions(victims)
+        if evicted is None:
+            print(f"No free browser slot for {profile_id} ({self.max_size} in use)")
+            return None
+
+        pooled = self._launch(profile_id, use_selenium)
+        with self._lock:
+            if pooled is None:
+                self._busy.pop(profile_id, None)
+            else:
+                self._busy[profile_id] = pooled
+        return pooled
+
+    def release(self, profile_id: str):
+        """Return a job's browser to the pool; it stays open as the most recently used."""
+        with self._lock:
+            pooled = self._busy.pop(profile_id, None)
+            if pooled is not None and self.browser_manager.is_session_active(profile_id):
+                self._idle[profile_id] = pooled
+
+    @contextmanager
+    def job(self, profile_id: str, use_selenium: bool = False) -> Iterator[Optional[PooledBrowser]]:
+        """
+        Run a block on a pooled browser; yields None if none is available.
+
+        Example:
+            with pool.job(profile_id, use_selenium=True) as browser:
+                if browser:
+                    executor.execute_script(browser.session, script_id, params)
+        """
+        pooled = self.acquire(profile_id, use_selenium)
+        try:
+            yield pooled
+        finally:
+            if pooled is not None:
+                self.release(profile_id)
+
+    def prewarm(self, profile_ids: List[str], use_selenium: bool = False) -> List[str]:
+        """
+        Launch profiles ahead of their jobs and leave them idle.
+
+        Returns:
+            Profiles that are warm
+        """
+        warm = []
+        for profile_id in profile_ids:
+            if self.acquire(profile_id, use_selenium) is not None:
+                self.release(profile_id)
+                warm.append(profile_id)
+        return warm
+
+    # ==================== EVICTION ====================
+
+    def _make_room(self) -> Optional[List[str]]:
+        """
+        Pick the LRU idle browsers to close so a new session fits (caller
+        holds _lock). They are removed from the pool here and counted as
+        closing; the caller closes them with _close_sessions() after
+        releasing the lock.
+
+        Returns:
+            Profiles to close, or None if even closing every idle browser
+            would not make room (nothing is picked then)
+        """
+        # Profiles still launching hold a slot the engine may not count yet;
+        # browsers being closed still count until close_session returns;
+        # browsers of the other launchers count against the ceiling too
+        launching = sum(1 for pooled in self._busy.values() if pooled is None)
+        excess = self.browser_manager.engine.count() - self._closing + launching + 1 - self.max_size
+        if excess <= 0:
+            return []
+        if excess > len(self._idle):
+            return None
+        victims = [self._idle.popitem(last=False)[0] for _ in range(excess)]
+        self.evictions += excess
+        self._closing += excess
+        return victims
+
+    def _close_sessions(self, profile_ids: List[str]):
+        """Close browsers picked under the lock (call without holding _lock)."""
+        for profile_id in profile_ids:
+            try:
+                self.browser_manager.close_session(profile_id)
+            finally:
+                with self._lock:
+                    self._closing -= 1
+
+    def evict(self, profile_id: str) -> bool:
+        """Close an idle pooled browser."""
+        with self._lock:
+            if self._idle.pop(profile_id, None) is None:
+                return False
+        self.browser_manager.close_session(profile_id)
+        return True
+
+    def close_idle(self) -> int:
+        """Close every idle pooled browser."""
+        with self._lock:
+            profile_ids = list(self._idle)
+            self._idle.clear()
+        for profile_id in profile_ids:
+            self.browser_manager.close_session(profile_id)
+        return len(profile_ids)
+
+    def _launch(self, profile_id: str, use_selenium: bool) -> Optional[PooledBrowser]:
+        """Cold-start a profile and wait until it can take commands."""
+        manager = self.browser_manager
+        position = manager.calculate_window_position(manager.get_session_count())
+        session = manager.launch_profile(profile_id, window_position=position, use_selenium=use_selenium)
+        if session is None:
+            return None
+        driver = manager.get_driver(profile_id)
+        if use_selenium and driver is not None:
+            return PooledBrowser(profile_id, driver, use_selenium=True)
+        cdp_url = manager.wait_until_ready(profile_id, self.READY_TIMEOUT)
+        if cdp_url is None:
+            manager.close_session(profile_id)
+            return None
+        return PooledBrowser(profile_id, session, use_selenium=False, cdp_url=cdp_url)
+
+    def _on_session_ended(self, event: Any):
+        """BrowserManager listener: forget browsers that were closed or crashed."""
+        if event.reason == "unresponsive":
+            # Still running (maybe just busy); its job decides what to do
+            return
+        with self._lock:
+            self._idle.pop(event.profile_id, None)
+            if self._busy.get(event.profile_id) is not None:
+                del self._busy[event.profile_id]
+
+    # ==================== STATE ====================
+
+    def idle_profiles(self) -> List[str]:
+        """Idle pooled profiles, least recently used first."""
+        with self._lock:
+            return list(self._idle)
+
+    def busy_profiles(self) -> Set[str]:
+        """Profiles currently running a job."""
+        with self._lock:
+            return set(self._busy)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get pool counters."""
+        with self._lock:
+            return {
+                "idle": len(self._idle),
+                "busy": len(self._busy),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def __contains__(self, profile_id: str) -> bool:
+        with self._lock:
+            return profile_id in self._idle or profile_id in self._busy
@@ -4,45 +4,40 @@
 import os
 import subprocess
 import time
-import socket
-from typing import Optional, Tuple
-from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
-
-@dataclass
-class BrowserInstance:
-    """Running browser instance."""
-    process: subprocess.Popen
-    profile_id: str
-    debug_port: int
-    profile_path: str
+from app.core.launch_engine import BrowserInstance, CdpBackend, LaunchEngine, get_launch_engine
+from app.core.launch_metrics import LaunchMetrics, STAGE_READY
 
 
 class CDPBrowserLauncher:
     """
     Launch Orbita browser with CDP debugging enabled.
+    
+    Browsers are started and tracked by the launch engine shared with
+    BrowserManager and PlaywrightCDP, so they count against the same
+    concurrency ceiling and port range.
     """
     
     ORBITA_PATH = "trinhduyet/orbita-browser/chrome.exe"
     EXTENSIONS_DIR = "extensions"
     
-    def __init__(self, orbita_path: str = None, extensions_dir: str = None):
+    # Owner tag of this launcher's browsers in the engine registry
+    OWNER = "cdp_launcher"
+    
+    def __init__(self, orbita_path: str = None, extensions_dir: str = None, engine: LaunchEngine = None):
         self.orbita_path = orbita_path or self.ORBITA_PATH
         self.extensions_dir = extensions_dir or self.EXTENSIONS_DIR
-        self.instances: dict[str, BrowserInstance] = {}
-        self._next_port = 9222
+        self.engine = engine or get_launch_engine()
+        self.port_allocator = self.engine.port_allocator
+        self._backend = CdpBackend()
+        # Spawn-to-DevTools-ready latency (STAGE_READY)
+        self.launch_metrics = LaunchMetrics()
     
-    def _find_free_port(self, start_port: int = 9222) -> int:
-        """Find available port for debugging."""
-        port = start_port
-        while port < 65535:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('127.0.0.1', port))
-                    return port
-            except OSError:
-                port += 1
-        raise RuntimeError("No free port available")
+    @property
+    def instances(self) -> Dict[str, BrowserInstance]:
+        """Running browsers launched by this launcher."""
+        return self.engine.instances(self.OWNER)
     
     def _get_extension_paths(self) -> list[str]:
         """Get all extension paths including stealth."""
@@ -68,123 +63,68 @@ class CDPBrowserLauncher:
         Args:
             profile_id: Unique profile identifier
             profile_path: Path to profile directory
-            debug_port: CDP debug port (auto-assign if None)
+            debug_port: CDP debug port (auto-assign if None, chosen by the browser if 0)
             window_position: (x, y) window position
             headless: Run in headless mode
             
         Returns:
             BrowserInstance or None if failed
         """
-        # Check if already running
-        if profile_id in self.instances:
-            inst = self.instances[profile_id]
-            if inst.process.poll() is None:
-                print(f"Profile {profile_id} already running on port {inst.debug_port}")
-                return inst
-            else:
-                del self.instances[profile_id]
-        
-        # Find free port
-        if debug_port is None:
-            debug_port = self._find_free_port(self._next_port)
-            self._next_port = debug_port + 1
-        
-        # Build command
-        chrome_path = os.path.abspath(self.orbita_path)
-        profile_abs_path = os.path.abspath(profile_path)
-        
-        args = [
-            chrome_path,
-            f"--user-data-dir={profile_abs_path}",
-            f"--remote-debugging-port={debug_port}",
-            "--remote-allow-origins=*",
-        ]
-        
-        # Window position
-        if window_position:
-            x, y = window_position
-            args.append(f"--window-position={x},{y}")
-        
-        # Extensions
-        ext_paths = self._get_extension_paths()
-        if ext_paths:
-            args.append(f"--load-extension={','.join(ext_paths)}")
-        
-        # Anti-detection flags
-        args.extend([
-            "--no-first-run",
-            "--no-default-browser-check",
-            "--disable-blink-features=AutomationControlled",
-            "--disable-infobars",
-            "--force-dark-mode",
-        ])
-        
-        # Headless
-        if headless:
-            args.append("--headless=new")
+        # Check if already running (by any launcher)
+        inst = self.engine.get(profile_id)
+        if inst is not None:
+            print(f"Profile {profile_id} already running on port {inst.debug_port} ({inst.owner})")
+            return inst if inst.owner == self.OWNER else None
         
         try:
-            # Launch process
-            process = subprocess.Popen(
-                args,
+            instance = self.engine.spawn(
+                profile_id,
+                profile_path,
+                owner=self.OWNER,
+                orbita_path=self.orbita_path,
+                debug_port=debug_port,
+                window_position=window_position,
+                extension_paths=self._get_extension_paths(),
+                headless=headless,
+                backend=self._backend,
+                allow_remote_origins=True,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
             
             # Wait for CDP to be ready
-            if not self._wait_for_cdp(debug_port, timeout=15):
-                process.terminate()
-                print(f"CDP not ready on port {debug_port}")
+            if not self._wait_for_cdp(profile_id, timeout=15):
+                self.engine.close(profile_id, self.OWNER)
+                print(f"CDP not ready for {profile_id}")
                 return None
+            self.engine.attach(profile_id)
             
-            # Create instance
-            instance = BrowserInstance(
-                process=process,
-                profile_id=profile_id,
-                debug_port=debug_port,
-                profile_path=profile_abs_path
-            )
-            self.instances[profile_id] = instance
-            
-            print(f"Launched {profile_id} with CDP on port {debug_port}")
+            print(f"Launched {profile_id} with CDP on port {instance.debug_port}")
             return instance
             
         except Exception as e:
             print(f"Launch error: {e}")
             return None
     
-    def _wait_for_cdp(self, port: int, timeout: float = 15) -> bool:
-        """Wait for CDP endpoint to be ready."""
-        import urllib.request
+    def _wait_for_cdp(self, profile_id: str, timeout: float = 15) -> Optional[int]:
+        """
+        Wait until the browser writes DevToolsActivePort into its profile.
         
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                url = f"http://127.0.0.1:{port}/json/version"
-                with urllib.request.urlopen(url, timeout=1) as resp:
-                    if resp.status == 200:
-                        return True
-            except:
-                pass
-            time.sleep(0.5)
-        return False
+        Returns:
+            The DevTools port, or None on timeout / browser exit
+        """
+        instance = self.engine.wait_ready(profile_id, timeout)
+        if instance is None:
+            return None
+        self.launch_metrics.record(STAGE_READY, time.perf_counter() - instance.started_at, profile_id)
+        return instance.debug_port
     
     def close(self, profile_id: str) -> bool:
         """Close browser instance."""
         if profile_id not in self.instances:
             return False
         
-        instance = self.instances[profile_id]
-        try:
-            instance.process.terminate()
-            instance.process.wait(timeout=5)
-        except:
-            try:
-                instance.process.kill()
-            except:
-                pass
-        
-        del self.instances[profile_id]
+        self.engine.close(profile_id, self.OWNER)
         print(f"Closed {profile_id}")
         return True
     
@@ -202,6 +142,5 @@ class CDPBrowserLauncher:
     
     def is_running(self, profile_id: str) -> bool:
         """Check if profile is running."""
-        if profile_id not in self.instances:
-            return False
-        return self.instances[profile_id].process.poll() is None
+        instance = self.instances.get(profile_id)
+        return instance is not None and instance.process.poll() is None
@@ -0,0 +1,161 @@
+# Multi-Profile Fingerprint Automation
+# Background liveness probe of DevTools (CDP) endpoints
+
+import asyncio
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+
+class CdpHealthProbe:
+    """
+    Checks that browsers still answer on their remote debugging port.
+
+    One daemon thread runs an asyncio loop. Every `interval` seconds it
+    sends GET /json/version to all watched endpoints concurrently, each
+    with a `timeout`. An endpoint that fails `max_failures` probes in a
+    row is dropped and reported as on_dead(key) on the probe thread.
+    Nothing runs on the caller's thread besides registering endpoints.
+    """
+
+    # Seconds between probe rounds
+    INTERVAL = 3.0
+
+    # Seconds allowed for connect and for the response status line
+    TIMEOUT = 1.0
+
+    # Consecutive failed probes before an endpoint is reported dead
+    MAX_FAILURES = 2
+
+    def __init__(
+        self,
+        on_dead: Callable[[str], None],
+        interval: float = None,
+        timeout: float = None,
+        max_failures: int = None
+    ):
+        """
+        Initialize CdpHealthProbe.
+
+        Args:
+            on_dead: Called with the key of an endpoint that stopped answering
+            interval: Seconds between probe rounds
+            timeout: Seconds per connect / response
+            max_failures: Consecutive failures before on_dead
+        """
+        self.on_dead = on_dead
+        self.interval = interval or self.INTERVAL
+        self.timeout = timeout or self.TIMEOUT
+        self.max_failures = max_failures or self.MAX_FAILURES
+        # key -> (host, port)
+        self._endpoints: Dict[str, Tuple[str, int]] = {}
+        self._failures: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopped = False
+
+    def watch(self, key: str, host: str, port: int):
+        """
+        Start probing an endpoint; the probe thread starts on first use.
+
+        Args:
+            key: Identifier passed to on_dead (profile ID)
+            host: DevTools host
+            port: DevTools port
+        """
+        with self._lock:
+            self._endpoints[key] = (host, port)
+            self._failures[key] = 0
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="cdp-health-probe", daemon=True)
+                self._thread.start()
+
+    def unwatch(self, key: str):
+        """Stop probing an endpoint."""
+        with self._lock:
+            self._endpoints.pop(key, None)
+            self._failures.pop(key, None)
+
+    def stop(self):
+        """Stop the probe thread."""
+        with self._lock:
+            self._stopped = True
+            thread, loop, wakeup = self._thread, self._loop, self._wakeup
+        if loop is not None and wakeup is not None:
+            loop.call_soon_threadsafe(wakeup.set)
+        if thread is not None:
+            thread.join(timeout=self.timeout + 1)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._endpoints
+
+    # ==================== PROBE THREAD ====================
+
+    def _run(self):
+        """Probe thread: run probe rounds until stopped or nothing is watched."""
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._main(loop))
+        finally:
+            loop.close()
+
+    async def _main(self, loop: asyncio.AbstractEventLoop):
+        """Probe all endpoints every interval."""
+        with self._lock:
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        while True:
+            with self._lock:
+                endpoints = dict(self._endpoints)
+                if self._stopped or not endpoints:
+                    # Exit when idle; watch() starts a new thread
+                    self._thread = self._loop = self._wakeup = None
+                    return
+            keys = list(endpoints)
+            alive = await asyncio.gather(*(self.probe(*endpoints[key]) for key in keys))
+            dead = []
+            with self._lock:
+                for key, ok in zip(keys, alive):
+                    if key not in self._endpoints:
+                        continue
+                    self._failures[key] = 0 if ok else self._failures[key] + 1
+                    if self._failures[key] >= self.max_failures:
+                        del self._endpoints[key]
+                        del self._failures[key]
+                        dead.append(key)
+            for key in dead:
+                try:
+                    self.on_dead(key)
+                except Exception as e:
+                    print(f"Error handling dead endpoint {key}: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def probe(self, host: str, port: int) -> bool:
+        """
+        Send GET /json/version without blocking the loop.
+
+        Returns:
+            True if the endpoint answered 200
+        """
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), self.timeout)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        try:
+            writer.write(
+                f"GET /json/version HTTP/1.1\r\nHost: {host}:{port}\r\nConnection: close\r\n\r\n".encode()
+            )
+            await writer.drain()
+            status_line = await asyncio.wait_for(reader.readline(), self.timeout)
+            parts = status_line.split()
+            return len(parts) >= 2 and parts[1] == b"200"
+        except (OSError, asyncio.TimeoutError):
+            return False
+        finally:
+            writer.close()
@@ -0,0 +1,140 @@
+# Multi-Profile Fingerprint Automation
+# Browser readiness from the profile's DevToolsActivePort file
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import time
+from typing import Any, Optional, Tuple
+
+
+# Written by Chrome into the user data dir once remote debugging listens:
+# line 1 is the port, line 2 the browser WebSocket path
+DEVTOOLS_ACTIVE_PORT = "DevToolsActivePort"
+
+# Seconds between checks without inotify
+POLL_INTERVAL = 0.05
+
+# Seconds between browser process liveness checks while waiting on inotify
+PROCESS_CHECK_INTERVAL = 0.25
+
+# inotify event masks / flags (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+# inotify through libc (Linux only); elsewhere the file is polled
+try:
+    if not sys.platform.startswith("linux"):
+        raise OSError("inotify requires Linux")
+    _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+    _libc.inotify_init1.argtypes = [ctypes.c_int]
+    _libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    INOTIFY_AVAILABLE = True
+except (OSError, AttributeError):
+    INOTIFY_AVAILABLE = False
+
+
+def devtools_port_path(user_data_dir: str) -> str:
+    """Get the DevToolsActivePort path of a user data dir."""
+    return os.path.join(user_data_dir, DEVTOOLS_ACTIVE_PORT)
+
+
+def read_devtools_active_port(user_data_dir: str) -> Optional[Tuple[int, str]]:
+    """
+    Read the DevTools port Chrome wrote for a profile.
+
+    Args:
+        user_data_dir: Browser user data dir (profile path)
+
+    Returns:
+        (port, browser WebSocket path), or None if the file is missing or
+        not completely written yet
+    """
+    try:
+        with open(devtools_port_path(user_data_dir), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    if len(lines) < 2:
+        return None
+    try:
+        port = int(lines[0])
+    except ValueError:
+        return None
+    if not 0 < port < 65536 or not lines[1].startswith("/devtools/"):
+        return None
+    return port, lines[1]
+
+
+def clear_devtools_port(user_data_dir: str):
+    """Remove a DevToolsActivePort left by an earlier run, so only a fresh one is read."""
+    try:
+        os.remove(devtools_port_path(user_data_dir))
+    except OSError:
+        pass
+
+
+def _inotify_watch(directory: str) -> Optional[int]:
+    """Open an inotify descriptor watching a directory for written files."""
+    fd = _libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        return None
+    mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+    if _libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def wait_for_devtools_port(
+    user_data_dir: str,
+    timeout: float = 15.0,
+    process: Any = None
+) -> Optional[Tuple[int, str]]:
+    """
+    Block until Chrome reports its DevTools port for a profile.
+
+    On Linux the user data dir is watched with inotify, so this returns as
+    soon as the file is written; elsewhere the file is checked every
+    POLL_INTERVAL seconds. Works for --remote-debugging-port=0, where the
+    file is the only way to learn the port.
+
+    Args:
+        user_data_dir: Browser user data dir (profile path)
+        timeout: Seconds to wait
+        process: Browser process (anything with poll()); waiting stops
+                 early if it exits
+
+    Returns:
+        (port, browser WebSocket path), or None on timeout / browser exit
+    """
+    deadline = time.monotonic() + timeout
+    # Watch before the first read, so a write in between is not missed
+    fd = _inotify_watch(user_data_dir) if INOTIFY_AVAILABLE else None
+    try:
+        while True:
+            result = read_devtools_active_port(user_data_dir)
+            if result:
+                return result
+            if process is not None and process.poll() is not None:
+                return None
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            if fd is None:
+                time.sleep(min(remaining, POLL_INTERVAL))
+                continue
+            readable, _, _ = select.select([fd], [], [], min(remaining, PROCESS_CHECK_INTERVAL))
+            if readable:
+                try:
+                    os.read(fd, 4096)
+                except BlockingIOError:
+                    pass
+    finally:
+        if fd is not None:
+            os.close(fd)
@@ -0,0 +1,129 @@
+# Multi-Profile Fingerprint Automation
+# LRU cache of parsed GologinConfig objects
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from app.data.profile_models import GologinConfig, CompactGologinConfig
+
+
+# (Preferences mtime_ns, Preferences size) at the time it was parsed
+FileStamp = Tuple[int, int]
+
+
+def _deep_sizeof(obj, seen: set = None) -> int:
+    """Approximate memory footprint of an object graph in bytes."""
+    seen = seen if seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(_deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, "__dict__"):
+        size += _deep_sizeof(vars(obj), seen)
+    elif hasattr(type(obj), "__slots__"):
+        size += sum(_deep_sizeof(getattr(obj, name), seen) for name in type(obj).__slots__)
+    return size
+
+
+class FingerprintCache:
+    """
+    Parsed fingerprints keyed by profile ID.
+
+    Each entry remembers the (mtime, size) of the Preferences file it was
+    parsed from; a lookup with a different stamp is a miss, so edits made
+    by Chrome or other tools are picked up. Entries are evicted least
+    recently used first once their estimated size exceeds max_bytes.
+    Entries are held as CompactGologinConfig; callers get a fresh
+    GologinConfig, so mutating a result never changes the cache.
+    """
+
+    # Default memory budget
+    MAX_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, max_bytes: int = None):
+        """
+        Initialize FingerprintCache.
+
+        Args:
+            max_bytes: Memory budget for cached configs
+        """
+        self.max_bytes = max_bytes if max_bytes is not None else self.MAX_BYTES
+        self._entries: "OrderedDict[str, Tuple[FileStamp, CompactGologinConfig, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, profile_id: str, stamp: FileStamp) -> Optional[GologinConfig]:
+        """
+        Look up a fingerprint.
+
+        Args:
+            profile_id: The profile ID
+            stamp: Current (mtime_ns, size) of the Preferences file
+
+        Returns:
+            New GologinConfig built from the cache, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(profile_id)
+            if entry is None or entry[0] != stamp:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(profile_id)
+            self.hits += 1
+            compact = entry[1]
+        return compact.to_config()
+
+    def put(self, profile_id: str, stamp: FileStamp, config: GologinConfig):
+        """
+        Store a freshly parsed fingerprint.
+
+        Args:
+            profile_id: The profile ID
+            stamp: (mtime_ns, size) of the Preferences file it came from
+            config: Parsed GologinConfig
+        """
+        compact = CompactGologinConfig.from_config(config)
+        size = _deep_sizeof(compact)
+        with self._lock:
+            self._remove(profile_id)
+            if size > self.max_bytes:
+                return
+            self._entries[profile_id] = (stamp, compact, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, profile_id: str):
+        """Drop the cached fingerprint of a profile."""
+        with self._lock:
+            self._remove(profile_id)
+
+    def clear(self):
+        """Drop everything."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Estimated memory used by cached configs."""
+        with self._lock:
+            return self._bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _remove(self, profile_id: str):
+        """Remove an entry (caller holds _lock)."""
+        entry = self._entries.pop(profile_id, None)
+        if entry:
+            self._bytes -= entry[2]
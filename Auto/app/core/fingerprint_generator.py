@@ -5,13 +5,30 @@ import json
 import os
 import random
 import uuid
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence, Union
 
 from app.data.profile_models import (
     GologinConfig, AudioContextConfig, CanvasConfig, ClientRectsConfig,
     WebGLConfig, WebGLMetadataConfig, NavigatorConfig, TimezoneConfig,
     GeolocationConfig, WebRTCConfig, FontsConfig, MediaDevicesConfig, ProxyConfig
 )
+from app.data.preferences_document import (
+    write_json_atomic, write_gologin_sidecar, read_gologin_section
+)
+from app.core.fingerprint_cache import FingerprintCache
+
+# Optional NumPy for vectorized batch generation
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Columnar batch of fingerprints: column name -> array (or list) of length n.
+# Pool-backed columns ("gpu", "resolution", "timezone", "user_agent") hold
+# indexes into the matching FingerprintGenerator pool.
+FingerprintTable = Dict[str, Sequence]
 
 
 class FingerprintGenerator:
@@ -75,6 +92,7 @@ class FingerprintGenerator:
     # Hardware configurations
     HARDWARE_CONCURRENCY = [2, 4, 6, 8, 12, 16]
     DEVICE_MEMORY = [2, 4, 8, 16, 32]
+    DEVICE_PIXEL_RATIOS = [1.0, 1.25, 1.5, 2.0]
     
     # Timezones
     TIMEZONES = [
@@ -96,6 +114,10 @@ class FingerprintGenerator:
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129.0.0.0 Safari/537.36"
     ]
     
+    # Parsed gologin configs, shared by all generators so any
+    # write_preferences call invalidates what others have cached
+    config_cache = FingerprintCache()
+    
     def __init__(self):
         """Initialize the fingerprint generator."""
         pass
@@ -151,8 +173,158 @@ class FingerprintGenerator:
         timezone = random.choice(self.TIMEZONES)
         user_agent = random.choice(self.USER_AGENTS)
         
-        # Create config
-        config = GologinConfig(
+        return self._build_config(
+            audio_noise=audio_noise,
+            canvas_noise=canvas_noise,
+            client_rects_noise=client_rects_noise,
+            webgl_noise=webgl_noise,
+            gpu_config=gpu_config,
+            width=width,
+            height=height,
+            hardware_concurrency=hardware_concurrency,
+            device_memory=device_memory,
+            timezone=timezone,
+            user_agent=user_agent,
+            device_pixel_ratio=random.choice(self.DEVICE_PIXEL_RATIOS),
+            audio_inputs=random.randint(1, 3),
+            audio_outputs=random.randint(1, 2),
+            video_inputs=random.randint(0, 1),
+            uid=uuid.uuid4().hex
+        )
+    
+    def generate_fingerprints(
+        self,
+        n: int,
+        seed: int = None,
+        as_table: bool = False
+    ) -> Union[List[GologinConfig], FingerprintTable]:
+        """
+        Generate n random fingerprints with all values drawn in one pass
+        (vectorized with NumPy when available).
+        
+        Args:
+            n: Number of fingerprints
+            seed: Optional seed; the same seed gives the same fingerprints
+            as_table: Return the columnar FingerprintTable instead of configs
+            
+        Returns:
+            List of GologinConfig, or FingerprintTable if as_table
+        """
+        table = self._draw_fingerprint_table(n, seed)
+        return table if as_table else self.configs_from_table(table)
+    
+    def _draw_fingerprint_table(self, n: int, seed: int = None) -> FingerprintTable:
+        """Draw every random column for n fingerprints."""
+        audio = self.AUDIO_NOISE_RANGE
+        canvas = self.CANVAS_NOISE_RANGE
+        rects = self.CLIENT_RECTS_NOISE_RANGE
+        webgl = self.WEBGL_NOISE_RANGE
+        
+        if NUMPY_AVAILABLE:
+            rng = np.random.default_rng(seed)
+            
+            def pick(pool):
+                return np.asarray(pool)[rng.integers(0, len(pool), n)]
+            
+            return {
+                "audio_noise": rng.uniform(audio[0], audio[1], n),
+                "canvas_noise": rng.uniform(canvas[0], canvas[1], n),
+                "client_rects_noise": rng.integers(rects[0], rects[1], n, endpoint=True),
+                "webgl_noise": rng.uniform(webgl[0], webgl[1], n),
+                "gpu": rng.integers(0, len(self.GPU_CONFIGS), n, dtype=np.int8),
+                "resolution": rng.integers(0, len(self.SCREEN_RESOLUTIONS), n, dtype=np.int8),
+                "hardware_concurrency": pick(self.HARDWARE_CONCURRENCY),
+                "device_memory": pick(self.DEVICE_MEMORY),
+                "timezone": rng.integers(0, len(self.TIMEZONES), n, dtype=np.int8),
+                "user_agent": rng.integers(0, len(self.USER_AGENTS), n, dtype=np.int8),
+                "device_pixel_ratio": pick(self.DEVICE_PIXEL_RATIOS),
+                "audio_inputs": rng.integers(1, 3, n, endpoint=True, dtype=np.int8),
+                "audio_outputs": rng.integers(1, 2, n, endpoint=True, dtype=np.int8),
+                "video_inputs": rng.integers(0, 1, n, endpoint=True, dtype=np.int8),
+                "uid": np.frombuffer(rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16),
+            }
+        
+        rng = random.Random(seed)
+        
+        def index(pool):
+            return [rng.randrange(len(pool)) for _ in range(n)]
+        
+        return {
+            "audio_noise": [rng.uniform(*audio) for _ in range(n)],
+            "canvas_noise": [rng.uniform(*canvas) for _ in range(n)],
+            "client_rects_noise": [rng.randint(*rects) for _ in range(n)],
+            "webgl_noise": [rng.uniform(*webgl) for _ in range(n)],
+            "gpu": index(self.GPU_CONFIGS),
+            "resolution": index(self.SCREEN_RESOLUTIONS),
+            "hardware_concurrency": [rng.choice(self.HARDWARE_CONCURRENCY) for _ in range(n)],
+            "device_memory": [rng.choice(self.DEVICE_MEMORY) for _ in range(n)],
+            "timezone": index(self.TIMEZONES),
+            "user_agent": index(self.USER_AGENTS),
+            "device_pixel_ratio": [rng.choice(self.DEVICE_PIXEL_RATIOS) for _ in range(n)],
+            "audio_inputs": [rng.randint(1, 3) for _ in range(n)],
+            "audio_outputs": [rng.randint(1, 2) for _ in range(n)],
+            "video_inputs": [rng.randint(0, 1) for _ in range(n)],
+            "uid": [rng.getrandbits(128).to_bytes(16, "big") for _ in range(n)],
+        }
+    
+    def configs_from_table(self, table: FingerprintTable) -> List[GologinConfig]:
+        """
+        Build GologinConfig objects from a FingerprintTable.
+        
+        Args:
+            table: Table from generate_fingerprints(..., as_table=True)
+            
+        Returns:
+            List of GologinConfig, one per row
+        """
+        columns = {
+            name: (values.tolist() if hasattr(values, "tolist") else values)
+            for name, values in table.items()
+        }
+        configs = []
+        for i in range(len(columns["gpu"])):
+            width, height = self.SCREEN_RESOLUTIONS[columns["resolution"][i]]
+            configs.append(self._build_config(
+                audio_noise=columns["audio_noise"][i],
+                canvas_noise=columns["canvas_noise"][i],
+                client_rects_noise=columns["client_rects_noise"][i],
+                webgl_noise=columns["webgl_noise"][i],
+                gpu_config=self.GPU_CONFIGS[columns["gpu"][i]],
+                width=width,
+                height=height,
+                hardware_concurrency=columns["hardware_concurrency"][i],
+                device_memory=columns["device_memory"][i],
+                timezone=self.TIMEZONES[columns["timezone"][i]],
+                user_agent=self.USER_AGENTS[columns["user_agent"][i]],
+                device_pixel_ratio=columns["device_pixel_ratio"][i],
+                audio_inputs=columns["audio_inputs"][i],
+                audio_outputs=columns["audio_outputs"][i],
+                video_inputs=columns["video_inputs"][i],
+                uid=bytes(columns["uid"][i]).hex()
+            ))
+        return configs
+    
+    def _build_config(
+        self,
+        audio_noise: float,
+        canvas_noise: float,
+        client_rects_noise: int,
+        webgl_noise: float,
+        gpu_config: Dict[str, str],
+        width: int,
+        height: int,
+        hardware_concurrency: int,
+        device_memory: int,
+        timezone: str,
+        user_agent: str,
+        device_pixel_ratio: float,
+        audio_inputs: int,
+        audio_outputs: int,
+        video_inputs: int,
+        uid: str
+    ) -> GologinConfig:
+        """Assemble a GologinConfig from already drawn values."""
+        return GologinConfig(
             audioContext=AudioContextConfig(enable=True, noiseValue=audio_noise),
             canvas=CanvasConfig(mode="noise", noise=canvas_noise),
             canvasNoise=canvas_noise,
@@ -181,7 +353,7 @@ class FingerprintGenerator:
             userAgent=user_agent,
             hardwareConcurrency=hardware_concurrency,
             deviceMemory=device_memory,
-            devicePixelRatio=random.choice([1.0, 1.25, 1.5, 2.0]),
+            devicePixelRatio=device_pixel_ratio,
             screenWidth=width,
             screenHeight=height,
             timezone=TimezoneConfig(id=timezone),
@@ -193,10 +365,10 @@ class FingerprintGenerator:
             mediaDevices=MediaDevicesConfig(
                 enable=True,
                 enableMasking=True,
-                audioInputs=random.randint(1, 3),
-                audioOutputs=random.randint(1, 2),
-                videoInputs=random.randint(0, 1),
-                uid=uuid.uuid4().hex
+                audioInputs=audio_inputs,
+                audioOutputs=audio_outputs,
+                videoInputs=video_inputs,
+                uid=uid
             ),
             proxy=ProxyConfig(mode="none"),
             proxyEnabled=False,
@@ -213,8 +385,6 @@ class FingerprintGenerator:
             canBeRunning=True,
             lockEnabled=False
         )
-        
-        return config
     
     def randomize_noise_values(self, config: GologinConfig) -> GologinConfig:
         """
@@ -292,14 +462,52 @@ class FingerprintGenerator:
         # Ensure directory exists
         os.makedirs(os.path.dirname(prefs_path), exist_ok=True)
         
+        self.config_cache.invalidate(self._profile_id_of(profile_path))
         try:
-            with open(prefs_path, 'w', encoding='utf-8') as f:
-                json.dump(prefs, f, ensure_ascii=False)
+            write_json_atomic(prefs_path, prefs)
+            write_gologin_sidecar(prefs_path, prefs.get('gologin'))
             return True
         except IOError as e:
             print(f"Error writing preferences: {e}")
             return False
     
+    @staticmethod
+    def _profile_id_of(profile_path: str) -> str:
+        """Profile ID (directory name) of a profile path."""
+        return os.path.basename(os.path.normpath(profile_path))
+    
+    def load_gologin_config(self, profile_path: str) -> Optional[GologinConfig]:
+        """
+        Get the gologin config of a profile, parsing Preferences only when
+        it changed since the last call (see FingerprintCache). A cache miss
+        reads the small gologin sidecar instead of Preferences when the
+        sidecar is current (see read_gologin_section).
+        
+        Args:
+            profile_path: Path to profile directory
+            
+        Returns:
+            GologinConfig or None if missing
+        """
+        prefs_path = os.path.join(profile_path, "Default", "Preferences")
+        try:
+            st = os.stat(prefs_path)
+        except OSError:
+            return None
+        
+        profile_id = self._profile_id_of(profile_path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        config = self.config_cache.get(profile_id, stamp)
+        if config is not None:
+            return config
+        
+        found, section = read_gologin_section(prefs_path)
+        if not found or section is None:
+            return None
+        config = GologinConfig.from_dict(section)
+        self.config_cache.put(profile_id, stamp, config)
+        return config
+    
     def extract_gologin_config(self, prefs: Dict[str, Any]) -> Optional[GologinConfig]:
         """
         Extract gologin configuration from preferences dict.
@@ -384,8 +592,46 @@ class FingerprintGenerator:
         if not prefs:
             return False
         
-        # Build new User Agent
-        new_ua = f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{chrome_version}.0.0.0 Safari/537.36"
+        self.apply_user_agent(prefs, chrome_version)
+        return self.write_preferences(profile_path, prefs)
+    
+    @staticmethod
+    def user_agent_for(chrome_version: str) -> str:
+        """Windows Chrome User Agent for a major version."""
+        return f"Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/{chrome_version}.0.0.0 Safari/537.36"
+    
+    def has_user_agent(self, prefs: Dict[str, Any], chrome_version: str = "129") -> bool:
+        """
+        Check whether preferences already carry the User Agent for a Chrome version.
+        
+        Args:
+            prefs: Full preferences dict
+            chrome_version: Chrome version number (e.g., "129")
+            
+        Returns:
+            True if apply_user_agent would change nothing
+        """
+        gologin = prefs.get('gologin')
+        if not isinstance(gologin, dict):
+            return False
+        expected = self.user_agent_for(chrome_version)
+        navigator = gologin.get('navigator')
+        if not isinstance(navigator, dict) or navigator.get('userAgent') != expected:
+            return False
+        return gologin.get('userAgent', expected) == expected
+    
+    def apply_user_agent(self, prefs: Dict[str, Any], chrome_version: str = "129") -> Dict[str, Any]:
+        """
+        Set the User Agent for a Chrome version in a preferences dict.
+        
+        Args:
+            prefs: Full preferences dict (modified in place)
+            chrome_version: Chrome version number (e.g., "129")
+            
+        Returns:
+            Updated preferences dict
+        """
+        new_ua = self.user_agent_for(chrome_version)
         
         # Update in gologin section
         if 'gologin' not in prefs:
@@ -400,7 +646,7 @@ class FingerprintGenerator:
         if 'userAgent' in prefs['gologin']:
             prefs['gologin']['userAgent'] = new_ua
         
-        return self.write_preferences(profile_path, prefs)
+        return prefs
     
     def fix_user_agent_mismatch(self, profile_path: str, orbita_version: str = "129.0.6668.101") -> bool:
         """
@@ -0,0 +1,159 @@
+# Multi-Profile Fingerprint Automation
+# Index of fingerprint signatures for collision detection
+
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.data.profile_models import GologinConfig
+from app.core.fingerprint_generator import FingerprintGenerator
+
+
+class FingerprintIndex:
+    """
+    Maps fingerprint signatures to the profiles that have them.
+
+    A signature is the visible tuple a site can read (GPU renderer/vendor,
+    user agent, screen, hardware concurrency, device memory, timezone) plus
+    the noise values quantized into NOISE_BUCKETS buckets per range, so
+    near-identical noise also counts as a collision. Lookups are dict
+    operations; nothing re-reads Preferences once the index is built.
+    """
+
+    # Buckets per noise range (audio, canvas, WebGL); client rects noise is
+    # already a small integer and is used as is
+    NOISE_BUCKETS = 8
+
+    def __init__(self, noise_buckets: int = None):
+        """
+        Initialize FingerprintIndex.
+
+        Args:
+            noise_buckets: Buckets per noise range
+        """
+        self.noise_buckets = noise_buckets or self.NOISE_BUCKETS
+        self._profiles_by_signature: Dict[tuple, Set[str]] = {}
+        self._signature_by_profile: Dict[str, tuple] = {}
+        # Signatures shared by 2+ profiles
+        self._collisions: Set[tuple] = set()
+        self._lock = threading.RLock()
+
+    def _bucket(self, value: float, value_range: Tuple[float, float]) -> int:
+        """Quantize a noise value into one of noise_buckets buckets."""
+        low, high = value_range
+        if high <= low:
+            return 0
+        position = (value - low) / (high - low)
+        return min(max(int(position * self.noise_buckets), 0), self.noise_buckets - 1)
+
+    def signature(self, config: GologinConfig) -> tuple:
+        """
+        Get the collision signature of a fingerprint.
+
+        Args:
+            config: Fingerprint to sign
+
+        Returns:
+            Hashable signature tuple
+        """
+        nav = config.navigator
+        return (
+            config.webGLMetadata.renderer,
+            config.webGLMetadata.vendor,
+            nav.userAgent or config.userAgent,
+            config.screenWidth,
+            config.screenHeight,
+            nav.hardwareConcurrency,
+            nav.deviceMemory,
+            config.timezone.id,
+            self._bucket(config.audioContext.noiseValue, FingerprintGenerator.AUDIO_NOISE_RANGE),
+            self._bucket(config.canvas.noise, FingerprintGenerator.CANVAS_NOISE_RANGE),
+            self._bucket(config.webGL.noise, FingerprintGenerator.WEBGL_NOISE_RANGE),
+            config.clientRects.noise,
+        )
+
+    # ==================== UPDATES ====================
+
+    def add(self, profile_id: str, config: GologinConfig):
+        """
+        Index (or re-index) a profile's fingerprint.
+
+        Args:
+            profile_id: The profile ID
+            config: Its current fingerprint
+        """
+        signature = self.signature(config)
+        with self._lock:
+            self.remove(profile_id)
+            members = self._profiles_by_signature.setdefault(signature, set())
+            members.add(profile_id)
+            if len(members) > 1:
+                self._collisions.add(signature)
+            self._signature_by_profile[profile_id] = signature
+
+    def remove(self, profile_id: str):
+        """Drop a profile from the index."""
+        with self._lock:
+            signature = self._signature_by_profile.pop(profile_id, None)
+            if signature is None:
+                return
+            members = self._profiles_by_signature[signature]
+            members.discard(profile_id)
+            if len(members) < 2:
+                self._collisions.discard(signature)
+            if not members:
+                del self._profiles_by_signature[signature]
+
+    def rebuild(self, fingerprints: Iterable[Tuple[str, GologinConfig]]):
+        """
+        Replace the index contents.
+
+        Args:
+            fingerprints: (profile_id, config) pairs
+        """
+        with self._lock:
+            self._profiles_by_signature.clear()
+            self._signature_by_profile.clear()
+            self._collisions.clear()
+            for profile_id, config in fingerprints:
+                self.add(profile_id, config)
+
+    # ==================== QUERIES ====================
+
+    def profiles_with(self, config: GologinConfig) -> Set[str]:
+        """Get the profiles whose fingerprint has the same signature."""
+        with self._lock:
+            return set(self._profiles_by_signature.get(self.signature(config), ()))
+
+    def is_unique(self, config: GologinConfig, profile_id: Optional[str] = None) -> bool:
+        """
+        Check whether a fingerprint collides with any indexed profile.
+
+        Args:
+            config: Candidate fingerprint
+            profile_id: Profile the candidate belongs to (ignored in the check)
+
+        Returns:
+            True if no other profile has the same signature
+        """
+        return not (self.profiles_with(config) - {profile_id})
+
+    def collisions_of(self, profile_id: str) -> Set[str]:
+        """Get the other profiles sharing this profile's signature."""
+        with self._lock:
+            signature = self._signature_by_profile.get(profile_id)
+            if signature is None:
+                return set()
+            return self._profiles_by_signature[signature] - {profile_id}
+
+    def duplicate_groups(self) -> List[Set[str]]:
+        """Get every group of 2+ profiles sharing a signature."""
+        with self._lock:
+            return [set(self._profiles_by_signature[s]) for s in self._collisions]
+
+    def __contains__(self, profile_id: str) -> bool:
+        with self._lock:
+            return profile_id in self._signature_by_profile
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._signature_by_profile)
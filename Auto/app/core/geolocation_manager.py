@@ -218,33 +218,7 @@ class GeolocationManager:
             with open(preferences_path, 'r', encoding='utf-8') as f:
                 prefs = json.load(f)
             
-            # Update gologin section with geolocation
-            if "gologin" not in prefs:
-                prefs["gologin"] = {}
-            
-            prefs["gologin"]["geolocation"] = {
-                "mode": "allow",
-                "latitude": location.latitude,
-                "longitude": location.longitude,
-                "accuracy": location.accuracy
-            }
-            
-            # Also set timezone if available
-            if location.timezone:
-                prefs["gologin"]["timezone"] = {
-                    "id": location.timezone
-                }
-            
-            # Align WebRTC public IP with detected IP to avoid leaks
-            if "webRTC" not in prefs["gologin"]:
-                prefs["gologin"]["webRTC"] = {}
-            prefs["gologin"]["webRTC"].update({
-                "mode": "public",
-                "enabled": True,
-                "customize": True,
-                "fillBasedOnIp": True,
-                "publicIp": location.ip or ""
-            })
+            self.apply_geolocation_to_prefs(prefs, location)
             
             with open(preferences_path, 'w', encoding='utf-8') as f:
                 json.dump(prefs, f, indent=2)
@@ -254,3 +228,44 @@ class GeolocationManager:
         except Exception as e:
             print(f"Error updating preferences: {e}")
             return False
+    
+    def apply_geolocation_to_prefs(self, prefs: Dict, location: GeoLocation) -> Dict:
+        """
+        Apply geolocation, timezone and WebRTC IP to a preferences dict.
+        
+        Args:
+            prefs: Full preferences dict (modified in place)
+            location: GeoLocation to apply
+            
+        Returns:
+            Updated preferences dict
+        """
+        # Update gologin section with geolocation
+        if "gologin" not in prefs:
+            prefs["gologin"] = {}
+        
+        prefs["gologin"]["geolocation"] = {
+            "mode": "allow",
+            "latitude": location.latitude,
+            "longitude": location.longitude,
+            "accuracy": location.accuracy
+        }
+        
+        # Also set timezone if available
+        if location.timezone:
+            prefs["gologin"]["timezone"] = {
+                "id": location.timezone
+            }
+        
+        # Align WebRTC public IP with detected IP to avoid leaks
+        if "webRTC" not in prefs["gologin"]:
+            prefs["gologin"]["webRTC"] = {}
+        prefs["gologin"]["webRTC"].update({
+            "mode": "public",
+            "enabled": True,
+            "customize": True,
+            "fillBasedOnIp": True,
+            "publicIp": location.ip or ""
+        })
+        
+        return prefs
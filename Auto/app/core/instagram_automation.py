@@ -8,6 +8,7 @@ from typing import Optional, List
 from dataclasses import dataclass
 
 from app.core.playwright_cdp import PlaywrightCDP
+from app.core.playwright_service import get_playwright_service
 
 try:
     from playwright.async_api import Page
@@ -337,4 +338,8 @@ if __name__ == "__main__":
         
         print(f"\nResult: {'✅ Success' if success else '❌ Failed'}")
     
-    asyncio.run(main())
+    service = get_playwright_service()
+    try:
+        service.run(main())
+    finally:
+        service.stop()
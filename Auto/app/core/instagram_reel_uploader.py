@@ -9,6 +9,8 @@ import time
 from typing import Optional, List, Tuple, Callable
 from dataclasses import dataclass
 
+from app.core.playwright_service import CallbackRelay, get_playwright_service
+
 try:
     from playwright.async_api import async_playwright, Page, Browser, BrowserContext
     PLAYWRIGHT_AVAILABLE = True
@@ -36,6 +38,8 @@ class InstagramReelUploader:
         └── noidung.txt (format: filename | caption)
     
     Uses Playwright CDP to connect to existing browser for anti-detection.
+    Run on the Playwright service loop (run_instagram_upload_sync), all
+    uploaders share one Playwright driver.
     """
     
     INSTAGRAM_URL = "https://www.instagram.com"
@@ -43,6 +47,7 @@ class InstagramReelUploader:
     CDP_PORT_FILE = "data/cdp_ports.json"  # Store CDP ports for profiles
     
     def __init__(self):
+        # Private driver, only when not running on the Playwright service loop
         self.playwright = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
@@ -60,6 +65,18 @@ class InstagramReelUploader:
         if self.log_callback:
             self.log_callback(message)
     
+    async def _get_playwright(self):
+        """
+        Get a Playwright driver: the shared one on the Playwright service
+        loop, otherwise a private one (stopped in stop()), since Playwright
+        objects are bound to the loop that started their driver.
+        """
+        service = get_playwright_service()
+        if service.in_loop():
+            return await service.get_playwright()
+        self.playwright = await async_playwright().start()
+        return self.playwright
+    
     async def start_with_cdp(self, cdp_url: str) -> bool:
         """Connect to existing browser via CDP."""
         if not PLAYWRIGHT_AVAILABLE:
@@ -67,8 +84,8 @@ class InstagramReelUploader:
             return False
         
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.connect_over_cdp(cdp_url)
+            playwright = await self._get_playwright()
+            self.browser = await playwright.chromium.connect_over_cdp(cdp_url)
             
             # Get existing context or create new one
             contexts = self.browser.contexts
@@ -98,10 +115,10 @@ class InstagramReelUploader:
             return False
         
         try:
-            self.playwright = await async_playwright().start()
+            playwright = await self._get_playwright()
             
             # Launch browser with profile
-            self.browser = await self.playwright.chromium.launch_persistent_context(
+            self.browser = await playwright.chromium.launch_persistent_context(
                 user_data_dir=profile_path,
                 headless=False,
                 args=[
@@ -665,26 +682,25 @@ def run_instagram_upload_sync(
     """
     Synchronous wrapper for Instagram upload.
     Use this from non-async code (like PyQt).
-    """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
     
-    try:
-        return loop.run_until_complete(
-            run_instagram_upload_for_profile(
-                profile_id=profile_id,
-                profile_path=profile_path,
-                max_uploads=max_uploads,
-                random_order=random_order,
-                delay_min=delay_min,
-                delay_max=delay_max,
-                cdp_url=cdp_url,
-                log_callback=log_callback,
-                progress_callback=progress_callback
-            )
+    The upload runs on the shared Playwright service loop and driver;
+    log and progress callbacks still run on the calling thread.
+    """
+    relay = CallbackRelay()
+    future = get_playwright_service().submit(
+        run_instagram_upload_for_profile(
+            profile_id=profile_id,
+            profile_path=profile_path,
+            max_uploads=max_uploads,
+            random_order=random_order,
+            delay_min=delay_min,
+            delay_max=delay_max,
+            cdp_url=cdp_url,
+            log_callback=relay.wrap(log_callback),
+            progress_callback=relay.wrap(progress_callback)
         )
-    finally:
-        loop.close()
+    )
+    return relay.wait(future)
 
 
 # ==================== CLI ====================
@@ -711,4 +727,8 @@ if __name__ == "__main__":
         
         print(f"\nFinal Results: {results}")
     
-    asyncio.run(main())
+    service = get_playwright_service()
+    try:
+        service.run(main())
+    finally:
+        service.stop()
@@ -0,0 +1,607 @@
+# Multi-Profile Fingerprint Automation
+# Launch engine shared by every browser launcher in the process
+
+import os
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.cdp_health_probe import CdpHealthProbe
+from app.core.devtools_port import clear_devtools_port, wait_for_devtools_port
+from app.core.playwright_service import get_playwright_service
+from app.core.port_allocator import PortAllocator, get_port_allocator
+from app.core.process_reaper import ProcessReaper, SessionExitEvent
+
+
+# Anti-detection switches every launcher passes to Orbita
+ANTI_DETECTION_ARGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-infobars",
+    "--force-dark-mode",
+)
+
+
+# ==================== CONTROL BACKENDS ====================
+
+class ControlBackend:
+    """
+    How a launched browser is driven. The base backend drives nothing:
+    the browser is only started, tracked and stopped (manual use).
+    """
+
+    name = "none"
+
+    def attach(self, instance: "BrowserInstance") -> Any:
+        """Connect to a ready browser; returns the control handle."""
+        return None
+
+    def detach(self, instance: "BrowserInstance"):
+        """Disconnect before the browser is stopped."""
+        pass
+
+
+class CdpBackend(ControlBackend):
+    """Raw CDP: the handle is the DevTools HTTP endpoint."""
+
+    name = "cdp"
+
+    def attach(self, instance: "BrowserInstance") -> Any:
+        return instance.cdp_url
+
+
+class SeleniumBackend(ControlBackend):
+    """
+    Selenium WebDriver. attach() connects a chromedriver to a browser the
+    engine started (debuggerAddress); drivers that started their own
+    browser are registered with register_external() instead.
+    """
+
+    name = "selenium"
+
+    def __init__(self, chromedriver_path: str = None):
+        self.chromedriver_path = chromedriver_path
+
+    def attach(self, instance: "BrowserInstance") -> Any:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options as ChromeOptions
+        from selenium.webdriver.chrome.service import Service
+
+        options = ChromeOptions()
+        options.debugger_address = f"127.0.0.1:{instance.debug_port}"
+        if self.chromedriver_path and os.path.exists(self.chromedriver_path):
+            return webdriver.Chrome(service=Service(executable_path=self.chromedriver_path), options=options)
+        return webdriver.Chrome(options=options)
+
+    def detach(self, instance: "BrowserInstance"):
+        if instance.control is not None:
+            try:
+                instance.control.quit()
+            except Exception as e:
+                print(f"Error closing WebDriver of {instance.profile_id}: {e}")
+
+
+class PlaywrightBackend(ControlBackend):
+    """
+    Playwright over CDP. Playwright is asyncio based, so connecting is
+    attach_async(); the handle is the Playwright Browser. On the
+    Playwright service loop every browser attaches through the shared
+    driver; on any other loop a private driver is started once.
+    """
+
+    name = "playwright"
+
+    def __init__(self, playwright: Any = None):
+        # Private driver (async_playwright().start()) used off the service loop
+        self.playwright = playwright
+
+    async def attach_async(self, instance: "BrowserInstance") -> Any:
+        service = get_playwright_service()
+        if service.in_loop():
+            return await service.connect_over_cdp(instance.cdp_url)
+        if self.playwright is None:
+            from playwright.async_api import async_playwright
+            self.playwright = await async_playwright().start()
+        return await self.playwright.chromium.connect_over_cdp(instance.cdp_url)
+
+    async def detach_async(self, instance: "BrowserInstance"):
+        if instance.control is not None:
+            try:
+                await instance.control.close()
+            except Exception:
+                pass
+
+    async def stop(self):
+        """Stop the private Playwright driver (the shared one stays up)."""
+        if self.playwright is not None:
+            await self.playwright.stop()
+            self.playwright = None
+
+
+# ==================== REGISTRY ====================
+
+@dataclass
+class BrowserInstance:
+    """A browser known to the launch engine."""
+    profile_id: str
+    profile_path: str
+    # Browser process; None for browsers started by chromedriver
+    process: Optional[subprocess.Popen] = None
+    # DevTools port; 0 until the browser reports it (--remote-debugging-port=0)
+    debug_port: Optional[int] = None
+    # Component that launched it (e.g. "browser_manager", "cdp_launcher")
+    owner: str = ""
+    backend: ControlBackend = field(default_factory=ControlBackend)
+    # Backend handle (WebDriver, Playwright Browser, CDP URL)
+    control: Any = None
+    # Browser WebSocket path from DevToolsActivePort
+    ws_path: Optional[str] = None
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def cdp_url(self) -> Optional[str]:
+        """DevTools HTTP endpoint, once the port is known."""
+        return f"http://127.0.0.1:{self.debug_port}" if self.debug_port else None
+
+
+class BrowserRegistry:
+    """
+    Every browser running in the process, whoever launched it, with one
+    concurrency ceiling. A slot is reserved before the browser is
+    started, so concurrent launches cannot overshoot the limit.
+    """
+
+    def __init__(self, max_browsers: int):
+        """
+        Initialize BrowserRegistry.
+
+        Args:
+            max_browsers: Concurrency ceiling
+        """
+        self.max_browsers = max_browsers
+        # profile_id -> instance (None while the slot is reserved)
+        self._instances: Dict[str, Optional[BrowserInstance]] = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, profile_id: str):
+        """
+        Reserve a slot for a browser about to start.
+
+        Raises:
+            RuntimeError: If the profile is already running or the ceiling is reached
+        """
+        with self._lock:
+            if profile_id in self._instances:
+                raise RuntimeError(f"Profile {profile_id} is already running")
+            if len(self._instances) >= self.max_browsers:
+                raise RuntimeError(f"Browser limit reached ({self.max_browsers} running)")
+            self._instances[profile_id] = None
+
+    def register(self, instance: BrowserInstance):
+        """Fill a reserved slot."""
+        with self._lock:
+            self._instances[instance.profile_id] = instance
+
+    def unregister(self, profile_id: str, instance: BrowserInstance = None) -> Optional[BrowserInstance]:
+        """
+        Free a slot.
+
+        Args:
+            profile_id: Profile to remove
+            instance: Only remove if the slot still holds this instance
+
+        Returns:
+            The removed instance (None if absent or only reserved)
+        """
+        with self._lock:
+            if profile_id not in self._instances:
+                return None
+            if instance is not None and self._instances[profile_id] is not instance:
+                return None
+            return self._instances.pop(profile_id)
+
+    def get(self, profile_id: str) -> Optional[BrowserInstance]:
+        with self._lock:
+            return self._instances.get(profile_id)
+
+    def instances(self, owner: str = None) -> Dict[str, BrowserInstance]:
+        """Get running browsers, optionally only those of one owner."""
+        with self._lock:
+            return {
+                pid: inst for pid, inst in self._instances.items()
+                if inst is not None and (owner is None or inst.owner == owner)
+            }
+
+    def __contains__(self, profile_id: str) -> bool:
+        with self._lock:
+            return profile_id in self._instances
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._instances)
+
+
+# ==================== ENGINE ====================
+
+class LaunchEngine:
+    """
+    Starts, tracks and stops Orbita for BrowserManager, CDPBrowserLauncher
+    and PlaywrightCDP.
+
+    One engine per process (get_launch_engine) owns the instance registry
+    and its concurrency ceiling, leases CDP ports from the shared
+    PortAllocator, builds the command line, waits for readiness through
+    DevToolsActivePort and tracks health: process exits through a
+    ProcessReaper, browsers without a process of ours (chromedriver)
+    through a CdpHealthProbe. Ended browsers are removed from the registry,
+    their ports released, and exit listeners called with
+    (instance, SessionExitEvent).
+    """
+
+    ORBITA_PATH = "trinhduyet/orbita-browser/chrome.exe"
+
+    # Browsers running at once across all launchers
+    # (BrowserManager.MAX_CONCURRENT_PROFILES is taken from here)
+    MAX_BROWSERS = 10
+
+    # Seconds to wait for DevToolsActivePort
+    READY_TIMEOUT = 15.0
+
+    def __init__(self, port_allocator: PortAllocator = None, max_browsers: int = None):
+        """
+        Initialize LaunchEngine.
+
+        Args:
+            port_allocator: CDP port allocator (default: the process-wide one)
+            max_browsers: Concurrency ceiling across all launchers
+        """
+        self.port_allocator = port_allocator or get_port_allocator()
+        self.registry = BrowserRegistry(max_browsers or self.MAX_BROWSERS)
+        self.reaper = ProcessReaper()
+        self.health_probe = CdpHealthProbe(self._on_endpoint_dead)
+        self._exit_listeners: List[Callable[[BrowserInstance, SessionExitEvent], None]] = []
+
+    # ==================== LAUNCH ====================
+
+    def build_args(
+        self,
+        orbita_path: str,
+        profile_path: str,
+        debug_port: Optional[int] = None,
+        window_position: Tuple[int, int] = None,
+        extension_paths: List[str] = None,
+        extra_args: List[str] = None,
+        headless: bool = False,
+        allow_remote_origins: bool = False
+    ) -> List[str]:
+        """
+        Build the Orbita command line.
+
+        Args:
+            orbita_path: Browser executable
+            profile_path: User data dir
+            debug_port: Remote debugging port (None: no CDP, 0: browser picks)
+            window_position: (x, y) window position
+            extension_paths: Unpacked extensions to load
+            extra_args: Additional switches (appended last)
+            headless: Run headless
+            allow_remote_origins: Accept DevTools websocket connections from
+                                  any origin (--remote-allow-origins=*)
+
+        Returns:
+            argv list
+        """
+        args = [
+            os.path.abspath(orbita_path or self.ORBITA_PATH),
+            f"--user-data-dir={os.path.abspath(profile_path)}",
+        ]
+        if debug_port is not None:
+            args.append(f"--remote-debugging-port={debug_port}")
+            if allow_remote_origins:
+                args.append("--remote-allow-origins=*")
+        if window_position:
+            x, y = window_position
+            args.append(f"--window-position={x},{y}")
+        if extension_paths:
+            args.append(f"--load-extension={','.join(extension_paths)}")
+        args.extend(ANTI_DETECTION_ARGS)
+        if extra_args:
+            args.extend(arg for arg in extra_args if arg not in args)
+        if headless:
+            args.append("--headless=new")
+        return args
+
+    def spawn(
+        self,
+        profile_id: str,
+        profile_path: str,
+        owner: str,
+        orbita_path: str = None,
+        debug_port: Optional[int] = None,
+        enable_cdp: bool = True,
+        window_position: Tuple[int, int] = None,
+        extension_paths: List[str] = None,
+        extra_args: List[str] = None,
+        headless: bool = False,
+        backend: ControlBackend = None,
+        allow_remote_origins: bool = False,
+        **popen_kwargs
+    ) -> BrowserInstance:
+        """
+        Start a browser and register it.
+
+        Args:
+            profile_id: Profile to launch
+            profile_path: User data dir
+            owner: Launching component
+            orbita_path: Browser executable
+            debug_port: CDP port (None: leased for the profile, 0: browser picks)
+            enable_cdp: Enable remote debugging
+            window_position: (x, y) window position
+            extension_paths: Unpacked extensions to load
+            extra_args: Additional switches
+            headless: Run headless
+            backend: Control backend (default: none)
+            allow_remote_origins: Add --remote-allow-origins=* (see build_args)
+            **popen_kwargs: Passed to subprocess.Popen
+
+        Returns:
+            Registered BrowserInstance
+
+        Raises:
+            RuntimeError: If the profile already runs, the ceiling is reached
+                          or no port is free
+            OSError: If the browser cannot be started
+        """
+        self.registry.reserve(profile_id)
+        leased = None
+        try:
+            if enable_cdp and debug_port is None:
+                debug_port = leased = self.port_allocator.lease(profile_id)
+            if not enable_cdp:
+                debug_port = None
+            args = self.build_args(
+                orbita_path, profile_path, debug_port, window_position, extension_paths, extra_args, headless,
+                allow_remote_origins
+            )
+            if debug_port is not None:
+                # A stale DevToolsActivePort would read as ready
+                clear_devtools_port(os.path.abspath(profile_path))
+            process = subprocess.Popen(args, **popen_kwargs)
+        except BaseException:
+            self.registry.unregister(profile_id)
+            self.port_allocator.release(leased)
+            raise
+
+        instance = BrowserInstance(
+            profile_id=profile_id,
+            profile_path=os.path.abspath(profile_path),
+            process=process,
+            debug_port=debug_port,
+            owner=owner,
+            backend=backend or ControlBackend()
+        )
+        self.registry.register(instance)
+        self.reaper.watch(profile_id, process, self._on_process_exit)
+        return instance
+
+    def register_external(
+        self,
+        profile_id: str,
+        profile_path: str,
+        owner: str,
+        control: Any,
+        debug_address: str = None,
+        process: Any = None,
+        backend: ControlBackend = None
+    ) -> BrowserInstance:
+        """
+        Register a browser started outside the engine (by chromedriver), so
+        it counts against the ceiling and its health is tracked. These are
+        the only browsers the health probe watches; spawned ones are covered
+        by the reaper.
+
+        Args:
+            profile_id: Profile running
+            profile_path: User data dir
+            owner: Launching component
+            control: Backend handle (WebDriver)
+            debug_address: "host:port" of its DevTools endpoint, probed for health
+            process: Process whose exit ends the browser (chromedriver service)
+            backend: Control backend (default: SeleniumBackend)
+
+        Raises:
+            RuntimeError: If the profile already runs or the ceiling is reached
+        """
+        self.registry.reserve(profile_id)
+        host, port = None, None
+        if debug_address and ":" in debug_address:
+            host, port = debug_address.rsplit(":", 1)
+            port = int(port)
+        instance = BrowserInstance(
+            profile_id=profile_id,
+            profile_path=os.path.abspath(profile_path),
+            process=process,
+            debug_port=port,
+            owner=owner,
+            backend=backend or SeleniumBackend(),
+            control=control
+        )
+        self.registry.register(instance)
+        if port:
+            self.health_probe.watch(profile_id, host, port)
+        if process is not None and hasattr(process, "wait"):
+            self.reaper.watch(profile_id, process, self._on_process_exit)
+        return instance
+
+    def wait_ready(self, profile_id: str, timeout: float = None) -> Optional[BrowserInstance]:
+        """
+        Block until a spawned browser accepts DevTools connections
+        (DevToolsActivePort written); fills in debug_port and ws_path.
+
+        Returns:
+            The instance, or None on timeout, exit or unknown profile
+        """
+        instance = self.registry.get(profile_id)
+        if instance is None or instance.process is None:
+            return None
+        active = wait_for_devtools_port(instance.profile_path, timeout or self.READY_TIMEOUT, instance.process)
+        if not active:
+            return None
+        instance.debug_port, instance.ws_path = active
+        return instance
+
+    def attach(self, profile_id: str) -> Any:
+        """Connect the instance's backend; returns (and stores) the control handle."""
+        instance = self.registry.get(profile_id)
+        if instance is None:
+            return None
+        instance.control = instance.backend.attach(instance)
+        return instance.control
+
+    # ==================== STOP ====================
+
+    def forget(self, profile_id: str, owner: Optional[str]) -> Optional[BrowserInstance]:
+        """
+        Stop tracking a browser without stopping it or notifying listeners
+        (its launcher is about to close it). Frees the slot and the port.
+
+        Args:
+            profile_id: Profile to drop
+            owner: Only drop the browser if this launcher owns it (None: any owner)
+
+        Returns:
+            The instance that was registered (None if absent or owned by another launcher)
+        """
+        instance = self.registry.get(profile_id)
+        if instance is None or (owner is not None and instance.owner != owner):
+            return None
+        if self.registry.unregister(profile_id, instance) is None:
+            return None
+        self.reaper.unwatch(profile_id)
+        self.health_probe.unwatch(profile_id)
+        self._release_port(instance)
+        return instance
+
+    def close(self, profile_id: str, owner: Optional[str] = None) -> bool:
+        """
+        Detach the backend, stop the browser and free its slot and port.
+
+        Args:
+            profile_id: Profile to close
+            owner: Only close the browser if this launcher owns it (None: any owner)
+
+        Returns:
+            True if the profile was running (and owned by `owner`)
+        """
+        instance = self.forget(profile_id, owner)
+        if instance is None:
+            return False
+        instance.backend.detach(instance)
+        process = instance.process
+        if process is not None:
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+            except Exception:
+                try:
+                    process.kill()
+                except Exception:
+                    pass
+        exit_code = process.returncode if process is not None else None
+        self._notify_exit(instance, SessionExitEvent(profile_id, "closed", exit_code))
+        return True
+
+    def _release_port(self, instance: BrowserInstance):
+        """Give back a port leased for the instance (browser-picked ports were never leased)."""
+        port = instance.debug_port
+        if port and self.port_allocator.owner_of(port) == instance.profile_id:
+            self.port_allocator.release(port)
+
+    # ==================== HEALTH ====================
+
+    def _on_process_exit(self, profile_id: str, process: Any):
+        """Reaper callback: a browser (or its chromedriver) exited."""
+        instance = self.registry.get(profile_id)
+        if instance is None or instance.process is not process:
+            return
+        self._end(instance, "exited", getattr(process, "returncode", None))
+
+    def _on_endpoint_dead(self, profile_id: str):
+        """
+        Health probe callback: a browser stopped answering on its DevTools port.
+        Only reported - a busy browser (heavy page load) misses probes too, so
+        it stays registered until its process exits or its launcher closes it.
+        """
+        instance = self.registry.get(profile_id)
+        if instance is not None:
+            self._notify_exit(instance, SessionExitEvent(profile_id, "unresponsive"))
+
+    def _end(self, instance: BrowserInstance, reason: str, exit_code: int = None):
+        """Remove an ended browser and tell the listeners."""
+        if self.registry.unregister(instance.profile_id, instance) is None:
+            return
+        self.reaper.unwatch(instance.profile_id)
+        self.health_probe.unwatch(instance.profile_id)
+        self._release_port(instance)
+        self._notify_exit(instance, SessionExitEvent(instance.profile_id, reason, exit_code))
+
+    def add_exit_listener(self, callback: Callable[[BrowserInstance, SessionExitEvent], None]):
+        """
+        Register a callback run as callback(instance, event) whenever a
+        browser ends, or with reason "unresponsive" when a probed browser
+        stops answering (it is still registered then). May run on a reaper
+        or health probe thread.
+        """
+        self._exit_listeners.append(callback)
+
+    def remove_exit_listener(self, callback: Callable[[BrowserInstance, SessionExitEvent], None]):
+        """Unregister an exit listener."""
+        if callback in self._exit_listeners:
+            self._exit_listeners.remove(callback)
+
+    def _notify_exit(self, instance: BrowserInstance, event: SessionExitEvent):
+        """Call exit listeners."""
+        for callback in list(self._exit_listeners):
+            try:
+                callback(instance, event)
+            except Exception as e:
+                print(f"Error in exit listener: {e}")
+
+    # ==================== STATE ====================
+
+    def get(self, profile_id: str) -> Optional[BrowserInstance]:
+        """Get a running browser."""
+        return self.registry.get(profile_id)
+
+    def instances(self, owner: str = None) -> Dict[str, BrowserInstance]:
+        """Get running browsers, optionally only those of one owner."""
+        return self.registry.instances(owner)
+
+    def is_running(self, profile_id: str) -> bool:
+        """True if any launcher runs the profile."""
+        return profile_id in self.registry
+
+    def count(self) -> int:
+        """Browsers running (or starting) across all launchers."""
+        return len(self.registry)
+
+    def is_full(self) -> bool:
+        """True if no browser can be started until another one ends."""
+        return self.count() >= self.registry.max_browsers
+
+
+_shared_engine: Optional[LaunchEngine] = None
+_shared_lock = threading.Lock()
+
+
+def get_launch_engine() -> LaunchEngine:
+    """Get the engine shared by every launcher in this process."""
+    global _shared_engine
+    with _shared_lock:
+        if _shared_engine is None:
+            _shared_engine = LaunchEngine()
+        return _shared_engine
@@ -0,0 +1,175 @@
+# Multi-Profile Fingerprint Automation
+# Per-stage timing of the browser launch pipeline
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+
+
+# Launch stages in pipeline order (see BrowserManager.launch_profile)
+STAGE_LOOKUP = "lookup"
+STAGE_USER_AGENT = "user_agent"
+STAGE_GEOIP = "geoip"
+STAGE_PREFERENCES = "preferences_write"
+STAGE_PORT = "port"
+STAGE_SPAWN = "spawn"
+STAGE_STATUS = "status_write"
+STAGE_TOTAL = "total"
+
+LAUNCH_STAGES = (
+    STAGE_LOOKUP, STAGE_USER_AGENT, STAGE_GEOIP, STAGE_PREFERENCES,
+    STAGE_PORT, STAGE_SPAWN, STAGE_STATUS, STAGE_TOTAL
+)
+
+# Spawn until DevTools accepts connections; recorded by callers that wait
+# for readiness (see BrowserManager.wait_until_ready), after the pipeline
+STAGE_READY = "devtools_ready"
+
+
+class LaunchMetrics:
+    """
+    Timing spans for launch stages.
+
+    Each stage keeps its last max_samples durations, from which p50/p95
+    are computed on demand. With a trace_path, every span is also
+    appended to that file as one JSON line:
+    {"ts": ..., "profile_id": ..., "stage": ..., "ms": ..., "ok": ...}.
+    """
+
+    # Durations kept per stage
+    MAX_SAMPLES = 1000
+
+    def __init__(self, trace_path: str = None, max_samples: int = None):
+        """
+        Initialize LaunchMetrics.
+
+        Args:
+            trace_path: Optional JSON-lines trace file (appended to)
+            max_samples: Durations kept per stage for percentiles
+        """
+        self.trace_path = trace_path
+        self.max_samples = max_samples or self.MAX_SAMPLES
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._trace_file = None
+
+    @contextmanager
+    def span(self, stage: str, profile_id: str = None):
+        """
+        Time a block as one stage of a launch.
+
+        Args:
+            stage: Stage name (one of LAUNCH_STAGES)
+            profile_id: Profile being launched
+        """
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(stage, time.perf_counter() - start, profile_id, ok)
+
+    def record(self, stage: str, seconds: float, profile_id: str = None, ok: bool = True):
+        """
+        Record a stage duration.
+
+        Args:
+            stage: Stage name
+            seconds: Duration in seconds
+            profile_id: Profile being launched
+            ok: False if the stage raised
+        """
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.max_samples)
+            samples.append(seconds)
+            if self.trace_path:
+                self._write_trace({
+                    "ts": round(time.time(), 3),
+                    "profile_id": profile_id,
+                    "stage": stage,
+                    "ms": round(seconds * 1000, 3),
+                    "ok": ok
+                })
+
+    def _write_trace(self, event: Dict):
+        """Append one trace line (caller holds _lock)."""
+        try:
+            if self._trace_file is None:
+                self._trace_file = open(self.trace_path, "a", encoding="utf-8")
+            self._trace_file.write(json.dumps(event) + "\n")
+            self._trace_file.flush()
+        except OSError as e:
+            print(f"Error writing launch trace: {e}")
+            self.trace_path = None
+
+    # ==================== STATISTICS ====================
+
+    @staticmethod
+    def _percentile(sorted_values: List[float], q: float) -> float:
+        """Nearest-rank percentile of sorted values."""
+        rank = max(math.ceil(q / 100 * len(sorted_values)), 1)
+        return sorted_values[rank - 1]
+
+    def percentile(self, stage: str, q: float) -> Optional[float]:
+        """
+        Get a percentile of a stage's durations.
+
+        Args:
+            stage: Stage name
+            q: Percentile (0-100)
+
+        Returns:
+            Duration in seconds, or None if the stage has no samples
+        """
+        with self._lock:
+            values = sorted(self._samples.get(stage, ()))
+        return self._percentile(values, q) if values else None
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get count, p50, p95 and max (milliseconds) per stage.
+
+        Returns:
+            Dict of stage -> statistics, in pipeline order
+        """
+        with self._lock:
+            snapshot = {stage: sorted(values) for stage, values in self._samples.items() if values}
+        order = {stage: i for i, stage in enumerate(LAUNCH_STAGES + (STAGE_READY,))}
+        result = {}
+        for stage in sorted(snapshot, key=lambda s: order.get(s, len(order))):
+            values = snapshot[stage]
+            result[stage] = {
+                "count": len(values),
+                "p50": self._percentile(values, 50) * 1000,
+                "p95": self._percentile(values, 95) * 1000,
+                "max": values[-1] * 1000
+            }
+        return result
+
+    def format_summary(self) -> str:
+        """Summary as an aligned text table."""
+        lines = [f"{'stage':<18} {'count':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+        for stage, stats in self.summary().items():
+            lines.append(
+                f"{stage:<18} {stats['count']:>6} {stats['p50']:>9.1f} {stats['p95']:>9.1f} {stats['max']:>9.1f}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        """Drop all samples."""
+        with self._lock:
+            self._samples.clear()
+
+    def close(self):
+        """Close the trace file."""
+        with self._lock:
+            if self._trace_file is not None:
+                self._trace_file.close()
+                self._trace_file = None
@@ -0,0 +1,148 @@
+# Multi-Profile Fingerprint Automation
+# Concurrent launch scheduler: parallel pre-launch, rate-limited spawns
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List
+
+from app.core.browser_manager import BrowserManager, SELENIUM_AVAILABLE
+
+
+class LaunchScheduler:
+    """
+    Launches a batch of profiles with bounded parallelism.
+
+    The pre-launch stages (DB fetch, Preferences patching, GeoIP lookup,
+    port allocation; see BrowserManager.prepare_launch) run for up to
+    `workers` profiles at a time on a thread pool. Browsers are spawned
+    from the calling thread in the order preparations finish, at most one
+    per spawn_interval seconds, so a batch costs about one GeoIP lookup
+    plus n * spawn_interval instead of n * (GeoIP + startup + delay).
+    """
+
+    # Profiles prepared concurrently (also the most prepared but not yet spawned)
+    WORKERS = 8
+
+    # Minimum seconds between two browser spawns
+    SPAWN_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        browser_manager: BrowserManager,
+        workers: int = None,
+        spawn_interval: float = None
+    ):
+        """
+        Initialize LaunchScheduler.
+
+        Args:
+            browser_manager: BrowserManager doing the launches
+            workers: Pre-launch worker threads
+            spawn_interval: Minimum seconds between spawns
+        """
+        self.browser_manager = browser_manager
+        self.workers = workers or self.WORKERS
+        self.spawn_interval = spawn_interval if spawn_interval is not None else self.SPAWN_INTERVAL
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        """Stop spawning; preparations in flight are released. A stopped scheduler stays stopped."""
+        self._stop_event.set()
+
+    @property
+    def stopped(self) -> bool:
+        """True once stop() was called."""
+        return self._stop_event.is_set()
+
+    def run(
+        self,
+        profile_ids: List[str],
+        use_selenium: bool = False,
+        sync_geolocation: bool = True,
+        extensions: List[str] = None,
+        on_launched: Callable[[str, Any], None] = None,
+        wait_for_slot: Callable[[], bool] = None
+    ) -> Dict[str, Any]:
+        """
+        Launch profiles and block until all are spawned, failed or stopped.
+
+        Args:
+            profile_ids: Profiles to launch (duplicates ignored)
+            use_selenium: Launch with Selenium instead of subprocess
+            sync_geolocation: Sync GPS location with proxy IP
+            extensions: Optional list of extensions
+            on_launched: Called as on_launched(profile_id, result) after each
+                         spawn attempt; result is the process/driver or None
+            wait_for_slot: Called before each spawn; blocks until a session
+                           slot is free, returns False to stop the batch
+
+        Returns:
+            Dict of profile_id -> process/driver (None if failed); stopped
+            profiles are absent
+        """
+        browser_manager = self.browser_manager
+        enable_cdp = not (use_selenium and SELENIUM_AVAILABLE)
+        queue = list(dict.fromkeys(profile_ids))
+        queue.reverse()
+        results: Dict[str, Any] = {}
+        last_spawn = None
+
+        def report(profile_id: str, result: Any):
+            results[profile_id] = result
+            if on_launched:
+                on_launched(profile_id, result)
+
+        with ThreadPoolExecutor(max_workers=max(min(self.workers, len(queue)), 1)) as pool:
+            pending = {}
+
+            def refill():
+                while queue and len(pending) < self.workers and not self.stopped:
+                    profile_id = queue.pop()
+                    if browser_manager.is_session_active(profile_id):
+                        report(profile_id, browser_manager.active_processes.get(profile_id)
+                               or browser_manager.active_sessions.get(profile_id))
+                        continue
+                    future = pool.submit(browser_manager.prepare_launch, profile_id, sync_geolocation, enable_cdp)
+                    pending[future] = profile_id
+
+            refill()
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    profile_id = pending.pop(future)
+                    try:
+                        prepared = future.result()
+                    except Exception as e:
+                        print(f"Error preparing profile {profile_id}: {e}")
+                        prepared = None
+
+                    if prepared is None:
+                        if not self.stopped:
+                            report(profile_id, None)
+                        continue
+                    if self.stopped or (wait_for_slot and not wait_for_slot()):
+                        self.stop()
+                        browser_manager.release_prepared(prepared)
+                        continue
+
+                    if last_spawn is not None:
+                        remaining = self.spawn_interval - (time.monotonic() - last_spawn)
+                        if remaining > 0 and self._stop_event.wait(remaining):
+                            browser_manager.release_prepared(prepared)
+                            continue
+
+                    position = browser_manager.calculate_window_position(browser_manager.get_session_count())
+                    try:
+                        result = browser_manager.spawn_prepared(
+                            prepared, position, extensions, use_selenium, sync_geolocation
+                        )
+                    except Exception as e:
+                        print(f"Error launching profile {profile_id}: {e}")
+                        browser_manager.release_prepared(prepared)
+                        result = None
+                    last_spawn = time.monotonic()
+                    report(profile_id, result)
+                refill()
+
+        return results
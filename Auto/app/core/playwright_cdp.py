@@ -4,10 +4,11 @@
 import os
 import asyncio
 import subprocess
-import socket
 import time
-from typing import Optional, List, Dict, Any
-from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.core.launch_engine import BrowserInstance, LaunchEngine, PlaywrightBackend, get_launch_engine
+from app.core.launch_metrics import LaunchMetrics, STAGE_READY
 
 try:
     from playwright.async_api import async_playwright, Browser, BrowserContext, Page
@@ -17,18 +18,6 @@ except ImportError:
     print("Playwright not installed. Run: pip install playwright")
 
 
-@dataclass
-class BrowserInstance:
-    """Running browser instance."""
-    process: subprocess.Popen
-    profile_id: str
-    debug_port: int
-    profile_path: str
-    browser: Optional[Any] = None
-    context: Optional[Any] = None
-    page: Optional[Any] = None
-
-
 class PlaywrightCDP:
     """
     Control Orbita browser via Playwright CDP connection.
@@ -38,29 +27,35 @@ class PlaywrightCDP:
     - No WebDriver detection
     - Playwright's powerful API
     - Auto-wait, better selectors
+    
+    Browsers are started and tracked by the launch engine shared with
+    BrowserManager and CDPBrowserLauncher; the Playwright Browser is the
+    instance's control handle. Run on the Playwright service loop, every
+    browser attaches through the one shared driver.
     """
     
     ORBITA_PATH = "trinhduyet/orbita-browser/chrome.exe"
     EXTENSIONS_DIR = "extensions"
     
-    def __init__(self, orbita_path: str = None, extensions_dir: str = None):
+    # Owner tag of this controller's browsers in the engine registry
+    OWNER = "playwright_cdp"
+    
+    def __init__(self, orbita_path: str = None, extensions_dir: str = None, engine: LaunchEngine = None):
         self.orbita_path = orbita_path or self.ORBITA_PATH
         self.extensions_dir = extensions_dir or self.EXTENSIONS_DIR
-        self.instances: Dict[str, BrowserInstance] = {}
-        self._playwright = None
-        self._next_port = 9222
+        self.engine = engine or get_launch_engine()
+        self.port_allocator = self.engine.port_allocator
+        # Attaches through the shared Playwright driver (see PlaywrightBackend)
+        self._backend = PlaywrightBackend()
+        # profile_id -> (context, page) in use
+        self._pages: Dict[str, Tuple[Any, Any]] = {}
+        # Spawn-to-DevTools-ready latency (STAGE_READY)
+        self.launch_metrics = LaunchMetrics()
     
-    def _find_free_port(self, start_port: int = 9222) -> int:
-        """Find available port."""
-        port = start_port
-        while port < 65535:
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.bind(('127.0.0.1', port))
-                    return port
-            except OSError:
-                port += 1
-        raise RuntimeError("No free port")
+    @property
+    def instances(self) -> Dict[str, BrowserInstance]:
+        """Running browsers launched by this controller."""
+        return self.engine.instances(self.OWNER)
     
     def _get_extension_paths(self) -> List[str]:
         """Get extension paths including stealth."""
@@ -72,20 +67,18 @@ class PlaywrightCDP:
                     paths.append(os.path.abspath(ext_path))
         return paths
     
-    def _wait_for_cdp(self, port: int, timeout: float = 15) -> bool:
-        """Wait for CDP to be ready."""
-        import urllib.request
-        start = time.time()
-        while time.time() - start < timeout:
-            try:
-                url = f"http://127.0.0.1:{port}/json/version"
-                with urllib.request.urlopen(url, timeout=1) as resp:
-                    if resp.status == 200:
-                        return True
-            except:
-                pass
-            time.sleep(0.5)
-        return False
+    def _wait_for_cdp(self, profile_id: str, timeout: float = 15) -> Optional[int]:
+        """
+        Wait until the browser writes DevToolsActivePort into its profile.
+        
+        Returns:
+            The DevTools port, or None on timeout / browser exit
+        """
+        instance = self.engine.wait_ready(profile_id, timeout)
+        if instance is None:
+            return None
+        self.launch_metrics.record(STAGE_READY, time.perf_counter() - instance.started_at, profile_id)
+        return instance.debug_port
     
     async def launch(
         self,
@@ -100,7 +93,7 @@ class PlaywrightCDP:
         Args:
             profile_id: Unique identifier
             profile_path: Browser profile path
-            debug_port: CDP port (auto if None)
+            debug_port: CDP port (auto if None, chosen by the browser if 0)
             headless: Headless mode
             
         Returns:
@@ -113,61 +106,42 @@ class PlaywrightCDP:
         # Check if already running
         if profile_id in self.instances:
             inst = self.instances[profile_id]
-            if inst.process.poll() is None and inst.page:
-                return inst.page
+            if inst.process.poll() is None and self.get_page(profile_id):
+                return self.get_page(profile_id)
             else:
                 await self.close(profile_id)
-        
-        # Find port
-        if debug_port is None:
-            debug_port = self._find_free_port(self._next_port)
-            self._next_port = debug_port + 1
-        
-        # Build command
-        chrome_path = os.path.abspath(self.orbita_path)
-        profile_abs = os.path.abspath(profile_path)
-        
-        args = [
-            chrome_path,
-            f"--user-data-dir={profile_abs}",
-            f"--remote-debugging-port={debug_port}",
-            "--remote-allow-origins=*",
-            "--no-first-run",
-            "--no-default-browser-check",
-            "--disable-blink-features=AutomationControlled",
-            "--disable-infobars",
-            "--force-dark-mode",
-        ]
-        
-        # Extensions
-        ext_paths = self._get_extension_paths()
-        if ext_paths:
-            args.append(f"--load-extension={','.join(ext_paths)}")
-        
-        if headless:
-            args.append("--headless=new")
+        elif self.engine.is_running(profile_id):
+            print(f"Profile {profile_id} is already running in another launcher")
+            return None
         
         try:
             # Launch browser process
-            process = subprocess.Popen(
-                args,
+            self.engine.spawn(
+                profile_id,
+                profile_path,
+                owner=self.OWNER,
+                orbita_path=self.orbita_path,
+                debug_port=debug_port,
+                extension_paths=self._get_extension_paths(),
+                headless=headless,
+                backend=self._backend,
+                allow_remote_origins=True,
                 stdout=subprocess.DEVNULL,
                 stderr=subprocess.DEVNULL
             )
             
-            # Wait for CDP
-            if not self._wait_for_cdp(debug_port, timeout=15):
-                process.terminate()
-                print(f"CDP not ready on port {debug_port}")
+            # Wait for CDP (off the event loop)
+            loop = asyncio.get_running_loop()
+            ready_port = await loop.run_in_executor(None, self._wait_for_cdp, profile_id, 15)
+            if not ready_port:
+                self.engine.close(profile_id, self.OWNER)
+                print(f"CDP not ready for {profile_id}")
                 return None
             
             # Connect Playwright
-            if not self._playwright:
-                self._playwright = await async_playwright().start()
-            
-            browser = await self._playwright.chromium.connect_over_cdp(
-                f"http://127.0.0.1:{debug_port}"
-            )
+            instance = self.engine.get(profile_id)
+            browser = await self._backend.attach_async(instance)
+            instance.control = browser
             
             # Get existing context and page
             contexts = browser.contexts
@@ -178,49 +152,26 @@ class PlaywrightCDP:
             else:
                 context = await browser.new_context()
                 page = await context.new_page()
+            self._pages[profile_id] = (context, page)
             
-            # Store instance
-            instance = BrowserInstance(
-                process=process,
-                profile_id=profile_id,
-                debug_port=debug_port,
-                profile_path=profile_abs,
-                browser=browser,
-                context=context,
-                page=page
-            )
-            self.instances[profile_id] = instance
-            
-            print(f"Launched {profile_id} with Playwright CDP on port {debug_port}")
+            print(f"Launched {profile_id} with Playwright CDP on port {ready_port}")
             return page
             
         except Exception as e:
             print(f"Launch error: {e}")
+            if profile_id in self.instances:
+                self.engine.close(profile_id, self.OWNER)
             return None
     
     async def close(self, profile_id: str) -> bool:
         """Close browser instance."""
-        if profile_id not in self.instances:
+        self._pages.pop(profile_id, None)
+        inst = self.instances.get(profile_id)
+        if inst is None:
             return False
         
-        inst = self.instances[profile_id]
-        
-        try:
-            if inst.browser:
-                await inst.browser.close()
-        except:
-            pass
-        
-        try:
-            inst.process.terminate()
-            inst.process.wait(timeout=5)
-        except:
-            try:
-                inst.process.kill()
-            except:
-                pass
-        
-        del self.instances[profile_id]
+        await self._backend.detach_async(inst)
+        self.engine.close(profile_id, self.OWNER)
         return True
     
     async def close_all(self) -> int:
@@ -230,19 +181,18 @@ class PlaywrightCDP:
             if await self.close(pid):
                 count += 1
         
-        if self._playwright:
-            await self._playwright.stop()
-            self._playwright = None
+        await self._backend.stop()
         
         return count
     
     def get_page(self, profile_id: str) -> Optional[Page]:
         """Get page for profile."""
-        inst = self.instances.get(profile_id)
-        return inst.page if inst else None
+        if profile_id not in self.instances:
+            return None
+        context_page = self._pages.get(profile_id)
+        return context_page[1] if context_page else None
     
     def is_running(self, profile_id: str) -> bool:
         """Check if profile is running."""
-        if profile_id not in self.instances:
-            return False
-        return self.instances[profile_id].process.poll() is None
+        inst = self.instances.get(profile_id)
+        return inst is not None and inst.process.poll() is None
@@ -0,0 +1,220 @@
+# Multi-Profile Fingerprint Automation
+# Process-wide Playwright driver and event loop shared by all profiles
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Optional
+
+
+async def _start_playwright() -> Any:
+    """Start a Playwright driver (one Node process)."""
+    from playwright.async_api import async_playwright
+    return await async_playwright().start()
+
+
+class PlaywrightService:
+    """
+    One Playwright driver and one asyncio loop thread for the process.
+
+    Every async_playwright().start() boots its own Node driver, and
+    Playwright objects only work on the loop that created them. The
+    service owns a daemon thread running a single event loop; work is
+    submitted to it (submit / run) and, on that loop, every profile
+    attaches to its browser through the same driver (connect_over_cdp).
+    Twenty profiles cost one Node process, and the driver is booted once.
+
+    The loop thread and the driver start on first use.
+    """
+
+    def __init__(self, start_driver: Callable[[], Awaitable[Any]] = None):
+        """
+        Initialize PlaywrightService.
+
+        Args:
+            start_driver: Coroutine function starting the driver
+                          (default: async_playwright().start())
+        """
+        self._start_driver = start_driver or _start_playwright
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Driver start in progress / done (only touched on the loop)
+        self._driver_task: Optional[asyncio.Task] = None
+        self.driver_starts = 0
+
+    # ==================== LOOP ====================
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the loop thread if it is not running."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._run_loop, args=(loop,), name="playwright-service", daemon=True
+                )
+                self._loop = loop
+                self._thread.start()
+            return self._loop
+
+    def _run_loop(self, loop: asyncio.AbstractEventLoop):
+        """Loop thread: run the service loop until stop()."""
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def in_loop(self) -> bool:
+        """True if called from a coroutine running on the service loop."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return running is self._loop
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Schedule a coroutine on the service loop; returns its future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+
+    def run(self, coro: Coroutine, timeout: float = None) -> Any:
+        """
+        Run a coroutine on the service loop and block until it finishes.
+        Coroutines run by several threads at once share the loop.
+
+        Raises:
+            RuntimeError: If called from the service loop itself
+        """
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError("PlaywrightService.run() called from the service loop; await instead")
+        return self.submit(coro).result(timeout)
+
+    # ==================== DRIVER ====================
+
+    async def get_playwright(self) -> Any:
+        """
+        Get the shared driver, starting it on first use. Concurrent first
+        calls wait for the same start.
+
+        Raises:
+            RuntimeError: If not awaited on the service loop
+        """
+        if not self.in_loop():
+            raise RuntimeError("The shared Playwright driver is only usable on the service loop")
+        if self._driver_task is None:
+            self._driver_task = asyncio.ensure_future(self._start_driver())
+            self.driver_starts += 1
+        task = self._driver_task
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # Failed start: the next call retries (the first waiter to get here resets it)
+            if task.done() and self._driver_task is task:
+                self._driver_task = None
+            raise
+
+    async def connect_over_cdp(self, cdp_url: str) -> Any:
+        """Attach to a running browser through the shared driver; returns the Playwright Browser."""
+        playwright = await self.get_playwright()
+        return await playwright.chromium.connect_over_cdp(cdp_url)
+
+    async def _stop_driver(self):
+        """Stop the driver, if it was started."""
+        task, self._driver_task = self._driver_task, None
+        if task is None:
+            return
+        try:
+            playwright = await task
+        except Exception:
+            return
+        await playwright.stop()
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the driver and the loop thread; the next use starts them again."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._stop_driver(), loop).result(timeout)
+        except Exception as e:
+            print(f"Error stopping Playwright driver: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        """True if the loop thread is running."""
+        with self._lock:
+            return self._loop is not None
+
+
+class CallbackRelay:
+    """
+    Runs callbacks of a coroutine on the thread waiting for it.
+
+    Work on the service loop reports progress through plain callbacks
+    (log lines, progress counters) that often touch the UI; wrap() queues
+    their calls and wait() runs them on the caller's thread until the
+    coroutine finishes.
+
+    Example:
+        relay = CallbackRelay()
+        future = service.submit(job(log_callback=relay.wrap(self.log)))
+        result = relay.wait(future)
+    """
+
+    # Seconds between checks of the future while no callback is queued
+    POLL_INTERVAL = 0.05
+
+    def __init__(self):
+        """Initialize CallbackRelay."""
+        self._calls: "queue.Queue" = queue.Queue()
+
+    def wrap(self, callback: Optional[Callable[..., None]]) -> Optional[Callable[..., None]]:
+        """Get a stand-in that queues calls to callback (None stays None)."""
+        if callback is None:
+            return None
+
+        def relayed(*args):
+            self._calls.put((callback, args))
+        return relayed
+
+    def _drain(self, block: bool):
+        """Run queued calls."""
+        try:
+            callback, args = self._calls.get(block, self.POLL_INTERVAL)
+        except queue.Empty:
+            return
+        while True:
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in relayed callback: {e}")
+            try:
+                callback, args = self._calls.get_nowait()
+            except queue.Empty:
+                return
+
+    def wait(self, future: concurrent.futures.Future) -> Any:
+        """Run queued callbacks until the future is done; returns its result."""
+        while not future.done():
+            self._drain(block=True)
+        self._drain(block=False)
+        return future.result()
+
+
+_shared_service: Optional[PlaywrightService] = None
+_shared_lock = threading.Lock()
+
+
+def get_playwright_service() -> PlaywrightService:
+    """Get the Playwright service shared by every profile in this process."""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = PlaywrightService()
+        return _shared_service
@@ -0,0 +1,137 @@
+# Multi-Profile Fingerprint Automation
+# Process-wide allocator of remote debugging (CDP) ports
+
+import socket
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+
+class PortAllocator:
+    """
+    Leases ports from a fixed range to browser sessions.
+
+    Free ports are kept in a FIFO free-list, so a lease is a popleft and a
+    release an append, and a just-released port (possibly still in
+    TIME_WAIT) is the last to be handed out again. Only the port about to
+    be leased is bind-tested; a port some other program holds is moved to
+    the back of the list and the next one is tried.
+
+    All launchers in the process share one allocator (get_port_allocator),
+    so no two of them can hand out the same port.
+    """
+
+    # Default range (end exclusive): room for 500 concurrent browsers
+    PORT_START = 9222
+    PORT_END = 9722
+
+    def __init__(self, start: int = None, end: int = None, host: str = "127.0.0.1"):
+        """
+        Initialize PortAllocator.
+
+        Args:
+            start: First port of the range
+            end: End of the range (exclusive)
+            host: Interface the bind test uses
+        """
+        self.host = host
+        self._lock = threading.Lock()
+        # port -> owner (profile ID)
+        self._leases: Dict[int, Optional[str]] = {}
+        self._free: Deque[int] = deque()
+        self.configure(start or self.PORT_START, end or self.PORT_END)
+
+    def configure(self, start: int, end: int):
+        """
+        Change the port range. Current leases stay valid until released;
+        leased ports outside the new range are not reused.
+
+        Args:
+            start: First port of the range
+            end: End of the range (exclusive)
+        """
+        if not 0 < start < end <= 65536:
+            raise ValueError(f"Invalid port range {start}-{end}")
+        with self._lock:
+            self.start, self.end = start, end
+            self._free = deque(port for port in range(start, end) if port not in self._leases)
+
+    def _bindable(self, port: int) -> bool:
+        """True if nothing else listens on the port."""
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.bind((self.host, port))
+            return True
+        except OSError:
+            return False
+
+    def lease(self, owner: str = None) -> int:
+        """
+        Lease a free port.
+
+        Args:
+            owner: Session the port belongs to (profile ID)
+
+        Returns:
+            Port number
+
+        Raises:
+            RuntimeError: If every port in the range is leased or in use
+        """
+        with self._lock:
+            for _ in range(len(self._free)):
+                port = self._free.popleft()
+                if self._bindable(port):
+                    self._leases[port] = owner
+                    return port
+                # Held by another program: retry it last
+                self._free.append(port)
+        raise RuntimeError(f"No free CDP ports available in {self.start}-{self.end - 1}")
+
+    def release(self, port: Optional[int]):
+        """Return a leased port to the free-list (no-op if not leased)."""
+        if port is None:
+            return
+        with self._lock:
+            if port not in self._leases:
+                return
+            del self._leases[port]
+            if self.start <= port < self.end:
+                self._free.append(port)
+
+    def owner_of(self, port: int) -> Optional[str]:
+        """Get the owner of a leased port."""
+        with self._lock:
+            return self._leases.get(port)
+
+    def leases(self) -> Dict[int, Optional[str]]:
+        """Get leased ports and their owners."""
+        with self._lock:
+            return dict(self._leases)
+
+    @property
+    def available(self) -> int:
+        """Ports not leased (some may still be held by other programs)."""
+        with self._lock:
+            return len(self._free)
+
+    def __contains__(self, port: int) -> bool:
+        with self._lock:
+            return port in self._leases
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._leases)
+
+
+_shared_allocator: Optional[PortAllocator] = None
+_shared_lock = threading.Lock()
+
+
+def get_port_allocator() -> PortAllocator:
+    """Get the allocator shared by every launcher in this process."""
+    global _shared_allocator
+    with _shared_lock:
+        if _shared_allocator is None:
+            _shared_allocator = PortAllocator()
+        return _shared_allocator
@@ -0,0 +1,85 @@
+# Multi-Profile Fingerprint Automation
+# Reaper reporting browser process exits as they happen
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+
+@dataclass
+class SessionExitEvent:
+    """
+    A browser session ended, or stopped responding.
+
+    reason is one of: "exited" (process exit seen by the reaper or a
+    cleanup), "closed" (close_session), or "unresponsive" (DevTools
+    endpoint stopped answering - a warning only, the session stays open).
+    exit_code is the process return code when known.
+    """
+    profile_id: str
+    reason: str = "exited"
+    exit_code: Optional[int] = None
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+class ProcessReaper:
+    """
+    Waits on browser processes and reports their exit.
+
+    Each watched process gets a daemon thread blocked in Popen.wait(), so
+    an exit is reported within milliseconds instead of at the next poll.
+    The callback runs on that thread as on_exit(key, process). Processes
+    that are unwatched first (e.g. closed by the app) are not reported.
+    """
+
+    def __init__(self):
+        """Initialize ProcessReaper."""
+        self._watched: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def watch(self, key: str, process: Any, on_exit: Callable[[str, Any], None]):
+        """
+        Start waiting on a process.
+
+        Args:
+            key: Identifier passed back to on_exit (profile ID)
+            process: subprocess.Popen (anything with wait())
+            on_exit: Called once when the process exits
+        """
+        with self._lock:
+            self._watched[key] = process
+        threading.Thread(
+            target=self._wait,
+            args=(key, process, on_exit),
+            name=f"reaper-{key}",
+            daemon=True
+        ).start()
+
+    def unwatch(self, key: str):
+        """Stop reporting the exit of a process."""
+        with self._lock:
+            self._watched.pop(key, None)
+
+    def _wait(self, key: str, process: Any, on_exit: Callable[[str, Any], None]):
+        """Reaper thread: block until the process exits, then report it."""
+        try:
+            process.wait()
+        except Exception as e:
+            print(f"Error waiting for process {key}: {e}")
+        with self._lock:
+            if self._watched.get(key) is not process:
+                return
+            del self._watched[key]
+        try:
+            on_exit(key, process)
+        except Exception as e:
+            print(f"Error handling exit of {key}: {e}")
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._watched
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._watched)
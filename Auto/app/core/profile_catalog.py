@@ -0,0 +1,227 @@
+# Multi-Profile Fingerprint Automation
+# In-memory profile index with change notifications
+
+import threading
+from dataclasses import replace
+from typing import Callable, Dict, List, Optional, Set
+
+from app.data.profile_models import Profile, ProfileData, ProfileEvent
+from app.core.profile_manager import ProfileManager
+
+
+class ProfileCatalog:
+    """
+    In-memory index of Profile objects keyed by id, group and status.
+
+    Loaded once from ProfileManager, then kept current by listening to
+    ProfileRepository writes, so views can read and filter profiles without
+    touching SQLite or re-statting profile directories. Subscribers receive
+    a ProfileEvent per change (e.g. "status" of profile X: running -> inactive).
+    Events are delivered on the thread that made the write.
+    """
+
+    def __init__(self, profile_manager: ProfileManager):
+        """
+        Initialize ProfileCatalog.
+
+        Args:
+            profile_manager: ProfileManager whose repository is observed
+        """
+        self.profile_manager = profile_manager
+        self.repository = profile_manager.repository
+
+        self._profiles: Dict[str, Profile] = {}
+        self._by_group: Dict[str, Set[str]] = {}
+        self._by_status: Dict[str, Set[str]] = {}
+        self._subscribers: List[Callable[[ProfileEvent], None]] = []
+        self._lock = threading.RLock()
+        self._loaded = False
+
+        self.repository.add_listener(self._on_repository_event)
+
+    # ==================== LOADING ====================
+
+    def reload(self) -> List[Profile]:
+        """
+        Rebuild the index from the database.
+
+        Returns:
+            All profiles in display order
+        """
+        profiles = self.profile_manager.load_all_profiles()
+        with self._lock:
+            self._profiles.clear()
+            self._by_group.clear()
+            self._by_status.clear()
+            for profile in profiles:
+                self._index(profile)
+            self._loaded = True
+        return self.all()
+
+    def close(self):
+        """Stop listening to repository writes."""
+        self.repository.remove_listener(self._on_repository_event)
+
+    # ==================== QUERIES ====================
+
+    @staticmethod
+    def _order_key(profile: Profile):
+        return (profile.data.sothutu or 0, profile.data.id)
+
+    def _sorted(self, ids) -> List[Profile]:
+        return sorted((self._profiles[pid] for pid in ids), key=self._order_key)
+
+    def all(self) -> List[Profile]:
+        """Get all profiles ordered by (sothutu, id)."""
+        with self._lock:
+            if not self._loaded:
+                self.reload()
+            return self._sorted(self._profiles)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        """Get a profile by ID."""
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def by_status(self, status: str) -> List[Profile]:
+        """Get profiles with the given status."""
+        with self._lock:
+            return self._sorted(self._by_status.get(status, ()))
+
+    def by_group(self, group: str) -> List[Profile]:
+        """Get profiles in the given group."""
+        with self._lock:
+            return self._sorted(self._by_group.get(group, ()))
+
+    def filter(self, status: str = None, group: str = None, search: str = None) -> List[Profile]:
+        """
+        Filter profiles in memory using the status and group indexes.
+
+        Args:
+            status: Filter by status
+            group: Filter by group
+            search: Case-insensitive substring of name or profile ID
+
+        Returns:
+            Matching profiles ordered by (sothutu, id)
+        """
+        with self._lock:
+            if not self._loaded:
+                self.reload()
+            ids = set(self._profiles)
+            if status is not None:
+                ids &= self._by_status.get(status, set())
+            if group is not None:
+                ids &= self._by_group.get(group, set())
+            if search:
+                needle = search.lower()
+                ids = {
+                    pid for pid in ids
+                    if needle in pid.lower() or needle in (self._profiles[pid].data.name or "").lower()
+                }
+            return self._sorted(ids)
+
+    def count_by_status(self, status: str) -> int:
+        """Count profiles with the given status."""
+        with self._lock:
+            return len(self._by_status.get(status, ()))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._profiles)
+
+    # ==================== SUBSCRIPTIONS ====================
+
+    def subscribe(self, callback: Callable[[ProfileEvent], None]):
+        """
+        Register a callback for profile changes.
+
+        Args:
+            callback: Called with a ProfileEvent after the index is updated
+        """
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ProfileEvent], None]):
+        """Unregister a callback added with subscribe."""
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def _emit(self, event: ProfileEvent):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Profile catalog subscriber error: {e}")
+
+    # ==================== INDEX MAINTENANCE ====================
+
+    def _index(self, profile: Profile):
+        pid = profile.profile_id
+        self._profiles[pid] = profile
+        self._by_group.setdefault(profile.data.group_profile or "", set()).add(pid)
+        self._by_status.setdefault(profile.status, set()).add(pid)
+
+    def _unindex(self, profile_id: str) -> Optional[Profile]:
+        profile = self._profiles.pop(profile_id, None)
+        if profile:
+            self._by_group.get(profile.data.group_profile or "", set()).discard(profile_id)
+            self._by_status.get(profile.status, set()).discard(profile_id)
+        return profile
+
+    def _on_repository_event(self, event: ProfileEvent):
+        """
+        Apply a repository write to the index and re-emit it.
+        The repository's event is shared with its other listeners, so
+        status/last_run changes are re-emitted as a copy with old_value set.
+        """
+        with self._lock:
+            if not self._loaded:
+                return
+            profile = self._profiles.get(event.profile_id)
+
+            if event.kind == "created":
+                # Own copy: the event carries the stored row (with its rowid)
+                self._index(Profile(
+                    data=ProfileData.from_dict(event.data.to_dict()),
+                    fingerprint=None,
+                    path=self.repository.get_profile_path(event.profile_id),
+                    exists=self.repository.profile_exists(event.profile_id)
+                ))
+
+            elif event.kind == "updated":
+                # Effective row: profile_status overrides (if any) on top of the written one
+                data = self.repository.get_profile_by_id(event.profile_id)
+                if data is None:
+                    return
+                old = self._unindex(event.profile_id)
+                self._index(Profile(
+                    data=data,
+                    fingerprint=old.fingerprint if old else None,
+                    path=self.repository.get_profile_path(event.profile_id),
+                    exists=old.exists if old else self.repository.profile_exists(event.profile_id)
+                ))
+
+            elif event.kind == "deleted":
+                if not self._unindex(event.profile_id):
+                    return
+
+            elif event.kind == "status":
+                if not profile or profile.data.status == event.new_value:
+                    return
+                event = replace(event, old_value=profile.data.status)
+                self._by_status.get(profile.data.status, set()).discard(event.profile_id)
+                profile.data.status = event.new_value
+                self._by_status.setdefault(event.new_value, set()).add(event.profile_id)
+
+            elif event.kind == "last_run":
+                if not profile:
+                    return
+                event = replace(event, old_value=profile.data.last_run)
+                profile.data.last_run = event.new_value
+
+        self._emit(event)
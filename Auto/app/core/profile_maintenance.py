@@ -0,0 +1,363 @@
+# Multi-Profile Fingerprint Automation
+# Bulk Preferences maintenance (fingerprint randomize / User-Agent repair)
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.profile_manager import ProfileManager
+
+
+OP_RANDOMIZE = "randomize"
+OP_FIX_USER_AGENT = "fix_user_agent"
+
+
+@dataclass
+class MaintenanceProgress:
+    """Progress of a maintenance run."""
+    total: int
+    done: int = 0
+    failed: int = 0
+    skipped: int = 0
+    # Completed by an earlier, interrupted run of the same job
+    resumed: int = 0
+    elapsed: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def processed(self) -> int:
+        """Profiles handled by this run."""
+        return self.done + self.failed + self.skipped
+
+    @property
+    def rate(self) -> float:
+        """Profiles per second handled by this run."""
+        return self.processed / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary."""
+        data = asdict(self)
+        data["rate"] = self.rate
+        return data
+
+
+def is_browser_lock_held(profile_path: str) -> bool:
+    """
+    Check whether a Chrome process outside this app holds the profile.
+    Uses the profile's SingletonLock ("host-pid" symlink) on POSIX and
+    the exclusively opened "lockfile" on Windows.
+
+    Args:
+        profile_path: Path to profile directory
+
+    Returns:
+        True if a live browser holds the profile lock
+    """
+    if os.name == "nt":
+        lock_path = os.path.join(profile_path, "lockfile")
+        if not os.path.exists(lock_path):
+            return False
+        try:
+            with open(lock_path, "a"):
+                return False
+        except PermissionError:
+            return True
+        except OSError:
+            return False
+
+    try:
+        target = os.readlink(os.path.join(profile_path, "SingletonLock"))
+        pid = int(target.rsplit("-", 1)[1])
+    except (OSError, IndexError, ValueError):
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+# Per-process generator used by pool workers
+_worker_generator: Optional[FingerprintGenerator] = None
+
+
+def _maintain_profile(
+    generator: FingerprintGenerator,
+    profile_id: str,
+    profile_path: str,
+    operations: Tuple[str, ...],
+    chrome_version: str
+) -> Optional[str]:
+    """
+    Apply maintenance operations to one profile with one read and one write.
+
+    Returns:
+        None if successful, otherwise an error message
+    """
+    prefs = generator.read_preferences(profile_path)
+    if not prefs:
+        return "no Preferences"
+
+    if OP_RANDOMIZE in operations:
+        config = generator.extract_gologin_config(prefs)
+        if config:
+            config = generator.randomize_noise_values(config)
+        else:
+            config = generator.generate_fingerprint()
+        config.profile_id = profile_id
+        prefs = generator.update_gologin_config(prefs, config)
+
+    if OP_FIX_USER_AGENT in operations:
+        if OP_RANDOMIZE not in operations and generator.has_user_agent(prefs, chrome_version):
+            return None
+        generator.apply_user_agent(prefs, chrome_version)
+
+    if not generator.write_preferences(profile_path, prefs):
+        return "write failed"
+    return None
+
+
+def _maintain_chunk(
+    tasks: List[Tuple[str, str]],
+    operations: Tuple[str, ...],
+    chrome_version: str
+) -> List[Tuple[str, Optional[str]]]:
+    """Pool worker: maintain a chunk of (profile_id, profile_path) pairs."""
+    global _worker_generator
+    if _worker_generator is None:
+        _worker_generator = FingerprintGenerator()
+    results = []
+    for profile_id, profile_path in tasks:
+        try:
+            error = _maintain_profile(_worker_generator, profile_id, profile_path, operations, chrome_version)
+        except Exception as e:
+            error = str(e)
+        results.append((profile_id, error))
+    return results
+
+
+class ProfileMaintenance:
+    """
+    Rewrites Preferences of many profiles on a process pool.
+
+    Each profile is read and written once for all requested operations.
+    Profiles whose browser is running are skipped. Completed profiles are
+    appended to a checkpoint file after every chunk; running the same job
+    again after an interruption continues where it stopped. The checkpoint
+    is removed once every profile has been done.
+    """
+
+    # Profiles per pool task (one checkpoint write per chunk)
+    CHUNK_SIZE = 32
+
+    def __init__(
+        self,
+        profile_manager: ProfileManager,
+        checkpoint_path: str = "data/maintenance_checkpoint.jsonl",
+        workers: int = None,
+        is_running: Callable[[str], bool] = None
+    ):
+        """
+        Initialize ProfileMaintenance.
+
+        Args:
+            profile_manager: ProfileManager whose profiles are maintained
+            checkpoint_path: File recording completed profiles
+            workers: Worker processes (default: CPU count; 1 runs in-process)
+            is_running: Callback telling whether the app runs a profile's
+                        browser (e.g. BrowserManager.is_session_active)
+        """
+        self.profile_manager = profile_manager
+        self.checkpoint_path = checkpoint_path
+        self.workers = workers or os.cpu_count() or 1
+        self.is_running = is_running
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Stop after the chunks in flight; progress stays in the checkpoint."""
+        self._cancel.set()
+
+    # ==================== CHECKPOINT ====================
+
+    def _load_checkpoint(self, job: Dict) -> Set[str]:
+        """Get profiles completed by an earlier run of the same job."""
+        done = set()
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return done
+        try:
+            if not lines or json.loads(lines[0]).get("job") != job:
+                return done
+            for line in lines[1:]:
+                done.update(json.loads(line).get("done", []))
+        except (ValueError, AttributeError):
+            # Torn last line from a crash: keep what was read
+            pass
+        return done
+
+    def _start_checkpoint(self, job: Dict, done: Set[str]):
+        """Rewrite the checkpoint for a job, keeping already completed profiles."""
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.checkpoint_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"job": job}) + "\n")
+            if done:
+                f.write(json.dumps({"done": sorted(done)}) + "\n")
+
+    def _append_checkpoint(self, profile_ids: List[str]):
+        """Record completed profiles."""
+        if not profile_ids:
+            return
+        with open(self.checkpoint_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"done": profile_ids}) + "\n")
+            f.flush()
+
+    # ==================== RUN ====================
+
+    def _profile_is_busy(self, profile_id: str, profile_path: str) -> bool:
+        """True if a browser is running the profile."""
+        if self.is_running and self.is_running(profile_id):
+            return True
+        return is_browser_lock_held(profile_path)
+
+    def run(
+        self,
+        randomize: bool = False,
+        fix_user_agent: bool = False,
+        chrome_version: str = "129",
+        profile_ids: Iterable[str] = None,
+        progress: Callable[[MaintenanceProgress], None] = None
+    ) -> MaintenanceProgress:
+        """
+        Run maintenance over profiles.
+
+        Args:
+            randomize: Randomize fingerprint noise (see randomize_profile_fingerprint)
+            fix_user_agent: Rewrite the User Agent for chrome_version
+            chrome_version: Major Chrome/Orbita version for the User Agent
+            profile_ids: Profiles to process (default: all with a directory)
+            progress: Called with a MaintenanceProgress after every chunk
+
+        Returns:
+            Final MaintenanceProgress
+        """
+        operations = tuple(op for op, enabled in (
+            (OP_RANDOMIZE, randomize),
+            (OP_FIX_USER_AGENT, fix_user_agent)
+        ) if enabled)
+        repository = self.profile_manager.repository
+        if profile_ids is None:
+            profile_ids = repository.get_all_profile_ids() & repository.get_existing_profile_ids()
+        profile_ids = sorted(set(profile_ids))
+
+        job = {
+            "operations": list(operations),
+            "chrome_version": chrome_version if fix_user_agent else None
+        }
+        done_before = self._load_checkpoint(job)
+        state = MaintenanceProgress(total=len(profile_ids))
+        if not operations:
+            return state
+
+        self._cancel.clear()
+        self._start_checkpoint(job, done_before)
+        start = time.perf_counter()
+
+        tasks = []
+        for profile_id in profile_ids:
+            if profile_id in done_before:
+                state.resumed += 1
+                continue
+            profile_path = repository.get_profile_path(profile_id)
+            if self._profile_is_busy(profile_id, profile_path):
+                state.skipped += 1
+                continue
+            tasks.append((profile_id, profile_path))
+        chunks = [tasks[i:i + self.CHUNK_SIZE] for i in range(0, len(tasks), self.CHUNK_SIZE)]
+
+        def record(results: List[Tuple[str, Optional[str]]]):
+            completed = [pid for pid, error in results if error is None]
+            for profile_id, error in results:
+                if error is not None:
+                    print(f"Error maintaining profile {profile_id}: {error}")
+            self._append_checkpoint(completed)
+            state.done += len(completed)
+            state.failed += len(results) - len(completed)
+            state.elapsed = time.perf_counter() - start
+            if progress:
+                progress(state)
+
+        if self.workers <= 1:
+            generator = FingerprintGenerator()
+            for chunk in chunks:
+                if self._cancel.is_set():
+                    break
+                record([
+                    (pid, _maintain_profile(generator, pid, path, operations, chrome_version))
+                    for pid, path in chunk
+                ])
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                futures = [pool.submit(_maintain_chunk, chunk, operations, chrome_version) for chunk in chunks]
+                for future in as_completed(futures):
+                    if self._cancel.is_set():
+                        for pending in futures:
+                            pending.cancel()
+                    if future.cancelled():
+                        continue
+                    try:
+                        record(future.result())
+                    except Exception as e:
+                        print(f"Error in maintenance worker: {e}")
+
+        state.cancelled = self._cancel.is_set()
+        state.elapsed = time.perf_counter() - start
+        if OP_RANDOMIZE in operations:
+            self.profile_manager.invalidate_fingerprint_index()
+        if not state.cancelled and not state.failed and not state.skipped:
+            try:
+                os.remove(self.checkpoint_path)
+            except OSError:
+                pass
+        return state
+
+
+def main():
+    """Command line entry: python -m app.core.profile_maintenance [--randomize] [--user-agent VERSION]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Rewrite Preferences of all profiles")
+    parser.add_argument("--randomize", action="store_true", help="randomize fingerprint noise")
+    parser.add_argument("--user-agent", metavar="VERSION", help="set the User Agent for a Chrome major version")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--checkpoint", default="data/maintenance_checkpoint.jsonl", help="checkpoint file")
+    args = parser.parse_args()
+
+    def report(state: MaintenanceProgress):
+        print(f"\r{state.processed + state.resumed}/{state.total} "
+              f"({state.failed} failed, {state.skipped} skipped) {state.rate:.1f} profiles/s", end="")
+
+    maintenance = ProfileMaintenance(ProfileManager(), checkpoint_path=args.checkpoint, workers=args.workers)
+    state = maintenance.run(
+        randomize=args.randomize,
+        fix_user_agent=bool(args.user_agent),
+        chrome_version=(args.user_agent or "129").split(".")[0],
+        progress=report
+    )
+    print()
+    print(f"Done: {state.done}, failed: {state.failed}, skipped: {state.skipped}, "
+          f"resumed: {state.resumed} in {state.elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,12 +4,15 @@
 import os
 import shutil
 import time
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 from datetime import datetime
 
-from app.data.profile_models import ProfileData, Profile, GologinConfig
+from app.data.profile_models import ProfileData, Profile, GologinConfig, ProfileQuery
 from app.data.profile_repository import ProfileRepository
 from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.template_cloner import TemplateCloner
+from app.core.fingerprint_index import FingerprintIndex
 
 
 class ProfileManager:
@@ -17,11 +20,18 @@ class ProfileManager:
     Manager for profile lifecycle operations.
     """
     
+    # Threads cloning templates / writing Preferences in create_profiles
+    CREATE_WORKERS = 8
+    
+    # Attempts at drawing a fingerprint no other profile has
+    MAX_RESAMPLES = 50
+    
     def __init__(
         self,
         repository: ProfileRepository = None,
         generator: FingerprintGenerator = None,
-        template_dir: str = "temp"
+        template_dir: str = "temp",
+        cloner: TemplateCloner = None
     ):
         """
         Initialize ProfileManager.
@@ -30,28 +40,36 @@ class ProfileManager:
             repository: ProfileRepository instance
             generator: FingerprintGenerator instance
             template_dir: Path to template profile directory
+            cloner: TemplateCloner used to copy the template
         """
         self.repository = repository or ProfileRepository()
         self.generator = generator or FingerprintGenerator()
         self.template_dir = template_dir
+        self.cloner = cloner or TemplateCloner()
+        # Built on first use, then kept in sync by create/randomize/delete
+        self._fingerprint_index: Optional[FingerprintIndex] = None
     
     def load_all_profiles(self) -> List[Profile]:
         """
         Load all profiles from database with status check.
+        Directory existence comes from one cached scan of the profile
+        directory; newly missing profiles are marked in one batch write.
         
         Returns:
             List of Profile objects with existence status
         """
         profiles = []
+        newly_missing = []
         profile_data_list = self.repository.get_all_profiles()
+        existing_ids = self.repository.get_existing_profile_ids()
         
         for data in profile_data_list:
             profile_path = self.repository.get_profile_path(data.idprofile)
-            exists = self.repository.profile_exists(data.idprofile)
+            exists = data.idprofile in existing_ids
             
             # Update status if profile is missing
             if not exists and data.status != "missing":
-                self.repository.update_profile_status(data.idprofile, "missing")
+                newly_missing.append(data.idprofile)
                 data.status = "missing"
             
             profile = Profile(
@@ -62,6 +80,9 @@ class ProfileManager:
             )
             profiles.append(profile)
         
+        if newly_missing:
+            self.repository.update_profile_statuses(newly_missing, "missing")
+        
         return profiles
     
     def get_profile(self, profile_id: str) -> Optional[Profile]:
@@ -91,6 +112,7 @@ class ProfileManager:
     def get_profile_fingerprint(self, profile_id: str) -> Optional[GologinConfig]:
         """
         Load fingerprint config from Preferences file.
+        Served from the generator's cache while Preferences is unchanged.
         
         Args:
             profile_id: The profile ID
@@ -99,40 +121,104 @@ class ProfileManager:
             GologinConfig or None
         """
         profile_path = self.repository.get_profile_path(profile_id)
-        prefs = self.generator.read_preferences(profile_path)
+        return self.generator.load_gologin_config(profile_path)
+    
+    # ==================== FINGERPRINT UNIQUENESS ====================
+    
+    def get_fingerprint_index(self) -> FingerprintIndex:
+        """
+        Get the fingerprint collision index, building it on first call.
+        The build reads each profile's gologin sidecar (or the fingerprint
+        cache) once; afterwards the index is updated in place.
         
-        if not prefs:
-            return None
+        Returns:
+            FingerprintIndex over all profiles with a fingerprint
+        """
+        if self._fingerprint_index is None:
+            index = FingerprintIndex()
+            existing_ids = self.repository.get_existing_profile_ids()
+            index.rebuild(
+                (profile_id, config)
+                for profile_id in self.repository.get_all_profile_ids() & existing_ids
+                for config in (self.get_profile_fingerprint(profile_id),)
+                if config
+            )
+            self._fingerprint_index = index
+        return self._fingerprint_index
+    
+    def find_duplicate_fingerprints(self) -> List[List[str]]:
+        """
+        Get groups of profiles sharing a fingerprint signature.
+        
+        Returns:
+            Lists of profile IDs (sorted), one per colliding signature
+        """
+        return sorted(sorted(group) for group in self.get_fingerprint_index().duplicate_groups())
+    
+    def invalidate_fingerprint_index(self):
+        """Drop the index after Preferences were rewritten elsewhere (rebuilt on next use)."""
+        self._fingerprint_index = None
+    
+    def _index_fingerprint(self, profile_id: str, config: GologinConfig):
+        """Record a new fingerprint if the index has been built."""
+        if self._fingerprint_index is not None:
+            self._fingerprint_index.add(profile_id, config)
+    
+    def _resample_until_unique(
+        self,
+        config: GologinConfig,
+        resample,
+        profile_id: str = None,
+        taken: set = None
+    ) -> GologinConfig:
+        """
+        Redraw a fingerprint until no other profile has its signature.
         
-        return self.generator.extract_gologin_config(prefs)
+        Args:
+            config: First candidate
+            resample: Callable returning the next candidate
+            profile_id: Profile the fingerprint is for (its own entry is ignored)
+            taken: Extra signatures to avoid (e.g. earlier profiles of a batch)
+            
+        Returns:
+            A unique candidate, or the last one after MAX_RESAMPLES attempts
+        """
+        index = self.get_fingerprint_index()
+        for _ in range(self.MAX_RESAMPLES):
+            if index.is_unique(config, profile_id) and not (taken and index.signature(config) in taken):
+                break
+            config = resample()
+        else:
+            print(f"No unique fingerprint after {self.MAX_RESAMPLES} attempts")
+        return config
     
-    def create_profile(self, name: str = None) -> Optional[Profile]:
+    def create_profile(self, name: str = None, unique: bool = False) -> Optional[Profile]:
         """
         Create new profile from template with random fingerprint.
         
         Args:
             name: Optional profile name
+            unique: Resample the fingerprint until no other profile shares it
             
         Returns:
             Created Profile or None if failed
         """
         # Generate unique profile ID
-        profile_id = str(int(time.time() * 1000000) + hash(os.urandom(8)) % 10000000000)
-        profile_id = profile_id[:20]  # Limit to 20 digits
+        profile_id = self._new_profile_id()
         
         # Ensure unique
         while self.repository.get_profile_by_id(profile_id):
-            profile_id = str(int(time.time() * 1000000) + hash(os.urandom(8)) % 10000000000)
-            profile_id = profile_id[:20]
+            profile_id = self._new_profile_id()
         
         profile_path = self.repository.get_profile_path(profile_id)
         
-        # Copy template directory
+        # Clone template directory (reflink / hardlink / copy)
         if os.path.isdir(self.template_dir):
             try:
-                shutil.copytree(self.template_dir, profile_path)
+                self.cloner.clone(self.template_dir, profile_path)
             except Exception as e:
                 print(f"Error copying template: {e}")
+                shutil.rmtree(profile_path, ignore_errors=True)
                 return None
         else:
             # Create minimal structure if template doesn't exist
@@ -140,6 +226,8 @@ class ProfileManager:
         
         # Generate and apply random fingerprint
         fingerprint = self.generator.generate_fingerprint()
+        if unique:
+            fingerprint = self._resample_until_unique(fingerprint, self.generator.generate_fingerprint)
         fingerprint.profile_id = profile_id
         fingerprint.name = name or f"Profile_{profile_id[:8]}"
         
@@ -165,6 +253,7 @@ class ProfileManager:
             shutil.rmtree(profile_path, ignore_errors=True)
             return None
         
+        self._index_fingerprint(profile_id, fingerprint)
         return Profile(
             data=profile_data,
             fingerprint=fingerprint,
@@ -172,6 +261,103 @@ class ProfileManager:
             exists=True
         )
     
+    @staticmethod
+    def _new_profile_id() -> str:
+        """Generate a random profile ID (up to 20 digits)."""
+        profile_id = str(int(time.time() * 1000000) + hash(os.urandom(8)) % 10000000000)
+        return profile_id[:20]  # Limit to 20 digits
+    
+    def create_profiles(
+        self,
+        count: int,
+        name_pattern: str = None,
+        group: str = None,
+        unique: bool = False
+    ) -> List[Profile]:
+        """
+        Create many profiles from template in one go.
+        IDs are generated against one in-memory snapshot of existing IDs,
+        template clones and Preferences writes run on a thread pool, and
+        all rows are inserted in a single transaction. If anything fails,
+        every directory created by the call is removed and no rows are kept.
+        
+        Args:
+            count: Number of profiles to create
+            name_pattern: Name format with optional {n} (1-based index) and
+                {id} fields, e.g. "Shop {n:03d}"
+            group: Optional group_profile for all new profiles
+            unique: Resample fingerprints colliding with existing profiles
+                or with each other
+            
+        Returns:
+            Created Profiles, or an empty list if failed
+        """
+        if count <= 0:
+            return []
+        
+        taken = self.repository.get_all_profile_ids() | self.repository.get_existing_profile_ids()
+        profile_ids = []
+        while len(profile_ids) < count:
+            profile_id = self._new_profile_id()
+            if profile_id not in taken:
+                taken.add(profile_id)
+                profile_ids.append(profile_id)
+        
+        fingerprints = self.generator.generate_fingerprints(count)
+        if unique:
+            index = self.get_fingerprint_index()
+            batch_signatures = set()
+            for i, fingerprint in enumerate(fingerprints):
+                fingerprints[i] = self._resample_until_unique(
+                    fingerprint, self.generator.generate_fingerprint, taken=batch_signatures
+                )
+                batch_signatures.add(index.signature(fingerprints[i]))
+        profiles = []
+        for n, (profile_id, fingerprint) in enumerate(zip(profile_ids, fingerprints), 1):
+            name = (name_pattern.format(n=n, id=profile_id) if name_pattern
+                    else f"Profile_{profile_id[:8]}")
+            fingerprint.profile_id = profile_id
+            fingerprint.name = name
+            profiles.append(Profile(
+                data=ProfileData(
+                    name=name,
+                    idprofile=profile_id,
+                    status="inactive",
+                    proxymode="none",
+                    group_profile=group or ""
+                ),
+                fingerprint=fingerprint,
+                path=self.repository.get_profile_path(profile_id),
+                exists=True
+            ))
+        
+        has_template = os.path.isdir(self.template_dir)
+        base_prefs = (self.generator.read_preferences(self.template_dir) if has_template else None) or {}
+        
+        def build(profile: Profile):
+            if has_template:
+                self.cloner.clone(self.template_dir, profile.path)
+            else:
+                os.makedirs(os.path.join(profile.path, "Default"))
+            prefs = self.generator.update_gologin_config(dict(base_prefs), profile.fingerprint)
+            if not self.generator.write_preferences(profile.path, prefs):
+                raise IOError(f"Could not write preferences for {profile.profile_id}")
+        
+        with ThreadPoolExecutor(max_workers=self.CREATE_WORKERS) as pool:
+            futures = [pool.submit(build, profile) for profile in profiles]
+            errors = [f.exception() for f in futures if f.exception()]
+        
+        if errors or not self.repository.create_profiles([p.data for p in profiles]):
+            if errors:
+                print(f"Error creating profiles: {errors[0]}")
+            for profile in profiles:
+                shutil.rmtree(profile.path, ignore_errors=True)
+            return []
+        
+        for profile in profiles:
+            self._index_fingerprint(profile.profile_id, profile.fingerprint)
+        return profiles
+    
     def update_profile_status(self, profile_id: str, status: str) -> bool:
         """
         Update profile status in database.
@@ -213,6 +399,9 @@ class ProfileManager:
         if not self.repository.delete_profile(profile_id):
             return False
         
+        if self._fingerprint_index is not None:
+            self._fingerprint_index.remove(profile_id)
+        
         # Delete files if requested
         if delete_files:
             profile_path = self.repository.get_profile_path(profile_id)
@@ -224,29 +413,45 @@ class ProfileManager:
     def filter_profiles(
         self,
         status: str = None,
-        group: str = None
+        group: str = None,
+        name_contains: str = None,
+        search: str = None,
+        has_proxy: bool = None,
+        limit: int = None,
+        after: Tuple[int, int] = None
     ) -> List[Profile]:
         """
         Filter profiles by criteria.
+        All criteria are combined and evaluated in SQL by the repository.
         
         Args:
             status: Filter by status
             group: Filter by group
+            name_contains: Filter by name substring
+            search: Filter by name or profile ID substring
+            has_proxy: Filter by proxy presence
+            limit: Maximum number of profiles (page size)
+            after: Keyset cursor (sothutu, id) of the previous page's last row
             
         Returns:
             List of matching Profile objects
         """
-        if status:
-            data_list = self.repository.get_profiles_by_status(status)
-        elif group:
-            data_list = self.repository.get_profiles_by_group(group)
-        else:
-            data_list = self.repository.get_all_profiles()
+        query = ProfileQuery(
+            status=status or None,
+            group=group or None,
+            name_contains=name_contains or None,
+            search=search or None,
+            has_proxy=has_proxy,
+            limit=limit,
+            after=after
+        )
+        data_list = self.repository.query_profiles(query)
+        existing_ids = self.repository.get_existing_profile_ids()
         
         profiles = []
         for data in data_list:
             profile_path = self.repository.get_profile_path(data.idprofile)
-            exists = self.repository.profile_exists(data.idprofile)
+            exists = data.idprofile in existing_ids
             
             profile = Profile(
                 data=data,
@@ -258,12 +463,13 @@ class ProfileManager:
         
         return profiles
     
-    def randomize_profile_fingerprint(self, profile_id: str) -> bool:
+    def randomize_profile_fingerprint(self, profile_id: str, unique: bool = False) -> bool:
         """
         Randomize fingerprint for existing profile.
         
         Args:
             profile_id: The profile ID
+            unique: Re-randomize until no other profile shares the fingerprint
             
         Returns:
             True if successful
@@ -282,14 +488,21 @@ class ProfileManager:
         config = self.generator.extract_gologin_config(prefs)
         if config:
             config = self.generator.randomize_noise_values(config)
+            resample = lambda: self.generator.randomize_noise_values(config)
         else:
             config = self.generator.generate_fingerprint()
+            resample = self.generator.generate_fingerprint
+        if unique:
+            config = self._resample_until_unique(config, resample, profile_id)
         
         config.profile_id = profile_id
         
         # Update preferences
         prefs = self.generator.update_gologin_config(prefs, config)
-        return self.generator.write_preferences(profile_path, prefs)
+        if not self.generator.write_preferences(profile_path, prefs):
+            return False
+        self._index_fingerprint(profile_id, config)
+        return True
     
     def count_profiles(self) -> int:
         """Get total number of profiles."""
@@ -1,7 +1,6 @@
 # Multi-Profile Fingerprint Automation
 # Session Manager for concurrent profile execution
 
-import time
 import threading
 from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass
@@ -9,6 +8,8 @@ from enum import Enum
 from datetime import datetime
 
 from app.core.browser_manager import BrowserManager
+from app.core.launch_scheduler import LaunchScheduler
+from app.core.process_reaper import SessionExitEvent
 
 
 class SessionStatus(Enum):
@@ -40,13 +41,20 @@ class SessionResult:
 class SessionManager:
     """
     Manager for concurrent profile session execution.
+    Batch launches wait on a condition for a free slot; BrowserManager
+    session-end events (process exit via its reaper, close_session,
+    cleanup) wake the waiting batch immediately.
     """
     
+    # Safety re-check while waiting for a slot, for sessions ended without an event
+    SLOT_RECHECK_INTERVAL = 5.0
+    
     def __init__(
         self,
         browser_manager: BrowserManager,
         max_concurrent: int = 5,
-        default_delay: float = 1.0
+        default_delay: float = 1.0,
+        launch_workers: int = None
     ):
         """
         Initialize SessionManager.
@@ -55,15 +63,21 @@ class SessionManager:
             browser_manager: BrowserManager instance
             max_concurrent: Maximum concurrent sessions
             default_delay: Default delay between launches (seconds)
+            launch_workers: Profiles prepared concurrently (see LaunchScheduler)
         """
         self.browser_manager = browser_manager
         self.max_concurrent = max_concurrent
         self.default_delay = default_delay
+        self.launch_workers = launch_workers
+        self._scheduler: Optional[LaunchScheduler] = None
         
         self._results: Dict[str, SessionResult] = {}
         self._stop_requested = False
         self._batch_thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
+        # Signalled when a session ends or the batch is stopped
+        self._slot_freed = threading.Condition()
+        self.browser_manager.add_session_listener(self._on_session_ended)
     
     @property
     def active_count(self) -> int:
@@ -104,11 +118,12 @@ class SessionManager:
         self._results.clear()
         
         delay = delay if delay is not None else self.default_delay
+        self._scheduler = LaunchScheduler(self.browser_manager, workers=self.launch_workers, spawn_interval=delay)
         
         # Start batch in background thread
         self._batch_thread = threading.Thread(
             target=self._run_batch,
-            args=(profile_ids, delay, on_session_complete),
+            args=(profile_ids, on_session_complete),
             daemon=True
         )
         self._batch_thread.start()
@@ -118,62 +133,77 @@ class SessionManager:
     def _run_batch(
         self,
         profile_ids: List[str],
-        delay: float,
         on_complete: Callable[[SessionResult], None] = None
     ):
-        """Run batch execution (internal)."""
-        for profile_id in profile_ids:
-            if self._stop_requested:
-                break
-            
-            # Wait for available slot
-            while not self.can_start_session() and not self._stop_requested:
-                time.sleep(0.5)
-            
-            if self._stop_requested:
-                break
-            
-            # Start session
-            result = self._start_session(profile_id)
+        """
+        Run batch execution (internal).
+        Pre-launch stages run concurrently in a LaunchScheduler; spawns are
+        spaced by the batch delay and wait for a free session slot.
+        """
+        def on_launched(profile_id: str, launched):
+            result = SessionResult(
+                profile_id=profile_id,
+                status=SessionStatus.RUNNING if launched else SessionStatus.FAILED,
+                start_time=datetime.now()
+            )
+            if not launched:
+                result.error = "Failed to launch browser"
+                result.end_time = result.start_time
             
             with self._lock:
                 self._results[profile_id] = result
             
             if on_complete:
                 on_complete(result)
-            
-            # Delay before next launch
-            if delay > 0:
-                time.sleep(delay)
+        
+        self._scheduler.run(profile_ids, on_launched=on_launched, wait_for_slot=self._wait_for_slot)
     
-    def _start_session(self, profile_id: str) -> SessionResult:
-        """Start a single session."""
-        result = SessionResult(
-            profile_id=profile_id,
-            status=SessionStatus.PENDING,
-            start_time=datetime.now()
-        )
+    def _wait_for_slot(self) -> bool:
+        """Block until a session slot is free; False if the batch was stopped."""
+        with self._slot_freed:
+            while not self.can_start_session() and not self._stop_requested:
+                self._slot_freed.wait(self.SLOT_RECHECK_INTERVAL)
+        return not self._stop_requested
+    
+    def wait_for_free_slot(self, limit: int = None) -> bool:
+        """
+        Block until fewer than `limit` sessions are running.
+        For launches outside a batch (e.g. the UI opening browsers), so
+        they queue on the same slot condition instead of failing.
         
-        try:
-            # Calculate window position
-            position = self.browser_manager.calculate_window_position(self.active_count)
-            
-            # Launch browser
-            driver = self.browser_manager.launch_profile(profile_id, window_position=position)
+        Args:
+            limit: Session ceiling (defaults to max_concurrent)
             
-            if driver:
-                result.status = SessionStatus.RUNNING
-            else:
-                result.status = SessionStatus.FAILED
-                result.error = "Failed to launch browser"
-                result.end_time = datetime.now()
-                
-        except Exception as e:
-            result.status = SessionStatus.FAILED
-            result.error = str(e)
-            result.end_time = datetime.now()
-        
-        return result
+        Returns:
+            True once a slot is free
+        """
+        limit = limit or self.max_concurrent
+        with self._slot_freed:
+            while self.active_count >= limit:
+                self._slot_freed.wait(self.SLOT_RECHECK_INTERVAL)
+        return True
+    
+    def _on_session_ended(self, event: SessionExitEvent):
+        """
+        BrowserManager listener: record the end and wake the batch.
+        "unresponsive" only notes the error; the session ends (as FAILED)
+        when its browser actually exits or is closed.
+        """
+        with self._lock:
+            result = self._results.get(event.profile_id)
+            if result and result.status == SessionStatus.RUNNING:
+                if event.reason == "unresponsive":
+                    result.error = "Browser stopped responding"
+                    return
+                if self._stop_requested:
+                    result.status = SessionStatus.STOPPED
+                elif result.error:
+                    result.status = SessionStatus.FAILED
+                else:
+                    result.status = SessionStatus.COMPLETED
+                result.end_time = event.timestamp
+        with self._slot_freed:
+            self._slot_freed.notify_all()
     
     def stop_batch(self) -> int:
         """
@@ -183,6 +213,10 @@ class SessionManager:
             Number of sessions stopped
         """
         self._stop_requested = True
+        if self._scheduler:
+            self._scheduler.stop()
+        with self._slot_freed:
+            self._slot_freed.notify_all()
         
         # Wait for batch thread to finish
         if self._batch_thread and self._batch_thread.is_alive():
@@ -0,0 +1,177 @@
+# Multi-Profile Fingerprint Automation
+# Template cloning with reflink / hardlink / copy fallback
+
+import errno
+import os
+import shutil
+import threading
+from typing import Dict
+
+try:
+    import fcntl
+    FICLONE_AVAILABLE = hasattr(fcntl, "ioctl")
+except ImportError:
+    FICLONE_AVAILABLE = False
+
+
+# _IOW(0x94, 9, int) - Linux ioctl that shares extents between two files
+FICLONE = 0x40049409
+
+# Errors meaning the filesystem (not this one file) can't hardlink / reflink
+HARDLINK_UNSUPPORTED = frozenset(
+    code for code in (
+        errno.EXDEV, errno.EPERM, getattr(errno, "ENOTSUP", None), getattr(errno, "EOPNOTSUPP", None)
+    ) if code is not None
+)
+REFLINK_UNSUPPORTED = HARDLINK_UNSUPPORTED | frozenset(
+    code for code in (errno.EINVAL, errno.ENOTTY, getattr(errno, "ENOSYS", None)) if code is not None
+)
+
+
+class TemplateCloner:
+    """
+    Clone the template profile directory into a new profile directory.
+
+    Every file goes through a fallback chain, cheapest first:
+      - hardlink: only for files under IMMUTABLE_DIRS (extensions, spell-check
+        dictionaries, component data). Chrome replaces these by writing new
+        version folders, never by editing in place, so sharing the inode with
+        the template is safe.
+      - reflink: copy-on-write clone via FICLONE (btrfs, XFS, bcachefs...).
+        Safe for any file, including the ones Chrome mutates.
+      - copy: plain shutil.copy2.
+    A strategy that fails with "not supported" (cross-device, no permission,
+    filesystem can't do it) is switched off for the rest of the cloner's
+    lifetime so later files skip straight to the next one. Any other error
+    only sends that one file down the chain.
+    """
+
+    # Template folders whose files Chrome never modifies in place
+    IMMUTABLE_DIRS = frozenset({
+        "Extensions",
+        "Dictionaries",
+        "hyphen-data",
+        "WidevineCdm",
+        "ZxcvbnData",
+        "pnacl",
+        "Safe Browsing",
+        "SSLErrorAssistant",
+        "FileTypePolicies",
+        "OriginTrials",
+        "Subresource Filter",
+        "MEIPreload",
+        "CertificateRevocation",
+        "TrustTokenKeyCommitments",
+        "Crowd Deny",
+        "OnDeviceHeadSuggestModel",
+        "OptimizationHints",
+        "FirstPartySetsPreloaded",
+    })
+
+    def __init__(self, use_reflink: bool = True, use_hardlink: bool = True):
+        """
+        Initialize TemplateCloner.
+
+        Args:
+            use_reflink: Try FICLONE copy-on-write clones
+            use_hardlink: Hardlink files under IMMUTABLE_DIRS
+        """
+        self.reflink_enabled = use_reflink and FICLONE_AVAILABLE
+        self.hardlink_enabled = use_hardlink and hasattr(os, "link")
+        self._stats: Dict[str, int] = {"reflink": 0, "hardlink": 0, "copy": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Number of files cloned by each strategy."""
+        with self._lock:
+            return dict(self._stats)
+
+    def clone(self, template_dir: str, target_dir: str):
+        """
+        Clone template_dir into target_dir (which must not exist).
+
+        Args:
+            template_dir: Template profile directory
+            target_dir: New profile directory
+
+        Raises:
+            OSError: If a file cannot be cloned by any strategy
+        """
+        template_dir = os.path.abspath(template_dir)
+        os.makedirs(target_dir)
+
+        for root, dirs, files in os.walk(template_dir):
+            rel_root = os.path.relpath(root, template_dir)
+            dest_root = target_dir if rel_root == "." else os.path.join(target_dir, rel_root)
+            immutable = rel_root != "." and not self.IMMUTABLE_DIRS.isdisjoint(rel_root.split(os.sep))
+
+            for name in dirs:
+                src = os.path.join(root, name)
+                dest = os.path.join(dest_root, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dest)
+                else:
+                    os.mkdir(dest)
+            # Symlinked dirs were recreated as links; don't descend into them
+            dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
+
+            for name in files:
+                src = os.path.join(root, name)
+                dest = os.path.join(dest_root, name)
+                if os.path.islink(src):
+                    os.symlink(os.readlink(src), dest)
+                else:
+                    self.clone_file(src, dest, immutable)
+
+    def clone_file(self, src: str, dest: str, immutable: bool = False) -> str:
+        """
+        Clone one file through the fallback chain.
+
+        Args:
+            src: Source file
+            dest: Destination file (must not exist)
+            immutable: True if the file may share its inode with the source
+
+        Returns:
+            Name of the strategy used ("hardlink", "reflink" or "copy")
+        """
+        if immutable and self.hardlink_enabled:
+            try:
+                os.link(src, dest)
+                return self._count("hardlink")
+            except OSError as e:
+                # Cross-device, FAT/exFAT, or no permission: stop trying
+                if e.errno in HARDLINK_UNSUPPORTED:
+                    self._disable("hardlink_enabled")
+
+        if self.reflink_enabled:
+            try:
+                self._reflink(src, dest)
+                return self._count("reflink")
+            except OSError as e:
+                # EOPNOTSUPP / EXDEV / EINVAL: filesystem can't clone
+                if e.errno in REFLINK_UNSUPPORTED:
+                    self._disable("reflink_enabled")
+                if e.errno != errno.EEXIST and os.path.exists(dest):
+                    os.remove(dest)
+
+        shutil.copy2(src, dest)
+        return self._count("copy")
+
+    @staticmethod
+    def _reflink(src: str, dest: str):
+        """Create dest as a copy-on-write clone of src."""
+        with open(src, "rb") as fsrc, open(dest, "xb") as fdest:
+            fcntl.ioctl(fdest.fileno(), FICLONE, fsrc.fileno())
+        shutil.copystat(src, dest)
+
+    def _disable(self, flag: str):
+        """Switch a strategy off for later files (clone workers share the cloner)."""
+        with self._lock:
+            setattr(self, flag, False)
+
+    def _count(self, strategy: str) -> str:
+        with self._lock:
+            self._stats[strategy] += 1
+        return strategy
@@ -0,0 +1,142 @@
+# Multi-Profile Fingerprint Automation
+# Thread-aware SQLite connection pool for the app database
+
+import sqlite3
+import threading
+from typing import Dict
+
+
+class _Slot:
+    """A thread's pooled connection and how many callers are using it."""
+    __slots__ = ("conn", "depth", "stale")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.depth = 0
+        # Set by close_all while in use; closed by the owner's last release()
+        self.stale = False
+
+
+class SQLiteConnectionPool:
+    """
+    One long-lived SQLite connection per thread.
+
+    Connections are opened lazily on first use in a thread and reused
+    afterwards, so the sqlite3 statement cache is shared by every query
+    the thread runs. The database is switched to WAL journaling so readers
+    and a writer can work concurrently (Qt thread + SessionManager workers).
+    """
+
+    # Seconds a writer waits for the lock before "database is locked"
+    BUSY_TIMEOUT = 10.0
+
+    # Prepared statements kept per connection
+    STATEMENT_CACHE_SIZE = 256
+
+    def __init__(self, db_path: str):
+        """
+        Initialize pool for a database file.
+
+        Args:
+            db_path: Path to SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._slots: Dict[threading.Thread, _Slot] = {}
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        """Open and configure a new connection."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.BUSY_TIMEOUT,
+            cached_statements=self.STATEMENT_CACHE_SIZE,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _close_slot(slot: _Slot):
+        """Close a slot's connection (caller holds _lock)."""
+        conn, slot.conn = slot.conn, None
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _prune_dead_threads(self):
+        """Close connections owned by threads that have exited (caller holds _lock)."""
+        for thread in [t for t in self._slots if not t.is_alive()]:
+            self._close_slot(self._slots.pop(thread))
+
+    def get(self) -> sqlite3.Connection:
+        """
+        Get the calling thread's connection, opening it if needed.
+        Every get() must be paired with a release().
+
+        Returns:
+            sqlite3.Connection owned by the current thread
+        """
+        slot = getattr(self._local, "slot", None)
+        with self._lock:
+            if slot is not None and slot.conn is not None:
+                slot.depth += 1
+                return slot.conn
+
+        slot = _Slot(self._open())
+        slot.depth = 1
+        self._local.slot = slot
+        with self._lock:
+            self._prune_dead_threads()
+            self._slots[threading.current_thread()] = slot
+        return slot.conn
+
+    def release(self, conn: sqlite3.Connection):
+        """
+        Return a connection after use.
+        Rolls back anything left uncommitted so the next user starts clean,
+        and closes the connection if close_all() ran while it was in use.
+
+        Args:
+            conn: Connection obtained from get()
+        """
+        if conn.in_transaction:
+            conn.rollback()
+
+        slot = getattr(self._local, "slot", None)
+        if slot is None or slot.conn is not conn:
+            return
+        with self._lock:
+            slot.depth -= 1
+            if slot.stale and slot.depth == 0:
+                thread = threading.current_thread()
+                if self._slots.get(thread) is slot:
+                    del self._slots[thread]
+                self._close_slot(slot)
+
+    @property
+    def size(self) -> int:
+        """Number of open connections."""
+        with self._lock:
+            return len(self._slots)
+
+    def close_all(self):
+        """
+        Close every pooled connection without pulling one out from under
+        a running query: idle connections (and those of exited threads) are
+        closed now, connections in use are closed by their thread's release().
+
+        Stop background writers first (ProfileRepository.close() closes the
+        status journal before calling this), otherwise their next query
+        simply opens a fresh connection.
+        """
+        with self._lock:
+            for thread, slot in list(self._slots.items()):
+                if slot.depth == 0 or not thread.is_alive():
+                    del self._slots[thread]
+                    self._close_slot(slot)
+                else:
+                    slot.stale = True
@@ -0,0 +1,191 @@
+# Multi-Profile Fingerprint Automation
+# Single-load / single-write access to a profile's Default/Preferences
+
+import json
+import os
+import tempfile
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def write_json_atomic(path: str, data: Any, indent: int = None):
+    """
+    Write JSON to path through a temp file in the same directory and rename.
+    Readers (and Chrome) see either the old or the new file, never a
+    half-written one.
+
+    Args:
+        path: Destination file
+        data: JSON-serializable data
+        indent: Optional json.dump indent
+
+    Raises:
+        OSError: If the file cannot be written
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Sidecar next to Preferences holding only the gologin section
+GOLOGIN_SIDECAR = "gologin.sidecar.json"
+
+
+def _file_stamp(path: str) -> Optional[List[int]]:
+    """[mtime_ns, size] of a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def write_gologin_sidecar(prefs_path: str, gologin: Optional[Dict[str, Any]], stamp: List[int] = None):
+    """
+    Store the gologin section of a Preferences file in its sidecar.
+
+    Args:
+        prefs_path: Path to the Preferences file
+        gologin: gologin section (None if Preferences has none)
+        stamp: [mtime_ns, size] of Preferences the section belongs to;
+               defaults to the file's current stamp
+    """
+    stamp = stamp or _file_stamp(prefs_path)
+    if stamp is None:
+        return
+    sidecar_path = os.path.join(os.path.dirname(prefs_path), GOLOGIN_SIDECAR)
+    try:
+        write_json_atomic(sidecar_path, {"preferences": stamp, "gologin": gologin})
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Error writing gologin sidecar: {e}")
+
+
+def read_gologin_section(prefs_path: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Read only the gologin section of a Preferences file.
+
+    The sidecar is used when it was written for the current (mtime, size)
+    of Preferences; otherwise Preferences is parsed in full and the sidecar
+    refreshed, so files rewritten by Chrome cost one full parse.
+
+    Args:
+        prefs_path: Path to the Preferences file
+
+    Returns:
+        (found, section): found is False if Preferences is missing or invalid
+    """
+    stamp = _file_stamp(prefs_path)
+    if stamp is None:
+        return False, None
+
+    sidecar_path = os.path.join(os.path.dirname(prefs_path), GOLOGIN_SIDECAR)
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            sidecar = json.load(f)
+        if sidecar.get("preferences") == stamp:
+            return True, sidecar.get("gologin")
+    except (OSError, ValueError, AttributeError):
+        pass
+
+    try:
+        with open(prefs_path, "r", encoding="utf-8") as f:
+            prefs = json.load(f)
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Error reading preferences: {e}")
+        return False, None
+    if not isinstance(prefs, dict):
+        return False, None
+
+    gologin = prefs.get("gologin")
+    # Stamp taken before the parse: a concurrent rewrite just forces another parse
+    write_gologin_sidecar(prefs_path, gologin, stamp)
+    return True, gologin
+
+
+class PreferencesDocument:
+    """
+    Default/Preferences of one profile, parsed at most once.
+
+    Pre-launch steps (User-Agent fix, geolocation sync, ...) register their
+    changes with patch(); save() then writes the file once, atomically, and
+    only if something was patched. The gologin sidecar is refreshed too.
+    """
+
+    def __init__(self, profile_path: str):
+        """
+        Initialize PreferencesDocument.
+
+        Args:
+            profile_path: Path to profile directory
+        """
+        self.path = os.path.join(profile_path, "Default", "Preferences")
+        self._data: Optional[Dict[str, Any]] = None
+        self._loaded = False
+        self.dirty = False
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        """
+        Parse the file on first call; later calls return the same dict.
+
+        Returns:
+            Preferences dict, or None if the file is missing or invalid
+        """
+        if not self._loaded:
+            self._loaded = True
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except FileNotFoundError:
+                self._data = None
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error reading preferences: {e}")
+                self._data = None
+        return self._data
+
+    @property
+    def exists(self) -> bool:
+        """True if the Preferences file was loaded."""
+        return self.load() is not None
+
+    def patch(self, apply: Callable[[Dict[str, Any]], None]) -> bool:
+        """
+        Modify the loaded preferences in memory.
+
+        Args:
+            apply: Callable that mutates the preferences dict
+
+        Returns:
+            True if applied, False if there is no Preferences file
+        """
+        prefs = self.load()
+        if prefs is None:
+            return False
+        apply(prefs)
+        self.dirty = True
+        return True
+
+    def save(self) -> bool:
+        """
+        Write pending patches to disk (no-op if nothing changed).
+
+        Returns:
+            True if successful
+        """
+        if not self.dirty:
+            return True
+        try:
+            write_json_atomic(self.path, self._data)
+        except OSError as e:
+            print(f"Error writing preferences: {e}")
+            return False
+        write_gologin_sidecar(self.path, self._data.get("gologin"))
+        self.dirty = False
+        return True
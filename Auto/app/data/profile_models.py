@@ -2,8 +2,9 @@
 # Data Models for Profile Management
 
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import json
+import sys
 
 
 @dataclass
@@ -116,6 +117,30 @@ class ProxyConfig:
 
 
 
+def _geolocation_dict(geo: GeolocationConfig) -> Dict[str, Any]:
+    return {
+        'mode': geo.mode,
+        'enabled': geo.enabled,
+        'customize': geo.customize,
+        'fillBasedOnIp': geo.fillBasedOnIp,
+        'latitude': geo.latitude,
+        'longitude': geo.longitude,
+        'accuracy': geo.accuracy
+    }
+
+
+def _webrtc_dict(rtc: WebRTCConfig) -> Dict[str, Any]:
+    return {
+        'mode': rtc.mode,
+        'enabled': rtc.enabled,
+        'customize': rtc.customize,
+        'fillBasedOnIp': rtc.fillBasedOnIp,
+        'localIpMasking': rtc.localIpMasking,
+        'publicIp': rtc.publicIp,
+        'localIps': list(rtc.localIps)
+    }
+
+
 @dataclass
 class GologinConfig:
     """
@@ -188,8 +213,81 @@ class GologinConfig:
     lockEnabled: bool = False
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for JSON serialization."""
-        return asdict(self)
+        """
+        Convert to dictionary for JSON serialization.
+        Same output as dataclasses.asdict, without its recursive deep copy.
+        """
+        ac, cv, cr, wgl, wglm = self.audioContext, self.canvas, self.clientRects, self.webGL, self.webGLMetadata
+        nav, md, px = self.navigator, self.mediaDevices, self.proxy
+        return {
+            'audioContext': {'enable': ac.enable, 'noiseValue': ac.noiseValue},
+            'canvas': {'mode': cv.mode, 'noise': cv.noise},
+            'canvasNoise': self.canvasNoise,
+            'canvasMode': self.canvasMode,
+            'clientRects': {'mode': cr.mode, 'noise': cr.noise},
+            'getClientRectsNoice': self.getClientRectsNoice,
+            'get_client_rects_noise': self.get_client_rects_noise,
+            'webGL': {'mode': wgl.mode, 'noise': wgl.noise, 'getClientRectsNoise': wgl.getClientRectsNoise},
+            'webGLMetadata': {'mode': wglm.mode, 'renderer': wglm.renderer, 'vendor': wglm.vendor},
+            'webglNoiseValue': self.webglNoiseValue,
+            'webglNoiceEnable': self.webglNoiceEnable,
+            'navigator': {
+                'deviceMemory': nav.deviceMemory,
+                'hardwareConcurrency': nav.hardwareConcurrency,
+                'language': nav.language,
+                'platform': nav.platform,
+                'userAgent': nav.userAgent,
+                'maxTouchPoints': nav.maxTouchPoints,
+                'resolution': nav.resolution,
+                'doNotTrack': nav.doNotTrack
+            },
+            'userAgent': self.userAgent,
+            'hardwareConcurrency': self.hardwareConcurrency,
+            'deviceMemory': self.deviceMemory,
+            'devicePixelRatio': self.devicePixelRatio,
+            'screenWidth': self.screenWidth,
+            'screenHeight': self.screenHeight,
+            'timezone': {'id': self.timezone.id},
+            'geolocation': _geolocation_dict(self.geolocation),
+            'geoLocation': _geolocation_dict(self.geoLocation),
+            'webRTC': _webrtc_dict(self.webRTC),
+            'webRtc': _webrtc_dict(self.webRtc),
+            'fonts': {
+                'enableMasking': self.fonts.enableMasking,
+                'enableDomRect': self.fonts.enableDomRect,
+                'families': list(self.fonts.families)
+            },
+            'mediaDevices': {
+                'enable': md.enable,
+                'enableMasking': md.enableMasking,
+                'audioInputs': md.audioInputs,
+                'audioOutputs': md.audioOutputs,
+                'videoInputs': md.videoInputs,
+                'uid': md.uid
+            },
+            'proxy': {
+                'mode': px.mode,
+                'host': px.host,
+                'port': px.port,
+                'username': px.username,
+                'password': px.password
+            },
+            'proxyEnabled': self.proxyEnabled,
+            'doNotTrack': self.doNotTrack,
+            'browserType': self.browserType,
+            'os': self.os,
+            'name': self.name,
+            'profile_id': self.profile_id,
+            'startUrl': self.startUrl,
+            'langHeader': self.langHeader,
+            'language': self.language,
+            'languages': self.languages,
+            'debugMode': self.debugMode,
+            'googleServicesEnabled': self.googleServicesEnabled,
+            'checkCookies': self.checkCookies,
+            'canBeRunning': self.canBeRunning,
+            'lockEnabled': self.lockEnabled
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'GologinConfig':
@@ -357,6 +455,275 @@ class GologinConfig:
         return config
 
 
+class _SameAsPrimary:
+    """Alias-slot marker in CompactGologinConfig: value equals its primary field."""
+    __slots__ = ()
+    
+    def __repr__(self):
+        return "_SAME"
+    
+    def __reduce__(self):
+        # copy/pickle keep the singleton
+        return "_SAME"
+
+
+_SAME = _SameAsPrimary()
+
+
+def _intern(value):
+    """Intern low-cardinality strings so many configs share one copy."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def _geolocation_tuple(geo: Dict[str, Any]) -> tuple:
+    return (
+        _intern(geo.get('mode', 'block')), geo.get('enabled', True), geo.get('customize', True),
+        geo.get('fillBasedOnIp', True), geo.get('latitude', 0.0), geo.get('longitude', 0.0),
+        geo.get('accuracy', 100)
+    )
+
+
+def _webrtc_tuple(rtc: Dict[str, Any]) -> tuple:
+    return (
+        _intern(rtc.get('mode', 'disabled')), rtc.get('enabled', True), rtc.get('customize', True),
+        rtc.get('fillBasedOnIp', True), rtc.get('localIpMasking', True),
+        rtc.get('publicIp', '') or rtc.get('publicIP', '') or '', tuple(rtc.get('localIps', []))
+    )
+
+
+def _geolocation_from_tuple(geo: tuple) -> Dict[str, Any]:
+    mode, enabled, customize, fill, latitude, longitude, accuracy = geo
+    return {
+        'mode': mode, 'enabled': enabled, 'customize': customize, 'fillBasedOnIp': fill,
+        'latitude': latitude, 'longitude': longitude, 'accuracy': accuracy
+    }
+
+
+def _webrtc_from_tuple(rtc: tuple) -> Dict[str, Any]:
+    mode, enabled, customize, fill, masking, public_ip, local_ips = rtc
+    return {
+        'mode': mode, 'enabled': enabled, 'customize': customize, 'fillBasedOnIp': fill,
+        'localIpMasking': masking, 'publicIp': public_ip, 'localIps': list(local_ips)
+    }
+
+
+_SETTINGS_KEYS = (
+    'doNotTrack', 'browserType', 'os', 'name', 'profile_id', 'startUrl', 'langHeader',
+    'language', 'languages', 'debugMode', 'googleServicesEnabled', 'checkCookies',
+    'canBeRunning', 'lockEnabled'
+)
+_SETTINGS_DEFAULTS = (
+    True, 'chrome', 'win', '', '', 'https://google.com', 'en-US',
+    'en-US', 'en-US', False, True, False, True, False
+)
+
+
+class CompactGologinConfig:
+    """
+    Memory-lean, slotted form of GologinConfig for holding many fingerprints.
+    
+    Sections are stored as tuples in slots. Duplicated data is kept once:
+    geoLocation/webRtc mirror geolocation/webRTC, and canvasNoise,
+    webglNoiseValue, the client-rects copies and the top-level
+    userAgent/hardwareConcurrency/deviceMemory mirror their nested fields.
+    An alias is stored separately only when it differs. Repeated strings
+    (GPU, user agent, timezone, modes) are interned. to_dict() gives the
+    same dict as GologinConfig.to_dict().
+    """
+    
+    __slots__ = (
+        'audio', 'canvas', 'canvas_alias', 'client_rects', 'rects_alias',
+        'webgl', 'webgl_alias', 'webgl_metadata', 'webgl_noise_enable',
+        'navigator', 'navigator_alias', 'device_pixel_ratio', 'screen', 'timezone',
+        'geolocation', 'geolocation_alias', 'webrtc', 'webrtc_alias',
+        'fonts', 'media_devices', 'proxy', 'proxy_enabled', 'settings'
+    )
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CompactGologinConfig':
+        """Create from a gologin dict (same defaults as GologinConfig.from_dict)."""
+        self = cls.__new__(cls)
+        get = data.get
+        
+        ac = get('audioContext')
+        self.audio = (ac.get('enable', True), ac.get('noiseValue', 0.0)) if ac is not None else (True, 0.0)
+        
+        c = get('canvas')
+        self.canvas = (_intern(c.get('mode', 'noise')), c.get('noise', 0.0)) if c is not None else ('noise', 0.0)
+        alias = (get('canvasNoise', 0.0), _intern(get('canvasMode', 'noise')))
+        self.canvas_alias = _SAME if alias == (self.canvas[1], self.canvas[0]) else alias
+        
+        cr = get('clientRects')
+        self.client_rects = (cr.get('mode', True), cr.get('noise', 0)) if cr is not None else (True, 0)
+        
+        wgl = get('webGL')
+        if wgl is not None:
+            self.webgl = (_intern(wgl.get('mode', 'noise')), wgl.get('noise', 0.0))
+            webgl_rects = wgl.get('getClientRectsNoise', 0)
+        else:
+            self.webgl = ('noise', 0.0)
+            webgl_rects = 0
+        rects = self.client_rects[1]
+        alias = (get('getClientRectsNoice', 0), get('get_client_rects_noise', 0), webgl_rects)
+        self.rects_alias = _SAME if alias == (rects, rects, rects) else alias
+        alias = get('webglNoiseValue', 0.0)
+        self.webgl_alias = _SAME if alias == self.webgl[1] else alias
+        
+        wglm = get('webGLMetadata')
+        self.webgl_metadata = (
+            _intern(wglm.get('mode', 'mask')), _intern(wglm.get('renderer', '')), _intern(wglm.get('vendor', ''))
+        ) if wglm is not None else ('mask', '', '')
+        self.webgl_noise_enable = _intern(get('webglNoiceEnable', 'noise'))
+        
+        nav = get('navigator')
+        if nav is not None:
+            self.navigator = (
+                nav.get('deviceMemory', 8), nav.get('hardwareConcurrency', 4),
+                _intern(nav.get('language', 'en-US')), _intern(nav.get('platform', 'Win32')),
+                _intern(nav.get('userAgent', '')), nav.get('maxTouchPoints', 0),
+                _intern(nav.get('resolution', '1920x1080')), nav.get('doNotTrack', True)
+            )
+        else:
+            self.navigator = (8, 4, 'en-US', 'Win32', '', 0, '1920x1080', True)
+        alias = (_intern(get('userAgent', '')), get('hardwareConcurrency', 4), get('deviceMemory', 8))
+        self.navigator_alias = _SAME if alias == (self.navigator[4], self.navigator[1], self.navigator[0]) else alias
+        
+        self.device_pixel_ratio = get('devicePixelRatio', 1.0)
+        self.screen = (get('screenWidth', 1920), get('screenHeight', 1080))
+        tz = get('timezone')
+        self.timezone = _intern(tz.get('id', 'America/New_York')) if tz is not None else 'America/New_York'
+        
+        geo = get('geolocation')
+        self.geolocation = _geolocation_tuple(geo) if geo is not None else _geolocation_tuple({})
+        geo = get('geoLocation')
+        alias = _geolocation_tuple(geo) if geo is not None else _geolocation_tuple({})
+        self.geolocation_alias = _SAME if alias == self.geolocation else alias
+        
+        rtc = get('webRTC')
+        self.webrtc = _webrtc_tuple(rtc) if rtc is not None else _webrtc_tuple({})
+        rtc = get('webRtc')
+        alias = _webrtc_tuple(rtc) if rtc is not None else _webrtc_tuple({})
+        self.webrtc_alias = _SAME if alias == self.webrtc else alias
+        
+        f = get('fonts')
+        self.fonts = (
+            f.get('enableMasking', True), f.get('enableDomRect', True), tuple(f.get('families', []))
+        ) if f is not None else (True, True, ())
+        
+        md = get('mediaDevices')
+        self.media_devices = (
+            md.get('enable', True), md.get('enableMasking', True), md.get('audioInputs', 2),
+            md.get('audioOutputs', 1), md.get('videoInputs', 0), md.get('uid', '')
+        ) if md is not None else (True, True, 2, 1, 0, '')
+        
+        p = get('proxy')
+        self.proxy = (
+            _intern(p.get('mode', 'none')), str(p.get('host', '')), str(p.get('port', '')),
+            p.get('username', ''), p.get('password', '')
+        ) if p is not None else ('none', '', '', '', '')
+        self.proxy_enabled = get('proxyEnabled', False)
+        
+        self.settings = tuple(
+            _intern(get(key, default)) for key, default in zip(_SETTINGS_KEYS, _SETTINGS_DEFAULTS)
+        )
+        return self
+    
+    @classmethod
+    def from_config(cls, config: GologinConfig) -> 'CompactGologinConfig':
+        """Create from a GologinConfig."""
+        return cls.from_dict(config.to_dict())
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Expand to the gologin dict (same layout as GologinConfig.to_dict)."""
+        canvas_mode, canvas_noise = self.canvas
+        canvas_alias = self.canvas_alias if self.canvas_alias is not _SAME else (canvas_noise, canvas_mode)
+        rects = self.client_rects[1]
+        rects_alias = self.rects_alias if self.rects_alias is not _SAME else (rects, rects, rects)
+        webgl_alias = self.webgl_alias if self.webgl_alias is not _SAME else self.webgl[1]
+        nav = self.navigator
+        nav_alias = self.navigator_alias if self.navigator_alias is not _SAME else (nav[4], nav[1], nav[0])
+        geo_alias = self.geolocation_alias if self.geolocation_alias is not _SAME else self.geolocation
+        rtc_alias = self.webrtc_alias if self.webrtc_alias is not _SAME else self.webrtc
+        
+        wm_mode, renderer, vendor = self.webgl_metadata
+        md_enable, md_masking, audio_in, audio_out, video_in, uid = self.media_devices
+        px_mode, host, port, username, password = self.proxy
+        (do_not_track, browser_type, os_name, name, profile_id, start_url, lang_header,
+         language, languages, debug_mode, google_services, check_cookies,
+         can_be_running, lock_enabled) = self.settings
+        
+        return {
+            'audioContext': {'enable': self.audio[0], 'noiseValue': self.audio[1]},
+            'canvas': {'mode': canvas_mode, 'noise': canvas_noise},
+            'canvasNoise': canvas_alias[0],
+            'canvasMode': canvas_alias[1],
+            'clientRects': {'mode': self.client_rects[0], 'noise': rects},
+            'getClientRectsNoice': rects_alias[0],
+            'get_client_rects_noise': rects_alias[1],
+            'webGL': {'mode': self.webgl[0], 'noise': self.webgl[1], 'getClientRectsNoise': rects_alias[2]},
+            'webGLMetadata': {'mode': wm_mode, 'renderer': renderer, 'vendor': vendor},
+            'webglNoiseValue': webgl_alias,
+            'webglNoiceEnable': self.webgl_noise_enable,
+            'navigator': {
+                'deviceMemory': nav[0],
+                'hardwareConcurrency': nav[1],
+                'language': nav[2],
+                'platform': nav[3],
+                'userAgent': nav[4],
+                'maxTouchPoints': nav[5],
+                'resolution': nav[6],
+                'doNotTrack': nav[7]
+            },
+            'userAgent': nav_alias[0],
+            'hardwareConcurrency': nav_alias[1],
+            'deviceMemory': nav_alias[2],
+            'devicePixelRatio': self.device_pixel_ratio,
+            'screenWidth': self.screen[0],
+            'screenHeight': self.screen[1],
+            'timezone': {'id': self.timezone},
+            'geolocation': _geolocation_from_tuple(self.geolocation),
+            'geoLocation': _geolocation_from_tuple(geo_alias),
+            'webRTC': _webrtc_from_tuple(self.webrtc),
+            'webRtc': _webrtc_from_tuple(rtc_alias),
+            'fonts': {'enableMasking': self.fonts[0], 'enableDomRect': self.fonts[1], 'families': list(self.fonts[2])},
+            'mediaDevices': {
+                'enable': md_enable,
+                'enableMasking': md_masking,
+                'audioInputs': audio_in,
+                'audioOutputs': audio_out,
+                'videoInputs': video_in,
+                'uid': uid
+            },
+            'proxy': {'mode': px_mode, 'host': host, 'port': port, 'username': username, 'password': password},
+            'proxyEnabled': self.proxy_enabled,
+            'doNotTrack': do_not_track,
+            'browserType': browser_type,
+            'os': os_name,
+            'name': name,
+            'profile_id': profile_id,
+            'startUrl': start_url,
+            'langHeader': lang_header,
+            'language': language,
+            'languages': languages,
+            'debugMode': debug_mode,
+            'googleServicesEnabled': google_services,
+            'checkCookies': check_cookies,
+            'canBeRunning': can_be_running,
+            'lockEnabled': lock_enabled
+        }
+    
+    def to_config(self) -> GologinConfig:
+        """Expand to a new, independent GologinConfig."""
+        return GologinConfig.from_dict(self.to_dict())
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactGologinConfig):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+    
+    __hash__ = None
+
+
 @dataclass
 class ProfileData:
     """
@@ -441,6 +808,45 @@ class ProfileData:
         )
 
 
+@dataclass
+class ProfileEvent:
+    """
+    Change notification for a single profile.
+    
+    kind is one of: "created", "updated", "deleted", "status", "last_run".
+    created/updated carry the new ProfileData; status/last_run carry
+    old_value/new_value (old_value is set on the copy ProfileCatalog re-emits).
+    """
+    kind: str
+    profile_id: str
+    data: Optional['ProfileData'] = None
+    old_value: Any = None
+    new_value: Any = None
+
+
+@dataclass
+class ProfileQuery:
+    """
+    Composable profile filter evaluated in SQL by ProfileRepository.
+    All criteria are ANDed; None means "don't filter".
+    
+    Results are ordered by (sothutu, id). For keyset pagination pass the
+    cursor of the last row of the previous page as `after`.
+    """
+    status: Optional[str] = None
+    group: Optional[str] = None
+    name_contains: Optional[str] = None
+    search: Optional[str] = None  # substring of name or idprofile
+    has_proxy: Optional[bool] = None
+    after: Optional[Tuple[int, int]] = None  # (sothutu, id) keyset cursor
+    limit: Optional[int] = None
+    
+    @staticmethod
+    def cursor_of(profile: 'ProfileData') -> Tuple[int, int]:
+        """Get keyset cursor for a row returned by a query."""
+        return (profile.sothutu or 0, profile.id)
+
+
 @dataclass
 class Profile:
     """
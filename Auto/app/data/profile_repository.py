@@ -7,10 +7,12 @@
 
 import sqlite3
 import os
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Iterator, Callable, Set, FrozenSet, Iterable
 from contextlib import contextmanager
 
-from app.data.profile_models import ProfileData, Profile, GologinConfig
+from app.data.profile_models import ProfileData, Profile, GologinConfig, ProfileQuery, ProfileEvent
+from app.data.connection_pool import SQLiteConnectionPool
+from app.data.status_journal import StatusJournal, StatusEntry
 
 
 class ProfileRepository:
@@ -48,6 +50,18 @@ class ProfileRepository:
         self.app_db_path = app_db_path  # READ-WRITE
         self.profile_dir = profile_dir
         
+        # Long-lived per-thread connections to the app database
+        self._app_pool = SQLiteConnectionPool(self.app_db_path)
+        
+        # Write-behind queue for status/last_run updates
+        self.status_journal = StatusJournal(self._write_status_batch)
+        
+        # Change listeners (see add_listener)
+        self._listeners: List[Callable[[ProfileEvent], None]] = []
+        
+        # (profile_dir mtime_ns, set of profile IDs) from the last scandir
+        self._existing_ids_cache: Optional[Tuple[int, FrozenSet[str]]] = None
+        
         # Initialize app database
         self._init_app_database()
         
@@ -98,6 +112,28 @@ class ProfileRepository:
                 )
             """)
             
+            # Indexes for filtered/paginated profile queries
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_app_profiles_group ON app_profiles (group_profile, sothutu)")
+            # Display/keyset order; NULL sothutu sorts as 0 (see PROFILE_ORDER)
+            cursor.execute("DROP INDEX IF EXISTS idx_app_profiles_sothutu")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_app_profiles_order ON app_profiles (COALESCE(sothutu, 0), id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_app_profiles_status ON app_profiles (status)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_profile_status_status ON profile_status (status)")
+            
+            # Main database sync high-water mark (see _import_from_main_db)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    source TEXT PRIMARY KEY,
+                    last_rowid INTEGER DEFAULT 0,
+                    last_idprofile TEXT DEFAULT '',
+                    file_signature TEXT DEFAULT '',
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            sync_columns = {row[1] for row in cursor.execute("PRAGMA table_info(sync_state)")}
+            if "last_idprofile" not in sync_columns:
+                cursor.execute("ALTER TABLE sync_state ADD COLUMN last_idprofile TEXT DEFAULT ''")
+            
             # Table for session logs
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS session_logs (
@@ -114,57 +150,122 @@ class ProfileRepository:
     def _sync_from_main_db(self):
         """
         Sync profiles from main database to app database.
-        Only imports profiles that don't exist in app database yet.
-        This ensures new profiles added by other apps are imported.
+        Only imports rows added to the main database since the last sync,
+        so new profiles from other apps arrive while profiles deleted in
+        this app stay deleted (resync_from_main_db(full=True) restores them).
+        """
+        count = self._import_from_main_db()
+        if count:
+            print(f"Synced {count} new profiles from main database")
+    
+    # Columns copied from danhsachacc into app_profiles
+    IMPORT_COLUMNS = [
+        'name', 'idprofile', 'proxymode', 'proxy', 'status',
+        'username_fb', 'password_fb', 'ma2fa', 'list_uid', 'list_group',
+        'control_fb', 'username_gmail', 'password_gmail', 'gmail_khoiphuc',
+        'sothutu', 'notes', 'cookies', 'group_profile', 'last_run'
+    ]
+    
+    def _main_db_signature(self) -> str:
+        """
+        Get change signature of the main database files (mtime + size).
+        Includes the -wal file in case the other app writes in WAL mode.
+        """
+        parts = []
+        for path in (self.db_path, self.db_path + "-wal"):
+            try:
+                st = os.stat(path)
+                parts.append(f"{st.st_mtime_ns}:{st.st_size}")
+            except OSError:
+                parts.append("-")
+        return "|".join(parts)
+    
+    def _import_from_main_db(self, full: bool = False) -> int:
+        """
+        Import new danhsachacc rows into app_profiles.
+        
+        Incremental by default: skips the main database entirely when its
+        file signature is unchanged, otherwise reads only rows above the
+        stored rowid high-water mark. Falls back to a full read when the
+        row at the mark is gone or holds a different idprofile (file
+        replaced, or the last row deleted and its rowid reused).
+        Rows are inserted with one executemany in a single transaction;
+        existing idprofile values are ignored by the UNIQUE constraint.
+        
+        Because old rows are not re-read, profiles deleted in the app are
+        not re-imported by incremental syncs; only a full read (full=True
+        or the fallback above) brings them back.
+        
+        Args:
+            full: Ignore the high-water mark and read every row
+            
+        Returns:
+            Number of new profiles imported
         """
         if not os.path.exists(self.db_path):
-            return
+            return 0
         
         try:
-            # Get existing profile IDs in app database
-            existing_ids = set()
+            signature = self._main_db_signature()
+            last_rowid = 0
+            last_idprofile = ""
+            
             with self._get_app_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT idprofile FROM app_profiles")
-                existing_ids = {row['idprofile'] for row in cursor.fetchall()}
+                row = conn.execute(
+                    "SELECT last_rowid, last_idprofile, file_signature FROM sync_state WHERE source = ?",
+                    (self.db_path,)
+                ).fetchone()
             
-            # Get profiles from main database
+            if row and not full:
+                if row['file_signature'] == signature:
+                    return 0
+                last_rowid = row['last_rowid'] or 0
+                last_idprofile = row['last_idprofile'] or ""
+            
+            # Read rows above the high-water mark from main database
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("SELECT * FROM danhsachacc")
-                rows = cursor.fetchall()
+                if last_rowid:
+                    at_mark = cursor.execute(
+                        "SELECT idprofile FROM danhsachacc WHERE rowid = ?", (last_rowid,)
+                    ).fetchone()
+                    if at_mark is None or (at_mark[0] or "") != last_idprofile:
+                        last_rowid = 0
+                
+                max_row = cursor.execute(
+                    "SELECT rowid, idprofile FROM danhsachacc ORDER BY rowid DESC LIMIT 1"
+                ).fetchone()
+                max_rowid, max_idprofile = (max_row[0], max_row[1] or "") if max_row else (0, "")
                 
-                # Import new profiles to app database
-                new_profiles = []
-                for row in rows:
-                    profile = ProfileData.from_db_row(tuple(row), list(row.keys()))
-                    if profile.idprofile and profile.idprofile not in existing_ids:
-                        new_profiles.append(profile)
+                cursor.execute(
+                    "SELECT * FROM danhsachacc WHERE rowid > ? ORDER BY rowid",
+                    (last_rowid,)
+                )
+                columns = [col[0] for col in cursor.description]
+                new_rows = []
+                for db_row in cursor:
+                    profile = ProfileData.from_db_row(tuple(db_row), columns)
+                    if profile.idprofile:
+                        new_rows.append(tuple(getattr(profile, col) for col in self.IMPORT_COLUMNS))
             
-            # Insert new profiles into app database
-            if new_profiles:
-                with self._get_app_connection() as conn:
-                    cursor = conn.cursor()
-                    for profile in new_profiles:
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO app_profiles (
-                                name, idprofile, proxymode, proxy, status,
-                                username_fb, password_fb, ma2fa, list_uid, list_group,
-                                control_fb, username_gmail, password_gmail, gmail_khoiphuc,
-                                sothutu, notes, cookies, group_profile, last_run
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            profile.name, profile.idprofile, profile.proxymode, profile.proxy,
-                            profile.status, profile.username_fb, profile.password_fb,
-                            profile.ma2fa, profile.list_uid, profile.list_group,
-                            profile.control_fb, profile.username_gmail, profile.password_gmail,
-                            profile.gmail_khoiphuc, profile.sothutu, profile.notes,
-                            profile.cookies, profile.group_profile, profile.last_run
-                        ))
-                    conn.commit()
-                    print(f"Synced {len(new_profiles)} new profiles from main database")
+            # Insert new profiles and advance the mark in one transaction
+            with self._get_app_connection() as conn:
+                before = conn.total_changes
+                conn.executemany(f"""
+                    INSERT OR IGNORE INTO app_profiles ({', '.join(self.IMPORT_COLUMNS)})
+                    VALUES ({', '.join('?' * len(self.IMPORT_COLUMNS))})
+                """, new_rows)
+                imported = conn.total_changes - before
+                conn.execute("""
+                    INSERT OR REPLACE INTO sync_state (source, last_rowid, last_idprofile, file_signature, updated_at)
+                    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+                """, (self.db_path, max_rowid, max_idprofile, signature))
+                conn.commit()
+            
+            return imported
         except sqlite3.Error as e:
             print(f"Error syncing from main database: {e}")
+            return 0
     
     @contextmanager
     def _get_connection(self):
@@ -178,37 +279,92 @@ class ProfileRepository:
     
     @contextmanager
     def _get_app_connection(self):
-        """Context manager for READ-WRITE app database connections."""
-        conn = sqlite3.connect(self.app_db_path)
-        conn.row_factory = sqlite3.Row
+        """
+        Context manager for READ-WRITE app database connections.
+        Yields the calling thread's pooled connection (WAL mode); uncommitted
+        work is rolled back on exit instead of closing the connection.
+        """
+        conn = self._app_pool.get()
         try:
             yield conn
         finally:
-            conn.close()
+            self._app_pool.release(conn)
+    
+    def add_listener(self, callback: Callable[[ProfileEvent], None]):
+        """
+        Register a callback for profile writes made through this repository.
+        Callbacks run synchronously on the writing thread.
+        
+        Args:
+            callback: Called with a ProfileEvent after each successful write
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[ProfileEvent], None]):
+        """Unregister a callback added with add_listener."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+    
+    def _notify(self, event: ProfileEvent):
+        """Deliver an event to all listeners."""
+        for callback in list(self._listeners):
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"Profile listener error: {e}")
+    
+    def close(self):
+        """Flush pending status updates and close all pooled connections."""
+        self.status_journal.close()
+        self._app_pool.close_all()
+    
+    # Profile read path: app_profiles joined with its profile_status override.
+    # Empty/NULL overrides fall back to the app_profiles value.
+    PROFILE_SELECT = """
+        SELECT
+            p.id, p.name, p.idprofile, p.proxymode, p.proxy,
+            COALESCE(NULLIF(s.status, ''), p.status) AS status,
+            p.username_fb, p.password_fb, p.ma2fa, p.list_uid, p.list_group,
+            p.control_fb, p.username_gmail, p.password_gmail, p.gmail_khoiphuc,
+            p.sothutu, p.notes, p.cookies, p.group_profile,
+            COALESCE(NULLIF(s.last_run, ''), p.last_run) AS last_run
+        FROM app_profiles p
+        LEFT JOIN profile_status s ON s.idprofile = p.idprofile
+    """
+    
+    # Display and keyset order. NULL sothutu counts as 0 so the row-value
+    # cursor comparison in _build_filter never hits NULL.
+    PROFILE_ORDER = "ORDER BY COALESCE(p.sothutu, 0), p.id"
+    
+    def _query_profiles(self, where: str = "", params: tuple = ()) -> List[ProfileData]:
+        """
+        Run the joined profile query on a single connection.
+        
+        Args:
+            where: Optional SQL clause appended after the JOIN (WHERE/ORDER BY)
+            params: Query parameters
+            
+        Returns:
+            List of merged ProfileData objects
+        """
+        self._flush_pending_status()
+        with self._get_app_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"{self.PROFILE_SELECT} {where}", params)
+            columns = [col[0] for col in cursor.description]
+            return [ProfileData.from_db_row(tuple(row), columns) for row in cursor.fetchall()]
     
     def get_all_profiles(self) -> List[ProfileData]:
         """
         Query all profiles from app database.
         Profiles are synced from main db on startup, so app_profiles contains all data.
-        Merges status from profile_status table.
+        Status and last_run overrides from profile_status are merged in the same query.
         
         Returns:
             List of ProfileData objects
         """
-        profiles = []
-        
-        # Get profiles from app database (contains synced + new profiles)
-        with self._get_app_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT * FROM app_profiles ORDER BY sothutu, id")
-            rows = cursor.fetchall()
-            
-            for row in rows:
-                profile = ProfileData.from_db_row(tuple(row), list(row.keys()))
-                profile = self._merge_app_status(profile)
-                profiles.append(profile)
-        
-        return profiles
+        return self._query_profiles(self.PROFILE_ORDER)
     
     def get_profile_by_id(self, profile_id: str) -> Optional[ProfileData]:
         """
@@ -221,37 +377,8 @@ class ProfileRepository:
         Returns:
             ProfileData if found, None otherwise
         """
-        with self._get_app_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM app_profiles WHERE idprofile = ?",
-                (profile_id,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                profile = ProfileData.from_db_row(tuple(row), list(row.keys()))
-                return self._merge_app_status(profile)
-        
-        return None
-    
-    def _merge_app_status(self, profile: ProfileData) -> ProfileData:
-        """Merge status and last_run from app database."""
-        with self._get_app_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT status, last_run FROM profile_status WHERE idprofile = ?",
-                (profile.idprofile,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                if row['status']:
-                    profile.status = row['status']
-                if row['last_run']:
-                    profile.last_run = row['last_run']
-        
-        return profile
+        profiles = self._query_profiles("WHERE p.idprofile = ?", (profile_id,))
+        return profiles[0] if profiles else None
     
     def get_profile_by_db_id(self, db_id: int) -> Optional[ProfileData]:
         """
@@ -263,18 +390,36 @@ class ProfileRepository:
         Returns:
             ProfileData if found, None otherwise
         """
-        with self._get_app_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT * FROM app_profiles WHERE id = ?",
-                (db_id,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                profile = ProfileData.from_db_row(tuple(row), list(row.keys()))
-                return self._merge_app_status(profile)
-            return None
+        profiles = self._query_profiles("WHERE p.id = ?", (db_id,))
+        return profiles[0] if profiles else None
+    
+    INSERT_PROFILE_SQL = """
+        INSERT INTO app_profiles (
+            name, idprofile, proxymode, proxy, status,
+            username_fb, password_fb, ma2fa, list_uid, list_group,
+            control_fb, username_gmail, password_gmail, gmail_khoiphuc,
+            sothutu, notes, cookies, group_profile, last_run
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    @staticmethod
+    def _insert_params(profile: ProfileData) -> tuple:
+        """Parameters for INSERT_PROFILE_SQL."""
+        return (
+            profile.name, profile.idprofile, profile.proxymode, profile.proxy,
+            profile.status, profile.username_fb, profile.password_fb,
+            profile.ma2fa, profile.list_uid, profile.list_group,
+            profile.control_fb, profile.username_gmail, profile.password_gmail,
+            profile.gmail_khoiphuc, profile.sothutu, profile.notes,
+            profile.cookies, profile.group_profile, profile.last_run
+        )
+    
+    @staticmethod
+    def _stored_copy(profile: ProfileData, rowid: int) -> ProfileData:
+        """Copy of an inserted profile carrying its new rowid (for created events)."""
+        data = ProfileData.from_dict(profile.to_dict())
+        data.id = rowid
+        return data
     
     def create_profile(self, profile: ProfileData) -> bool:
         """
@@ -289,27 +434,77 @@ class ProfileRepository:
         with self._get_app_connection() as conn:
             cursor = conn.cursor()
             try:
-                cursor.execute("""
-                    INSERT INTO app_profiles (
-                        name, idprofile, proxymode, proxy, status,
-                        username_fb, password_fb, ma2fa, list_uid, list_group,
-                        control_fb, username_gmail, password_gmail, gmail_khoiphuc,
-                        sothutu, notes, cookies, group_profile, last_run
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    profile.name, profile.idprofile, profile.proxymode, profile.proxy,
-                    profile.status, profile.username_fb, profile.password_fb,
-                    profile.ma2fa, profile.list_uid, profile.list_group,
-                    profile.control_fb, profile.username_gmail, profile.password_gmail,
-                    profile.gmail_khoiphuc, profile.sothutu, profile.notes,
-                    profile.cookies, profile.group_profile, profile.last_run
-                ))
+                cursor.execute(self.INSERT_PROFILE_SQL, self._insert_params(profile))
                 conn.commit()
+                self._notify(ProfileEvent(
+                    "created", profile.idprofile, data=self._stored_copy(profile, cursor.lastrowid)
+                ))
                 return True
             except sqlite3.Error as e:
                 print(f"Database error: {e}")
                 return False
     
+    def create_profiles(self, profiles: List[ProfileData]) -> bool:
+        """
+        Insert many profile records in one transaction.
+        Either all rows are inserted or none are.
+        
+        Args:
+            profiles: ProfileData records to insert
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        with self._get_app_connection() as conn:
+            try:
+                conn.executemany(self.INSERT_PROFILE_SQL, [self._insert_params(p) for p in profiles])
+                rowids = self._rowids_of(conn, [p.idprofile for p in profiles])
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                print(f"Database error: {e}")
+                return False
+        
+        for profile in profiles:
+            data = self._stored_copy(profile, rowids.get(profile.idprofile, 0))
+            self._notify(ProfileEvent("created", data.idprofile, data=data))
+        return True
+    
+    # Bound parameters per IN (...) query, below SQLite's variable limit
+    IN_CHUNK_SIZE = 500
+    
+    def _rowids_of(self, conn, profile_ids: List[str]) -> Dict[str, int]:
+        """
+        Look up app_profiles rowids for many profiles.
+        
+        Args:
+            conn: Connection to query (may be inside a transaction)
+            profile_ids: Profile IDs to look up
+            
+        Returns:
+            Dict of idprofile -> id
+        """
+        rowids = {}
+        for start in range(0, len(profile_ids), self.IN_CHUNK_SIZE):
+            chunk = profile_ids[start:start + self.IN_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            rowids.update(
+                (row[1], row[0]) for row in conn.execute(
+                    f"SELECT id, idprofile FROM app_profiles WHERE idprofile IN ({placeholders})", chunk
+                )
+            )
+        return rowids
+    
+    def get_all_profile_ids(self) -> Set[str]:
+        """
+        Get the IDs of all profiles in the app database.
+        
+        Returns:
+            Set of profile IDs
+        """
+        with self._get_app_connection() as conn:
+            return {row[0] for row in conn.execute("SELECT idprofile FROM app_profiles")}
+    
     def update_profile(self, profile: ProfileData) -> bool:
         """
         Update existing profile record in APP database.
@@ -340,6 +535,7 @@ class ProfileRepository:
                     profile.cookies, profile.group_profile, profile.last_run
                 ))
                 conn.commit()
+                self._notify(ProfileEvent("updated", profile.idprofile, data=profile))
                 return True
             except sqlite3.Error as e:
                 print(f"Database error: {e}")
@@ -350,49 +546,92 @@ class ProfileRepository:
         Update only the status field of a profile in APP database.
         Stores status override in profile_status table.
         
+        The update is queued in the status journal and written in the next
+        batch; reads through this repository flush the journal first.
+        
         Args:
             profile_id: The profile ID
             status: New status value
             
         Returns:
-            True if successful, False otherwise
+            True if the update was queued
         """
-        with self._get_app_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO profile_status (idprofile, status, updated_at)
-                    VALUES (?, ?, CURRENT_TIMESTAMP)
-                """, (profile_id, status))
-                conn.commit()
-                return True
-            except sqlite3.Error as e:
-                print(f"Database error: {e}")
-                return False
+        self.status_journal.record(profile_id, status=status)
+        self._notify(ProfileEvent("status", profile_id, new_value=status))
+        return True
     
     def update_last_run(self, profile_id: str, last_run: str) -> bool:
         """
         Update the last_run field of a profile in APP database.
+        Queued in the status journal like update_profile_status.
         
         Args:
             profile_id: The profile ID
             last_run: Last run timestamp string
             
         Returns:
-            True if successful, False otherwise
+            True if the update was queued
+        """
+        self.status_journal.record(profile_id, last_run=last_run)
+        self._notify(ProfileEvent("last_run", profile_id, new_value=last_run))
+        return True
+    
+    def update_profile_statuses(self, profile_ids: Iterable[str], status: str) -> bool:
+        """
+        Set the same status on many profiles; written as one journal batch.
+        
+        Args:
+            profile_ids: Profile IDs to update
+            status: New status value
+            
+        Returns:
+            True if the updates were written
+        """
+        for profile_id in profile_ids:
+            self.status_journal.record(profile_id, status=status)
+            self._notify(ProfileEvent("status", profile_id, new_value=status))
+        self.status_journal.flush()
+        return True
+    
+    def flush_status_updates(self) -> int:
+        """
+        Write queued status/last_run updates immediately.
+        
+        Returns:
+            Number of profiles written
+        """
+        return self.status_journal.flush()
+    
+    def _flush_pending_status(self):
+        """
+        Write queued status updates before a read that depends on them.
+        Skipped when nothing is queued, so reads on the Qt thread don't
+        open a write transaction (or wait on the flusher) for nothing.
+        """
+        if self.status_journal.pending_count:
+            self.status_journal.flush()
+    
+    def _write_status_batch(self, entries: List[StatusEntry]):
+        """
+        Persist coalesced status journal entries in one transaction.
+        A None status/last_run keeps the stored value; new rows default to 'inactive'.
+        
+        Args:
+            entries: List of (profile_id, status, last_run)
         """
         with self._get_app_connection() as conn:
-            cursor = conn.cursor()
-            try:
-                cursor.execute("""
-                    INSERT OR REPLACE INTO profile_status (idprofile, status, last_run, updated_at)
-                    VALUES (?, COALESCE((SELECT status FROM profile_status WHERE idprofile = ?), 'inactive'), ?, CURRENT_TIMESTAMP)
-                """, (profile_id, profile_id, last_run))
-                conn.commit()
-                return True
-            except sqlite3.Error as e:
-                print(f"Database error: {e}")
-                return False
+            conn.executemany("""
+                INSERT INTO profile_status (idprofile, status, last_run, updated_at)
+                VALUES (:id, COALESCE(:status, 'inactive'), :last_run, CURRENT_TIMESTAMP)
+                ON CONFLICT(idprofile) DO UPDATE SET
+                    status = COALESCE(:status, profile_status.status),
+                    last_run = COALESCE(:last_run, profile_status.last_run),
+                    updated_at = CURRENT_TIMESTAMP
+            """, [
+                {'id': pid, 'status': status, 'last_run': last_run}
+                for pid, status, last_run in entries
+            ])
+            conn.commit()
     
     def delete_profile(self, profile_id: str) -> bool:
         """
@@ -405,6 +644,7 @@ class ProfileRepository:
         Returns:
             True if successful, False otherwise
         """
+        self.status_journal.discard(profile_id)
         with self._get_app_connection() as conn:
             cursor = conn.cursor()
             try:
@@ -419,6 +659,7 @@ class ProfileRepository:
                     (profile_id,)
                 )
                 conn.commit()
+                self._notify(ProfileEvent("deleted", profile_id))
                 return True
             except sqlite3.Error as e:
                 print(f"Database error: {e}")
@@ -449,10 +690,145 @@ class ProfileRepository:
         path = self.get_profile_path(profile_id)
         return os.path.isdir(path)
     
+    def get_existing_profile_ids(self) -> Set[str]:
+        """
+        Get IDs of all profile directories with a single scandir.
+        The result is cached and reused while profile_dir's mtime is
+        unchanged (creating or removing a profile directory bumps it).
+        Callers get their own copy, so mutating it cannot corrupt the cache.
+        
+        Returns:
+            Set of profile IDs that have a directory
+        """
+        try:
+            mtime = os.stat(self.profile_dir).st_mtime_ns
+        except OSError:
+            return set()
+        
+        cached = self._existing_ids_cache
+        if cached and cached[0] == mtime:
+            return set(cached[1])
+        
+        with os.scandir(self.profile_dir) as entries:
+            ids = frozenset(entry.name for entry in entries if entry.is_dir())
+        self._existing_ids_cache = (mtime, ids)
+        return set(ids)
+    
+    def _build_filter(self, query: ProfileQuery) -> Tuple[str, list]:
+        """
+        Translate a ProfileQuery into a WHERE clause over the joined select.
+        
+        Args:
+            query: ProfileQuery criteria
+            
+        Returns:
+            (where_clause, params) - where_clause is empty if nothing to filter
+        """
+        conditions = []
+        params = []
+        
+        if query.status is not None:
+            # Effective status: non-empty override wins, else app_profiles.status.
+            # Written as IN-subqueries so both status indexes can be used.
+            conditions.append("""(
+                p.idprofile IN (SELECT idprofile FROM profile_status WHERE status = ? AND status <> '')
+                OR (p.status = ? AND p.idprofile NOT IN (
+                    SELECT idprofile FROM profile_status WHERE status IS NOT NULL AND status <> ''
+                ))
+            )""")
+            params.extend([query.status, query.status])
+        
+        if query.group is not None:
+            conditions.append("p.group_profile = ?")
+            params.append(query.group)
+        
+        if query.name_contains:
+            conditions.append("p.name LIKE ? ESCAPE '\\'")
+            params.append(f"%{self._escape_like(query.name_contains)}%")
+        
+        if query.search:
+            pattern = f"%{self._escape_like(query.search)}%"
+            conditions.append("(p.name LIKE ? ESCAPE '\\' OR p.idprofile LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        
+        if query.has_proxy is True:
+            conditions.append("(p.proxy IS NOT NULL AND p.proxy <> '')")
+        elif query.has_proxy is False:
+            conditions.append("(p.proxy IS NULL OR p.proxy = '')")
+        
+        if query.after is not None:
+            conditions.append("(COALESCE(p.sothutu, 0), p.id) > (?, ?)")
+            params.extend(query.after)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+    
+    @staticmethod
+    def _escape_like(text: str) -> str:
+        """Escape LIKE wildcards in user input."""
+        return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    
+    def query_profiles(self, query: ProfileQuery) -> List[ProfileData]:
+        """
+        Get profiles matching a composable query, filtered in SQL.
+        
+        Args:
+            query: ProfileQuery criteria (status, group, name, proxy, paging)
+            
+        Returns:
+            List of matching ProfileData objects ordered by (sothutu, id)
+        """
+        where, params = self._build_filter(query)
+        clause = f"{where} {self.PROFILE_ORDER}"
+        if query.limit is not None:
+            clause += " LIMIT ?"
+            params.append(query.limit)
+        return self._query_profiles(clause, tuple(params))
+    
+    def iter_profiles(self, query: ProfileQuery = None, page_size: int = 500) -> Iterator[ProfileData]:
+        """
+        Iterate over matching profiles page by page using the keyset cursor.
+        Only one page is held in memory at a time.
+        
+        Args:
+            query: ProfileQuery criteria (limit/after are managed here)
+            page_size: Rows fetched per query
+            
+        Yields:
+            ProfileData objects ordered by (sothutu, id)
+        """
+        query = query or ProfileQuery()
+        page_query = ProfileQuery(**{**query.__dict__, 'limit': page_size})
+        
+        while True:
+            page = self.query_profiles(page_query)
+            yield from page
+            if len(page) < page_size:
+                return
+            page_query.after = ProfileQuery.cursor_of(page[-1])
+    
+    def count_matching(self, query: ProfileQuery) -> int:
+        """
+        Count profiles matching a query without loading them.
+        
+        Args:
+            query: ProfileQuery criteria (limit/after are ignored)
+            
+        Returns:
+            Number of matching profiles
+        """
+        where, params = self._build_filter(ProfileQuery(**{**query.__dict__, 'after': None, 'limit': None}))
+        if query.status is not None:
+            self._flush_pending_status()
+        with self._get_app_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT COUNT(*) FROM app_profiles p {where}", tuple(params))
+            return cursor.fetchone()[0]
+    
     def get_profiles_by_status(self, status: str) -> List[ProfileData]:
         """
         Get profiles filtered by status.
-        Checks app database status overrides.
+        Filters on the effective status (app database override first).
         
         Args:
             status: Status to filter by
@@ -460,9 +836,7 @@ class ProfileRepository:
         Returns:
             List of matching ProfileData objects
         """
-        # Get all profiles and filter by effective status
-        all_profiles = self.get_all_profiles()
-        return [p for p in all_profiles if p.status == status]
+        return self.query_profiles(ProfileQuery(status=status))
     
     def get_profiles_by_group(self, group: str) -> List[ProfileData]:
         """
@@ -474,8 +848,7 @@ class ProfileRepository:
         Returns:
             List of matching ProfileData objects
         """
-        all_profiles = self.get_all_profiles()
-        return [p for p in all_profiles if p.group_profile == group]
+        return self.query_profiles(ProfileQuery(group=group))
     
     def count_profiles(self) -> int:
         """
@@ -489,60 +862,15 @@ class ProfileRepository:
             cursor.execute("SELECT COUNT(*) FROM app_profiles")
             return cursor.fetchone()[0]
     
-    def resync_from_main_db(self) -> int:
+    def resync_from_main_db(self, full: bool = False) -> int:
         """
         Force resync profiles from main database.
         Call this to import new profiles added by other apps.
         
+        Args:
+            full: Re-read the whole main table instead of only new rows
+        
         Returns:
             Number of new profiles imported
         """
-        if not os.path.exists(self.db_path):
-            return 0
-        
-        try:
-            # Get existing profile IDs in app database
-            existing_ids = set()
-            with self._get_app_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT idprofile FROM app_profiles")
-                existing_ids = {row['idprofile'] for row in cursor.fetchall()}
-            
-            # Get profiles from main database
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM danhsachacc")
-                rows = cursor.fetchall()
-                
-                new_profiles = []
-                for row in rows:
-                    profile = ProfileData.from_db_row(tuple(row), list(row.keys()))
-                    if profile.idprofile and profile.idprofile not in existing_ids:
-                        new_profiles.append(profile)
-            
-            # Insert new profiles
-            if new_profiles:
-                with self._get_app_connection() as conn:
-                    cursor = conn.cursor()
-                    for profile in new_profiles:
-                        cursor.execute("""
-                            INSERT OR IGNORE INTO app_profiles (
-                                name, idprofile, proxymode, proxy, status,
-                                username_fb, password_fb, ma2fa, list_uid, list_group,
-                                control_fb, username_gmail, password_gmail, gmail_khoiphuc,
-                                sothutu, notes, cookies, group_profile, last_run
-                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            profile.name, profile.idprofile, profile.proxymode, profile.proxy,
-                            profile.status, profile.username_fb, profile.password_fb,
-                            profile.ma2fa, profile.list_uid, profile.list_group,
-                            profile.control_fb, profile.username_gmail, profile.password_gmail,
-                            profile.gmail_khoiphuc, profile.sothutu, profile.notes,
-                            profile.cookies, profile.group_profile, profile.last_run
-                        ))
-                    conn.commit()
-            
-            return len(new_profiles)
-        except sqlite3.Error as e:
-            print(f"Error resyncing from main database: {e}")
-            return 0
+        return self._import_from_main_db(full=full)
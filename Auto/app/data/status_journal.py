@@ -0,0 +1,174 @@
+# Multi-Profile Fingerprint Automation
+# Write-behind journal for profile status / last_run updates
+
+import atexit
+import threading
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# (profile_id, status, last_run) - None means "leave unchanged"
+StatusEntry = Tuple[str, Optional[str], Optional[str]]
+
+# Live journals, flushed by one atexit hook
+_journals: "weakref.WeakSet[StatusJournal]" = weakref.WeakSet()
+
+
+class StatusJournal:
+    """
+    In-process queue of profile status updates.
+
+    Updates are coalesced per profile (latest status and latest last_run win)
+    and handed to `write_batch` together, so N launches cost one transaction
+    instead of 2N single-row commits. One persistent background thread sleeps
+    until an update is recorded, lets the burst coalesce for `interval`
+    seconds and flushes it; being a single thread, it keeps one pooled
+    connection for its whole life. Pending updates are also flushed by
+    flush(), close() and at interpreter exit.
+    """
+
+    FLUSH_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[StatusEntry]], None],
+        interval: float = None
+    ):
+        """
+        Initialize journal.
+
+        Args:
+            write_batch: Callable that persists a list of entries in one transaction
+            interval: Seconds a burst of updates coalesces before the background flush
+        """
+        self._write_batch = write_batch
+        self.interval = interval if interval is not None else self.FLUSH_INTERVAL
+        self._pending: Dict[str, List[Optional[str]]] = {}
+        # Profiles taken by a flush that has not committed yet
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        # Serializes writers so a flush() returns only after earlier batches committed
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+        _journals.add(self)
+
+    def record(self, profile_id: str, status: str = None, last_run: str = None):
+        """
+        Queue an update for a profile.
+
+        Args:
+            profile_id: The profile ID
+            status: New status (None keeps the current one)
+            last_run: New last_run timestamp (None keeps the current one)
+        """
+        with self._lock:
+            entry = self._pending.setdefault(profile_id, [None, None])
+            if status is not None:
+                entry[0] = status
+            if last_run is not None:
+                entry[1] = last_run
+            self._ensure_thread()
+        self._wakeup.set()
+
+    def discard(self, profile_id: str):
+        """
+        Drop pending updates for a profile (e.g. when it is deleted).
+        Waits for a batch being written, so once this returns no update
+        for the profile can still land (delete its rows afterwards).
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._pending.pop(profile_id, None)
+
+    @property
+    def pending_count(self) -> int:
+        """Number of profiles with uncommitted updates (queued or being written)."""
+        with self._lock:
+            return len(self._pending) + self._in_flight
+
+    def flush(self) -> int:
+        """
+        Write all pending updates now.
+
+        Returns:
+            Number of profiles written
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch, self._pending = self._pending, {}
+                self._in_flight = len(batch)
+
+            entries = [(pid, values[0], values[1]) for pid, values in batch.items()]
+            written = False
+            try:
+                self._write_batch(entries)
+                written = True
+            except Exception as e:
+                print(f"Error flushing status journal: {e}")
+            finally:
+                with self._lock:
+                    self._in_flight = 0
+                    if not written:
+                        # Re-queue; updates recorded meanwhile are newer and win
+                        for pid, values in batch.items():
+                            entry = self._pending.setdefault(pid, [None, None])
+                            entry[0] = entry[0] if entry[0] is not None else values[0]
+                            entry[1] = entry[1] if entry[1] is not None else values[1]
+                if not written:
+                    # Retry on the flusher's next round instead of waiting for another update
+                    self._wakeup.set()
+            return len(entries) if written else 0
+
+    def close(self):
+        """Stop the background thread and flush what is left."""
+        self._closed = True
+        self._stop.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread and thread is not threading.current_thread():
+            thread.join(timeout=5.0)
+        self.flush()
+        self._warn_unwritten()
+
+    def _warn_unwritten(self):
+        """Say so if updates could not be written and are about to be lost."""
+        with self._lock:
+            lost = len(self._pending)
+        if lost:
+            print(f"Status journal: {lost} profile update(s) could not be written and are lost")
+
+    def _ensure_thread(self):
+        """Start the background flusher once (caller holds _lock)."""
+        if self._closed or (self._thread and self._thread.is_alive()):
+            return
+        self._thread = threading.Thread(target=self._run, name="StatusJournal", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        """Background loop: wait for updates, coalesce for `interval`, flush."""
+        while True:
+            self._wakeup.wait()
+            if self._closed:
+                return
+            # Let the burst coalesce; close() cuts the wait short
+            self._stop.wait(self.interval)
+            if self._closed:
+                return
+            self._wakeup.clear()
+            self.flush()
+
+
+def _flush_at_exit():
+    """atexit hook: flush every journal still alive."""
+    for journal in list(_journals):
+        journal.flush()
+        journal._warn_unwritten()
+
+
+atexit.register(_flush_at_exit)
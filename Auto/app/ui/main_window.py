@@ -2,6 +2,7 @@
 
 import os
 import subprocess
+import threading
 import time
 import psutil
 from typing import List, Optional
@@ -13,18 +14,21 @@ from PyQt5.QtWidgets import (
     QHeaderView, QAbstractItemView, QCheckBox, QTextEdit, QTabWidget,
     QFrame, QListWidget, QFormLayout, QApplication, QDialog, QDialogButtonBox
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QColor
 
 from app.data.profile_repository import ProfileRepository
-from app.data.profile_models import Profile
+from app.data.profile_models import Profile, ProfileEvent
 from app.core.profile_manager import ProfileManager
+from app.core.profile_catalog import ProfileCatalog
 from app.core.fingerprint_generator import FingerprintGenerator
 from app.core.browser_manager import BrowserManager
 from app.core.session_manager import SessionManager
+from app.core.launch_scheduler import LaunchScheduler
 from app.core.backup_manager import BackupManager
 from app.core.script_manager import ScriptManager
 from app.core.automation_executor import AutomationExecutor
+from app.core.playwright_service import get_playwright_service
 from app.ui.widgets import StatusBadge, StatsCard, ActionButton
 
 
@@ -117,6 +121,13 @@ class ProfileEditDialog(QDialog):
 class MainWindow(QMainWindow):
     """Main application window."""
     
+    # ProfileCatalog events, re-emitted so they are handled on the Qt thread
+    profile_event = pyqtSignal(object)
+    # (profile_id, process or None) from LaunchScheduler worker threads
+    launch_event = pyqtSignal(object)
+    # SessionExitEvent from the BrowserManager reaper / health probe threads
+    session_exit_event = pyqtSignal(object)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Orbita Multi-Profile Automation")
@@ -126,6 +137,16 @@ class MainWindow(QMainWindow):
         self._init_ui()
         self._load_profiles()
         self._start_system_monitor()
+        
+        # Coalesce structural changes (create/edit/delete) into one table rebuild
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self._refresh_profiles)
+        self.profile_event.connect(self._on_profile_event)
+        self.profile_catalog.subscribe(self.profile_event.emit)
+        self.launch_event.connect(self._on_browser_launched)
+        self.session_exit_event.connect(self._on_session_exit)
+        self.browser_manager.add_session_listener(self.session_exit_event.emit)
     
     def _init_managers(self):
         """Initialize all manager components."""
@@ -140,7 +161,10 @@ class MainWindow(QMainWindow):
             generator=self.fingerprint_gen,
             template_dir="temp"
         )
-        self.browser_manager = BrowserManager(profile_manager=self.profile_manager)
+        self.profile_catalog = ProfileCatalog(self.profile_manager)
+        self.browser_manager = BrowserManager(profile_manager=self.profile_manager, auto_cdp_port=True)
+        # Automation jobs reuse warm browsers instead of cold-starting each run
+        self.browser_pool = self.browser_manager.enable_pool()
         self.session_manager = SessionManager(
             browser_manager=self.browser_manager,
             max_concurrent=5
@@ -153,6 +177,9 @@ class MainWindow(QMainWindow):
         self.automation_executor = AutomationExecutor(self.script_manager)
         
         self.profiles: List[Profile] = []
+        # profile_id -> table row, for in-place status updates
+        self._auto_rows = {}
+        self._profile_rows = {}
         self.selected_profile: Optional[Profile] = None
         self.selected_script = None
         self.script_input_widgets = {}
@@ -572,9 +599,10 @@ class MainWindow(QMainWindow):
     # ==================== DATA & EVENTS ====================
     
     def _load_profiles(self):
+        """Reload all profiles from the database into the catalog."""
         self.statusBar().showMessage("Loading profiles...")
         try:
-            self.profiles = self.profile_manager.load_all_profiles()
+            self.profiles = self.profile_catalog.reload()
             self._populate_auto_table(self.profiles)
             self._populate_profile_table(self.profiles)
             self._update_stats()
@@ -582,8 +610,36 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load profiles: {e}")
     
+    def _refresh_profiles(self):
+        """Rebuild tables from the in-memory catalog (no database access)."""
+        self.profiles = self.profile_catalog.all()
+        self._populate_auto_table(self.profiles)
+        self._populate_profile_table(self.profiles)
+        self._update_stats()
+    
+    def _on_profile_event(self, event: ProfileEvent):
+        """Apply a catalog change: status in place, structural changes by rebuild."""
+        if event.kind == "status":
+            for table, rows, column in (
+                (self.auto_table, self._auto_rows, 4),
+                (self.profile_table, self._profile_rows, 3)
+            ):
+                row = rows.get(event.profile_id)
+                if row is not None:
+                    table.setCellWidget(row, column, StatusBadge(event.new_value))
+            if self.selected_profile and self.selected_profile.profile_id == event.profile_id:
+                self.detail_status.setStatus(event.new_value)
+            self._update_stats()
+        elif event.kind == "last_run":
+            row = self._profile_rows.get(event.profile_id)
+            if row is not None:
+                self.profile_table.item(row, 5).setText(event.new_value or "Never")
+        else:
+            self._refresh_timer.start(0)
+    
     def _populate_auto_table(self, profiles: List[Profile]):
         self.auto_table.setRowCount(len(profiles))
+        self._auto_rows = {profile.profile_id: row for row, profile in enumerate(profiles)}
         for row, profile in enumerate(profiles):
             checkbox = QCheckBox()
             checkbox_widget = QWidget()
@@ -628,6 +684,7 @@ class MainWindow(QMainWindow):
     def _populate_profile_table(self, profiles: List[Profile]):
         self.profile_table.setRowCount(len(profiles))
         self.profile_count_label.setText(f"{len(profiles)} profiles")
+        self._profile_rows = {profile.profile_id: row for row, profile in enumerate(profiles)}
         for row, profile in enumerate(profiles):
             id_item = QTableWidgetItem(profile.profile_id[:15] + "...")
             id_item.setData(Qt.UserRole, profile.profile_id)
@@ -681,8 +738,8 @@ class MainWindow(QMainWindow):
         return "🌐 Other"
     
     def _update_stats(self):
-        total = len(self.profiles)
-        running = len([p for p in self.profiles if p.status == "running"])
+        total = len(self.profile_catalog)
+        running = self.profile_catalog.count_by_status("running")
         self.total_card.setValue(str(total))
         self.running_card.setValue(str(running))
         self.running_label.setText(f"Running: {running}")
@@ -691,11 +748,6 @@ class MainWindow(QMainWindow):
         self.system_timer = QTimer()
         self.system_timer.timeout.connect(self._update_system_stats)
         self.system_timer.start(2000)
-        
-        # Timer to check browser status
-        self.browser_check_timer = QTimer()
-        self.browser_check_timer.timeout.connect(self._check_browser_status)
-        self.browser_check_timer.start(3000)
     
     def _update_system_stats(self):
         try:
@@ -703,23 +755,25 @@ class MainWindow(QMainWindow):
             self.ram_label.setText(f"RAM: {psutil.virtual_memory().percent:.0f}%")
         except: pass
     
-    def _check_browser_status(self):
-        """Check if browsers are still running and update status."""
-        try:
-            closed_profiles = self.browser_manager.cleanup_inactive_sessions()
-            
-            # Refresh UI if any browser was closed
-            if closed_profiles:
-                self._load_profiles()
-        except Exception as e:
-            pass
+    def _on_session_exit(self, event):
+        """Report a browser that was closed or stopped responding."""
+        # Ended profiles are already marked inactive; the catalog's status events update the tables.
+        # "unresponsive" is a warning only - the browser keeps running.
+        if event.reason == "unresponsive":
+            self.statusBar().showMessage(f"Browser for {event.profile_id[:15]}... stopped responding")
+        elif event.reason == "exited":
+            code = "" if event.exit_code is None else f" (exit code {event.exit_code})"
+            self.statusBar().showMessage(
+                f"Browser for {event.profile_id[:15]}... closed at {event.timestamp:%H:%M:%S}{code}"
+            )
     
     def _on_profile_selected(self):
         selected = self.profile_table.selectedItems()
         if not selected: return
         id_item = self.profile_table.item(selected[0].row(), 0)
         if not id_item: return
-        profile = self.profile_manager.get_profile(id_item.data(Qt.UserRole))
+        profile_id = id_item.data(Qt.UserRole)
+        profile = self.profile_catalog.get(profile_id) or self.profile_manager.get_profile(profile_id)
         if profile:
             self.selected_profile = profile
             self._update_detail_panel(profile)
@@ -766,20 +820,17 @@ class MainWindow(QMainWindow):
                     checkbox.setChecked(True)
         self.selected_card.setValue(str(len(self._get_auto_selected_ids())))
     
+    def _query_profiles(self, status_text: str, search_text: str) -> List[Profile]:
+        """Filter the in-memory catalog by status combo text and search text."""
+        status_map = {"Ready": "inactive", "Running": "running", "Error": "error", "Missing": "missing"}
+        status = None if status_text == "All Status" else status_map.get(status_text, status_text.lower())
+        return self.profile_catalog.filter(status=status, search=search_text.strip() or None)
+    
     def _apply_auto_filter(self, status: str):
-        if status == "All Status":
-            self._populate_auto_table(self.profiles)
-        else:
-            status_map = {"Ready": "inactive", "Running": "running", "Error": "error", "Missing": "missing"}
-            filtered = [p for p in self.profiles if p.status == status_map.get(status, status.lower())]
-            self._populate_auto_table(filtered)
+        self._populate_auto_table(self._query_profiles(status, self.auto_search.text()))
     
     def _search_auto_profiles(self, text: str):
-        if not text:
-            self._populate_auto_table(self.profiles)
-        else:
-            filtered = [p for p in self.profiles if text.lower() in (p.data.name or "").lower() or text in p.profile_id]
-            self._populate_auto_table(filtered)
+        self._populate_auto_table(self._query_profiles(self.auto_status_filter.currentText(), text))
     
     def _run_selected_automation(self):
         selected = self._get_auto_selected_ids()
@@ -789,15 +840,22 @@ class MainWindow(QMainWindow):
         
         # Check if script is selected
         if not self.selected_script:
-            # No script - just open browsers
+            # No script - just open browsers; pre-launch runs concurrently off the UI thread.
+            # Profiles beyond the browser limit wait for a free slot instead of failing.
             self.auto_progress.setVisible(True)
             self.auto_progress.setMaximum(len(selected))
-            for i, pid in enumerate(selected):
-                self._open_browser_for_profile(pid)
-                self.auto_progress.setValue(i + 1)
-                QApplication.processEvents()
-            self.auto_progress.setVisible(False)
-            self._load_profiles()
+            self.auto_progress.setValue(0)
+            scheduler = LaunchScheduler(self.browser_manager)
+            limit = self.browser_manager.max_browsers
+            threading.Thread(
+                target=scheduler.run,
+                args=(selected,),
+                kwargs={
+                    "on_launched": lambda pid, result: self.launch_event.emit((pid, result)),
+                    "wait_for_slot": lambda: self.session_manager.wait_for_free_slot(limit)
+                },
+                daemon=True
+            ).start()
             return
         
         # Get script params
@@ -816,12 +874,10 @@ class MainWindow(QMainWindow):
             else:
                 # Regular script - use Selenium
                 if not self.automation_executor.running or i == 0:
-                    result = self.browser_manager.launch_profile(pid, use_selenium=True)
-                    if result:
-                        driver = self.browser_manager.get_driver(pid)
-                        if driver:
+                    with self.browser_pool.job(pid, use_selenium=True) as browser:
+                        if browser and browser.use_selenium:
                             self.automation_executor.execute_script(
-                                driver,
+                                browser.session,
                                 self.selected_script.id,
                                 script_params,
                                 lambda cur, total: self._update_script_progress(cur, total)
@@ -832,7 +888,6 @@ class MainWindow(QMainWindow):
         
         self.auto_progress.setVisible(False)
         self.auto_status_label.setText("Automation completed")
-        self._load_profiles()
     
     def _run_instagram_upload_for_profile(self, profile_id: str, params: dict):
         """Run Instagram Reel Upload for a specific profile using CDP."""
@@ -854,36 +909,26 @@ class MainWindow(QMainWindow):
             self.auto_status_label.setText(f"🚀 Launching browser for {profile_id[:15]}...")
             QApplication.processEvents()
             
-            # Launch browser with CDP enabled (if not already running)
-            if not self.browser_manager.is_session_active(profile_id):
-                index = self.browser_manager.get_session_count()
-                position = self.browser_manager.calculate_window_position(index)
-                self.browser_manager.launch_profile(profile_id, window_position=position, use_selenium=False)
+            # Warm browser from the pool, or launched with CDP and waited for
+            with self.browser_pool.job(profile_id) as browser:
+                if not browser or not browser.cdp_url:
+                    self.auto_status_label.setText(f"❌ CDP not available for {profile_id[:15]}")
+                    return
                 
-                # Wait for browser to start
-                import time
-                time.sleep(3)
-            
-            # Get CDP URL
-            cdp_url = self.browser_manager.get_cdp_url(profile_id)
-            if not cdp_url:
-                self.auto_status_label.setText(f"❌ CDP not available for {profile_id[:15]}")
-                return
-            
-            self.auto_status_label.setText(f"📷 Uploading reels for {profile_id[:15]}...")
-            QApplication.processEvents()
-            
-            # Run Instagram upload with CDP connection
-            results = self.automation_executor.execute_instagram_reel_upload(
-                profile_id=profile_id,
-                profile_path=profile_path,
-                max_uploads=max_uploads,
-                random_order=random_order,
-                delay_min=delay_min,
-                delay_max=delay_max,
-                cdp_url=cdp_url,
-                progress_callback=lambda cur, total: self._update_script_progress(cur, total)
-            )
+                self.auto_status_label.setText(f"📷 Uploading reels for {profile_id[:15]}...")
+                QApplication.processEvents()
+                
+                # Run Instagram upload with CDP connection
+                results = self.automation_executor.execute_instagram_reel_upload(
+                    profile_id=profile_id,
+                    profile_path=profile_path,
+                    max_uploads=max_uploads,
+                    random_order=random_order,
+                    delay_min=delay_min,
+                    delay_max=delay_max,
+                    cdp_url=browser.cdp_url,
+                    progress_callback=lambda cur, total: self._update_script_progress(cur, total)
+                )
             
             # Update status
             if results.get('success', 0) > 0:
@@ -909,41 +954,28 @@ class MainWindow(QMainWindow):
                 self._run_instagram_upload_for_profile(profile_id, script_params)
             else:
                 # Regular script - use Selenium
-                result = self.browser_manager.launch_profile(profile_id, use_selenium=True)
-                if result:
-                    driver = self.browser_manager.get_driver(profile_id)
-                    if driver:
+                with self.browser_pool.job(profile_id, use_selenium=True) as browser:
+                    if browser and browser.use_selenium:
                         self.automation_executor.execute_script(
-                            driver,
+                            browser.session,
                             self.selected_script.id,
                             script_params
                         )
         else:
             self._open_browser_for_profile(profile_id)
-        self._load_profiles()
     
     def _stop_all_automation(self):
         if QMessageBox.question(self, "Confirm", "Stop all browsers?", QMessageBox.Yes | QMessageBox.No) == QMessageBox.Yes:
             # Stop automation executor
             self.automation_executor.stop()
             count = self.browser_manager.close_all_sessions()
-            self._load_profiles()
             self.statusBar().showMessage(f"Stopped {count} browsers")
     
     def _apply_profile_filter(self, status: str):
-        if status == "All Status":
-            self._populate_profile_table(self.profiles)
-        else:
-            status_map = {"Ready": "inactive", "Running": "running", "Error": "error", "Missing": "missing"}
-            filtered = [p for p in self.profiles if p.status == status_map.get(status, status.lower())]
-            self._populate_profile_table(filtered)
+        self._populate_profile_table(self._query_profiles(status, self.profile_search.text()))
     
     def _search_profiles(self, text: str):
-        if not text:
-            self._populate_profile_table(self.profiles)
-        else:
-            filtered = [p for p in self.profiles if text.lower() in (p.data.name or "").lower() or text in p.profile_id]
-            self._populate_profile_table(filtered)
+        self._populate_profile_table(self._query_profiles(self.profile_status_filter.currentText(), text))
     
     def _open_browser_manual(self):
         if not self.selected_profile:
@@ -968,7 +1000,17 @@ class MainWindow(QMainWindow):
         if reply == QMessageBox.Yes:
             closed = self.browser_manager.close_all_sessions()
             self.statusBar().showMessage(f"Closed {closed} browser(s)")
-            self._load_profiles()
+    
+    def _on_browser_launched(self, event):
+        """Advance the batch progress for one scheduler launch."""
+        profile_id, result = event
+        self.auto_progress.setValue(self.auto_progress.value() + 1)
+        if result:
+            self.statusBar().showMessage(f"Opened browser for {profile_id[:15]}...")
+        else:
+            self.statusBar().showMessage(f"Failed to open browser for {profile_id[:15]}...")
+        if self.auto_progress.value() >= self.auto_progress.maximum():
+            self.auto_progress.setVisible(False)
     
     def _open_browser_for_profile(self, profile_id: str):
         try:
@@ -977,7 +1019,6 @@ class MainWindow(QMainWindow):
             result = self.browser_manager.launch_profile(profile_id, window_position=position, use_selenium=False)
             if result:
                 self.statusBar().showMessage(f"Opened browser for {profile_id[:15]}...")
-                self._load_profiles()
             else:
                 QMessageBox.warning(self, "Warning", "Failed to open browser")
         except Exception as e:
@@ -1025,7 +1066,6 @@ class MainWindow(QMainWindow):
                     profile.data.group_profile = data.get('group_profile', '')
                     profile.data.notes = data.get('notes', '')
                     self.repository.update_profile(profile.data)
-                    self._load_profiles()
                     self.statusBar().showMessage(f"Created profile: {name}")
                 else:
                     QMessageBox.warning(self, "Warning", "Failed to create profile")
@@ -1052,7 +1092,6 @@ class MainWindow(QMainWindow):
                 self.selected_profile.data.notes = data.get('notes', '')
                 
                 if self.repository.update_profile(self.selected_profile.data):
-                    self._load_profiles()
                     self._update_detail_panel(self.selected_profile)
                     self.statusBar().showMessage("Profile updated")
                 else:
@@ -1073,7 +1112,6 @@ class MainWindow(QMainWindow):
             
             if self.repository.update_profile(self.selected_profile.data):
                 self._update_detail_panel(self.selected_profile)
-                self._load_profiles()
                 self.statusBar().showMessage("Proxy saved")
             else:
                 QMessageBox.warning(self, "Warning", "Failed to save proxy")
@@ -1097,7 +1135,6 @@ class MainWindow(QMainWindow):
                 if self.profile_manager.delete_profile(self.selected_profile.profile_id, delete_files=True):
                     self.selected_profile = None
                     self.detail_header.setText("Select a profile")
-                    self._load_profiles()
                     self.statusBar().showMessage("Profile deleted")
                 else:
                     QMessageBox.warning(self, "Warning", "Failed to delete profile")
@@ -1108,4 +1145,11 @@ class MainWindow(QMainWindow):
         try:
             self.browser_manager.close_all_sessions()
         except: pass
+        try:
+            get_playwright_service().stop()
+        except: pass
+        try:
+            self.profile_catalog.close()
+            self.repository.close()
+        except: pass
         event.accept()
@@ -0,0 +1,66 @@
+# Benchmark: browser readiness detection
+# Simulates a browser writing DevToolsActivePort after a random startup
+# delay and measures how late each strategy notices: inotify (Linux),
+# polling the file every POLL_INTERVAL, and the old 0.5 s poll loop.
+# Run from the project root:
+#   python -m benchmarks.bench_devtools_ready
+
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from app.core import devtools_port
+from app.core.devtools_port import DEVTOOLS_ACTIVE_PORT, clear_devtools_port, wait_for_devtools_port
+
+
+RUNS = 20
+
+
+def old_poll(user_data_dir: str, timeout: float = 15.0):
+    """The previous loop: check, then sleep 0.5 s."""
+    start = time.monotonic()
+    while time.monotonic() - start < timeout:
+        if devtools_port.read_devtools_active_port(user_data_dir):
+            return True
+        time.sleep(0.5)
+    return False
+
+
+def measure(wait) -> float:
+    """Median ms between the write and the wait returning."""
+    lags = []
+    with tempfile.TemporaryDirectory() as user_data_dir:
+        for _ in range(RUNS):
+            clear_devtools_port(user_data_dir)
+            written = []
+            
+            def write():
+                with open(os.path.join(user_data_dir, DEVTOOLS_ACTIVE_PORT), "w") as f:
+                    f.write("41234\n/devtools/browser/x")
+                written.append(time.perf_counter())
+            
+            threading.Timer(random.uniform(0.05, 0.3), write).start()
+            wait(user_data_dir)
+            lags.append((time.perf_counter() - written[0]) * 1000)
+    return statistics.median(lags)
+
+
+def main():
+    print("=" * 60)
+    print(f"DevTools readiness detection ({RUNS} launches)")
+    print("=" * 60)
+    random.seed(1)
+    
+    if devtools_port.INOTIFY_AVAILABLE:
+        print(f"{'inotify':<12} {measure(wait_for_devtools_port):9.2f} ms median lag")
+    devtools_port.INOTIFY_AVAILABLE, inotify = False, devtools_port.INOTIFY_AVAILABLE
+    print(f"{'poll 50ms':<12} {measure(wait_for_devtools_port):9.2f} ms median lag")
+    devtools_port.INOTIFY_AVAILABLE = inotify
+    print(f"{'poll 500ms':<12} {measure(old_poll):9.2f} ms median lag (previous loop)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# Benchmark: batch fingerprint generation
+# Compares generate_fingerprint in a loop with generate_fingerprints
+# (configs and columnar table). Run from the project root:
+#   python -m benchmarks.bench_fingerprint_generation
+
+import time
+
+from app.core import fingerprint_generator
+from app.core.fingerprint_generator import FingerprintGenerator
+
+
+COUNT = 10000
+
+
+def timed(label: str, generate):
+    start = time.perf_counter()
+    generate()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<24} {elapsed * 1000:9.1f} ms  ({COUNT / elapsed:10.0f} /s)")
+
+
+def main():
+    print("=" * 60)
+    print(f"Fingerprint generation benchmark ({COUNT} fingerprints, numpy={fingerprint_generator.NUMPY_AVAILABLE})")
+    print("=" * 60)
+    
+    generator = FingerprintGenerator()
+    timed("generate_fingerprint loop", lambda: [generator.generate_fingerprint() for _ in range(COUNT)])
+    timed("generate_fingerprints", lambda: generator.generate_fingerprints(COUNT, seed=1))
+    timed("  as_table", lambda: generator.generate_fingerprints(COUNT, seed=1, as_table=True))
+
+
+if __name__ == "__main__":
+    main()
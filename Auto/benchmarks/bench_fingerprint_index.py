@@ -0,0 +1,51 @@
+# Benchmark: fingerprint collision lookups
+# Builds a FingerprintIndex over generated fingerprints, reports how many
+# collide, and compares an index lookup with comparing against every
+# profile's fingerprint. Run from the project root:
+#   python -m benchmarks.bench_fingerprint_index
+
+import time
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.fingerprint_index import FingerprintIndex
+
+
+COUNT = 10000
+LOOKUPS = 200
+
+
+def main():
+    print("=" * 60)
+    print(f"Fingerprint index benchmark ({COUNT} profiles)")
+    print("=" * 60)
+    
+    configs = FingerprintGenerator().generate_fingerprints(COUNT, seed=1)
+    index = FingerprintIndex()
+    
+    start = time.perf_counter()
+    index.rebuild((str(i), config) for i, config in enumerate(configs))
+    elapsed = time.perf_counter() - start
+    print(f"{'build':<12} {elapsed * 1000:9.1f} ms")
+    
+    groups = index.duplicate_groups()
+    print(f"{'collisions':<12} {sum(len(g) for g in groups)} profiles in {len(groups)} groups")
+    
+    probes = configs[:LOOKUPS]
+    start = time.perf_counter()
+    for config in probes:
+        index.profiles_with(config)
+    indexed = (time.perf_counter() - start) / LOOKUPS
+    
+    signatures = [index.signature(config) for config in configs]
+    start = time.perf_counter()
+    for config in probes:
+        signature = index.signature(config)
+        [i for i, other in enumerate(signatures) if other == signature]
+    scanned = (time.perf_counter() - start) / LOOKUPS
+    
+    print(f"{'index':<12} {indexed * 1e6:9.1f} us/lookup")
+    print(f"{'scan':<12} {scanned * 1e6:9.1f} us/lookup (signatures already in memory)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Benchmark: reading fingerprints of many profiles
+# Compares full Preferences parsing with the gologin sidecar and the
+# in-memory FingerprintCache. Run from the project root:
+#   python -m benchmarks.bench_fingerprint_listing
+
+import os
+import shutil
+import tempfile
+import time
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.data.preferences_document import read_gologin_section
+
+
+PROFILES = 200
+
+# Entries padding each Preferences file to ~1 MB
+PADDING_ENTRIES = 10000
+
+
+def create_profiles(root: str, generator: FingerprintGenerator) -> list:
+    """Create PROFILES profile directories with bulky Preferences."""
+    padding = {
+        f"https://site{i}.example.com:443,*": {"last_modified": str(13300000000000000 + i), "setting": {"x": i}}
+        for i in range(PADDING_ENTRIES)
+    }
+    paths = []
+    for i in range(PROFILES):
+        path = os.path.join(root, f"{i:020d}")
+        prefs = generator.update_gologin_config({"profile": {"content_settings": padding}}, generator.generate_fingerprint())
+        generator.write_preferences(path, prefs)
+        paths.append(path)
+    return paths
+
+
+def timed(label: str, read, paths: list):
+    start = time.perf_counter()
+    for path in paths:
+        read(path)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed * 1000:9.1f} ms  ({elapsed * 1000 / len(paths):6.2f} ms/profile)")
+
+
+def main():
+    print("=" * 60)
+    print(f"Fingerprint listing benchmark ({PROFILES} profiles)")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    generator = FingerprintGenerator()
+    try:
+        paths = create_profiles(temp_dir, generator)
+        size = os.path.getsize(os.path.join(paths[0], "Default", "Preferences"))
+        print(f"Preferences size: {size / 1e6:.1f} MB")
+        
+        timed("full parse", lambda p: generator.extract_gologin_config(generator.read_preferences(p)), paths)
+        timed("sidecar", lambda p: read_gologin_section(os.path.join(p, "Default", "Preferences")), paths)
+        
+        generator.config_cache.clear()
+        timed("load_gologin_config", generator.load_gologin_config, paths)
+        timed("  (memory cache warm)", generator.load_gologin_config, paths)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
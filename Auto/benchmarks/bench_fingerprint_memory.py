@@ -0,0 +1,63 @@
+# Benchmark: memory and serialization cost of 10k fingerprints in memory
+# Compares GologinConfig (dataclasses) with CompactGologinConfig (slots).
+# Run from the project root:
+#   python -m benchmarks.bench_fingerprint_memory
+
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import asdict
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.data.profile_models import GologinConfig, CompactGologinConfig
+
+
+COUNT = 10000
+
+
+def measure_memory(build) -> float:
+    """Bytes per object retained by the list that build() returns."""
+    gc.collect()
+    tracemalloc.start()
+    objects = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current / COUNT
+
+
+def timed(label: str, run):
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<34} {elapsed * 1000:8.1f} ms  ({COUNT / elapsed:9.0f} /s)")
+
+
+def main():
+    print("=" * 60)
+    print(f"Fingerprint memory benchmark ({COUNT} configs)")
+    print("=" * 60)
+    
+    # JSON text as read from Preferences, so nothing is shared up front
+    texts = [json.dumps(c.to_dict()) for c in FingerprintGenerator().generate_fingerprints(COUNT, seed=1)]
+    
+    full = measure_memory(lambda: [GologinConfig.from_dict(json.loads(t)) for t in texts])
+    compact = measure_memory(lambda: [CompactGologinConfig.from_dict(json.loads(t)) for t in texts])
+    print(f"GologinConfig          {full:8.0f} bytes/profile")
+    print(f"CompactGologinConfig   {compact:8.0f} bytes/profile  ({full / compact:.1f}x smaller)")
+    print()
+    
+    dicts = [json.loads(t) for t in texts]
+    configs = [GologinConfig.from_dict(d) for d in dicts]
+    compacts = [CompactGologinConfig.from_dict(d) for d in dicts]
+    
+    timed("dataclasses.asdict", lambda: [asdict(c) for c in configs])
+    timed("GologinConfig.to_dict", lambda: [c.to_dict() for c in configs])
+    timed("CompactGologinConfig.to_dict", lambda: [c.to_dict() for c in compacts])
+    timed("GologinConfig.from_dict", lambda: [GologinConfig.from_dict(d) for d in dicts])
+    timed("CompactGologinConfig.from_dict", lambda: [CompactGologinConfig.from_dict(d) for d in dicts])
+
+
+if __name__ == "__main__":
+    main()
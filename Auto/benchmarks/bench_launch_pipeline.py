@@ -0,0 +1,91 @@
+# Benchmark: per-stage latency of BrowserManager.launch_profile
+# Launches real profiles (temp repository, generated Preferences) with
+# the browser process and the GeoIP request replaced by stand-ins, and
+# prints p50/p95 per stage from BrowserManager.get_launch_stats(), then
+# times the same batch launched sequentially and with LaunchScheduler.
+# Run from the project root:
+#   python -m benchmarks.bench_launch_pipeline [geoip_ms]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+from app.core.browser_manager import BrowserManager
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.geolocation_manager import GeoLocation
+from app.core.launch_engine import LaunchEngine
+from app.core.launch_scheduler import LaunchScheduler
+from app.core.profile_manager import ProfileManager
+from app.data.profile_repository import ProfileRepository
+
+
+LAUNCHES = 50
+
+# Stagger between spawns in the scheduled batch
+SPAWN_INTERVAL = 0.02
+
+LOCATION = GeoLocation(latitude=10.77, longitude=106.69, city="Ho Chi Minh", timezone="Asia/Ho_Chi_Minh", ip="1.2.3.4")
+
+
+def main():
+    geoip_delay = (float(sys.argv[1]) if len(sys.argv) > 1 else 50.0) / 1000
+    print("=" * 60)
+    print(f"Launch pipeline benchmark ({LAUNCHES} launches, GeoIP {geoip_delay * 1000:.0f} ms)")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        repo = ProfileRepository(
+            db_path=os.path.join(temp_dir, "data.db"),
+            app_db_path=os.path.join(temp_dir, "app_data.db"),
+            profile_dir=os.path.join(temp_dir, "profiles")
+        )
+        os.makedirs(repo.profile_dir)
+        manager = ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=os.path.join(temp_dir, "no_template"))
+        profiles = manager.create_profiles(LAUNCHES)
+        
+        browser_manager = BrowserManager(
+            profile_manager=manager,
+            engine=LaunchEngine(max_browsers=LAUNCHES),
+            launch_trace_path=os.path.join(temp_dir, "launch.jsonl")
+        )
+        
+        def geoip(proxy=None):
+            time.sleep(geoip_delay)
+            return LOCATION
+        
+        def close_all():
+            for profile in profiles:
+                browser_manager.active_processes.pop(profile.profile_id, None)
+                browser_manager.engine.forget(profile.profile_id, browser_manager.OWNER)
+                browser_manager._release_cdp_port(profile.profile_id)
+        
+        with patch.object(browser_manager.geolocation_manager, "get_location_from_ip", side_effect=geoip), \
+                patch("subprocess.Popen"):
+            start = time.perf_counter()
+            for profile in profiles:
+                browser_manager.launch_profile(profile.profile_id)
+            sequential = time.perf_counter() - start
+            close_all()
+            print(browser_manager.launch_metrics.format_summary())
+            
+            scheduler = LaunchScheduler(browser_manager, spawn_interval=SPAWN_INTERVAL)
+            start = time.perf_counter()
+            scheduler.run([profile.profile_id for profile in profiles])
+            scheduled = time.perf_counter() - start
+            close_all()
+        
+        print()
+        print(f"{'sequential':<12} {sequential:7.2f} s for {LAUNCHES} launches")
+        print(f"{'scheduler':<12} {scheduled:7.2f} s ({scheduler.workers} workers, {SPAWN_INTERVAL * 1000:.0f} ms stagger)")
+        browser_manager.launch_metrics.close()
+        repo.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Benchmark: pre-launch Preferences handling in BrowserManager
+# Compares the old per-step read/write (User-Agent fix, then geolocation
+# sync with indent=2) with one PreferencesDocument load + single atomic
+# write. Network lookups are excluded. Run from the project root:
+#   python -m benchmarks.bench_launch_preferences
+
+import os
+import shutil
+import tempfile
+import time
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.geolocation_manager import GeolocationManager, GeoLocation
+from app.data.preferences_document import PreferencesDocument, write_json_atomic
+
+
+LAUNCHES = 20
+
+# Entries padding Preferences to a realistic several-MB size
+PADDING_ENTRIES = 40000
+
+LOCATION = GeoLocation(latitude=10.77, longitude=106.69, city="Ho Chi Minh", timezone="Asia/Ho_Chi_Minh", ip="1.2.3.4")
+
+
+def create_preferences(profile_path: str):
+    """Write a Preferences file with a gologin section and bulky site data."""
+    prefs = FingerprintGenerator().update_gologin_config({}, FingerprintGenerator().generate_fingerprint())
+    prefs["profile"] = {
+        "content_settings": {
+            f"https://site{i}.example.com:443,*": {"last_modified": str(13300000000000000 + i), "setting": {"x": i}}
+            for i in range(PADDING_ENTRIES)
+        }
+    }
+    os.makedirs(os.path.join(profile_path, "Default"))
+    write_json_atomic(os.path.join(profile_path, "Default", "Preferences"), prefs)
+
+
+def old_path(profile_path: str, generator: FingerprintGenerator, geo: GeolocationManager):
+    generator.update_user_agent(profile_path, "129")
+    geo.apply_geolocation_to_preferences(os.path.join(profile_path, "Default", "Preferences"), LOCATION)
+
+
+def new_path(profile_path: str, generator: FingerprintGenerator, geo: GeolocationManager):
+    prefs = PreferencesDocument(profile_path)
+    prefs.patch(lambda p: generator.apply_user_agent(p, "129"))
+    prefs.patch(lambda p: geo.apply_geolocation_to_prefs(p, LOCATION))
+    prefs.save()
+
+
+def main():
+    print("=" * 60)
+    print(f"Launch Preferences benchmark ({LAUNCHES} launches)")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    generator = FingerprintGenerator()
+    geo = GeolocationManager()
+    try:
+        for label, step in (("per-step", old_path), ("document", new_path)):
+            profile_path = os.path.join(temp_dir, label)
+            create_preferences(profile_path)
+            size = os.path.getsize(os.path.join(profile_path, "Default", "Preferences"))
+            
+            start = time.perf_counter()
+            for _ in range(LAUNCHES):
+                step(profile_path, generator, geo)
+            elapsed = (time.perf_counter() - start) / LAUNCHES
+            print(f"{label:<10} {elapsed * 1000:8.1f} ms per launch  (Preferences {size / 1e6:.1f} MB)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
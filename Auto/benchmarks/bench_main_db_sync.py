@@ -0,0 +1,70 @@
+# Benchmark: ProfileRepository startup against a large main database
+# Measures first (full) import, unchanged restart and restart after
+# a few rows were added. Run from the project root:
+#   python -m benchmarks.bench_main_db_sync
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from app.data.profile_repository import ProfileRepository
+
+
+MAIN_ROWS = 50000
+ADDED_ROWS = 100
+
+
+def create_main_db(path: str, count: int):
+    """Create a danhsachacc table with `count` rows."""
+    conn = sqlite3.connect(path)
+    columns = ", ".join(f"{col} TEXT" for col in ProfileRepository.COLUMNS if col not in ("id", "sothutu"))
+    conn.execute(f"CREATE TABLE danhsachacc (id INTEGER PRIMARY KEY, sothutu INTEGER, {columns})")
+    conn.executemany(
+        "INSERT INTO danhsachacc (name, idprofile, status, sothutu) VALUES (?, ?, 'inactive', ?)",
+        ((f"Profile {i}", f"{i:020d}", i) for i in range(count))
+    )
+    conn.commit()
+    conn.close()
+
+
+def timed_startup(main_db: str, app_db: str, profile_dir: str) -> float:
+    """Construct a repository (which syncs) and return elapsed seconds."""
+    start = time.perf_counter()
+    repo = ProfileRepository(db_path=main_db, app_db_path=app_db, profile_dir=profile_dir)
+    elapsed = time.perf_counter() - start
+    repo.close()
+    return elapsed
+
+
+def main():
+    print("=" * 60)
+    print(f"Main DB sync benchmark ({MAIN_ROWS} rows)")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        main_db = os.path.join(temp_dir, "data.db")
+        app_db = os.path.join(temp_dir, "app_data.db")
+        profile_dir = os.path.join(temp_dir, "profile")
+        create_main_db(main_db, MAIN_ROWS)
+        
+        print(f"First startup (full import):   {timed_startup(main_db, app_db, profile_dir) * 1000:8.1f} ms")
+        print(f"Restart, main DB unchanged:    {timed_startup(main_db, app_db, profile_dir) * 1000:8.1f} ms")
+        
+        conn = sqlite3.connect(main_db)
+        conn.executemany(
+            "INSERT INTO danhsachacc (name, idprofile, status, sothutu) VALUES (?, ?, 'inactive', 0)",
+            ((f"New {i}", f"new{i:017d}") for i in range(ADDED_ROWS))
+        )
+        conn.commit()
+        conn.close()
+        
+        print(f"Restart, {ADDED_ROWS} rows added:       {timed_startup(main_db, app_db, profile_dir) * 1000:8.1f} ms")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
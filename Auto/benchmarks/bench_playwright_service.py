@@ -0,0 +1,61 @@
+# Benchmark: Playwright driver cost per profile
+# Starts one Playwright driver per profile, as every upload did before,
+# then serves the same number of profiles from the shared
+# PlaywrightService, and prints total driver boot time and the number of
+# driver processes. Needs playwright installed (no browser is launched).
+# Run from the project root:
+#   python -m benchmarks.bench_playwright_service [profiles]
+
+import asyncio
+import sys
+import time
+
+from app.core.playwright_service import PlaywrightService
+
+
+def per_profile(profiles: int) -> float:
+    """The previous pattern: a fresh event loop and driver per profile."""
+    from playwright.async_api import async_playwright
+    
+    async def one():
+        playwright = await async_playwright().start()
+        await playwright.stop()
+    
+    start = time.perf_counter()
+    for _ in range(profiles):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(one())
+        finally:
+            loop.close()
+    return time.perf_counter() - start
+
+
+def shared(profiles: int) -> float:
+    """All profiles on the service loop and its one driver."""
+    service = PlaywrightService()
+    start = time.perf_counter()
+    for _ in range(profiles):
+        service.run(service.get_playwright())
+    elapsed = time.perf_counter() - start
+    service.stop()
+    return elapsed
+
+
+def main():
+    profiles = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print("=" * 60)
+    print(f"Playwright driver per profile vs shared ({profiles} profiles)")
+    print("=" * 60)
+    try:
+        import playwright  # noqa: F401
+    except ImportError:
+        print("playwright not installed; run: pip install playwright")
+        return
+    
+    print(f"{'per profile':<12} {per_profile(profiles):7.2f} s, {profiles} driver processes")
+    print(f"{'shared':<12} {shared(profiles):7.2f} s, 1 driver process")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Benchmark: CDP port allocation
+# Leases ports for many concurrent browsers with PortAllocator and with the
+# linear scan the launchers used before (bind-test every port from the
+# range start until a free one not yet handed out is found). Run from the
+# project root:
+#   python -m benchmarks.bench_port_allocator
+
+import socket
+import time
+
+from app.core.port_allocator import PortAllocator
+
+
+SESSIONS = 300
+START = 30000
+
+
+def scan_lease(used: set) -> int:
+    """The old strategy: linear bind-test scan from the range start."""
+    port = START
+    while port < 65535:
+        if port not in used:
+            try:
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                    s.bind(("127.0.0.1", port))
+                    used.add(port)
+                    return port
+            except OSError:
+                pass
+        port += 1
+    raise RuntimeError("No free port")
+
+
+def main():
+    print("=" * 60)
+    print(f"CDP port allocation benchmark ({SESSIONS} sessions)")
+    print("=" * 60)
+    
+    allocator = PortAllocator(START, START + SESSIONS * 2)
+    start = time.perf_counter()
+    ports = [allocator.lease(str(i)) for i in range(SESSIONS)]
+    leased = time.perf_counter() - start
+    for port in ports:
+        allocator.release(port)
+    
+    used = set()
+    start = time.perf_counter()
+    for _ in range(SESSIONS):
+        scan_lease(used)
+    scanned = time.perf_counter() - start
+    
+    print(f"{'allocator':<12} {leased * 1e6 / SESSIONS:9.1f} us/lease")
+    print(f"{'scan':<12} {scanned * 1e6 / SESSIONS:9.1f} us/lease")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Benchmark: profiles/second for bulk profile creation
+# Compares shutil.copytree with TemplateCloner on a synthetic Chromium
+# template, then ProfileManager.create_profile in a loop with
+# create_profiles. Run from the project root:
+#   python -m benchmarks.bench_profile_creation [template_dir]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.profile_manager import ProfileManager
+from app.core.template_cloner import TemplateCloner
+from app.data.profile_repository import ProfileRepository
+
+
+PROFILES = 50
+
+# (relative dir, file count, bytes per file)
+SYNTHETIC_TEMPLATE = [
+    (os.path.join("Default", "Extensions", "ext", "1.0"), 200, 64 * 1024),
+    ("Dictionaries", 4, 2 * 1024 * 1024),
+    ("WidevineCdm", 2, 8 * 1024 * 1024),
+    ("Default", 20, 256 * 1024),
+]
+
+
+def create_template(path: str):
+    """Write a synthetic template of roughly 40 MB."""
+    for rel_dir, count, size in SYNTHETIC_TEMPLATE:
+        directory = os.path.join(path, rel_dir)
+        os.makedirs(directory, exist_ok=True)
+        for i in range(count):
+            with open(os.path.join(directory, f"file_{i}"), "wb") as f:
+                f.write(os.urandom(size))
+
+
+def run(label: str, clone, template_dir: str, work_dir: str):
+    """Clone the template PROFILES times and print the rate."""
+    start = time.perf_counter()
+    for i in range(PROFILES):
+        clone(template_dir, os.path.join(work_dir, f"{label}_{i}"))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {PROFILES / elapsed:8.1f} profiles/s  ({elapsed * 1000 / PROFILES:7.1f} ms each)")
+
+
+def main():
+    print("=" * 60)
+    print(f"Profile creation benchmark ({PROFILES} profiles)")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        if len(sys.argv) > 1:
+            template_dir = sys.argv[1]
+        else:
+            template_dir = os.path.join(temp_dir, "template")
+            create_template(template_dir)
+
+        run("copytree", shutil.copytree, template_dir, temp_dir)
+
+        cloner = TemplateCloner()
+        run("cloner", cloner.clone, template_dir, temp_dir)
+        print(f"Files by strategy: {cloner.stats}")
+        
+        for label, bulk in (("loop", False), ("bulk", True)):
+            repo = ProfileRepository(
+                db_path=os.path.join(temp_dir, "data.db"),
+                app_db_path=os.path.join(temp_dir, f"{label}.db"),
+                profile_dir=os.path.join(temp_dir, f"{label}_profiles")
+            )
+            os.makedirs(repo.profile_dir)
+            manager = ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=template_dir)
+            start = time.perf_counter()
+            if bulk:
+                manager.create_profiles(PROFILES)
+            else:
+                for _ in range(PROFILES):
+                    manager.create_profile()
+            elapsed = time.perf_counter() - start
+            repo.close()
+            print(f"{label:<10} {PROFILES / elapsed:8.1f} profiles/s  (ProfileManager, DB + Preferences)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
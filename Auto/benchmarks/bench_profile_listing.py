@@ -0,0 +1,67 @@
+# Benchmark: profile listing from the app database
+# Counts SQLite connections and measures wall time of get_all_profiles
+# for growing profile counts. Run from the project root:
+#   python -m benchmarks.bench_profile_listing
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import app.data.profile_repository as profile_repository
+from app.data.profile_repository import ProfileRepository
+from app.data.profile_models import ProfileData
+
+
+PROFILE_COUNTS = [100, 1000, 5000]
+
+
+def seed_repository(temp_dir: str, count: int) -> ProfileRepository:
+    """Create a repository with `count` profiles, a third of them with status overrides."""
+    repo = ProfileRepository(
+        db_path=os.path.join(temp_dir, "missing.db"),
+        app_db_path=os.path.join(temp_dir, "app_data.db"),
+        profile_dir=os.path.join(temp_dir, "profile")
+    )
+    for i in range(count):
+        repo.create_profile(ProfileData(name=f"Profile {i}", idprofile=f"{i:020d}", sothutu=i))
+        if i % 3 == 0:
+            repo.update_profile_status(f"{i:020d}", "running")
+    return repo
+
+
+def main():
+    print("=" * 60)
+    print("Profile listing benchmark")
+    print("=" * 60)
+    
+    real_connect = sqlite3.connect
+    
+    for count in PROFILE_COUNTS:
+        temp_dir = tempfile.mkdtemp(prefix="bench_")
+        try:
+            repo = seed_repository(temp_dir, count)
+            
+            connections = [0]
+            
+            def counting_connect(*args, **kwargs):
+                connections[0] += 1
+                return real_connect(*args, **kwargs)
+            
+            profile_repository.sqlite3.connect = counting_connect
+            try:
+                start = time.perf_counter()
+                profiles = repo.get_all_profiles()
+                elapsed = time.perf_counter() - start
+            finally:
+                profile_repository.sqlite3.connect = real_connect
+            
+            print(f"{count:>6} profiles: {len(profiles):>6} rows, "
+                  f"{connections[0]} connection(s), {elapsed * 1000:.1f} ms")
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# Benchmark: bulk User-Agent repair + randomize over many profiles
+# Compares the per-profile calls (randomize_profile_fingerprint then
+# fix_user_agent_mismatch) with ProfileMaintenance in-process and on a
+# process pool. Run from the project root:
+#   python -m benchmarks.bench_profile_maintenance [workers]
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.profile_maintenance import ProfileMaintenance
+from app.core.profile_manager import ProfileManager
+from app.data.profile_repository import ProfileRepository
+
+
+PROFILES = 400
+
+# Filler keys so Preferences is about the size of a used Chrome profile
+FILLER = {f"setting_{i}": {"value": "x" * 200, "list": list(range(20))} for i in range(300)}
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count()
+    print("=" * 60)
+    print(f"Profile maintenance benchmark ({PROFILES} profiles, {workers} workers)")
+    print("=" * 60)
+    
+    temp_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        template_dir = os.path.join(temp_dir, "template")
+        os.makedirs(os.path.join(template_dir, "Default"))
+        with open(os.path.join(template_dir, "Default", "Preferences"), "w") as f:
+            json.dump(FILLER, f)
+        repo = ProfileRepository(
+            db_path=os.path.join(temp_dir, "data.db"),
+            app_db_path=os.path.join(temp_dir, "app_data.db"),
+            profile_dir=os.path.join(temp_dir, "profiles")
+        )
+        os.makedirs(repo.profile_dir)
+        manager = ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=template_dir)
+        manager.create_profiles(PROFILES)
+        profile_ids = sorted(repo.get_all_profile_ids())
+        
+        start = time.perf_counter()
+        for profile_id in profile_ids:
+            manager.randomize_profile_fingerprint(profile_id)
+            manager.generator.fix_user_agent_mismatch(repo.get_profile_path(profile_id), "130.0.0.0")
+        elapsed = time.perf_counter() - start
+        print(f"{'per-profile':<12} {PROFILES / elapsed:8.1f} profiles/s")
+        
+        for label, count in (("in-process", 1), ("pool", workers)):
+            maintenance = ProfileMaintenance(
+                manager, checkpoint_path=os.path.join(temp_dir, f"{label}.jsonl"), workers=count
+            )
+            state = maintenance.run(randomize=True, fix_user_agent=True, chrome_version="131")
+            print(f"{label:<12} {state.rate:8.1f} profiles/s  ({state.done} done, {state.failed} failed)")
+        repo.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ def reset_app_database():
     if os.path.exists(app_db):
         print(f"Removing existing app database: {app_db}")
         os.remove(app_db)
+        # WAL mode sidecar files
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(app_db + suffix):
+                os.remove(app_db + suffix)
         print("Done!")
     else:
         print("App database doesn't exist, nothing to reset.")
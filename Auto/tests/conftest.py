@@ -5,6 +5,8 @@ import pytest
 import tempfile
 import shutil
 import os
+import threading
+from unittest.mock import patch
 
 
 @pytest.fixture(autouse=True)
@@ -28,6 +30,16 @@ def isolate_from_production_db(monkeypatch):
         pass
 
 
+@pytest.fixture(autouse=True)
+def fresh_launch_engine(monkeypatch):
+    """
+    Give each test its own process-wide launch engine, so browsers left
+    registered by one test do not count against the next one's limit.
+    """
+    from app.core import launch_engine
+    monkeypatch.setattr(launch_engine, "_shared_engine", None)
+
+
 @pytest.fixture
 def clean_temp_dir():
     """Provide a clean temporary directory for tests."""
@@ -36,6 +48,48 @@ def clean_temp_dir():
     shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+class FakeProcess:
+    """Stand-in for a browser subprocess.Popen that runs until exit() or terminate()."""
+    
+    def __init__(self, args=None, **kwargs):
+        self.args = args
+        self.returncode = None
+        self._exited = threading.Event()
+    
+    def exit(self, code: int = 0):
+        self.returncode = code
+        self._exited.set()
+    
+    def terminate(self):
+        self.exit(-15)
+    
+    kill = terminate
+    
+    def poll(self):
+        return self.returncode
+    
+    def wait(self, timeout=None):
+        self._exited.wait(timeout)
+        return self.returncode
+
+
+@pytest.fixture
+def fake_popen():
+    """Patch subprocess.Popen with FakeProcess; yields the processes started."""
+    processes = []
+    
+    def start(args, **kwargs):
+        process = FakeProcess(args, **kwargs)
+        processes.append(process)
+        return process
+    
+    with patch("subprocess.Popen", side_effect=start):
+        yield processes
+    
+    for process in processes:
+        process.exit()
+
+
 def pytest_configure(config):
     """Configure pytest to show warnings about database access."""
     pass
@@ -234,6 +234,175 @@ class TestBrowserManagerGeneral:
         assert browser_manager.is_session_active("test")
 
 
+class TestLaunchStageTimings:
+    """launch_profile records one span per pipeline stage."""
+    
+    def test_stages_recorded_and_traced(self, mock_profile_manager, temp_profile):
+        """A subprocess launch times every stage and writes them to the trace."""
+        import json
+        from app.core.geolocation_manager import GeoLocation
+        from app.core.launch_metrics import LAUNCH_STAGES
+        
+        prefs_path = os.path.join(temp_profile.path, "Default", "Preferences")
+        os.makedirs(os.path.dirname(prefs_path))
+        with open(prefs_path, "w") as f:
+            json.dump({"gologin": {}}, f)
+        trace_path = os.path.join(temp_profile.path, "launch.jsonl")
+        
+        mock_profile_manager.get_profile.return_value = temp_profile
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager, launch_trace_path=trace_path)
+        location = GeoLocation(latitude=1.0, longitude=2.0, timezone="UTC", ip="1.2.3.4")
+        with patch.object(browser_manager.geolocation_manager, "get_location_from_ip", return_value=location), \
+                patch("subprocess.Popen"):
+            browser_manager.launch_profile(temp_profile.profile_id)
+        browser_manager.launch_metrics.close()
+        
+        stats = browser_manager.get_launch_stats()
+        assert list(stats) == list(LAUNCH_STAGES)
+        assert all(s["count"] == 1 for s in stats.values())
+        assert stats["total"]["p95"] >= stats["geoip"]["p95"]
+        
+        with open(trace_path) as f:
+            traced = [json.loads(line) for line in f]
+        assert sorted(e["stage"] for e in traced) == sorted(LAUNCH_STAGES)
+        assert {e["profile_id"] for e in traced} == {temp_profile.profile_id}
+
+
+class TestDevToolsReadiness:
+    """Port 0 launches learn their port from DevToolsActivePort."""
+    
+    def test_auto_port_launch(self, mock_profile_manager, temp_profile, fake_popen):
+        """The browser picks the port; wait_until_ready reports it and records the latency."""
+        import threading
+        from app.core.launch_metrics import STAGE_READY
+        from app.core.launch_engine import LaunchEngine
+        from app.core.port_allocator import PortAllocator
+        
+        mock_profile_manager.get_profile.return_value = temp_profile
+        allocator = PortAllocator()
+        browser_manager = BrowserManager(
+            profile_manager=mock_profile_manager, engine=LaunchEngine(port_allocator=allocator), auto_cdp_port=True
+        )
+        stale = os.path.join(temp_profile.path, "DevToolsActivePort")
+        with open(stale, "w") as f:
+            f.write("1111\n/devtools/browser/stale")
+        
+        browser_manager.launch_profile(temp_profile.profile_id, sync_geolocation=False)
+        assert "--remote-debugging-port=0" in fake_popen[0].args
+        assert not os.path.exists(stale)
+        assert len(allocator) == 0
+        assert browser_manager.get_cdp_url(temp_profile.profile_id) is None
+        
+        def write():
+            with open(stale, "w") as f:
+                f.write("43210\n/devtools/browser/abc")
+        threading.Timer(0.1, write).start()
+        
+        assert browser_manager.wait_until_ready(temp_profile.profile_id, timeout=5) == "http://127.0.0.1:43210"
+        assert browser_manager.get_cdp_url(temp_profile.profile_id) == "http://127.0.0.1:43210"
+        assert browser_manager.get_launch_stats()[STAGE_READY]["count"] == 1
+        
+        assert browser_manager.close_session(temp_profile.profile_id)
+        assert browser_manager.get_cdp_url(temp_profile.profile_id) is None
+    
+    def test_exit_before_ready(self, mock_profile_manager, temp_profile, fake_popen):
+        """A browser exiting before it listens is not waited for."""
+        mock_profile_manager.get_profile.return_value = temp_profile
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager, auto_cdp_port=True)
+        
+        browser_manager.launch_profile(temp_profile.profile_id, sync_geolocation=False)
+        fake_popen[0].returncode = 1
+        
+        assert browser_manager.wait_until_ready(temp_profile.profile_id, timeout=5) is None
+
+
+class TestProcessExitEndsSession:
+    """A closed browser window ends its session without polling."""
+    
+    def test_exit_releases_session(self, mock_profile_manager, temp_profile, fake_popen):
+        """The reaper removes the process, frees the port and notifies listeners."""
+        import threading
+        
+        mock_profile_manager.get_profile.return_value = temp_profile
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager)
+        ended = threading.Event()
+        events = []
+        browser_manager.add_session_listener(lambda event: (events.append(event), ended.set()))
+        
+        process = browser_manager.launch_profile(temp_profile.profile_id, sync_geolocation=False)
+        assert browser_manager.is_session_active(temp_profile.profile_id)
+        assert browser_manager.cdp_ports[temp_profile.profile_id] in browser_manager.port_allocator
+        
+        process.exit(3)
+        assert ended.wait(1.0)
+        assert [(e.profile_id, e.reason, e.exit_code) for e in events] == [(temp_profile.profile_id, "exited", 3)]
+        assert events[0].timestamp is not None
+        assert not browser_manager.is_session_active(temp_profile.profile_id)
+        assert temp_profile.profile_id not in browser_manager.port_allocator.leases().values()
+        mock_profile_manager.update_profile_status.assert_called_with(temp_profile.profile_id, "inactive")
+    
+    def test_close_session_notifies_once(self, mock_profile_manager, temp_profile, fake_popen):
+        """close_session ends the session itself; the reaper does not report it again."""
+        import threading
+        
+        mock_profile_manager.get_profile.return_value = temp_profile
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager)
+        ended = []
+        browser_manager.add_session_listener(ended.append)
+        
+        browser_manager.launch_profile(temp_profile.profile_id, sync_geolocation=False)
+        assert browser_manager.close_session(temp_profile.profile_id)
+        threading.Event().wait(0.1)
+        
+        assert [(e.profile_id, e.reason) for e in ended] == [(temp_profile.profile_id, "closed")]
+    
+    def test_unresponsive_driver_reported_not_killed(self, mock_profile_manager):
+        """A Selenium session whose DevTools endpoint stops answering is reported but left running."""
+        import threading
+        from http.server import HTTPServer, BaseHTTPRequestHandler
+        from app.core.cdp_health_probe import CdpHealthProbe
+        from app.core.launch_engine import LaunchEngine
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        server = HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        
+        engine = LaunchEngine()
+        engine.health_probe = CdpHealthProbe(engine._on_endpoint_dead, interval=0.05, timeout=0.2)
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager, engine=engine)
+        ended = threading.Event()
+        events = []
+        browser_manager.add_session_listener(lambda event: (events.append(event), ended.set()))
+        
+        driver = Mock()
+        driver.capabilities = {"goog:chromeOptions": {"debuggerAddress": f"127.0.0.1:{server.server_port}"}}
+        driver.service = None
+        browser_manager.active_sessions["p1"] = driver
+        browser_manager._register_driver(Mock(profile_id="p1", path="p1"), driver)
+        assert engine.get("p1").control is driver
+        
+        assert not ended.wait(0.3)
+        server.shutdown()
+        server.server_close()
+        
+        assert ended.wait(2.0)
+        assert [(e.profile_id, e.reason) for e in events] == [("p1", "unresponsive")]
+        assert browser_manager.is_session_active("p1")
+        assert engine.is_running("p1")
+        driver.quit.assert_not_called()
+        mock_profile_manager.update_profile_status.assert_not_called()
+        
+        assert browser_manager.close_session("p1")
+        driver.quit.assert_called_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 
@@ -324,3 +493,57 @@ class TestExtensionLoadingArguments:
         
         finally:
             shutil.rmtree(ext_dir, ignore_errors=True)
+
+
+class TestLaunchWritesPreferencesOnce:
+    """Pre-launch steps share one parse and one atomic write of Preferences."""
+    
+    def test_single_read_and_write(self, mock_profile_manager, temp_profile):
+        """UA fix and geolocation sync are written together."""
+        import json
+        from app.core.geolocation_manager import GeoLocation
+        
+        prefs_path = os.path.join(temp_profile.path, "Default", "Preferences")
+        os.makedirs(os.path.dirname(prefs_path))
+        with open(prefs_path, "w") as f:
+            json.dump({"gologin": {"navigator": {"userAgent": "old"}}, "big": ["x"] * 1000}, f)
+        
+        mock_profile_manager.get_profile.return_value = temp_profile
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager)
+        location = GeoLocation(latitude=10.5, longitude=106.7, timezone="Asia/Ho_Chi_Minh", ip="1.2.3.4")
+        
+        loads, replaces = [], []
+        real_load, real_replace = json.load, os.replace
+        with patch.object(browser_manager.geolocation_manager, "get_location_from_ip", return_value=location), \
+                patch("json.load", side_effect=lambda *a, **k: (loads.append(1), real_load(*a, **k))[1]), \
+                patch("os.replace", side_effect=lambda *a: (replaces.append(a[1]), real_replace(*a))[1]), \
+                patch("subprocess.Popen") as popen:
+            browser_manager.launch_profile(temp_profile.profile_id)
+        
+        assert popen.called
+        assert len(loads) == 1
+        assert [path for path in replaces if path.endswith("Preferences")] == [prefs_path]
+        
+        with open(prefs_path) as f:
+            prefs = json.load(f)
+        assert "Chrome/129" in prefs["gologin"]["navigator"]["userAgent"]
+        assert prefs["gologin"]["geolocation"]["latitude"] == 10.5
+        assert prefs["gologin"]["timezone"] == {"id": "Asia/Ho_Chi_Minh"}
+        assert prefs["big"] == ["x"] * 1000
+        assert sorted(os.listdir(os.path.dirname(prefs_path))) == ["Preferences", "gologin.sidecar.json"]
+    
+    def test_current_user_agent_not_patched(self, mock_profile_manager, temp_profile):
+        """A profile already on the Orbita User Agent needs no UA write."""
+        import json
+        from app.data.preferences_document import PreferencesDocument
+        
+        browser_manager = BrowserManager(profile_manager=mock_profile_manager)
+        prefs_path = os.path.join(temp_profile.path, "Default", "Preferences")
+        os.makedirs(os.path.dirname(prefs_path))
+        user_agent = browser_manager.fingerprint_generator.user_agent_for(browser_manager.orbita_version)
+        with open(prefs_path, "w") as f:
+            json.dump({"gologin": {"navigator": {"userAgent": user_agent}}}, f)
+        
+        prefs = PreferencesDocument(temp_profile.path)
+        assert browser_manager._fix_user_agent(temp_profile, prefs)
+        assert not prefs.dirty
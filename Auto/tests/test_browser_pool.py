@@ -0,0 +1,169 @@
+# Tests for Browser Pool
+# Feature: multi-profile-fingerprint-automation
+
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.core.browser_manager import BrowserManager
+from app.core.launch_engine import LaunchEngine
+from app.core.port_allocator import PortAllocator
+from app.core.profile_manager import ProfileManager
+from app.data.profile_models import Profile, ProfileData
+from tests.conftest import FakeProcess
+
+
+@pytest.fixture
+def pooled_manager():
+    """BrowserManager over 5 temp profiles whose fake browsers write DevToolsActivePort."""
+    temp_dir = tempfile.mkdtemp()
+    profiles = {}
+    for i in range(5):
+        profile_id = f"{i:020d}"
+        path = os.path.join(temp_dir, profile_id)
+        os.makedirs(path)
+        profiles[profile_id] = Profile(data=ProfileData(name=profile_id, idprofile=profile_id), path=path, exists=True)
+    
+    profile_manager = Mock(spec=ProfileManager)
+    profile_manager.get_profile.side_effect = profiles.get
+    manager = BrowserManager(
+        profile_manager=profile_manager, engine=LaunchEngine(port_allocator=PortAllocator()), auto_cdp_port=True
+    )
+    processes = []
+    
+    def start(args, **kwargs):
+        user_data_dir = next(a.split("=", 1)[1] for a in args if a.startswith("--user-data-dir="))
+        with open(os.path.join(user_data_dir, "DevToolsActivePort"), "w") as f:
+            f.write(f"{40000 + len(processes)}\n/devtools/browser/x")
+        process = FakeProcess(args)
+        processes.append(process)
+        return process
+    
+    with patch("subprocess.Popen", side_effect=start), \
+            patch.object(manager.geolocation_manager, "get_location_from_ip", return_value=None):
+        yield manager, sorted(profiles), processes
+    
+    for process in processes:
+        process.exit()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestBrowserPool:
+    """Jobs reuse warm browsers; idle browsers are evicted LRU at the ceiling."""
+    
+    def test_warm_hit_reuses_browser(self, pooled_manager):
+        """A second job for the same profile gets the same live browser without a launch."""
+        manager, profile_ids, processes = pooled_manager
+        pool = manager.enable_pool(max_size=3)
+        
+        with pool.job(profile_ids[0]) as browser:
+            assert browser.cdp_url == "http://127.0.0.1:40000"
+            assert profile_ids[0] in pool.busy_profiles()
+        assert pool.idle_profiles() == [profile_ids[0]]
+        assert manager.is_session_active(profile_ids[0])
+        
+        with pool.job(profile_ids[0]) as again:
+            assert again.session is browser.session
+        assert len(processes) == 1
+        assert pool.get_stats()["hits"] == 1 and pool.get_stats()["misses"] == 1
+    
+    def test_lru_eviction_at_ceiling(self, pooled_manager):
+        """At max_size the least recently used idle browser is closed."""
+        manager, profile_ids, processes = pooled_manager
+        pool = manager.enable_pool(max_size=3)
+        
+        pool.prewarm(profile_ids[:3])
+        with pool.job(profile_ids[0]):
+            pass
+        assert pool.idle_profiles() == [profile_ids[1], profile_ids[2], profile_ids[0]]
+        
+        with pool.job(profile_ids[3]) as browser:
+            assert browser is not None
+            assert not manager.is_session_active(profile_ids[1])
+            assert processes[1].returncode is not None
+        assert manager.get_session_count() == 3
+        assert pool.idle_profiles() == [profile_ids[2], profile_ids[0], profile_ids[3]]
+        assert pool.get_stats()["evictions"] == 1
+    
+    def test_eviction_does_not_hold_lock(self, pooled_manager):
+        """A slow eviction doesn't block release() or other acquires."""
+        manager, profile_ids, processes = pooled_manager
+        pool = manager.enable_pool(max_size=2)
+        pool.prewarm(profile_ids[:1])
+        assert pool.acquire(profile_ids[1]) is not None
+        
+        closing, finish = threading.Event(), threading.Event()
+        close_session = manager.close_session
+        
+        def slow_close(profile_id):
+            closing.set()
+            finish.wait(2.0)
+            return close_session(profile_id)
+        
+        manager.close_session = slow_close
+        worker = threading.Thread(target=pool.acquire, args=(profile_ids[2],))
+        worker.start()
+        assert closing.wait(2.0)
+        
+        released = threading.Thread(target=pool.release, args=(profile_ids[1],))
+        released.start()
+        released.join(0.5)
+        assert not released.is_alive()
+        assert pool.idle_profiles() == [profile_ids[1]]
+        
+        finish.set()
+        worker.join()
+        assert profile_ids[2] in pool.busy_profiles()
+        assert pool.get_stats()["evictions"] == 1
+    
+    def test_busy_browsers_not_evicted(self, pooled_manager):
+        """With every slot running a job, a new job gets no browser."""
+        manager, profile_ids, processes = pooled_manager
+        pool = manager.enable_pool(max_size=2)
+        
+        assert pool.acquire(profile_ids[0]) and pool.acquire(profile_ids[1])
+        assert pool.acquire(profile_ids[2]) is None
+        assert pool.acquire(profile_ids[0]) is None
+        assert manager.get_session_count() == 2
+        
+        pool.release(profile_ids[0])
+        assert pool.acquire(profile_ids[2]) is not None
+        assert not manager.is_session_active(profile_ids[0])
+    
+    def test_exited_browser_leaves_pool(self, pooled_manager):
+        """A warm browser closed by the user is dropped and relaunched on the next job."""
+        manager, profile_ids, processes = pooled_manager
+        pool = manager.enable_pool(max_size=3)
+        ended = threading.Event()
+        manager.add_session_listener(lambda event: ended.set())
+        
+        pool.prewarm(profile_ids[:1])
+        processes[0].exit()
+        assert ended.wait(1.0)
+        assert profile_ids[0] not in pool
+        
+        with pool.job(profile_ids[0]) as browser:
+            assert browser.session is processes[1]
+    
+    def test_default_size_follows_engine(self):
+        """The pool's default ceiling is the one the engine registry enforces."""
+        manager = BrowserManager(
+            profile_manager=Mock(spec=ProfileManager), engine=LaunchEngine(port_allocator=PortAllocator(), max_browsers=3)
+        )
+        assert manager.max_browsers == 3
+        assert manager.enable_pool().max_size == 3
+        assert BrowserManager.MAX_CONCURRENT_PROFILES == LaunchEngine.MAX_BROWSERS
+    
+    def test_close_idle(self, pooled_manager):
+        manager, profile_ids, processes = pooled_manager
+        pool = manager.enable_pool()
+        
+        assert pool.max_size == BrowserManager.MAX_CONCURRENT_PROFILES
+        assert manager.enable_pool() is pool
+        pool.prewarm(profile_ids[:2])
+        assert pool.close_idle() == 2
+        assert manager.get_session_count() == 0
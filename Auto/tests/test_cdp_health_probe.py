@@ -0,0 +1,93 @@
+# Tests for CDP Health Probe
+# Feature: multi-profile-fingerprint-automation
+
+import socket
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+from app.core.cdp_health_probe import CdpHealthProbe
+
+
+class _VersionHandler(BaseHTTPRequestHandler):
+    """Answers /json/version like a browser's DevTools endpoint."""
+    
+    def do_GET(self):
+        if self.path == "/json/version":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"Browser": "Chrome/129.0.0.0"}')
+        else:
+            self.send_response(404)
+            self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def devtools_server():
+    """A local HTTP server standing in for a browser's debugging port."""
+    server = HTTPServer(("127.0.0.1", 0), _VersionHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _closed_port() -> int:
+    """A local port nothing listens on."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestCdpHealthProbe:
+    """Dead endpoints are reported from the probe thread; live ones are not."""
+    
+    def test_live_endpoint_not_reported(self, devtools_server):
+        """An endpoint answering /json/version stays watched."""
+        dead = []
+        probe = CdpHealthProbe(dead.append, interval=0.05, timeout=0.5)
+        probe.watch("p1", "127.0.0.1", devtools_server.server_port)
+        
+        threading.Event().wait(0.3)
+        assert dead == []
+        assert "p1" in probe
+        probe.stop()
+    
+    def test_dead_endpoint_reported_once(self):
+        """An endpoint refusing connections is reported after max_failures probes."""
+        reported = threading.Event()
+        dead = []
+        probe = CdpHealthProbe(lambda key: (dead.append(key), reported.set()),
+                               interval=0.05, timeout=0.5, max_failures=2)
+        probe.watch("p1", "127.0.0.1", _closed_port())
+        
+        assert reported.wait(2.0)
+        threading.Event().wait(0.2)
+        assert dead == ["p1"]
+        assert "p1" not in probe
+        probe.stop()
+    
+    def test_unwatched_endpoint_not_reported(self):
+        """unwatch() before the failures add up suppresses the report."""
+        dead = []
+        probe = CdpHealthProbe(dead.append, interval=0.2, timeout=0.5, max_failures=3)
+        probe.watch("p1", "127.0.0.1", _closed_port())
+        probe.unwatch("p1")
+        
+        threading.Event().wait(0.5)
+        assert dead == []
+        probe.stop()
+    
+    def test_probe_status(self, devtools_server):
+        """probe() is True only for a 200 answer."""
+        import asyncio
+        
+        probe = CdpHealthProbe(lambda key: None, timeout=0.5)
+        assert asyncio.run(probe.probe("127.0.0.1", devtools_server.server_port))
+        assert not asyncio.run(probe.probe("127.0.0.1", _closed_port()))
@@ -0,0 +1,91 @@
+# Tests for DevToolsActivePort readiness detection
+# Feature: multi-profile-fingerprint-automation
+
+import os
+import tempfile
+import threading
+import time
+
+import pytest
+
+from app.core import devtools_port
+from app.core.devtools_port import (
+    DEVTOOLS_ACTIVE_PORT, clear_devtools_port, read_devtools_active_port, wait_for_devtools_port
+)
+from tests.conftest import FakeProcess
+
+
+WS_PATH = "/devtools/browser/1f6d4c2a-0000-4000-8000-000000000000"
+
+
+@pytest.fixture
+def user_data_dir():
+    """An empty profile directory."""
+    with tempfile.TemporaryDirectory() as path:
+        yield path
+
+
+def write_port(user_data_dir: str, content: str):
+    with open(os.path.join(user_data_dir, DEVTOOLS_ACTIVE_PORT), "w") as f:
+        f.write(content)
+
+
+class TestReadDevToolsActivePort:
+    """Only a complete file is read as ready."""
+    
+    def test_complete_file(self, user_data_dir):
+        write_port(user_data_dir, f"41234\n{WS_PATH}")
+        assert read_devtools_active_port(user_data_dir) == (41234, WS_PATH)
+    
+    @pytest.mark.parametrize("content", ["", "41234", "41234\n", "abc\n/devtools/x", "0\n/devtools/x"])
+    def test_partial_or_invalid_file(self, user_data_dir, content):
+        write_port(user_data_dir, content)
+        assert read_devtools_active_port(user_data_dir) is None
+    
+    def test_clear(self, user_data_dir):
+        write_port(user_data_dir, f"41234\n{WS_PATH}")
+        clear_devtools_port(user_data_dir)
+        clear_devtools_port(user_data_dir)
+        assert read_devtools_active_port(user_data_dir) is None
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def watch_mode(request, monkeypatch):
+    """Run waits with inotify (where available) and with polling."""
+    if request.param == "inotify" and not devtools_port.INOTIFY_AVAILABLE:
+        pytest.skip("inotify not available")
+    if request.param == "poll":
+        monkeypatch.setattr(devtools_port, "INOTIFY_AVAILABLE", False)
+    return request.param
+
+
+class TestWaitForDevToolsPort:
+    """Waiting returns when the file is written, the browser exits or time runs out."""
+    
+    def test_returns_when_written(self, user_data_dir, watch_mode):
+        """The wait ends right after the browser writes the file."""
+        timer = threading.Timer(0.2, write_port, (user_data_dir, f"41234\n{WS_PATH}"))
+        start = time.monotonic()
+        timer.start()
+        
+        assert wait_for_devtools_port(user_data_dir, timeout=5) == (41234, WS_PATH)
+        assert time.monotonic() - start < 0.5
+    
+    def test_partial_write_waits_for_completion(self, user_data_dir, watch_mode):
+        """A file holding only the port line is not taken as ready."""
+        write_port(user_data_dir, "41234\n")
+        threading.Timer(0.1, write_port, (user_data_dir, f"41234\n{WS_PATH}")).start()
+        
+        assert wait_for_devtools_port(user_data_dir, timeout=5) == (41234, WS_PATH)
+    
+    def test_browser_exit_stops_wait(self, user_data_dir, watch_mode):
+        """An exited browser ends the wait early."""
+        process = FakeProcess()
+        threading.Timer(0.1, process.exit, (1,)).start()
+        start = time.monotonic()
+        
+        assert wait_for_devtools_port(user_data_dir, timeout=5, process=process) is None
+        assert time.monotonic() - start < 1.0
+    
+    def test_timeout(self, user_data_dir, watch_mode):
+        assert wait_for_devtools_port(user_data_dir, timeout=0.1) is None
@@ -163,5 +163,186 @@ class TestFingerprintGeneration:
                config.canvas.noise != original_canvas
 
 
+class TestGologinConfigCache:
+    """load_gologin_config parses Preferences only when it changed."""
+    
+    @pytest.fixture
+    def profile_path(self, generator):
+        import os, shutil, tempfile
+        temp_dir = tempfile.mkdtemp()
+        generator.write_preferences(temp_dir, generator.update_gologin_config({}, generator.generate_fingerprint()))
+        yield temp_dir
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def _count_parses(self, monkeypatch, generator):
+        import app.core.fingerprint_generator as module
+        parses = []
+        read = module.read_gologin_section
+        monkeypatch.setattr(module, "read_gologin_section", lambda path: (parses.append(path), read(path))[1])
+        return parses
+    
+    def test_repeated_reads_hit_cache(self, generator, profile_path, monkeypatch):
+        """Second load is served from cache and returns an independent copy."""
+        parses = self._count_parses(monkeypatch, generator)
+        
+        first = generator.load_gologin_config(profile_path)
+        first.canvas.noise = -1
+        second = generator.load_gologin_config(profile_path)
+        
+        assert len(parses) == 1
+        assert second.canvas.noise != -1
+    
+    def test_external_change_is_reparsed(self, generator, profile_path, monkeypatch):
+        """A file rewritten behind our back has a new stamp and is parsed again."""
+        import json, os
+        parses = self._count_parses(monkeypatch, generator)
+        generator.load_gologin_config(profile_path)
+        
+        prefs_path = os.path.join(profile_path, "Default", "Preferences")
+        with open(prefs_path) as f:
+            prefs = json.load(f)
+        prefs["gologin"]["name"] = "changed by chrome"
+        with open(prefs_path, "w") as f:
+            json.dump(prefs, f)
+        
+        assert generator.load_gologin_config(profile_path).name == "changed by chrome"
+        assert len(parses) == 2
+    
+    def test_write_preferences_invalidates(self, generator, profile_path):
+        """Writes through write_preferences are seen even if mtime and size match."""
+        import os
+        prefs_path = os.path.join(profile_path, "Default", "Preferences")
+        config = generator.load_gologin_config(profile_path)
+        st = os.stat(prefs_path)
+        
+        config.name = "X" * len(config.name)
+        prefs = generator.update_gologin_config(generator.read_preferences(profile_path), config)
+        FingerprintGenerator().write_preferences(profile_path, prefs)
+        os.utime(prefs_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        
+        assert generator.load_gologin_config(profile_path).name == config.name
+    
+    def test_memory_budget_evicts_lru(self):
+        """Least recently used entries are dropped once over budget."""
+        from app.core.fingerprint_cache import FingerprintCache
+        config = FingerprintGenerator().generate_fingerprint()
+        probe = FingerprintCache()
+        probe.put("probe", (0, 0), config)
+        cache = FingerprintCache(max_bytes=probe.size_bytes * 3)
+        
+        for pid in ("a", "b", "c"):
+            cache.put(pid, (1, 1), config)
+        assert cache.get("a", (1, 1)) is not None
+        cache.put("d", (1, 1), config)
+        
+        assert len(cache) == 3
+        assert cache.get("b", (1, 1)) is None
+        assert cache.get("a", (1, 1)) is not None
+        assert cache.size_bytes <= cache.max_bytes
+
+
+class TestGologinSidecar:
+    """The gologin section is read from a sidecar while Preferences is unchanged."""
+    
+    @pytest.fixture
+    def prefs_path(self, generator):
+        import os, shutil, tempfile
+        temp_dir = tempfile.mkdtemp()
+        prefs = generator.update_gologin_config({"extensions": {"x": list(range(1000))}}, generator.generate_fingerprint())
+        generator.write_preferences(temp_dir, prefs)
+        yield os.path.join(temp_dir, "Default", "Preferences")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    
+    def test_sidecar_avoids_full_parse(self, prefs_path, monkeypatch):
+        """A current sidecar answers without opening Preferences."""
+        import builtins
+        from app.data.preferences_document import read_gologin_section
+        opened = []
+        real_open = builtins.open
+        monkeypatch.setattr(builtins, "open", lambda path, *a, **k: (opened.append(path), real_open(path, *a, **k))[1])
+        
+        found, section = read_gologin_section(prefs_path)
+        
+        assert found and "audioContext" in section
+        assert prefs_path not in opened
+    
+    def test_stale_sidecar_refreshed(self, prefs_path):
+        """When Chrome rewrites Preferences, the sidecar is ignored and rebuilt."""
+        import json
+        from app.data.preferences_document import read_gologin_section, GOLOGIN_SIDECAR
+        import os
+        
+        with open(prefs_path) as f:
+            prefs = json.load(f)
+        prefs["gologin"]["name"] = "rewritten"
+        with open(prefs_path, "w") as f:
+            json.dump(prefs, f, indent=3)
+        
+        found, section = read_gologin_section(prefs_path)
+        assert section["name"] == "rewritten"
+        
+        with open(os.path.join(os.path.dirname(prefs_path), GOLOGIN_SIDECAR)) as f:
+            sidecar = json.load(f)
+        st = os.stat(prefs_path)
+        assert sidecar["preferences"] == [st.st_mtime_ns, st.st_size]
+        assert sidecar["gologin"]["name"] == "rewritten"
+    
+    def test_missing_preferences(self, prefs_path):
+        """A sidecar without its Preferences file is not used."""
+        import os
+        from app.data.preferences_document import read_gologin_section
+        os.remove(prefs_path)
+        
+        assert read_gologin_section(prefs_path) == (False, None)
+
+
+class TestBatchFingerprintGeneration:
+    """generate_fingerprints draws a whole batch at once, with or without NumPy."""
+    
+    @pytest.fixture(params=[True, False], ids=["numpy", "python"])
+    def backend(self, request, monkeypatch):
+        import app.core.fingerprint_generator as module
+        if request.param and not module.NUMPY_AVAILABLE:
+            pytest.skip("numpy not installed")
+        monkeypatch.setattr(module, "NUMPY_AVAILABLE", request.param)
+        return request.param
+    
+    def test_batch_values_valid(self, generator, backend):
+        """Every generated config respects the ranges and pools."""
+        configs = generator.generate_fingerprints(200)
+        
+        assert len(configs) == 200
+        for config in configs:
+            assert generator.is_noise_in_range('audio', config.audioContext.noiseValue)
+            assert generator.is_noise_in_range('canvas', config.canvas.noise)
+            assert generator.is_noise_in_range('client_rects', config.clientRects.noise)
+            assert generator.is_noise_in_range('webgl', config.webGL.noise)
+            assert generator.is_gpu_config_valid(config.webGLMetadata.renderer, config.webGLMetadata.vendor)
+            assert (config.screenWidth, config.screenHeight) in generator.SCREEN_RESOLUTIONS
+            assert config.timezone.id in generator.TIMEZONES
+            assert config.userAgent in generator.USER_AGENTS
+            assert config.navigator.hardwareConcurrency in generator.HARDWARE_CONCURRENCY
+            assert len(config.mediaDevices.uid) == 32
+            assert type(config.clientRects.noise) is int
+        assert len({c.mediaDevices.uid for c in configs}) == 200
+    
+    def test_seed_reproducible(self, generator, backend):
+        """The same seed gives identical fingerprints; another seed does not."""
+        first = [c.to_dict() for c in generator.generate_fingerprints(20, seed=42)]
+        again = [c.to_dict() for c in generator.generate_fingerprints(20, seed=42)]
+        other = [c.to_dict() for c in generator.generate_fingerprints(20, seed=43)]
+        
+        assert first == again
+        assert first != other
+    
+    def test_table_matches_configs(self, generator, backend):
+        """The columnar table converts to the same configs as the direct call."""
+        table = generator.generate_fingerprints(50, seed=7, as_table=True)
+        
+        assert all(len(column) == 50 for column in table.values())
+        assert [c.to_dict() for c in generator.configs_from_table(table)] == \
+            [c.to_dict() for c in generator.generate_fingerprints(50, seed=7)]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,84 @@
+# Tests for Fingerprint Index
+# Feature: multi-profile-fingerprint-automation
+
+import copy
+
+import pytest
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.fingerprint_index import FingerprintIndex
+
+
+@pytest.fixture
+def config():
+    """A generated fingerprint."""
+    return FingerprintGenerator().generate_fingerprint()
+
+
+class TestFingerprintIndex:
+    """Profiles with the same signature are found without rescanning."""
+    
+    def test_identical_fingerprints_collide(self, config):
+        """Two profiles with the same config form one duplicate group."""
+        index = FingerprintIndex()
+        index.add("a", config)
+        index.add("b", copy.deepcopy(config))
+        
+        assert index.collisions_of("a") == {"b"}
+        assert index.profiles_with(config) == {"a", "b"}
+        assert index.duplicate_groups() == [{"a", "b"}]
+        assert not index.is_unique(config, "a")
+    
+    def test_near_noise_collides_far_noise_does_not(self, config):
+        """Noise in the same bucket collides; noise in another bucket does not."""
+        index = FingerprintIndex(noise_buckets=2)
+        index.add("a", config)
+        
+        other = copy.deepcopy(config)
+        low, high = FingerprintGenerator.CANVAS_NOISE_RANGE
+        config.canvas.noise = low
+        index.add("a", config)
+        other.canvas.noise = low + (high - low) * 0.1
+        assert not index.is_unique(other)
+        
+        other.canvas.noise = high
+        assert index.is_unique(other)
+    
+    def test_visible_difference_is_unique(self, config):
+        """A different timezone or user agent is a different signature."""
+        index = FingerprintIndex()
+        index.add("a", config)
+        
+        other = copy.deepcopy(config)
+        other.timezone.id = "Asia/Tokyo" if config.timezone.id != "Asia/Tokyo" else "Europe/Paris"
+        assert index.is_unique(other)
+        
+        other = copy.deepcopy(config)
+        other.navigator.userAgent += " Edg/129.0"
+        assert index.is_unique(other)
+    
+    def test_own_entry_ignored(self, config):
+        """A profile does not collide with itself."""
+        index = FingerprintIndex()
+        index.add("a", config)
+        
+        assert index.is_unique(config, "a")
+        assert index.collisions_of("a") == set()
+    
+    def test_readd_and_remove_update_groups(self, config):
+        """Re-indexing or removing a profile dissolves its duplicate group."""
+        index = FingerprintIndex()
+        index.add("a", config)
+        index.add("b", copy.deepcopy(config))
+        
+        changed = copy.deepcopy(config)
+        changed.screenWidth += 1
+        index.add("b", changed)
+        assert index.duplicate_groups() == []
+        assert len(index) == 2
+        
+        index.add("c", copy.deepcopy(config))
+        index.remove("a")
+        assert index.duplicate_groups() == []
+        assert "a" not in index
+        assert index.profiles_with(config) == {"c"}
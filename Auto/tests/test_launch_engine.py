@@ -0,0 +1,184 @@
+# Tests for Launch Engine
+# Feature: multi-profile-fingerprint-automation
+
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.browser_manager import BrowserManager
+from app.core.cdp_browser_launcher import CDPBrowserLauncher
+from app.core.launch_engine import CdpBackend, ControlBackend, LaunchEngine
+from app.core.port_allocator import PortAllocator
+from app.core.profile_manager import ProfileManager
+from app.data.profile_models import Profile, ProfileData
+from tests.conftest import FakeProcess
+
+
+@pytest.fixture
+def profile_dir():
+    """Temporary user data dir."""
+    path = tempfile.mkdtemp(prefix="engine_")
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+class TestSpawn:
+    """The engine builds the command line, leases the port and registers the browser."""
+
+    def test_spawn_registers_and_leases(self, profile_dir, fake_popen):
+        """A spawned browser holds a leased port and a registry slot until closed."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        stale = os.path.join(profile_dir, "DevToolsActivePort")
+        with open(stale, "w") as f:
+            f.write("1111\n/devtools/browser/stale")
+        
+        instance = engine.spawn("p1", profile_dir, owner="test", window_position=(10, 20))
+        args = fake_popen[0].args
+        assert f"--remote-debugging-port={instance.debug_port}" in args
+        assert "--window-position=10,20" in args
+        assert "--disable-blink-features=AutomationControlled" in args
+        assert not os.path.exists(stale)
+        assert engine.port_allocator.owner_of(instance.debug_port) == "p1"
+        assert engine.is_running("p1") and engine.count() == 1
+        
+        assert engine.close("p1")
+        assert fake_popen[0].returncode is not None
+        assert len(engine.port_allocator) == 0
+        assert engine.count() == 0
+
+    def test_duplicate_profile_refused(self, profile_dir, fake_popen):
+        """A profile runs once across all owners; the refused launch leases nothing."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        engine.spawn("p1", profile_dir, owner="a")
+        
+        with pytest.raises(RuntimeError):
+            engine.spawn("p1", profile_dir, owner="b")
+        assert len(fake_popen) == 1
+        assert len(engine.port_allocator) == 1
+
+    def test_browser_picked_port(self, profile_dir, fake_popen):
+        """Port 0 leases nothing; wait_ready fills in the reported port."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        engine.spawn("p1", profile_dir, owner="test", debug_port=0, backend=CdpBackend())
+        assert "--remote-debugging-port=0" in fake_popen[0].args
+        assert len(engine.port_allocator) == 0
+        
+        with open(os.path.join(profile_dir, "DevToolsActivePort"), "w") as f:
+            f.write("43210\n/devtools/browser/abc")
+        instance = engine.wait_ready("p1", timeout=1)
+        assert (instance.debug_port, instance.ws_path) == (43210, "/devtools/browser/abc")
+        assert engine.attach("p1") == "http://127.0.0.1:43210"
+
+
+class TestGlobalCapacity:
+    """One ceiling covers the browsers of every launcher."""
+
+    def test_limit_across_owners(self, profile_dir, fake_popen):
+        """Slots freed by an exit are available to any owner."""
+        engine = LaunchEngine(port_allocator=PortAllocator(), max_browsers=2)
+        engine.spawn("p1", profile_dir, owner="browser_manager")
+        engine.spawn("p2", profile_dir, owner="cdp_launcher")
+        assert engine.is_full()
+        
+        with pytest.raises(RuntimeError):
+            engine.spawn("p3", profile_dir, owner="playwright_cdp")
+        assert len(engine.port_allocator) == 2
+        
+        exited = threading.Event()
+        engine.add_exit_listener(lambda instance, event: exited.set())
+        fake_popen[0].exit()
+        assert exited.wait(1.0)
+        engine.spawn("p3", profile_dir, owner="playwright_cdp")
+        assert set(engine.instances()) == {"p2", "p3"}
+        assert set(engine.instances("playwright_cdp")) == {"p3"}
+
+    def test_launchers_see_each_other(self, profile_dir, fake_popen):
+        """A profile running in BrowserManager is not started again by CDPBrowserLauncher."""
+        profile_id = "12345678901234567890"
+        profile = Profile(data=ProfileData(name="Test", idprofile=profile_id), path=profile_dir, exists=True)
+        profile_manager = Mock(spec=ProfileManager)
+        profile_manager.get_profile.return_value = profile
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        browser_manager = BrowserManager(profile_manager=profile_manager, engine=engine)
+        launcher = CDPBrowserLauncher(engine=engine)
+        
+        browser_manager.launch_profile(profile_id, sync_geolocation=False)
+        assert launcher.launch(profile_id, profile_dir) is None
+        assert len(fake_popen) == 1
+        assert launcher.instances == {}
+        assert engine.get(profile_id).owner == BrowserManager.OWNER
+        
+        browser_manager.close_session(profile_id)
+        assert engine.count() == 0
+
+
+    def test_remote_origins_only_when_asked(self, profile_dir, fake_popen):
+        """--remote-allow-origins=* is added only for launchers that opt in."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        engine.spawn("p1", profile_dir, owner="a")
+        engine.spawn("p2", profile_dir, owner="b", allow_remote_origins=True)
+        
+        assert "--remote-allow-origins=*" not in fake_popen[0].args
+        assert "--remote-allow-origins=*" in fake_popen[1].args
+
+    def test_forget_and_close_respect_owner(self, profile_dir, fake_popen):
+        """A launcher cannot drop or close another launcher's browser."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        engine.spawn("p1", profile_dir, owner="a")
+        
+        assert engine.forget("p1", "b") is None
+        assert not engine.close("p1", "b")
+        assert engine.is_running("p1") and fake_popen[0].returncode is None
+        
+        assert engine.close("p1", "a")
+        assert not engine.is_running("p1")
+
+class TestHealth:
+    """Exits are reported once to the listeners and free the slot and port."""
+
+    def test_process_exit(self, profile_dir, fake_popen):
+        """The reaper reports the exit code; the port goes back to the allocator."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        ended = threading.Event()
+        events = []
+        engine.add_exit_listener(lambda instance, event: (events.append((instance.owner, event)), ended.set()))
+        
+        engine.spawn("p1", profile_dir, owner="test")
+        fake_popen[0].exit(4)
+        
+        assert ended.wait(1.0)
+        assert [(owner, e.profile_id, e.reason, e.exit_code) for owner, e in events] == [("test", "p1", "exited", 4)]
+        assert not engine.is_running("p1")
+        assert len(engine.port_allocator) == 0
+
+    def test_close_detaches_and_reports_once(self, profile_dir, fake_popen):
+        """close() detaches the backend and reports "closed"; the reaper stays silent."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        backend = Mock(spec=ControlBackend)
+        events = []
+        engine.add_exit_listener(lambda instance, event: events.append(event.reason))
+        
+        engine.spawn("p1", profile_dir, owner="test", backend=backend)
+        engine.close("p1")
+        threading.Event().wait(0.1)
+        
+        backend.detach.assert_called_once()
+        assert events == ["closed"]
+
+    def test_external_browser_reaped(self, profile_dir):
+        """A chromedriver-started browser counts and ends with its chromedriver."""
+        engine = LaunchEngine(port_allocator=PortAllocator())
+        ended = threading.Event()
+        engine.add_exit_listener(lambda instance, event: ended.set())
+        driver, service_process = Mock(), FakeProcess()
+        
+        engine.register_external("p1", profile_dir, owner="test", control=driver, process=service_process)
+        assert engine.count() == 1 and engine.get("p1").control is driver
+        
+        service_process.exit(1)
+        assert ended.wait(1.0)
+        assert engine.count() == 0
@@ -0,0 +1,72 @@
+# Tests for Launch Metrics
+# Feature: multi-profile-fingerprint-automation
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from app.core.launch_metrics import LaunchMetrics, STAGE_GEOIP, STAGE_SPAWN, STAGE_TOTAL
+
+
+class TestLaunchMetrics:
+    """Stage durations give percentiles and an optional JSON-lines trace."""
+    
+    def test_percentiles(self):
+        """p50/p95 use nearest rank over the recorded samples."""
+        metrics = LaunchMetrics()
+        for ms in range(1, 101):
+            metrics.record(STAGE_GEOIP, ms / 1000)
+        
+        assert metrics.percentile(STAGE_GEOIP, 50) == pytest.approx(0.050)
+        assert metrics.percentile(STAGE_GEOIP, 95) == pytest.approx(0.095)
+        assert metrics.percentile(STAGE_SPAWN, 50) is None
+        
+        stats = metrics.summary()[STAGE_GEOIP]
+        assert stats["count"] == 100
+        assert stats["p50"] == pytest.approx(50)
+        assert stats["p95"] == pytest.approx(95)
+        assert stats["max"] == pytest.approx(100)
+    
+    def test_samples_bounded(self):
+        """Only the most recent max_samples durations are kept."""
+        metrics = LaunchMetrics(max_samples=10)
+        for i in range(100):
+            metrics.record(STAGE_SPAWN, float(i))
+        
+        assert metrics.summary()[STAGE_SPAWN]["count"] == 10
+        assert metrics.percentile(STAGE_SPAWN, 0) == 90.0
+    
+    def test_summary_in_pipeline_order(self):
+        """Stages are listed in launch order regardless of record order."""
+        metrics = LaunchMetrics()
+        metrics.record(STAGE_TOTAL, 1.0)
+        metrics.record(STAGE_SPAWN, 0.5)
+        metrics.record(STAGE_GEOIP, 0.2)
+        
+        assert list(metrics.summary()) == [STAGE_GEOIP, STAGE_SPAWN, STAGE_TOTAL]
+    
+    def test_span_traces_failures(self):
+        """A span that raises is still recorded, with ok false, in the trace."""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            trace_path = os.path.join(temp_dir, "launch.jsonl")
+            metrics = LaunchMetrics(trace_path=trace_path)
+            
+            with metrics.span(STAGE_GEOIP, "p1"):
+                pass
+            with pytest.raises(RuntimeError):
+                with metrics.span(STAGE_SPAWN, "p1"):
+                    raise RuntimeError("boom")
+            metrics.close()
+            
+            with open(trace_path) as f:
+                events = [json.loads(line) for line in f]
+            assert [(e["profile_id"], e["stage"], e["ok"]) for e in events] == [
+                ("p1", STAGE_GEOIP, True), ("p1", STAGE_SPAWN, False)
+            ]
+            assert all(e["ms"] >= 0 for e in events)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
@@ -0,0 +1,123 @@
+# Tests for Launch Scheduler
+# Feature: multi-profile-fingerprint-automation
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.core.browser_manager import BrowserManager
+from app.core.geolocation_manager import GeoLocation
+from app.core.launch_engine import LaunchEngine
+from app.core.launch_scheduler import LaunchScheduler
+from app.core.port_allocator import PortAllocator
+from app.core.profile_manager import ProfileManager
+from app.data.profile_models import Profile, ProfileData
+
+
+GEOIP_DELAY = 0.2
+
+
+@pytest.fixture
+def browser_manager(fake_popen):
+    """BrowserManager over temp profiles, with a slow GeoIP stub and Popen patched."""
+    temp_dir = tempfile.mkdtemp()
+    profiles = {}
+    for i in range(8):
+        profile_id = f"{i:020d}"
+        path = os.path.join(temp_dir, profile_id)
+        os.makedirs(os.path.join(path, "Default"))
+        with open(os.path.join(path, "Default", "Preferences"), "w") as f:
+            json.dump({"gologin": {}}, f)
+        profiles[profile_id] = Profile(data=ProfileData(name=profile_id, idprofile=profile_id), path=path, exists=True)
+    
+    profile_manager = Mock(spec=ProfileManager)
+    profile_manager.get_profile.side_effect = profiles.get
+    manager = BrowserManager(profile_manager=profile_manager, engine=LaunchEngine(port_allocator=PortAllocator()))
+    
+    lock = threading.Lock()
+    manager.geoip_active = [0, 0]  # current, max concurrent lookups
+    
+    def geoip(proxy=None):
+        with lock:
+            manager.geoip_active[0] += 1
+            manager.geoip_active[1] = max(manager.geoip_active)
+        time.sleep(GEOIP_DELAY)
+        with lock:
+            manager.geoip_active[0] -= 1
+        return GeoLocation(latitude=1.0, longitude=2.0, timezone="UTC", ip="1.2.3.4")
+    
+    spawn_times = []
+    launch = manager._launch_with_subprocess
+    
+    def timed_launch(*args, **kwargs):
+        spawn_times.append(time.monotonic())
+        return launch(*args, **kwargs)
+    
+    with patch.object(manager.geolocation_manager, "get_location_from_ip", side_effect=geoip), \
+            patch.object(manager, "_launch_with_subprocess", side_effect=timed_launch):
+        manager.spawn_times = spawn_times
+        yield manager, sorted(profiles)
+    
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestLaunchScheduler:
+    """Pre-launch runs in parallel; spawns are rate limited and stoppable."""
+    
+    def test_prelaunch_runs_concurrently(self, browser_manager):
+        """8 GeoIP lookups of 0.2 s overlap instead of adding up."""
+        manager, profile_ids = browser_manager
+        
+        start = time.monotonic()
+        results = LaunchScheduler(manager, workers=4, spawn_interval=0).run(profile_ids)
+        elapsed = time.monotonic() - start
+        
+        assert set(results) == set(profile_ids) and all(results.values())
+        assert elapsed < len(profile_ids) * GEOIP_DELAY / 2
+        assert manager.geoip_active[1] <= 4
+        assert set(manager.active_processes) == set(profile_ids)
+        assert len(set(manager.cdp_ports.values())) == len(profile_ids)
+    
+    def test_spawns_rate_limited(self, browser_manager):
+        """Consecutive spawns are at least spawn_interval apart."""
+        manager, profile_ids = browser_manager
+        
+        LaunchScheduler(manager, workers=8, spawn_interval=0.05).run(profile_ids[:4])
+        
+        gaps = [b - a for a, b in zip(manager.spawn_times, manager.spawn_times[1:])]
+        assert len(gaps) == 3
+        assert all(gap >= 0.045 for gap in gaps)
+    
+    def test_stop_releases_prepared_ports(self, browser_manager):
+        """Refusing a slot stops the batch and frees ports of unspawned profiles."""
+        manager, profile_ids = browser_manager
+        slots = [True, True]
+        launched = []
+        
+        results = LaunchScheduler(manager, workers=4, spawn_interval=0).run(
+            profile_ids,
+            on_launched=lambda pid, result: launched.append(pid),
+            wait_for_slot=lambda: bool(slots) and slots.pop()
+        )
+        
+        assert len(launched) == 2 and set(results) == set(launched)
+        assert set(manager.port_allocator.leases()) == set(manager.cdp_ports.values())
+        assert set(manager.cdp_ports) == set(launched)
+    
+    def test_missing_and_running_profiles(self, browser_manager):
+        """Missing profiles report None; running ones return the existing process."""
+        manager, profile_ids = browser_manager
+        running = Mock()
+        manager.active_processes[profile_ids[0]] = running
+        
+        results = LaunchScheduler(manager, spawn_interval=0).run([profile_ids[0], "missing", profile_ids[1]])
+        
+        assert results[profile_ids[0]] is running
+        assert results["missing"] is None
+        assert results[profile_ids[1]]
@@ -0,0 +1,153 @@
+# Tests for Playwright Service
+# Feature: multi-profile-fingerprint-automation
+
+import asyncio
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.core.playwright_service import CallbackRelay, PlaywrightService
+
+
+def _fake_driver():
+    """Stand-in for a started Playwright whose connect_over_cdp returns a Mock browser."""
+    driver = Mock()
+    driver.chromium.connect_over_cdp = AsyncMock(side_effect=lambda url: Mock(url=url))
+    driver.stop = AsyncMock()
+    return driver
+
+
+@pytest.fixture
+def service():
+    """PlaywrightService over a fake driver that takes 50 ms to boot."""
+    driver = _fake_driver()
+    
+    async def start():
+        await asyncio.sleep(0.05)
+        return driver
+    
+    service = PlaywrightService(start_driver=start)
+    yield service, driver
+    service.stop()
+
+
+class TestSharedDriver:
+    """All profiles attach through one driver on one loop thread."""
+    
+    def test_one_driver_for_many_profiles(self, service):
+        """Twenty concurrent connections boot the driver once."""
+        service, driver = service
+        
+        async def connect_all():
+            return await asyncio.gather(*(
+                service.connect_over_cdp(f"http://127.0.0.1:{9222 + i}") for i in range(20)
+            ))
+        
+        browsers = service.run(connect_all())
+        assert len(browsers) == 20
+        assert service.driver_starts == 1
+        assert driver.chromium.connect_over_cdp.await_count == 20
+    
+    def test_runs_from_threads_share_loop(self, service):
+        """Coroutines run by several threads execute on the same loop thread."""
+        service, _ = service
+        loops = []
+        
+        async def job():
+            await service.get_playwright()
+            loops.append((asyncio.get_running_loop(), threading.current_thread().name))
+        
+        threads = [threading.Thread(target=service.run, args=(job(),)) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(loops) == 5
+        assert len(set(loops)) == 1
+        assert loops[0][1] == "playwright-service"
+        assert service.driver_starts == 1
+    
+    def test_driver_only_on_service_loop(self, service):
+        """get_playwright refuses callers on another loop."""
+        service, _ = service
+        assert not service.in_loop()
+        with pytest.raises(RuntimeError):
+            asyncio.run(service.get_playwright())
+    
+    def test_failed_start_retried(self):
+        """A driver that fails to boot is started again on the next use."""
+        driver = _fake_driver()
+        attempts = []
+        
+        async def start():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise OSError("driver missing")
+            return driver
+        
+        service = PlaywrightService(start_driver=start)
+        try:
+            with pytest.raises(OSError):
+                service.run(service.get_playwright())
+            assert service.run(service.get_playwright()) is driver
+        finally:
+            service.stop()
+    
+    def test_failed_start_concurrent_callers(self):
+        """Every caller waiting on a failed start gets the start error, then retries work."""
+        driver = _fake_driver()
+        attempts = []
+        
+        async def start():
+            attempts.append(1)
+            await asyncio.sleep(0.05)
+            if len(attempts) == 1:
+                raise ValueError("boom")
+            return driver
+        
+        async def both():
+            return await asyncio.gather(service.get_playwright(), service.get_playwright(), return_exceptions=True)
+        
+        service = PlaywrightService(start_driver=start)
+        try:
+            results = service.run(both())
+            assert [type(r) for r in results] == [ValueError, ValueError]
+            assert service.run(service.get_playwright()) is driver
+            assert service.driver_starts == 2
+        finally:
+            service.stop()
+    
+    def test_stop_and_restart(self, service):
+        """stop() shuts the driver and the thread down; the next use starts them again."""
+        service, driver = service
+        service.run(service.get_playwright())
+        service.stop()
+        
+        driver.stop.assert_awaited_once()
+        assert not service.running
+        assert service.run(service.get_playwright()) is driver
+        assert service.driver_starts == 2
+
+
+class TestCallbackRelay:
+    """Callbacks from the service loop run on the waiting thread."""
+    
+    def test_callbacks_run_on_caller_thread(self, service):
+        """Relayed calls run in order on the thread blocked in wait()."""
+        service, _ = service
+        calls = []
+        relay = CallbackRelay()
+        log = relay.wrap(lambda message: calls.append((message, threading.current_thread())))
+        
+        async def job():
+            for i in range(3):
+                log(f"line {i}")
+                await asyncio.sleep(0.01)
+            return "done"
+        
+        assert relay.wait(service.submit(job())) == "done"
+        assert [message for message, _ in calls] == ["line 0", "line 1", "line 2"]
+        assert all(thread is threading.current_thread() for _, thread in calls)
+        assert relay.wrap(None) is None
@@ -0,0 +1,121 @@
+# Tests for Port Allocator
+# Feature: multi-profile-fingerprint-automation
+
+import socket
+import threading
+
+import pytest
+
+from app.core.port_allocator import PortAllocator, get_port_allocator
+from app.core.browser_manager import BrowserManager
+from app.core.cdp_browser_launcher import CDPBrowserLauncher
+
+
+def _free_range(size: int) -> int:
+    """Find the start of `size` consecutive bindable ports."""
+    base = 20000
+    while base < 60000:
+        allocator = PortAllocator(base, base + size)
+        if all(allocator._bindable(port) for port in range(base, base + size)):
+            return base
+        base += size
+    pytest.skip("no free port range")
+
+
+class TestPortAllocator:
+    """Leases are unique, released ports are reused last, busy ports are skipped."""
+    
+    def test_leases_unique_until_exhausted(self):
+        """Every port in the range is leased once, then leasing fails."""
+        start = _free_range(5)
+        allocator = PortAllocator(start, start + 5)
+        
+        ports = [allocator.lease(f"p{i}") for i in range(5)]
+        assert sorted(ports) == list(range(start, start + 5))
+        assert allocator.owner_of(ports[0]) == "p0"
+        with pytest.raises(RuntimeError):
+            allocator.lease()
+        
+        allocator.release(ports[2])
+        assert allocator.lease() == ports[2]
+    
+    def test_released_port_reused_last(self):
+        """The free-list is FIFO: a released port goes behind the untouched ones."""
+        start = _free_range(3)
+        allocator = PortAllocator(start, start + 3)
+        
+        first = allocator.lease()
+        allocator.release(first)
+        assert [allocator.lease(), allocator.lease(), allocator.lease()] == [start + 1, start + 2, first]
+    
+    def test_busy_port_skipped(self):
+        """A port another program listens on is not leased."""
+        start = _free_range(2)
+        allocator = PortAllocator(start, start + 2)
+        
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as busy:
+            busy.bind(("127.0.0.1", start))
+            busy.listen()
+            assert allocator.lease() == start + 1
+            with pytest.raises(RuntimeError):
+                allocator.lease()
+    
+    def test_release_ignores_unleased(self):
+        """Releasing an unknown port or None changes nothing."""
+        start = _free_range(2)
+        allocator = PortAllocator(start, start + 2)
+        
+        allocator.release(None)
+        allocator.release(start)
+        assert allocator.available == 2 and len(allocator) == 0
+    
+    def test_configure_keeps_leases(self):
+        """A new range excludes ports still leased."""
+        start = _free_range(4)
+        allocator = PortAllocator(start, start + 2)
+        leased = allocator.lease("p1")
+        
+        allocator.configure(start, start + 4)
+        assert allocator.available == 3
+        assert leased not in [allocator.lease() for _ in range(3)]
+        with pytest.raises(ValueError):
+            allocator.configure(10, 5)
+    
+    def test_concurrent_leases_unique(self):
+        """Threads leasing at once never receive the same port."""
+        start = _free_range(40)
+        allocator = PortAllocator(start, start + 40)
+        ports = []
+        lock = threading.Lock()
+        
+        def lease_some():
+            for _ in range(10):
+                port = allocator.lease()
+                with lock:
+                    ports.append(port)
+        
+        threads = [threading.Thread(target=lease_some) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(ports)) == 40
+
+
+class TestSharedAllocator:
+    """Launchers draw from one process-wide allocator."""
+    
+    def test_launchers_share_allocator(self):
+        """BrowserManager and CDPBrowserLauncher default to the same allocator."""
+        from unittest.mock import Mock
+        
+        browser_manager = BrowserManager(profile_manager=Mock())
+        launcher = CDPBrowserLauncher()
+        assert browser_manager.port_allocator is get_port_allocator()
+        assert launcher.port_allocator is browser_manager.port_allocator
+        
+        port = browser_manager._get_free_cdp_port("p1")
+        other = launcher.port_allocator.lease("p2")
+        assert other != port
+        launcher.port_allocator.release(port)
+        launcher.port_allocator.release(other)
@@ -0,0 +1,61 @@
+# Tests for Preferences Document
+# Feature: multi-profile-fingerprint-automation
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from app.data.preferences_document import PreferencesDocument, write_json_atomic
+
+
+@pytest.fixture
+def profile_path():
+    """Create a profile directory with a Preferences file."""
+    temp_dir = tempfile.mkdtemp()
+    os.makedirs(os.path.join(temp_dir, "Default"))
+    with open(os.path.join(temp_dir, "Default", "Preferences"), "w") as f:
+        json.dump({"gologin": {"name": "a"}}, f)
+    yield temp_dir
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestPreferencesDocument:
+    """Patches are applied in memory and written once."""
+
+    def test_patches_written_on_save(self, profile_path):
+        """Several patches end up in one file; unsaved changes stay in memory."""
+        doc = PreferencesDocument(profile_path)
+        assert doc.patch(lambda p: p["gologin"].update(name="b"))
+        assert doc.patch(lambda p: p.setdefault("extra", 1))
+
+        with open(doc.path) as f:
+            assert json.load(f) == {"gologin": {"name": "a"}}
+
+        assert doc.save()
+        assert not doc.dirty
+        with open(doc.path) as f:
+            assert json.load(f) == {"gologin": {"name": "b"}, "extra": 1}
+
+    def test_missing_file(self, profile_path):
+        """Patching a profile without Preferences is refused and nothing is written."""
+        os.remove(os.path.join(profile_path, "Default", "Preferences"))
+        doc = PreferencesDocument(profile_path)
+
+        assert not doc.exists
+        assert not doc.patch(lambda p: p.update(x=1))
+        assert doc.save()
+        assert os.listdir(os.path.join(profile_path, "Default")) == []
+
+    def test_failed_write_keeps_original(self, profile_path):
+        """An error during serialization leaves the old file and no temp file."""
+        path = os.path.join(profile_path, "Default", "Preferences")
+
+        with pytest.raises(TypeError):
+            write_json_atomic(path, {"bad": object()})
+
+        with open(path) as f:
+            assert json.load(f) == {"gologin": {"name": "a"}}
+        assert os.listdir(os.path.dirname(path)) == ["Preferences"]
@@ -0,0 +1,55 @@
+# Tests for Process Reaper
+# Feature: multi-profile-fingerprint-automation
+
+import threading
+
+from app.core.process_reaper import ProcessReaper
+from tests.conftest import FakeProcess
+
+
+class TestProcessReaper:
+    """Exits are reported once, as they happen, unless unwatched first."""
+    
+    def test_exit_reported(self):
+        """on_exit runs with the key and process right after the exit."""
+        reaper = ProcessReaper()
+        process = FakeProcess()
+        exited = threading.Event()
+        calls = []
+        
+        reaper.watch("p1", process, lambda key, proc: (calls.append((key, proc)), exited.set()))
+        assert "p1" in reaper and not exited.wait(0.05)
+        
+        process.exit()
+        assert exited.wait(1.0)
+        assert calls == [("p1", process)]
+        assert len(reaper) == 0
+    
+    def test_unwatched_exit_not_reported(self):
+        """A process unwatched before it exits produces no callback."""
+        reaper = ProcessReaper()
+        process = FakeProcess()
+        calls = []
+        
+        reaper.watch("p1", process, lambda key, proc: calls.append(key))
+        reaper.unwatch("p1")
+        process.exit()
+        
+        threading.Event().wait(0.1)
+        assert calls == []
+    
+    def test_rewatched_key_reports_new_process_only(self):
+        """An old process exiting after its key was reused is ignored."""
+        reaper = ProcessReaper()
+        old, new = FakeProcess(), FakeProcess()
+        calls = []
+        exited = threading.Event()
+        
+        reaper.watch("p1", old, lambda key, proc: calls.append(proc))
+        reaper.watch("p1", new, lambda key, proc: (calls.append(proc), exited.set()))
+        old.exit()
+        new.exit()
+        
+        assert exited.wait(1.0)
+        threading.Event().wait(0.05)
+        assert calls == [new]
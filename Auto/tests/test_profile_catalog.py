@@ -0,0 +1,177 @@
+# Tests for Profile Catalog
+# Feature: multi-profile-fingerprint-automation
+
+import pytest
+import tempfile
+import os
+import shutil
+
+from app.core.profile_catalog import ProfileCatalog
+from app.core.profile_manager import ProfileManager
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.data.profile_repository import ProfileRepository
+from app.data.profile_models import ProfileData
+
+
+@pytest.fixture
+def catalog_setup():
+    """Create repository, manager and catalog with three profiles on disk."""
+    temp_dir = tempfile.mkdtemp()
+    profile_dir = os.path.join(temp_dir, "profiles")
+    os.makedirs(profile_dir)
+
+    repo = ProfileRepository(
+        db_path=os.path.join(temp_dir, "data.db"),
+        app_db_path=os.path.join(temp_dir, "app_data.db"),
+        profile_dir=profile_dir
+    )
+    for i in range(3):
+        pid = f"{i:020d}"
+        os.makedirs(os.path.join(profile_dir, pid))
+        repo.create_profile(ProfileData(name=f"P{i}", idprofile=pid, sothutu=i, group_profile=f"g{i % 2}"))
+
+    manager = ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=temp_dir)
+    catalog = ProfileCatalog(manager)
+    catalog.reload()
+
+    yield repo, manager, catalog
+
+    catalog.close()
+    repo.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestProfileCatalog:
+    """In-memory index follows repository writes and emits change events."""
+
+    def test_indexes(self, catalog_setup):
+        """Profiles are indexed by id, group and status."""
+        repo, manager, catalog = catalog_setup
+
+        assert len(catalog) == 3
+        assert catalog.get(f"{1:020d}").name == "P1"
+        assert [p.name for p in catalog.by_group("g0")] == ["P0", "P2"]
+        assert catalog.count_by_status("inactive") == 3
+
+    def test_status_change_updates_in_place(self, catalog_setup):
+        """Status writes move the profile between status buckets and emit an event."""
+        repo, manager, catalog = catalog_setup
+        events = []
+        catalog.subscribe(events.append)
+
+        profile = catalog.get(f"{0:020d}")
+        manager.update_profile_status(f"{0:020d}", "running")
+
+        assert catalog.get(f"{0:020d}") is profile
+        assert profile.status == "running"
+        assert [p.profile_id for p in catalog.by_status("running")] == [f"{0:020d}"]
+        assert catalog.count_by_status("inactive") == 2
+
+        assert len(events) == 1
+        assert (events[0].kind, events[0].profile_id, events[0].old_value, events[0].new_value) == \
+            ("status", f"{0:020d}", "inactive", "running")
+
+    def test_no_event_for_unchanged_status(self, catalog_setup):
+        """Writing the current status again is not reported."""
+        repo, manager, catalog = catalog_setup
+        events = []
+        catalog.subscribe(events.append)
+
+        manager.update_profile_status(f"{0:020d}", "inactive")
+        assert events == []
+
+    def test_created_updated_deleted(self, catalog_setup):
+        """Structural writes are reflected without reloading."""
+        repo, manager, catalog = catalog_setup
+        events = []
+        catalog.subscribe(events.append)
+
+        repo.create_profile(ProfileData(name="New", idprofile="n" * 20, sothutu=10, group_profile="g1"))
+        assert catalog.get("n" * 20).name == "New"
+        assert not catalog.get("n" * 20).exists
+
+        manager.update_profile_status("n" * 20, "running")
+        updated = ProfileData.from_dict(catalog.get("n" * 20).data.to_dict())
+        updated.group_profile = "g9"
+        updated.status = "inactive"
+        repo.update_profile(updated)
+        assert [p.profile_id for p in catalog.by_group("g9")] == ["n" * 20]
+        assert catalog.by_group("g1")[-1].profile_id != "n" * 20
+        assert catalog.get("n" * 20).status == "running"
+
+        manager.delete_profile("n" * 20, delete_files=False)
+        assert catalog.get("n" * 20) is None
+        assert catalog.by_status("running") == []
+
+        assert [e.kind for e in events] == ["created", "status", "updated", "deleted"]
+
+    def test_no_database_reads_after_load(self, catalog_setup, monkeypatch):
+        """Queries are served from memory."""
+        repo, manager, catalog = catalog_setup
+        monkeypatch.setattr(repo, "get_all_profiles", lambda: pytest.fail("database read"))
+        monkeypatch.setattr(repo, "profile_exists", lambda pid: pytest.fail("directory stat"))
+
+        manager.update_profile_status(f"{2:020d}", "error")
+        assert [p.name for p in catalog.all()] == ["P0", "P1", "P2"]
+        assert catalog.by_status("error")[0].name == "P2"
+
+    def test_created_profile_is_copied_with_rowid(self, catalog_setup):
+        """The catalog keeps its own copy of a new row, carrying the stored rowid."""
+        repo, manager, catalog = catalog_setup
+
+        data = ProfileData(name="New", idprofile="n" * 20, sothutu=0)
+        repo.create_profile(data)
+        data.name = "Changed by caller"
+
+        stored = catalog.get("n" * 20).data
+        assert stored is not data
+        assert stored.name == "New"
+        assert stored.id == repo.get_profile_by_id("n" * 20).id
+        assert [p.profile_id for p in catalog.all()] == [p.idprofile for p in repo.get_all_profiles()]
+
+    def test_repository_event_not_mutated(self, catalog_setup):
+        """Other repository listeners see the original event; subscribers get old_value."""
+        repo, manager, catalog = catalog_setup
+        raw, emitted = [], []
+        repo.add_listener(raw.append)
+        catalog.subscribe(emitted.append)
+
+        manager.update_profile_status(f"{0:020d}", "running")
+
+        assert raw[0].old_value is None
+        assert emitted[0].old_value == "inactive"
+        assert emitted[0] is not raw[0]
+
+    def test_filter_uses_indexes(self, catalog_setup, monkeypatch):
+        """Status/group/search filters are answered from memory."""
+        repo, manager, catalog = catalog_setup
+        monkeypatch.setattr(repo, "query_profiles", lambda query: pytest.fail("database read"))
+
+        manager.update_profile_status(f"{1:020d}", "running")
+        assert [p.name for p in catalog.filter(status="inactive")] == ["P0", "P2"]
+        assert [p.name for p in catalog.filter(status="inactive", group="g0", search="p2")] == ["P2"]
+        assert [p.name for p in catalog.filter(search="0000000001")] == ["P1"]
+        assert catalog.filter(status="error") == []
+
+    def test_bulk_created_profiles_carry_rowids(self, catalog_setup):
+        """create_profiles inserts with one executemany and reports every stored rowid."""
+        repo, manager, catalog = catalog_setup
+        batch = [ProfileData(name=f"B{i}", idprofile=f"b{i:019d}", sothutu=20 + i) for i in range(5)]
+
+        repo.create_profiles(batch)
+
+        stored = {p.idprofile: p.id for p in repo.get_all_profiles()}
+        assert [catalog.get(p.idprofile).data.id for p in batch] == [stored[p.idprofile] for p in batch]
+        assert all(p.id == 0 for p in batch)
+
+    def test_update_without_override_keeps_written_status(self, catalog_setup):
+        """update_profile's status shows up when no profile_status override exists."""
+        repo, manager, catalog = catalog_setup
+
+        updated = ProfileData.from_dict(repo.get_profile_by_id(f"{1:020d}").to_dict())
+        updated.status = "error"
+        repo.update_profile(updated)
+
+        assert catalog.get(f"{1:020d}").status == "error"
+        assert [p.profile_id for p in catalog.by_status("error")] == \
+            [p.idprofile for p in repo.get_profiles_by_status("error")]
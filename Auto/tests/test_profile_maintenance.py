@@ -0,0 +1,126 @@
+# Tests for Profile Maintenance
+# Feature: multi-profile-fingerprint-automation
+
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from app.core.fingerprint_generator import FingerprintGenerator
+from app.core.profile_maintenance import ProfileMaintenance
+from app.core.profile_manager import ProfileManager
+from app.data.profile_repository import ProfileRepository
+
+
+@pytest.fixture
+def manager():
+    """ProfileManager with a few created profiles."""
+    temp_dir = tempfile.mkdtemp()
+    repo = ProfileRepository(
+        db_path=os.path.join(temp_dir, "data.db"),
+        app_db_path=os.path.join(temp_dir, "app_data.db"),
+        profile_dir=os.path.join(temp_dir, "profiles")
+    )
+    os.makedirs(repo.profile_dir)
+    manager = ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=os.path.join(temp_dir, "none"))
+    manager.create_profiles(10)
+    
+    yield manager
+    
+    repo.close()
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def checkpoint_path(manager):
+    """Checkpoint file next to the profile directory."""
+    return os.path.join(os.path.dirname(manager.repository.profile_dir), "data", "checkpoint.jsonl")
+
+
+def user_agents(manager):
+    """User Agent stored in each profile's Preferences."""
+    result = {}
+    for profile in manager.load_all_profiles():
+        prefs = manager.generator.read_preferences(profile.path)
+        result[profile.profile_id] = prefs["gologin"]["navigator"]["userAgent"]
+    return result
+
+
+class TestProfileMaintenance:
+    """Bulk rewrites skip running browsers and resume after interruption."""
+    
+    def test_fix_user_agent_on_process_pool(self, manager, checkpoint_path):
+        """Every profile gets the new User Agent and the checkpoint is removed."""
+        maintenance = ProfileMaintenance(manager, checkpoint_path=checkpoint_path, workers=2)
+        maintenance.CHUNK_SIZE = 3
+        reports = []
+        
+        state = maintenance.run(fix_user_agent=True, chrome_version="131", progress=lambda s: reports.append(s.done))
+        
+        assert (state.done, state.failed, state.skipped) == (10, 0, 0)
+        assert reports[-1] == 10 and len(reports) == 4
+        assert set(user_agents(manager).values()) == {FingerprintGenerator.user_agent_for("131")}
+        assert not os.path.exists(checkpoint_path)
+    
+    def test_running_profiles_skipped_then_resumed(self, manager, checkpoint_path):
+        """Skipped profiles stay pending; the next run only does those."""
+        busy = sorted(manager.repository.get_all_profile_ids())[:3]
+        maintenance = ProfileMaintenance(
+            manager, checkpoint_path=checkpoint_path, workers=1, is_running=lambda pid: pid in busy
+        )
+        
+        state = maintenance.run(fix_user_agent=True, chrome_version="131")
+        assert (state.done, state.skipped) == (7, 3)
+        assert os.path.exists(checkpoint_path)
+        agents = user_agents(manager)
+        assert all("Chrome/131" not in agents[pid] for pid in busy)
+        
+        maintenance.is_running = None
+        state = maintenance.run(fix_user_agent=True, chrome_version="131")
+        assert (state.done, state.skipped, state.resumed) == (3, 0, 7)
+        assert not os.path.exists(checkpoint_path)
+    
+    def test_interrupted_randomize_resumes_without_repeating(self, manager, checkpoint_path):
+        """Profiles randomized before a cancel are not randomized again."""
+        maintenance = ProfileMaintenance(manager, checkpoint_path=checkpoint_path, workers=1)
+        maintenance.CHUNK_SIZE = 4
+        before = {p: manager.get_profile_fingerprint(p).canvas.noise for p in manager.repository.get_all_profile_ids()}
+        
+        state = maintenance.run(randomize=True, progress=lambda s: maintenance.cancel())
+        assert state.cancelled and state.done == 4
+        with open(checkpoint_path) as f:
+            first_run = set(json.loads(f.read().splitlines()[1])["done"])
+        after_first = {p: manager.get_profile_fingerprint(p).canvas.noise for p in before}
+        
+        state = maintenance.run(randomize=True)
+        assert (state.done, state.resumed) == (6, 4)
+        for profile_id, noise in before.items():
+            current = manager.get_profile_fingerprint(profile_id).canvas.noise
+            if profile_id in first_run:
+                assert current == after_first[profile_id] != noise
+            else:
+                assert after_first[profile_id] == noise
+    
+    def test_different_job_starts_over(self, manager, checkpoint_path):
+        """A checkpoint of another job is ignored."""
+        maintenance = ProfileMaintenance(manager, checkpoint_path=checkpoint_path, workers=1)
+        maintenance.CHUNK_SIZE = 4
+        maintenance.run(fix_user_agent=True, chrome_version="130", progress=lambda s: maintenance.cancel())
+        
+        state = maintenance.run(fix_user_agent=True, chrome_version="131")
+        assert (state.done, state.resumed) == (10, 0)
+    
+    @pytest.mark.skipif(os.name == "nt", reason="SingletonLock symlink is POSIX only")
+    def test_browser_lock_skipped(self, manager, checkpoint_path):
+        """A profile locked by a live Chrome process is not touched."""
+        profile_id = sorted(manager.repository.get_all_profile_ids())[0]
+        profile_path = manager.repository.get_profile_path(profile_id)
+        os.symlink(f"host-{os.getpid()}", os.path.join(profile_path, "SingletonLock"))
+        maintenance = ProfileMaintenance(manager, checkpoint_path=checkpoint_path, workers=1)
+        
+        state = maintenance.run(fix_user_agent=True, chrome_version="131")
+        
+        assert (state.done, state.skipped) == (9, 1)
+        assert "Chrome/131" not in user_agents(manager)[profile_id]
@@ -7,6 +7,7 @@ import tempfile
 import os
 import shutil
 import sqlite3
+import copy
 
 from app.core.profile_manager import ProfileManager
 from app.data.profile_repository import ProfileRepository
@@ -327,5 +328,212 @@ class TestProfileManagerOperations:
         assert not os.path.exists(profile_path)
 
 
+class TestProfileDirectoryScan:
+    """Directory existence comes from one cached scan of profile_dir."""
+    
+    def test_missing_profiles_marked_in_one_batch(self, temp_setup, monkeypatch):
+        """load_all_profiles scans once, never stats per profile, and writes one batch."""
+        main_db_path, app_db_path, profile_dir, template_dir = temp_setup
+        
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=profile_dir)
+        manager = ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=template_dir)
+        
+        for i in range(6):
+            pid = f"profile_{i:010d}"
+            if i % 2 == 0:
+                os.makedirs(os.path.join(profile_dir, pid))
+            repo.create_profile(ProfileData(name=f"Profile {i}", idprofile=pid, status="inactive"))
+        
+        monkeypatch.setattr(repo, "profile_exists", lambda pid: pytest.fail("per-profile stat"))
+        batches = []
+        write_batch = repo._write_status_batch
+        monkeypatch.setattr(repo.status_journal, "_write_batch", lambda entries: (batches.append(entries), write_batch(entries)))
+        
+        profiles = manager.load_all_profiles()
+        assert [p.exists for p in profiles] == [True, False] * 3
+        assert len(batches) == 1
+        assert sorted(entry[0] for entry in batches[0]) == [f"profile_{i:010d}" for i in (1, 3, 5)]
+        assert repo.get_profile_by_id("profile_0000000001").status == "missing"
+        
+        # Already-missing profiles are not written again
+        manager.load_all_profiles()
+        assert len(batches) == 1
+        repo.close()
+    
+    def test_scan_cached_until_directory_changes(self, temp_setup, monkeypatch):
+        """The scan is reused while profile_dir's mtime is unchanged."""
+        main_db_path, app_db_path, profile_dir, template_dir = temp_setup
+        
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=profile_dir)
+        os.makedirs(os.path.join(profile_dir, "a"))
+        
+        scans = []
+        real_scandir = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: (scans.append(path), real_scandir(path))[1])
+        
+        assert repo.get_existing_profile_ids() == {"a"}
+        ids = repo.get_existing_profile_ids()
+        assert ids == {"a"}
+        assert len(scans) == 1
+        
+        # Callers get a copy; mutating it leaves the cache intact
+        ids.add("zzz")
+        ids -= {"a"}
+        assert repo.get_existing_profile_ids() == {"a"}
+        assert len(scans) == 1
+        
+        os.makedirs(os.path.join(profile_dir, "b"))
+        # Force a visible mtime change on filesystems with coarse timestamps
+        stat = os.stat(profile_dir)
+        os.utime(profile_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert repo.get_existing_profile_ids() == {"a", "b"}
+        assert len(scans) == 2
+        repo.close()
+
+
+class TestCreateProfiles:
+    """Bulk creation is all-or-nothing."""
+    
+    def _manager(self, temp_setup):
+        main_db_path, app_db_path, profile_dir, template_dir = temp_setup
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=profile_dir)
+        return ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=template_dir)
+    
+    def test_creates_profiles(self, temp_setup):
+        """Profiles get unique IDs, pattern names, the group and own fingerprints."""
+        manager = self._manager(temp_setup)
+        
+        profiles = manager.create_profiles(20, name_pattern="Shop {n:02d}", group="shops")
+        
+        assert len(profiles) == 20
+        assert len({p.profile_id for p in profiles}) == 20
+        assert [p.name for p in profiles] == [f"Shop {n:02d}" for n in range(1, 21)]
+        
+        stored = manager.filter_profiles(group="shops")
+        assert len(stored) == 20
+        assert all(p.exists for p in stored)
+        
+        for profile in profiles:
+            prefs = manager.generator.read_preferences(profile.path)
+            config = manager.generator.extract_gologin_config(prefs)
+            assert config.profile_id == profile.profile_id
+            assert config.audioContext.noiseValue == profile.fingerprint.audioContext.noiseValue
+        manager.repository.close()
+    
+    def test_no_group_stored_as_empty(self, temp_setup):
+        """Without a group, batch profiles store "" like create_profile does."""
+        manager = self._manager(temp_setup)
+        
+        manager.create_profiles(3)
+        
+        assert [p.group_profile for p in manager.repository.get_all_profiles()] == ["", "", ""]
+        assert len(manager.repository.get_profiles_by_group("")) == 3
+        manager.repository.close()
+    
+    def test_file_failure_rolls_back(self, temp_setup, monkeypatch):
+        """One failed Preferences write removes every directory and inserts nothing."""
+        manager = self._manager(temp_setup)
+        profile_dir = temp_setup[2]
+        write = manager.generator.write_preferences
+        calls = []
+        
+        def flaky_write(path, prefs):
+            calls.append(path)
+            return len(calls) != 5 and write(path, prefs)
+        
+        monkeypatch.setattr(manager.generator, "write_preferences", flaky_write)
+        
+        assert manager.create_profiles(10) == []
+        assert os.listdir(profile_dir) == []
+        assert manager.repository.get_all_profiles() == []
+        manager.repository.close()
+    
+    def test_database_failure_rolls_back(self, temp_setup, monkeypatch):
+        """A failed batch insert removes the cloned directories."""
+        manager = self._manager(temp_setup)
+        profile_dir = temp_setup[2]
+        monkeypatch.setattr(manager.repository, "create_profiles", lambda profiles: False)
+        
+        assert manager.create_profiles(5) == []
+        assert os.listdir(profile_dir) == []
+        manager.repository.close()
+
+
+
+class TestFingerprintUniqueness:
+    """Colliding fingerprints are found and resampled through the index."""
+    
+    def _manager(self, temp_setup):
+        main_db_path, app_db_path, profile_dir, template_dir = temp_setup
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=profile_dir)
+        return ProfileManager(repository=repo, generator=FingerprintGenerator(), template_dir=template_dir)
+    
+    def test_index_built_from_existing_profiles(self, temp_setup):
+        """Profiles written with the same fingerprint show up as duplicates."""
+        manager = self._manager(temp_setup)
+        first = manager.create_profile()
+        second = manager.create_profile()
+        prefs = manager.generator.read_preferences(second.path)
+        manager.generator.write_preferences(
+            second.path, manager.generator.update_gologin_config(prefs, first.fingerprint)
+        )
+        
+        assert manager.find_duplicate_fingerprints() == [sorted([first.profile_id, second.profile_id])]
+        
+        manager.delete_profile(second.profile_id)
+        assert manager.find_duplicate_fingerprints() == []
+        manager.repository.close()
+    
+    def test_create_resamples_until_unique(self, temp_setup, monkeypatch):
+        """create_profile(unique=True) redraws a fingerprint another profile has."""
+        manager = self._manager(temp_setup)
+        existing = manager.create_profile()
+        generate = manager.generator.generate_fingerprint
+        draws = [copy.deepcopy(existing.fingerprint), copy.deepcopy(existing.fingerprint)]
+        monkeypatch.setattr(
+            manager.generator, "generate_fingerprint", lambda: draws.pop() if draws else generate()
+        )
+        
+        profile = manager.create_profile(unique=True)
+        
+        assert draws == []
+        assert manager.get_fingerprint_index().collisions_of(profile.profile_id) == set()
+        assert manager.find_duplicate_fingerprints() == []
+        manager.repository.close()
+    
+    def test_bulk_create_unique_within_batch(self, temp_setup):
+        """create_profiles(unique=True) avoids collisions inside the batch too."""
+        manager = self._manager(temp_setup)
+        same = manager.generator.generate_fingerprint()
+        manager.generator.generate_fingerprints = lambda count: [copy.deepcopy(same) for _ in range(count)]
+        
+        profiles = manager.create_profiles(5, unique=True)
+        
+        assert len(profiles) == 5
+        assert manager.find_duplicate_fingerprints() == []
+        manager.repository.close()
+    
+    def test_randomize_resamples_until_unique(self, temp_setup, monkeypatch):
+        """randomize_profile_fingerprint(unique=True) keeps re-randomizing on a collision."""
+        manager = self._manager(temp_setup)
+        first = manager.create_profile()
+        second = manager.create_profile()
+        randomize = manager.generator.randomize_noise_values
+        calls = []
+        
+        def colliding_first(config):
+            calls.append(config)
+            if len(calls) == 1:
+                config.__dict__.update(copy.deepcopy(first.fingerprint).__dict__)
+                return config
+            return randomize(config)
+        
+        monkeypatch.setattr(manager.generator, "randomize_noise_values", colliding_first)
+        
+        assert manager.randomize_profile_fingerprint(second.profile_id, unique=True)
+        assert len(calls) >= 2
+        assert manager.get_fingerprint_index().collisions_of(second.profile_id) == set()
+        manager.repository.close()
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -6,7 +6,7 @@ from hypothesis import given, strategies as st, settings
 import json
 
 from app.data.profile_models import (
-    GologinConfig, ProfileData, Profile,
+    GologinConfig, CompactGologinConfig, ProfileData, Profile,
     AudioContextConfig, CanvasConfig, ClientRectsConfig,
     WebGLConfig, WebGLMetadataConfig, NavigatorConfig,
     TimezoneConfig, GeolocationConfig, WebRTCConfig,
@@ -241,6 +241,52 @@ class TestGologinConfigRoundTrip:
         assert restored_config.webGL.noise == webgl_noise
 
 
+class TestCompactGologinConfig:
+    """
+    Hand-written to_dict matches dataclasses.asdict, and CompactGologinConfig
+    round-trips every GologinConfig, including aliases that differ.
+    """
+    
+    @given(config=gologin_config_strategy())
+    @settings(max_examples=100)
+    def test_to_dict_matches_asdict(self, config):
+        """GologinConfig.to_dict produces the same dict (and key order) as asdict."""
+        from dataclasses import asdict
+        expected = asdict(config)
+        result = config.to_dict()
+        assert result == expected
+        assert list(result) == list(expected)
+    
+    @given(config=gologin_config_strategy())
+    @settings(max_examples=100)
+    def test_compact_round_trip(self, config):
+        """Compact form expands back to the same dict and config."""
+        compact = CompactGologinConfig.from_config(config)
+        assert compact.to_dict() == config.to_dict()
+        assert compact.to_config() == config
+    
+    def test_duplicates_stored_once(self):
+        """Mirrored sections and alias scalars are not stored twice when equal."""
+        config = GologinConfig()
+        config.canvas.noise = config.canvasNoise = 4.5
+        compact = CompactGologinConfig.from_config(config)
+        
+        assert compact.geolocation_alias is compact.webrtc_alias is compact.canvas_alias
+        config.webRtc.publicIp = "1.2.3.4"
+        assert CompactGologinConfig.from_config(config).webrtc_alias[5] == "1.2.3.4"
+    
+    @pytest.mark.parametrize("data", [
+        {},
+        {"canvasNoise": 3.0},
+        {"webRtc": {"publicIP": "1.1.1.1"}},
+        {"proxy": {"host": 1, "port": 8080}},
+        {"navigator": {"userAgent": "UA"}, "userAgent": "UA"},
+    ])
+    def test_partial_dicts_match_gologin_config(self, data):
+        """Missing keys get the same defaults as GologinConfig.from_dict."""
+        assert CompactGologinConfig.from_dict(data).to_dict() == GologinConfig.from_dict(data).to_dict()
+
+
 class TestProfileDataRoundTrip:
     """Test ProfileData serialization."""
     
@@ -9,7 +9,7 @@ import os
 import shutil
 
 from app.data.profile_repository import ProfileRepository
-from app.data.profile_models import ProfileData
+from app.data.profile_models import ProfileData, ProfileQuery
 
 
 @pytest.fixture
@@ -283,5 +283,516 @@ class TestProfileCRUD:
         assert repository.get_profile_by_id("11111111111111111111") is None
 
 
+
+class TestJoinedProfileReads:
+    """Profile reads merge profile_status overrides in a single query."""
+    
+    def _seed(self, repository, count):
+        for i in range(count):
+            repository.create_profile(ProfileData(
+                name=f"Profile {i}",
+                idprofile=f"{i:020d}",
+                status="inactive",
+                sothutu=i,
+                group_profile="even" if i % 2 == 0 else "odd"
+            ))
+            if i % 3 == 0:
+                repository.update_profile_status(f"{i:020d}", "running")
+    
+    @pytest.mark.parametrize("count", [10, 200])
+    def test_connection_count_constant(self, repository, count, monkeypatch):
+        """Listing opens one connection regardless of profile count."""
+        self._seed(repository, count)
+        
+        connections = []
+        real_connect = sqlite3.connect
+        
+        def counting_connect(*args, **kwargs):
+            connections.append(args)
+            return real_connect(*args, **kwargs)
+        
+        monkeypatch.setattr("app.data.profile_repository.sqlite3.connect", counting_connect)
+        
+        profiles = repository.get_all_profiles()
+        assert len(profiles) == count
+        assert len(connections) <= 1
+        
+        connections.clear()
+        repository.get_profiles_by_status("running")
+        repository.get_profiles_by_group("even")
+        assert len(connections) <= 2
+    
+    def test_status_override_merged(self, repository):
+        """Status overrides from profile_status are applied to every read path."""
+        self._seed(repository, 6)
+        
+        by_id = {p.idprofile: p for p in repository.get_all_profiles()}
+        assert by_id[f"{0:020d}"].status == "running"
+        assert by_id[f"{1:020d}"].status == "inactive"
+        
+        running = repository.get_profiles_by_status("running")
+        assert {p.idprofile for p in running} == {f"{0:020d}", f"{3:020d}"}
+        
+        single = repository.get_profile_by_id(f"{3:020d}")
+        assert single.status == "running"
+        assert repository.get_profile_by_db_id(single.id).status == "running"
+        
+        even = repository.get_profiles_by_group("even")
+        assert [p.sothutu for p in even] == [0, 2, 4]
+    
+    def test_last_run_override_merged(self, repository):
+        """last_run from profile_status overrides the app_profiles value."""
+        self._seed(repository, 1)
+        repository.update_last_run(f"{0:020d}", "2024-01-01 10:00:00")
+        
+        profile = repository.get_profile_by_id(f"{0:020d}")
+        assert profile.last_run == "2024-01-01 10:00:00"
+        assert profile.status == "running"
+
+
+
+class TestPooledConnections:
+    """App database connections are pooled per thread in WAL mode."""
+    
+    def test_connection_reused_within_thread(self, repository):
+        """Repeated operations on one thread share a connection."""
+        with repository._get_app_connection() as first:
+            pass
+        repository.count_profiles()
+        with repository._get_app_connection() as second:
+            pass
+        assert first is second
+    
+    def test_wal_journal_mode(self, repository):
+        """App database runs in WAL mode with synchronous=NORMAL."""
+        with repository._get_app_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    
+    def test_concurrent_status_writes(self, repository):
+        """Worker threads write status concurrently without lock errors."""
+        import threading
+        
+        for i in range(8):
+            repository.create_profile(ProfileData(name=f"P{i}", idprofile=f"{i:020d}"))
+        
+        results = []
+        
+        def worker(index):
+            for _ in range(20):
+                results.append(repository.update_profile_status(f"{index:020d}", "running"))
+                results.append(repository.update_last_run(f"{index:020d}", "2024-01-01 00:00:00"))
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert all(results)
+        assert len(repository.get_profiles_by_status("running")) == 8
+    
+    def test_failed_write_rolled_back(self, repository):
+        """A failed write does not leave the pooled connection in a transaction."""
+        profile = ProfileData(name="Dup", idprofile="22222222222222222222")
+        assert repository.create_profile(profile)
+        assert not repository.create_profile(profile)
+        
+        with repository._get_app_connection() as conn:
+            assert not conn.in_transaction
+        
+        repository.close()
+        assert repository.get_profile_by_id("22222222222222222222") is not None
+    
+    def test_close_all_spares_connections_in_use(self, repository):
+        """close_all() does not close another thread's connection mid-query."""
+        import threading
+        
+        repository.create_profile(ProfileData(name="P", idprofile="99999999999999999999"))
+        inside, closed = threading.Event(), threading.Event()
+        errors = []
+        
+        def worker():
+            try:
+                with repository._get_app_connection() as conn:
+                    inside.set()
+                    closed.wait(2.0)
+                    conn.execute("SELECT COUNT(*) FROM app_profiles").fetchone()
+            except sqlite3.Error as e:
+                errors.append(e)
+        
+        thread = threading.Thread(target=worker)
+        thread.start()
+        inside.wait(2.0)
+        repository._app_pool.close_all()
+        assert repository._app_pool.size == 1
+        closed.set()
+        thread.join()
+        
+        assert errors == []
+        assert repository._app_pool.size == 0
+
+
+
+class TestProfileQuery:
+    """Composable filters are evaluated in SQL and support keyset paging."""
+    
+    @pytest.fixture
+    def seeded(self, repository):
+        for i in range(30):
+            repository.create_profile(ProfileData(
+                name=f"{'Insta' if i % 2 else 'Face'} account {i}",
+                idprofile=f"{i:020d}",
+                status="inactive",
+                proxy="1.2.3.4:8080" if i % 5 == 0 else "",
+                sothutu=i,
+                group_profile=f"g{i % 3}"
+            ))
+        for i in range(0, 30, 4):
+            repository.update_profile_status(f"{i:020d}", "running")
+        return repository
+    
+    @given(
+        status=st.sampled_from([None, "running", "inactive"]),
+        group=st.sampled_from([None, "g0", "g1", "g2"]),
+        has_proxy=st.sampled_from([None, True, False]),
+        name=st.sampled_from([None, "insta", "Face", "account 1"])
+    )
+    @settings(max_examples=50, suppress_health_check=[HealthCheck.function_scoped_fixture])
+    def test_matches_python_filter(self, seeded, status, group, has_proxy, name):
+        """SQL filtering gives the same result as filtering in Python."""
+        query = ProfileQuery(status=status, group=group, has_proxy=has_proxy, name_contains=name)
+        expected = [
+            p.idprofile for p in seeded.get_all_profiles()
+            if (status is None or p.status == status)
+            and (group is None or p.group_profile == group)
+            and (has_proxy is None or bool(p.proxy) == has_proxy)
+            and (name is None or name.lower() in p.name.lower())
+        ]
+        assert [p.idprofile for p in seeded.query_profiles(query)] == expected
+        assert seeded.count_matching(query) == len(expected)
+    
+    def test_keyset_pagination(self, seeded):
+        """Pages chained by cursor cover every row exactly once in order."""
+        all_ids = [p.idprofile for p in seeded.get_all_profiles()]
+        
+        seen = []
+        query = ProfileQuery(limit=7)
+        while True:
+            page = seeded.query_profiles(query)
+            seen.extend(p.idprofile for p in page)
+            if len(page) < 7:
+                break
+            query.after = ProfileQuery.cursor_of(page[-1])
+        
+        assert seen == all_ids
+        assert [p.idprofile for p in seeded.iter_profiles(page_size=4)] == all_ids
+    
+    def test_keyset_pagination_with_null_order(self, repository):
+        """Rows without sothutu sort as 0 and are not skipped at page boundaries."""
+        for i in range(10):
+            repository.create_profile(ProfileData(
+                name=f"P{i}", idprofile=f"{i:020d}", sothutu=None if i % 3 else i
+            ))
+        all_ids = [p.idprofile for p in repository.get_all_profiles()]
+        
+        assert len(all_ids) == 10
+        for page_size in (1, 2, 3, 4):
+            assert [p.idprofile for p in repository.iter_profiles(page_size=page_size)] == all_ids
+    
+    def test_search_matches_name_or_id(self, seeded):
+        """search matches name or idprofile substrings; LIKE wildcards are literal."""
+        assert [p.idprofile for p in seeded.query_profiles(ProfileQuery(search="00000000000000000029"))] == [f"{29:020d}"]
+        assert len(seeded.query_profiles(ProfileQuery(search="account 2"))) == 1 + 10
+        assert seeded.query_profiles(ProfileQuery(search="%")) == []
+    
+    def test_indexes_used(self, seeded):
+        """Group and status filters are served by indexes."""
+        with seeded._get_app_connection() as conn:
+            where, params = seeded._build_filter(ProfileQuery(group="g1"))
+            plan = " ".join(row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN {seeded.PROFILE_SELECT} {where}", params))
+            assert "idx_app_profiles_group" in plan
+            
+            where, params = seeded._build_filter(ProfileQuery(status="running"))
+            plan = " ".join(row[3] for row in conn.execute(
+                f"EXPLAIN QUERY PLAN {seeded.PROFILE_SELECT} {where}", params))
+            assert "idx_profile_status_status" in plan
+
+
+
+class TestIncrementalMainDbSync:
+    """Main database sync only reads new rows and skips unchanged files."""
+    
+    def _insert_main(self, main_db_path, ids):
+        conn = sqlite3.connect(main_db_path)
+        conn.executemany(
+            "INSERT INTO danhsachacc (name, idprofile, status, sothutu) VALUES (?, ?, 'inactive', 0)",
+            [(f"Main {pid}", pid) for pid in ids]
+        )
+        conn.commit()
+        conn.close()
+    
+    def test_unchanged_main_db_not_read(self, temp_db, temp_profile_dir, monkeypatch):
+        """Second startup does not open the main database when nothing changed."""
+        main_db_path, app_db_path = temp_db
+        self._insert_main(main_db_path, [f"{i:020d}" for i in range(50)])
+        
+        first = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=temp_profile_dir)
+        assert first.count_profiles() == 50
+        first.close()
+        
+        opened = []
+        original = ProfileRepository._get_connection
+        monkeypatch.setattr(
+            ProfileRepository, "_get_connection",
+            lambda self: opened.append(1) or original(self)
+        )
+        second = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=temp_profile_dir)
+        assert second.count_profiles() == 50
+        assert opened == []
+    
+    def test_only_new_rows_imported(self, temp_db, temp_profile_dir):
+        """Resync imports rows added after the last sync."""
+        main_db_path, app_db_path = temp_db
+        self._insert_main(main_db_path, ["a" * 20, "b" * 20])
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=temp_profile_dir)
+        
+        self._insert_main(main_db_path, ["c" * 20, "d" * 20, "e" * 20])
+        assert repo.resync_from_main_db() == 3
+        assert repo.resync_from_main_db() == 0
+        assert repo.count_profiles() == 5
+    
+    def test_reused_last_rowid_triggers_full_read(self, temp_db, temp_profile_dir):
+        """A new row that reuses the deleted last rowid is still imported."""
+        main_db_path, app_db_path = temp_db
+        self._insert_main(main_db_path, ["a" * 20, "b" * 20])
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=temp_profile_dir)
+        
+        conn = sqlite3.connect(main_db_path)
+        conn.execute("DELETE FROM danhsachacc WHERE idprofile = ?", ("b" * 20,))
+        conn.commit()
+        conn.close()
+        self._insert_main(main_db_path, ["c" * 20])
+        
+        assert repo.resync_from_main_db() == 1
+        assert repo.get_profile_by_id("c" * 20) is not None
+    
+    def test_deleted_app_profile_restored_by_full_resync(self, temp_db, temp_profile_dir):
+        """Incremental sync keeps app deletions; full resync re-imports them."""
+        main_db_path, app_db_path = temp_db
+        self._insert_main(main_db_path, ["a" * 20, "b" * 20])
+        repo = ProfileRepository(db_path=main_db_path, app_db_path=app_db_path, profile_dir=temp_profile_dir)
+        
+        repo.delete_profile("a" * 20)
+        self._insert_main(main_db_path, ["c" * 20])
+        assert repo.resync_from_main_db() == 1
+        assert repo.get_profile_by_id("a" * 20) is None
+        
+        assert repo.resync_from_main_db(full=True) == 1
+        assert repo.get_profile_by_id("a" * 20) is not None
+
+
+
+class TestStatusJournal:
+    """Status and last_run updates are coalesced and written in batches."""
+    
+    def _stored(self, repository, profile_id):
+        with repository._get_app_connection() as conn:
+            return conn.execute(
+                "SELECT status, last_run FROM profile_status WHERE idprofile = ?",
+                (profile_id,)
+            ).fetchone()
+    
+    def test_updates_deferred_until_flush(self, repository):
+        """Updates are queued, coalesced per profile and written by flush()."""
+        repository.status_journal.interval = 60
+        for i in range(5):
+            repository.create_profile(ProfileData(name=f"P{i}", idprofile=f"{i:020d}"))
+            repository.update_profile_status(f"{i:020d}", "running")
+            repository.update_last_run(f"{i:020d}", "2024-01-01 00:00:00")
+        repository.update_profile_status(f"{0:020d}", "error")
+        
+        assert self._stored(repository, f"{0:020d}") is None
+        assert repository.status_journal.pending_count == 5
+        
+        assert repository.flush_status_updates() == 5
+        assert tuple(self._stored(repository, f"{0:020d}")) == ("error", "2024-01-01 00:00:00")
+        assert repository.flush_status_updates() == 0
+    
+    def test_single_transaction_per_flush(self, repository):
+        """A flush commits once regardless of how many profiles changed."""
+        repository.status_journal.interval = 60
+        for i in range(20):
+            repository.update_profile_status(f"{i:020d}", "running")
+        
+        with repository._get_app_connection() as conn:
+            commits = []
+            conn.set_trace_callback(lambda sql: commits.append(sql) if sql.strip().upper() == "COMMIT" else None)
+            try:
+                repository.flush_status_updates()
+            finally:
+                conn.set_trace_callback(None)
+        assert len(commits) == 1
+    
+    def test_reads_see_queued_updates(self, repository):
+        """Reads flush the journal first so callers see their own writes."""
+        repository.status_journal.interval = 60
+        repository.create_profile(ProfileData(name="P", idprofile="33333333333333333333"))
+        repository.update_profile_status("33333333333333333333", "running")
+        
+        assert repository.get_profile_by_id("33333333333333333333").status == "running"
+        assert len(repository.get_profiles_by_status("running")) == 1
+    
+    def test_status_and_last_run_preserved(self, repository):
+        """Updating one field keeps the other."""
+        repository.update_last_run("44444444444444444444", "2024-02-02 00:00:00")
+        repository.flush_status_updates()
+        assert tuple(self._stored(repository, "44444444444444444444")) == ("inactive", "2024-02-02 00:00:00")
+        
+        repository.update_profile_status("44444444444444444444", "running")
+        repository.flush_status_updates()
+        assert tuple(self._stored(repository, "44444444444444444444")) == ("running", "2024-02-02 00:00:00")
+    
+    def test_background_flush(self, repository):
+        """Pending updates are written on the interval without an explicit flush."""
+        import time
+        
+        repository.status_journal.interval = 0.05
+        repository.update_profile_status("55555555555555555555", "running")
+        
+        # pending_count drops before the batch commits, so poll the row itself
+        deadline = time.time() + 2.0
+        while time.time() < deadline:
+            row = self._stored(repository, "55555555555555555555")
+            if row and row["status"] == "running":
+                break
+            time.sleep(0.01)
+        assert self._stored(repository, "55555555555555555555")["status"] == "running"
+    
+    def test_single_flusher_thread(self, repository):
+        """Separate bursts are written by the same persistent thread."""
+        import threading
+        import time
+        
+        threads = []
+        write_batch = repository.status_journal._write_batch
+        repository.status_journal._write_batch = lambda entries: (
+            threads.append(threading.current_thread()), write_batch(entries)
+        )
+        repository.status_journal.interval = 0.01
+        for burst in range(3):
+            repository.update_profile_status(f"{burst:020d}", "running")
+            deadline = time.time() + 2.0
+            while repository.status_journal.pending_count and time.time() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+        
+        assert len(threads) == 3
+        assert len(set(threads)) == 1
+        assert threads[0].is_alive()
+    
+    def test_failed_write_requeued(self, repository):
+        """Any exception from the writer keeps the batch queued."""
+        repository.status_journal.interval = 60
+        repository.update_profile_status("77777777777777777777", "running")
+        
+        def fail(entries):
+            raise RuntimeError("disk gone")
+        
+        write_batch = repository.status_journal._write_batch
+        repository.status_journal._write_batch = fail
+        assert repository.flush_status_updates() == 0
+        assert repository.status_journal.pending_count == 1
+        
+        repository.status_journal._write_batch = write_batch
+        assert repository.flush_status_updates() == 1
+        assert self._stored(repository, "77777777777777777777")["status"] == "running"
+    
+    def test_failed_background_write_retried(self, repository):
+        """A batch that failed in the background is retried without a new update."""
+        import time
+        
+        write_batch = repository.status_journal._write_batch
+        failures = []
+        
+        def flaky(entries):
+            if not failures:
+                failures.append(entries)
+                raise sqlite3.OperationalError("database is locked")
+            write_batch(entries)
+        
+        repository.status_journal._write_batch = flaky
+        repository.status_journal.interval = 0.02
+        repository.update_profile_status("12121212121212121212", "running")
+        
+        deadline = time.time() + 2.0
+        while time.time() < deadline:
+            row = self._stored(repository, "12121212121212121212")
+            if row and row["status"] == "running":
+                break
+            time.sleep(0.01)
+        assert failures
+        assert self._stored(repository, "12121212121212121212")["status"] == "running"
+    
+    def test_discard_waits_for_batch_in_flight(self, repository):
+        """A profile deleted while its batch is being written stays deleted."""
+        import threading
+        
+        repository.status_journal.interval = 60
+        repository.create_profile(ProfileData(name="P", idprofile="13131313131313131313"))
+        repository.update_profile_status("13131313131313131313", "running")
+        
+        writing, proceed = threading.Event(), threading.Event()
+        write_batch = repository.status_journal._write_batch
+        
+        def slow(entries):
+            writing.set()
+            proceed.wait(2.0)
+            write_batch(entries)
+        
+        repository.status_journal._write_batch = slow
+        flusher = threading.Thread(target=repository.flush_status_updates)
+        flusher.start()
+        assert writing.wait(2.0)
+        
+        deleter = threading.Thread(target=repository.delete_profile, args=("13131313131313131313",))
+        deleter.start()
+        threading.Event().wait(0.1)
+        proceed.set()
+        flusher.join()
+        deleter.join()
+        
+        assert self._stored(repository, "13131313131313131313") is None
+    
+    def test_one_exit_hook_for_all_journals(self, repository, monkeypatch):
+        """Journals are flushed at exit through one module-level hook."""
+        import atexit
+        from app.data import status_journal
+        
+        registered = []
+        monkeypatch.setattr(atexit, "register", lambda *args: registered.append(args))
+        status_journal.StatusJournal(lambda entries: None)
+        assert registered == []
+        assert repository.status_journal in status_journal._journals
+    
+    def test_reads_skip_flush_when_idle(self, repository, monkeypatch):
+        """Reads don't touch the journal writer when nothing is queued."""
+        repository.create_profile(ProfileData(name="P", idprofile="88888888888888888888"))
+        calls = []
+        monkeypatch.setattr(repository.status_journal, "flush", lambda: calls.append(1) or 0)
+        
+        repository.get_all_profiles()
+        repository.count_matching(ProfileQuery(status="inactive"))
+        assert calls == []
+    
+    def test_close_flushes(self, repository):
+        """close() writes pending updates."""
+        repository.status_journal.interval = 60
+        repository.update_profile_status("66666666666666666666", "running")
+        repository.close()
+        assert self._stored(repository, "66666666666666666666")["status"] == "running"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
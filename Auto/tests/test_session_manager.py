@@ -19,6 +19,8 @@ def mock_browser_manager():
     manager.close_all_sessions.return_value = 0
     manager.calculate_window_position.return_value = (0, 0)
     manager.launch_profile.return_value = Mock()  # Mock WebDriver
+    manager.prepare_launch.side_effect = lambda profile_id, *args: Mock(profile_id=profile_id)
+    manager.spawn_prepared.return_value = Mock()
     return manager
 
 
@@ -45,7 +47,7 @@ class TestConcurrentSessionLimitEnforcement:
         def mock_get_session_count():
             return active_count[0]
         
-        def mock_launch_profile(*args, **kwargs):
+        def mock_spawn_prepared(*args, **kwargs):
             if active_count[0] < max_concurrent:
                 active_count[0] += 1
                 max_observed[0] = max(max_observed[0], active_count[0])
@@ -53,7 +55,7 @@ class TestConcurrentSessionLimitEnforcement:
             return None
         
         mock_browser_manager.get_session_count.side_effect = mock_get_session_count
-        mock_browser_manager.launch_profile.side_effect = mock_launch_profile
+        mock_browser_manager.spawn_prepared.side_effect = mock_spawn_prepared
         
         session_manager = SessionManager(
             browser_manager=mock_browser_manager,
@@ -231,6 +233,89 @@ class TestStatistics:
         
         assert session_manager.active_count == 3
 
+    
+    def test_wait_for_free_slot(self, mock_browser_manager):
+        """Launches outside a batch block until the session count drops below the limit."""
+        import threading
+        
+        mock_browser_manager.get_session_count.return_value = 10
+        session_manager = SessionManager(browser_manager=mock_browser_manager, max_concurrent=5)
+        session_manager.SLOT_RECHECK_INTERVAL = 0.01
+        
+        freed = threading.Event()
+        thread = threading.Thread(target=lambda: session_manager.wait_for_free_slot(10) and freed.set())
+        thread.start()
+        assert not freed.wait(0.1)
+        
+        mock_browser_manager.get_session_count.return_value = 9
+        assert freed.wait(2.0)
+        thread.join()
+    
+    def test_unresponsive_is_not_an_end(self, mock_browser_manager):
+        """An unresponsive report keeps the session running; its later exit marks it failed."""
+        from app.core.process_reaper import SessionExitEvent
+        from datetime import datetime
+        from app.core.session_manager import SessionResult
+        
+        session_manager = SessionManager(browser_manager=mock_browser_manager, max_concurrent=5)
+        session_manager._results["p1"] = SessionResult(profile_id="p1", status=SessionStatus.RUNNING, start_time=datetime.now())
+        
+        session_manager._on_session_ended(SessionExitEvent("p1", "unresponsive"))
+        result = session_manager.get_all_results()["p1"]
+        assert result.status == SessionStatus.RUNNING
+        assert result.error == "Browser stopped responding"
+        
+        session_manager._on_session_ended(SessionExitEvent("p1", "exited"))
+        assert session_manager.get_all_results()["p1"].status == SessionStatus.FAILED
+
+class TestEventDrivenSlots:
+    """A browser exit frees its slot for the waiting batch right away."""
+    
+    def test_exit_starts_next_launch(self, fake_popen):
+        """With 2 slots, closing one browser launches the third within milliseconds."""
+        import json
+        import os
+        import shutil
+        import tempfile
+        import threading
+        from app.core.profile_manager import ProfileManager
+        from app.data.profile_models import Profile, ProfileData
+        
+        temp_dir = tempfile.mkdtemp()
+        profiles = {}
+        for i in range(3):
+            profile_id = f"{i:020d}"
+            path = os.path.join(temp_dir, profile_id)
+            os.makedirs(os.path.join(path, "Default"))
+            with open(os.path.join(path, "Default", "Preferences"), "w") as f:
+                json.dump({"gologin": {}}, f)
+            profiles[profile_id] = Profile(data=ProfileData(name=profile_id, idprofile=profile_id), path=path, exists=True)
+        profile_manager = Mock(spec=ProfileManager)
+        profile_manager.get_profile.side_effect = profiles.get
+        
+        launched = threading.Semaphore(0)
+        session_manager = SessionManager(BrowserManager(profile_manager=profile_manager), max_concurrent=2)
+        session_manager.SLOT_RECHECK_INTERVAL = 30
+        try:
+            with patch.object(session_manager.browser_manager, "_sync_geolocation_with_proxy", return_value=None):
+                session_manager.start_batch(sorted(profiles), delay=0, on_session_complete=lambda r: launched.release())
+                assert launched.acquire(timeout=2) and launched.acquire(timeout=2)
+                assert not launched.acquire(timeout=0.2)
+                
+                active = session_manager.browser_manager.active_processes
+                first = next(pid for pid, process in active.items() if process is fake_popen[0])
+                start = time.monotonic()
+                fake_popen[0].exit()
+                assert launched.acquire(timeout=2)
+                assert time.monotonic() - start < 0.5
+            
+            results = session_manager.get_all_results()
+            assert results[first].status == SessionStatus.COMPLETED
+            assert len(fake_popen) == 3
+        finally:
+            session_manager.stop_batch()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
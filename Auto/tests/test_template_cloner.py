@@ -0,0 +1,111 @@
+# Tests for Template Cloner
+# Feature: multi-profile-fingerprint-automation
+
+import errno
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from app.core.template_cloner import TemplateCloner
+
+
+@pytest.fixture
+def template():
+    """Create a small template profile with mutable and immutable files."""
+    temp_dir = tempfile.mkdtemp()
+    template_dir = os.path.join(temp_dir, "template")
+    files = {
+        os.path.join("Default", "Preferences"): '{"gologin": {}}',
+        os.path.join("Default", "Cookies"): "cookies",
+        os.path.join("Default", "Extensions", "abc", "1.0", "manifest.json"): "{}",
+        os.path.join("Dictionaries", "en-US-10-1.bdic"): "dict",
+        "Local State": "{}",
+    }
+    for rel_path, content in files.items():
+        path = os.path.join(template_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    yield temp_dir, template_dir, files
+
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestTemplateCloner:
+    """Clones match the template and never share mutable files with it."""
+
+    def test_clone_matches_template(self, template):
+        """Every file is present with the same content."""
+        temp_dir, template_dir, files = template
+        target = os.path.join(temp_dir, "p1")
+
+        TemplateCloner().clone(template_dir, target)
+
+        for rel_path, content in files.items():
+            with open(os.path.join(target, rel_path)) as f:
+                assert f.read() == content
+
+    def test_only_immutable_files_hardlinked(self, template):
+        """Extensions/Dictionaries share inodes; Preferences is independent."""
+        temp_dir, template_dir, files = template
+        target = os.path.join(temp_dir, "p1")
+        cloner = TemplateCloner(use_reflink=False)
+
+        cloner.clone(template_dir, target)
+
+        for rel_path in files:
+            same = os.path.samefile(os.path.join(template_dir, rel_path), os.path.join(target, rel_path))
+            assert same == ("Extensions" in rel_path or "Dictionaries" in rel_path)
+        assert cloner.stats == {"reflink": 0, "hardlink": 2, "copy": 3}
+
+        with open(os.path.join(target, "Default", "Preferences"), "w") as f:
+            f.write("changed")
+        with open(os.path.join(template_dir, "Default", "Preferences")) as f:
+            assert f.read() == '{"gologin": {}}'
+
+    def test_fallback_chain(self, template, monkeypatch):
+        """Unsupported strategies are disabled and files fall through to copy."""
+        temp_dir, template_dir, files = template
+        cloner = TemplateCloner()
+        cloner.reflink_enabled = True
+
+        def no_reflink(src, dest):
+            open(dest, "xb").close()
+            raise OSError(errno.EOPNOTSUPP, "Operation not supported")
+
+        def no_link(src, dest):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+        monkeypatch.setattr(cloner, "_reflink", no_reflink)
+        monkeypatch.setattr(os, "link", no_link)
+
+        target = os.path.join(temp_dir, "p1")
+        cloner.clone(template_dir, target)
+
+        assert not cloner.reflink_enabled
+        assert not cloner.hardlink_enabled
+        assert cloner.stats == {"reflink": 0, "hardlink": 0, "copy": len(files)}
+        with open(os.path.join(target, "Default", "Cookies")) as f:
+            assert f.read() == "cookies"
+
+    def test_transient_error_keeps_strategy(self, template, monkeypatch):
+        """A per-file failure falls back for that file only."""
+        temp_dir, template_dir, files = template
+        cloner = TemplateCloner(use_reflink=False)
+        real_link = os.link
+        calls = []
+
+        def flaky_link(src, dest):
+            calls.append(src)
+            if len(calls) == 1:
+                raise OSError(errno.EMLINK, "Too many links")
+            real_link(src, dest)
+
+        monkeypatch.setattr(os, "link", flaky_link)
+        cloner.clone(template_dir, os.path.join(temp_dir, "p1"))
+
+        assert cloner.hardlink_enabled
+        assert cloner.stats["hardlink"] == len(calls) - 1 >= 1